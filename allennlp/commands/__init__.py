@@ -7,6 +7,8 @@ from allennlp.commands.serve import Serve
 from allennlp.commands.predict import Predict
 from allennlp.commands.train import Train
 from allennlp.commands.evaluate import Evaluate
+from allennlp.commands.elmo import Elmo
+from allennlp.commands.elmo_vocab import ElmoVocab
 from allennlp.commands.subcommand import Subcommand
 from allennlp.service.predictors import DemoModel
 
@@ -52,6 +54,8 @@ def main(prog: str = None,
             "evaluate": Evaluate(),
             "predict": Predict(predictor_overrides),
             "serve": Serve(model_overrides),
+            "elmo": Elmo(),
+            "elmo-vocab": ElmoVocab(),
 
             # Superseded by overrides
             **subcommand_overrides
@@ -0,0 +1,309 @@
+"""
+The ``elmo`` subcommand writes the activations of every layer of a pretrained ELMo biLM, for every
+sentence in a file, to an HDF5 file.
+
+The input file has one whitespace tokenized sentence per line.  Each sentence is written as a
+``float32`` dataset of shape ``(num_layers, num_tokens, embedding_dim)``, keyed by its line number
+in the input file, or, with ``--use-sentence-keys``, by its first token (which isn't embedded).
+Sentences whose keys are already in the output file are skipped, so you can restart an
+interrupted run with the same command and it will pick up where it stopped.
+
+.. code-block:: bash
+
+    $ python -m allennlp.run elmo --help
+    usage: run [command] elmo [-h] --options-file OPTIONS_FILE --weight-file
+                              WEIGHT_FILE
+                              [--token-embedding-file TOKEN_EMBEDDING_FILE]
+                              [--tokens-per-batch TOKENS_PER_BATCH]
+                              [--sort-window SORT_WINDOW]
+                              [--cuda-device CUDA_DEVICE [CUDA_DEVICE ...]]
+                              [--workers-per-device WORKERS_PER_DEVICE]
+                              [--use-sentence-keys]
+                              input_file output_file
+
+    Write the ELMo biLM activations for a file of sentences
+
+    positional arguments:
+      input_file            a file with one whitespace tokenized sentence per line
+      output_file           the HDF5 file to write the activations to
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      --options-file OPTIONS_FILE
+                            the ELMo options file
+      --weight-file WEIGHT_FILE
+                            the ELMo weight file
+      --token-embedding-file TOKEN_EMBEDDING_FILE
+                            precomputed token embeddings from the elmo-vocab
+                            command
+      --tokens-per-batch TOKENS_PER_BATCH
+                            the maximum number of tokens in a batch, including
+                            padding
+      --sort-window SORT_WINDOW
+                            how many sentences to read ahead and sort by length
+      --cuda-device CUDA_DEVICE [CUDA_DEVICE ...]
+                            ids of the GPUs to use, or -1 for the CPU
+      --workers-per-device WORKERS_PER_DEVICE
+                            how many processes to run the biLM in on each device
+      --use-sentence-keys   use the first token of each sentence as its key
+"""
+from typing import Iterable, Iterator, List, Sequence, Set, Tuple, Union
+from multiprocessing.process import BaseProcess
+import argparse
+import logging
+import multiprocessing.queues
+import queue
+import threading
+import traceback
+
+import h5py
+import numpy
+import torch
+import torch.multiprocessing
+from torch.autograd import Variable
+import tqdm
+
+from allennlp.commands.subcommand import Subcommand
+from allennlp.modules.elmo import _ElmoBiLm, batch_to_ids
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# A batch of ``(key, tokens)`` pairs.
+SentenceBatch = List[Tuple[str, List[str]]]  # pylint: disable=invalid-name
+
+
+class Elmo(Subcommand):
+    def add_subparser(self, name: str, parser: argparse._SubParsersAction) -> argparse.ArgumentParser:
+        # pylint: disable=protected-access
+        description = '''Write the ELMo biLM activations for a file of sentences'''
+        subparser = parser.add_parser(name, description=description, help=description)
+
+        subparser.add_argument('input_file', type=str,
+                               help='a file with one whitespace tokenized sentence per line')
+        subparser.add_argument('output_file', type=str, help='the HDF5 file to write the activations to')
+        subparser.add_argument('--options-file', type=str, required=True, help='the ELMo options file')
+        subparser.add_argument('--weight-file', type=str, required=True, help='the ELMo weight file')
+        subparser.add_argument('--token-embedding-file', type=str,
+                               help='precomputed token embeddings from the elmo-vocab command')
+        subparser.add_argument('--tokens-per-batch', type=int, default=4096,
+                               help='the maximum number of tokens in a batch, including padding')
+        subparser.add_argument('--sort-window', type=int, default=10000,
+                               help='how many sentences to read ahead and sort by length')
+        subparser.add_argument('--cuda-device', type=int, nargs='+', default=[-1],
+                               help='ids of the GPUs to use, or -1 for the CPU')
+        subparser.add_argument('--workers-per-device', type=int, default=1,
+                               help='how many processes to run the biLM in on each device')
+        subparser.add_argument('--use-sentence-keys', action='store_true',
+                               help='use the first token of each sentence as its key')
+
+        subparser.set_defaults(func=write_elmo_embeddings_from_args)
+
+        return subparser
+
+
+def read_sentences(input_file: str, use_sentence_keys: bool = False) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yields a ``(key, tokens)`` pair for each line of ``input_file``.  The key is the line number,
+    or, if ``use_sentence_keys`` is ``True``, the first token on the line (and blank lines, which
+    have no key, are skipped).
+    """
+    with open(input_file, 'r') as sentences:
+        for line_number, line in enumerate(sentences):
+            tokens = line.split()
+            if not use_sentence_keys:
+                yield str(line_number), tokens
+            elif tokens:
+                yield tokens[0], tokens[1:]
+
+
+def sentence_batches(sentences: Iterable[Tuple[str, List[str]]],
+                     tokens_per_batch: int,
+                     sort_window: int,
+                     skip_keys: Set[str] = None) -> Iterator[SentenceBatch]:
+    """
+    Groups ``sentences`` into batches of similar lengths.  We read ``sort_window`` sentences at a
+    time, sort them by length, and cut them into batches of at most ``tokens_per_batch`` tokens,
+    counting the padding and the sentence boundary tokens the biLM adds.  A sentence that is longer
+    than that on its own gets a batch to itself.  Sentences whose keys are in ``skip_keys``, or
+    that repeat the key of an earlier sentence, are left out.
+    """
+    seen_keys = set(skip_keys or ())
+    window: SentenceBatch = []
+    for key, tokens in sentences:
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        window.append((key, tokens))
+        if len(window) >= sort_window:
+            yield from _batch_window(window, tokens_per_batch)
+            window = []
+    yield from _batch_window(window, tokens_per_batch)
+
+
+def _batch_window(window: SentenceBatch, tokens_per_batch: int) -> Iterator[SentenceBatch]:
+    batch: SentenceBatch = []
+    for sentence in sorted(window, key=lambda sentence: len(sentence[1])):
+        # The sentences are sorted, so this one sets the padded length of the batch.
+        padded_length = len(sentence[1]) + 2
+        if batch and (len(batch) + 1) * padded_length > tokens_per_batch:
+            yield batch
+            batch = []
+        batch.append(sentence)
+    if batch:
+        yield batch
+
+
+def embed_sentences(elmo_bilm: _ElmoBiLm,
+                    sentences: List[List[str]],
+                    cuda_device: int = -1) -> List[numpy.ndarray]:
+    """
+    Returns the biLM activations for each of the ``sentences``, as ``float32`` arrays of shape
+    ``(num_layers, num_tokens, embedding_dim)``, without the sentence boundary tokens.
+
+    The ``ElmoLstm`` carries its states over from one batch to the next, which would make a
+    sentence's activations depend on which worker embedded it and what that worker embedded
+    before, so we reset the states first.
+    """
+    character_ids = Variable(batch_to_ids(sentences), volatile=True)
+    if cuda_device >= 0:
+        character_ids = character_ids.cuda(cuda_device)
+    elmo_bilm._elmo_lstm.reset_states()  # pylint: disable=protected-access
+    bilm_output = elmo_bilm(character_ids)
+    # Shape: (batch_size, num_layers, timesteps + 2, embedding_dim)
+    activations = torch.stack(bilm_output['activations'], dim=1).data.cpu().numpy()
+    return [activations[i, :, 1:len(sentence) + 1] for i, sentence in enumerate(sentences)]
+
+
+def write_elmo_embeddings(input_file: str,
+                          output_file: str,
+                          options_file: str,
+                          weight_file: str,
+                          token_embedding_file: str = None,
+                          tokens_per_batch: int = 4096,
+                          sort_window: int = 10000,
+                          cuda_devices: Sequence[int] = (-1,),
+                          workers_per_device: int = 1,
+                          use_sentence_keys: bool = False) -> None:
+    """
+    Writes the biLM activations for every sentence in ``input_file`` to ``output_file``, skipping
+    the sentences that are already there.
+
+    Reading and batching the sentences, running the biLM and writing to the HDF5 file all happen
+    at the same time: the main process reads sentences in a background thread and writes the
+    results, and the biLM runs in ``workers_per_device`` workers for each of the ``cuda_devices``,
+    which take batches from a shared queue.  With a single worker, it's a thread in this process;
+    with more, each is a separate process, and they all send their results back to this one, so
+    there's only ever one writer for the output file.
+    """
+    devices = [device for device in cuda_devices for _ in range(workers_per_device)]
+    with h5py.File(output_file, 'a') as output:
+        existing_keys = set(output.keys())
+        if existing_keys:
+            logger.info("Skipping the %d sentences already in %s", len(existing_keys), output_file)
+        batches = sentence_batches(read_sentences(input_file, use_sentence_keys),
+                                   tokens_per_batch, sort_window, existing_keys)
+
+        # A single worker is a thread, sharing plain queues with this one, and more are processes.
+        task_queue: Union[queue.Queue, multiprocessing.queues.Queue]
+        result_queue: Union[queue.Queue, multiprocessing.queues.Queue]
+        workers: List[Union[threading.Thread, BaseProcess]]
+        if len(devices) == 1:
+            task_queue = queue.Queue(maxsize=4)
+            result_queue = queue.Queue(maxsize=4)
+            workers = [threading.Thread(target=_embed_batches,
+                                        args=(task_queue, result_queue, options_file, weight_file,
+                                              token_embedding_file, devices[0], None),
+                                        daemon=True)]
+        else:
+            # CUDA can't be used in forked processes.
+            context = torch.multiprocessing.get_context('spawn')
+            task_queue = context.Queue(maxsize=2 * len(devices))
+            result_queue = context.Queue(maxsize=2 * len(devices))
+            # Share the CPU between the workers, instead of each of them trying to use all of it.
+            num_threads = max(1, torch.get_num_threads() // len(devices))
+            workers = [context.Process(target=_embed_batches,
+                                       args=(task_queue, result_queue, options_file, weight_file,
+                                             token_embedding_file, device, num_threads),
+                                       daemon=True)
+                       for device in devices]
+        for worker in workers:
+            worker.start()
+        threading.Thread(target=_feed_batches, args=(batches, task_queue, result_queue, len(workers)),
+                         daemon=True).start()
+
+        try:
+            _write_results(result_queue, len(workers), output)
+        finally:
+            for worker in workers:
+                # Only processes can be stopped.  ``context.Process`` is a ``SpawnProcess``, which
+                # isn't a ``multiprocessing.Process``, but both are ``BaseProcesses``.
+                if isinstance(worker, BaseProcess) and worker.is_alive():
+                    worker.terminate()
+
+
+def _feed_batches(batches: Iterable[SentenceBatch], task_queue, result_queue, num_workers: int) -> None:
+    try:
+        for batch in batches:
+            task_queue.put(batch)
+    except Exception:  # pylint: disable=broad-except
+        result_queue.put(traceback.format_exc())
+    for _ in range(num_workers):
+        task_queue.put(None)
+
+
+def _embed_batches(task_queue,
+                   result_queue,
+                   options_file: str,
+                   weight_file: str,
+                   token_embedding_file: str,
+                   cuda_device: int,
+                   num_threads: int) -> None:
+    """
+    The loop each worker runs: embeds the batches from ``task_queue`` until it gets ``None``,
+    putting the keys and activations for each on ``result_queue``, followed by ``None`` when it's
+    done.  If anything goes wrong, it puts the traceback on ``result_queue`` instead.
+    """
+    try:
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        elmo_bilm = _ElmoBiLm(options_file, weight_file, token_embedding_file=token_embedding_file)
+        if cuda_device >= 0:
+            elmo_bilm.cuda(cuda_device)
+        elmo_bilm.eval()
+        for batch in iter(task_queue.get, None):
+            keys = [key for key, _ in batch]
+            result_queue.put((keys, embed_sentences(elmo_bilm, [tokens for _, tokens in batch], cuda_device)))
+    except Exception:  # pylint: disable=broad-except
+        result_queue.put(traceback.format_exc())
+        return
+    result_queue.put(None)
+
+
+def _write_results(result_queue, num_workers: int, output: h5py.File) -> None:
+    with tqdm.tqdm(unit=' sentences') as progress:
+        while num_workers > 0:
+            result = result_queue.get()
+            if result is None:
+                num_workers -= 1
+                continue
+            if isinstance(result, str):
+                raise RuntimeError("Failed to compute the ELMo activations:\n" + result)
+            keys, activations = result
+            for key, sentence_activations in zip(keys, activations):
+                output.create_dataset(key, data=sentence_activations)
+            # So that if we're interrupted, at most the batch we were writing is lost.
+            output.flush()
+            progress.update(len(keys))
+
+
+def write_elmo_embeddings_from_args(args: argparse.Namespace) -> None:
+    write_elmo_embeddings(args.input_file,
+                          args.output_file,
+                          args.options_file,
+                          args.weight_file,
+                          token_embedding_file=args.token_embedding_file,
+                          tokens_per_batch=args.tokens_per_batch,
+                          sort_window=args.sort_window,
+                          cuda_devices=args.cuda_device,
+                          workers_per_device=args.workers_per_device,
+                          use_sentence_keys=args.use_sentence_keys)
@@ -0,0 +1,120 @@
+"""
+The ``elmo-vocab`` subcommand precomputes the context insensitive ELMo token embeddings (the
+output of the character CNN, highway layers and projection) for every token in a vocabulary, and
+writes them to an HDF5 file.  Given this file as its ``token_embedding_file``, ELMo looks these
+tokens up instead of running the character CNN on them.
+
+.. code-block:: bash
+
+    $ python -m allennlp.run elmo-vocab --help
+    usage: run [command] elmo-vocab [-h] --options-file OPTIONS_FILE --weight-file
+                                    WEIGHT_FILE [--batch-size BATCH_SIZE]
+                                    [--cuda-device CUDA_DEVICE]
+                                    vocab_file output_file
+
+    Precompute ELMo token embeddings for a vocabulary
+
+    positional arguments:
+      vocab_file            a file with one token per line, such as a namespace
+                            file saved by a Vocabulary
+      output_file           the HDF5 file to write the embeddings to
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      --options-file OPTIONS_FILE
+                            the ELMo options file
+      --weight-file WEIGHT_FILE
+                            the ELMo weight file
+      --batch-size BATCH_SIZE
+                            how many tokens to embed at a time
+      --cuda-device CUDA_DEVICE
+                            id of GPU to use (if any)
+"""
+from typing import List
+import argparse
+import logging
+
+import h5py
+import numpy
+import torch
+from torch.autograd import Variable
+
+from allennlp.commands.subcommand import Subcommand
+from allennlp.data.token_indexers.elmo_indexer import ELMoCharacterMapper
+from allennlp.modules.elmo import _ElmoCharacterEncoder
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class ElmoVocab(Subcommand):
+    def add_subparser(self, name: str, parser: argparse._SubParsersAction) -> argparse.ArgumentParser:
+        # pylint: disable=protected-access
+        description = '''Precompute ELMo token embeddings for a vocabulary'''
+        subparser = parser.add_parser(name, description=description, help=description)
+
+        subparser.add_argument('vocab_file', type=str,
+                               help='a file with one token per line, such as a namespace file saved '
+                                    'by a Vocabulary')
+        subparser.add_argument('output_file', type=str, help='the HDF5 file to write the embeddings to')
+        subparser.add_argument('--options-file', type=str, required=True, help='the ELMo options file')
+        subparser.add_argument('--weight-file', type=str, required=True, help='the ELMo weight file')
+        subparser.add_argument('--batch-size', type=int, default=1024,
+                               help='how many tokens to embed at a time')
+        subparser.add_argument('--cuda-device', type=int, default=-1, help='id of GPU to use (if any)')
+
+        subparser.set_defaults(func=write_vocab_embeddings_from_args)
+
+        return subparser
+
+
+def write_vocab_embeddings(tokens: List[str],
+                           options_file: str,
+                           weight_file: str,
+                           output_file: str,
+                           batch_size: int = 1024,
+                           cuda_device: int = -1) -> None:
+    """
+    Computes the context insensitive ELMo embedding of each of the ``tokens``, and of the sentence
+    boundary tokens and padding that ELMo adds itself, and writes them to ``output_file``, with
+    datasets ``char_ids`` (the character ids the embeddings are looked up by), ``embeddings`` and
+    ``tokens``.  Tokens with the same character ids (which happens for words longer than ELMo's
+    maximum word length) are only written once.
+    """
+    tokens = list(tokens) + [ELMoCharacterMapper.bos_token, ELMoCharacterMapper.eos_token]
+    char_ids = ELMoCharacterMapper.batch_to_char_ids([tokens])[0]
+    # Padding tokens have all-zero character ids.  Their embeddings are masked out, but
+    # including them means we never run the CNN for them either.
+    char_ids = numpy.concatenate([char_ids, numpy.zeros((1, char_ids.shape[1]), dtype=char_ids.dtype)])
+    tokens.append('')
+    char_ids, unique_indices = numpy.unique(char_ids, axis=0, return_index=True)
+    tokens = [tokens[index] for index in unique_indices]
+
+    encoder = _ElmoCharacterEncoder(options_file, weight_file)
+    if cuda_device >= 0:
+        encoder.cuda(cuda_device)
+    encoder.eval()
+
+    embeddings = []
+    for start in range(0, len(char_ids), batch_size):
+        batch = torch.from_numpy(char_ids[start:start + batch_size])
+        if cuda_device >= 0:
+            batch = batch.cuda(cuda_device)
+        embeddings.append(encoder.embed_characters(Variable(batch, volatile=True)).data.cpu().numpy())
+        logger.info("Embedded %d of %d tokens", min(start + batch_size, len(char_ids)), len(char_ids))
+
+    with h5py.File(output_file, 'w') as fout:
+        fout.create_dataset('char_ids', data=char_ids.astype(numpy.int16))
+        fout.create_dataset('embeddings', data=numpy.concatenate(embeddings).astype(numpy.float32))
+        fout.create_dataset('tokens', data=numpy.array(tokens, dtype=object),
+                            dtype=h5py.special_dtype(vlen=str))
+
+
+def write_vocab_embeddings_from_args(args: argparse.Namespace) -> None:
+    with open(args.vocab_file, 'r') as vocab_file:
+        tokens = [line.rstrip('\n') for line in vocab_file]
+    write_vocab_embeddings(tokens,
+                           args.options_file,
+                           args.weight_file,
+                           args.output_file,
+                           args.batch_size,
+                           args.cuda_device)
@@ -22,6 +22,7 @@ predictions using a trained model and its :class:`~allennlp.service.predictors.p
 """
 
 import argparse
+import json
 from contextlib import ExitStack
 import sys
 from typing import Optional, IO, Dict
@@ -73,6 +74,10 @@ class Predict(Subcommand):
                                default="",
                                help='a HOCON structure used to override the experiment configuration')
 
+        subparser.add_argument('--predictor-args', type=str, default="",
+                               help='a JSON object of arguments for the predictor, such as '
+                                    '{"max_segment_length": 500} for coreference resolution')
+
         subparser.set_defaults(func=_predict(self.predictors))
 
         return subparser
@@ -82,7 +87,8 @@ def _get_predictor(args: argparse.Namespace, predictors: Dict[str, str]) -> Pred
     model_type = archive.config.get("model").get("type")
     if model_type not in predictors:
         raise ConfigurationError("no known predictor for model type {}".format(model_type))
-    predictor = Predictor.from_archive(archive, predictors[model_type])
+    predictor_args = json.loads(args.predictor_args) if args.predictor_args else None
+    predictor = Predictor.from_archive(archive, predictors[model_type], predictor_args=predictor_args)
     return predictor
 
 def _run(predictor: Predictor,
@@ -2,6 +2,7 @@ import logging
 import collections
 from typing import Any, Dict, List, Optional, Tuple, DefaultDict, Set
 
+import numpy
 from overrides import overrides
 from tqdm import tqdm
 
@@ -10,7 +11,7 @@ from allennlp.common.checks import ConfigurationError
 from allennlp.common.file_utils import cached_path
 from allennlp.data.dataset import Dataset
 from allennlp.data.dataset_readers.dataset_reader import DatasetReader
-from allennlp.data.fields import Field, ListField, TextField, IndexField, MetadataField, SequenceLabelField
+from allennlp.data.fields import Field, TextField, MetadataField, SequenceLabelField, SpanListField
 from allennlp.data.instance import Instance
 from allennlp.data.tokenizers import Token
 from allennlp.data.token_indexers import SingleIdTokenIndexer, TokenIndexer
@@ -60,14 +61,20 @@ class ConllCorefReader(DatasetReader):
     scripts/compile_coref_data.sh for more details of how to pre-process the Ontonotes 5.0 data
     into the correct format.
 
-    Returns a ``Dataset`` where the ``Instances`` have four fields: ``text``, a ``TextField``
-    containing the full document text, ``span_starts``, a ``ListField[IndexField]`` of inclusive
-    start indices for span candidates, ``span_ends``, a ``ListField[IndexField]`` of inclusive end
+    Returns a ``Dataset`` where the ``Instances`` have three fields: ``text``, a ``TextField``
+    containing the full document text, ``spans``, a ``SpanListField`` of inclusive start and end
     indices for span candidates, and ``metadata``, a ``MetadataField`` that stores the instance's
     original text. For data with gold cluster labels, we also include the original ``clusters``
     (a list of list of index pairs) and a ``SequenceLabelField`` of cluster ids for every span
     candidate.
 
+    With ``enumerate_spans=False``, we leave enumerating the span candidates to the
+    :class:`~allennlp.models.coreference_resolution.CoreferenceResolver`, which is much cheaper
+    for long documents, and instead of ``spans`` the ``Instances`` have a ``sentence_ids``
+    ``SequenceLabelField`` with the index of the sentence each word is in.  For data with gold
+    cluster labels, we then include the gold mentions as a ``gold_mentions`` ``SpanListField``,
+    and their cluster ids as a ``gold_mention_labels`` ``SequenceLabelField``.
+
     Parameters
     ----------
     max_span_width: ``int``, required.
@@ -75,12 +82,16 @@ class ConllCorefReader(DatasetReader):
     token_indexers : ``Dict[str, TokenIndexer]``, optional
         This is used to index the words in the document.  See :class:`TokenIndexer`.
         Default is ``{"tokens": SingleIdTokenIndexer()}``.
+    enumerate_spans : ``bool``, optional (default = True)
+        Whether to enumerate the candidate spans here, or to leave that to the model.
     """
     def __init__(self,
                  max_span_width: int,
-                 token_indexers: Dict[str, TokenIndexer] = None) -> None:
+                 token_indexers: Dict[str, TokenIndexer] = None,
+                 enumerate_spans: bool = True) -> None:
         self._max_span_width = max_span_width
         self._token_indexers = token_indexers or {"tokens": SingleIdTokenIndexer()}
+        self._enumerate_spans = enumerate_spans
 
     @overrides
     def read(self, file_path: str):
@@ -132,17 +143,22 @@ class ConllCorefReader(DatasetReader):
         An ``Instance`` containing the following ``Fields``:
             text : ``TextField``
                 The text of the full document.
-            span_starts : ``ListField[IndexField]``
-                A ListField containing the span starts represented as ``IndexFields``
-                with respect to the document text.
-            span_ends : ``ListField[IndexField]``
-                A ListField containing the span ends represented as ``IndexFields``
-                with respect to the document text.
+            spans : ``SpanListField``
+                A SpanListField containing the inclusive start and end indices of every
+                candidate span with respect to the document text.
             span_labels : ``SequenceLabelField``, optional
                 The id of the cluster which each possible span belongs to, or -1 if it does
                  not belong to a cluster. As these labels have variable length (it depends on
                  how many spans we are considering), we represent this a as a ``SequenceLabelField``
-                 with respect to the ``span_starts`` ``ListField``.
+                 with respect to the ``spans`` ``SpanListField``.
+
+        If we aren't enumerating the spans, ``spans`` and ``span_labels`` are replaced by:
+            sentence_ids : ``SequenceLabelField``
+                The index of the sentence each word in the document is in.
+            gold_mentions : ``SpanListField``, optional
+                Every mention in the gold clusters.
+            gold_mention_labels : ``SequenceLabelField``, optional
+                The id of the cluster which each gold mention belongs to.
         """
         flattened_sentences = [self._normalize_word(word)
                                for sentence in sentences
@@ -154,43 +170,33 @@ class ConllCorefReader(DatasetReader):
 
         text_field = TextField([Token(word) for word in flattened_sentences], self._token_indexers)
 
-        cluster_dict = {}
-        if gold_clusters is not None:
-            for cluster_id, cluster in enumerate(gold_clusters):
-                for mention in cluster:
-                    cluster_dict[tuple(mention)] = cluster_id
-
-        span_starts: List[Field] = []
-        span_ends: List[Field] = []
-        span_labels: Optional[List[int]] = [] if gold_clusters is not None else None
-
-        sentence_offset = 0
-        for sentence in sentences:
-            for start_index in range(len(sentence)):
-                for end_index in range(start_index, min(start_index + self._max_span_width, len(sentence))):
-                    start = sentence_offset + start_index
-                    end = sentence_offset + end_index
-
-                    if span_labels is not None:
-                        if (start, end) in cluster_dict:
-                            span_labels.append(cluster_dict[(start, end)])
-                        else:
-                            span_labels.append(-1)
-
-                    span_starts.append(IndexField(start, text_field))
-                    span_ends.append(IndexField(end, text_field))
-            sentence_offset += len(sentence)
-
-        span_starts_field = ListField(span_starts)
-        span_ends_field = ListField(span_ends)
-        metadata_field = MetadataField(metadata)
-
         fields: Dict[str, Field] = {"text": text_field,
-                                    "span_starts": span_starts_field,
-                                    "span_ends": span_ends_field,
-                                    "metadata": metadata_field}
-        if span_labels is not None:
-            fields["span_labels"] = SequenceLabelField(span_labels, span_starts_field)
+                                    "metadata": MetadataField(metadata)}
+
+        if not self._enumerate_spans:
+            sentence_ids = [sentence_id
+                            for sentence_id, sentence in enumerate(sentences)
+                            for _ in sentence]
+            fields["sentence_ids"] = SequenceLabelField(sentence_ids, text_field)
+            if gold_clusters is not None:
+                mentions = [(mention[0], mention[1], cluster_id)
+                            for cluster_id, cluster in enumerate(gold_clusters)
+                            for mention in cluster]
+                gold_mentions_field = SpanListField([start for start, _, _ in mentions],
+                                                    [end for _, end, _ in mentions],
+                                                    text_field)
+                fields["gold_mentions"] = gold_mentions_field
+                fields["gold_mention_labels"] = SequenceLabelField([label for _, _, label in mentions],
+                                                                   gold_mentions_field)
+            return Instance(fields)
+
+        span_starts, span_ends = _enumerate_spans([len(sentence) for sentence in sentences],
+                                                  self._max_span_width)
+        spans_field = SpanListField(span_starts, span_ends, text_field)
+        fields["spans"] = spans_field
+        if gold_clusters is not None:
+            span_labels = _label_spans(span_starts, span_ends, len(flattened_sentences), gold_clusters)
+            fields["span_labels"] = SequenceLabelField(span_labels.tolist(), spans_field)
 
         return Instance(fields)
 
@@ -198,8 +204,11 @@ class ConllCorefReader(DatasetReader):
     def from_params(cls, params: Params) -> "ConllCorefReader":
         token_indexers = TokenIndexer.dict_from_params(params.pop("token_indexers", {}))
         max_span_width = params.pop_int("max_span_width")
+        enumerate_spans = params.pop_bool("enumerate_spans", True)
         params.assert_empty(cls.__name__)
-        return cls(token_indexers=token_indexers, max_span_width=max_span_width)
+        return cls(token_indexers=token_indexers,
+                   max_span_width=max_span_width,
+                   enumerate_spans=enumerate_spans)
 
     @staticmethod
     def _normalize_word(word):
@@ -207,3 +216,50 @@ class ConllCorefReader(DatasetReader):
             return word[1:]
         else:
             return word
+
+
+def _enumerate_spans(sentence_lengths: List[int], max_span_width: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Returns the inclusive start and end indices of every span in a document which is at most
+    ``max_span_width`` words wide and doesn't cross a sentence boundary, ordered by start index and
+    then by end index.
+    """
+    sentence_ends = numpy.cumsum(sentence_lengths, dtype=numpy.int64)
+    # Shape: (document_length,)
+    word_sentence_ends = numpy.repeat(sentence_ends, sentence_lengths)
+    word_indices = numpy.arange(len(word_sentence_ends), dtype=numpy.int64)
+    # The number of spans which start at each word.
+    num_spans = numpy.minimum(word_sentence_ends - word_indices, max_span_width)
+
+    span_starts = numpy.repeat(word_indices, num_spans)
+    # The offset of each span's first entry in ``span_starts`` is the number of spans starting
+    # before its start word, so subtracting it off gives the width (minus one) of each span.
+    first_span_offsets = numpy.repeat(numpy.cumsum(num_spans) - num_spans, num_spans)
+    span_ends = span_starts + numpy.arange(len(span_starts), dtype=numpy.int64) - first_span_offsets
+    return span_starts, span_ends
+
+
+def _label_spans(span_starts: numpy.ndarray,
+                 span_ends: numpy.ndarray,
+                 document_length: int,
+                 gold_clusters: List[List[Tuple[int, int]]]) -> numpy.ndarray:
+    """
+    Returns the id of the gold cluster which each span belongs to, or -1 if it isn't in a cluster.
+    Mentions which aren't in the candidate spans (e.g. because they're too wide) are ignored.
+    """
+    span_labels = numpy.full(len(span_starts), -1, dtype=numpy.int64)
+    mentions = [(mention[0], mention[1], cluster_id)
+                for cluster_id, cluster in enumerate(gold_clusters)
+                for mention in cluster]
+    if not mentions or not len(span_starts):  # pylint: disable=len-as-condition
+        return span_labels
+    mention_starts, mention_ends, cluster_ids = numpy.array(mentions, dtype=numpy.int64).T
+
+    # The spans are sorted by start and then end, so a single number combining the two is sorted
+    # too, and we can find each mention's span with a binary search.
+    span_keys = span_starts * document_length + span_ends
+    mention_keys = mention_starts * document_length + mention_ends
+    positions = numpy.minimum(numpy.searchsorted(span_keys, mention_keys), len(span_keys) - 1)
+    found = span_keys[positions] == mention_keys
+    span_labels[positions[found]] = cluster_ids[found]
+    return span_labels
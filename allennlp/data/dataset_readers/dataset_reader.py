@@ -1,5 +1,9 @@
+from typing import Iterable, Iterator, List
+from multiprocessing import Pool
+
 from allennlp.data.dataset import InstanceCollection
 from allennlp.data.instance import Instance
+from allennlp.data.tokenizers import Token, Tokenizer
 from allennlp.common import Params
 from allennlp.common.registrable import Registrable
 
@@ -9,7 +13,22 @@ class DatasetReader(Registrable):
     A ``DatasetReader`` reads data from some location and constructs a :class:`Dataset`.  All
     parameters necessary to read the data apart from the filepath should be passed to the
     constructor of the ``DatasetReader``.
+
+    Readers that tokenize a lot of raw text should do so with :func:`batch_tokenize`, which
+    tokenizes texts in chunks, possibly across several processes.  How it does that is controlled
+    by two attributes, which can be set on any reader, or given as the top-level
+    ``"tokenization_chunk_size"`` and ``"tokenization_workers"`` keys in the reader's parameters.
+
+    Attributes
+    ----------
+    tokenization_chunk_size : ``int`` (default=``1000``)
+        How many texts we pass to ``Tokenizer.batch_tokenize`` at a time.
+    tokenization_workers : ``int`` (default=``1``)
+        How many processes we tokenize with.  With ``1``, we tokenize in the current process.
     """
+    tokenization_chunk_size = 1000
+    tokenization_workers = 1
+
     def read(self, file_path: str) -> InstanceCollection:
         """
         Actually reads some data from the `file_path` and returns a :class:`Dataset`.
@@ -35,10 +54,62 @@ class DatasetReader(Registrable):
         """
         raise NotImplementedError
 
+    def batch_tokenize(self, tokenizer: Tokenizer, texts: Iterable[str]) -> Iterator[List[Token]]:
+        """
+        Tokenizes ``texts`` with ``tokenizer``, yielding the tokens for each text in order.  This
+        gives the same tokens as calling ``tokenizer.tokenize`` on each text, but it's much faster:
+        we group the texts into chunks of ``tokenization_chunk_size`` and call
+        ``tokenizer.batch_tokenize`` on each chunk (which uses spaCy's ``pipe`` for the
+        ``SpacyWordSplitter``), and if ``tokenization_workers`` is greater than one, we tokenize the
+        chunks in a pool of that many processes.
+        """
+        chunks = _chunk(texts, self.tokenization_chunk_size)
+        if self.tokenization_workers <= 1:
+            for chunk in chunks:
+                yield from tokenizer.batch_tokenize(chunk)
+        else:
+            with Pool(self.tokenization_workers,
+                      initializer=_initialize_tokenization_worker,
+                      initargs=(tokenizer,)) as pool:
+                for tokenized_chunk in pool.imap(_tokenize_chunk, chunks):
+                    yield from tokenized_chunk
+
     @classmethod
     def from_params(cls, params: Params) -> 'DatasetReader':
         """
         Static method that constructs the dataset reader described by ``params``.
         """
         choice = params.pop_choice('type', cls.list_available())
-        return cls.by_name(choice).from_params(params)
+        tokenization_chunk_size = params.pop_int('tokenization_chunk_size', None)
+        tokenization_workers = params.pop_int('tokenization_workers', None)
+        reader = cls.by_name(choice).from_params(params)
+        if tokenization_chunk_size is not None:
+            reader.tokenization_chunk_size = tokenization_chunk_size
+        if tokenization_workers is not None:
+            reader.tokenization_workers = tokenization_workers
+        return reader
+
+
+def _chunk(texts: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Each tokenization worker process gets its own copy of the tokenizer when the pool starts, so we
+# don't have to send it (and e.g. a whole spaCy model) along with every chunk of text.
+_worker_tokenizer: Tokenizer = None  # pylint: disable=invalid-name
+
+
+def _initialize_tokenization_worker(tokenizer: Tokenizer) -> None:
+    global _worker_tokenizer  # pylint: disable=global-statement
+    _worker_tokenizer = tokenizer
+
+
+def _tokenize_chunk(texts: List[str]) -> List[List[Token]]:
+    return _worker_tokenizer.batch_tokenize(texts)
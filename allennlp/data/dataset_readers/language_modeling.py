@@ -81,7 +81,7 @@ class LanguageModelingReader(DatasetReader):
             for index in tqdm.tqdm(range(0, len(tokenized_text) - num_tokens, num_tokens - 1)):
                 tokenized_strings.append(tokenized_text[index:(index + num_tokens)])
         else:
-            tokenized_strings = [self._tokenizer.tokenize(s) for s in instance_strings]
+            tokenized_strings = list(self.batch_tokenize(self._tokenizer, instance_strings))
 
         instances = []
         for tokenized_string in tokenized_strings:
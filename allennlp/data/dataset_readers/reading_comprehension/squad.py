@@ -55,23 +55,29 @@ class SquadReader(DatasetReader):
             dataset_json = json.load(dataset_file)
             dataset = dataset_json['data']
         logger.info("Reading the dataset")
+        paragraphs = [paragraph_json for article in dataset for paragraph_json in article['paragraphs']]
+        question_texts = [question_answer["question"].strip().replace("\n", "")
+                          for paragraph_json in paragraphs
+                          for question_answer in paragraph_json['qas']]
+        logger.info("Tokenizing %d paragraphs and %d questions", len(paragraphs), len(question_texts))
+        tokenized_paragraphs = self.batch_tokenize(self._tokenizer,
+                                                   [paragraph_json["context"] for paragraph_json in paragraphs])
+        tokenized_questions = iter(list(self.batch_tokenize(self._tokenizer, question_texts)))
         instances = []
-        for article in tqdm(dataset):
-            for paragraph_json in article['paragraphs']:
-                paragraph = paragraph_json["context"]
-                tokenized_paragraph = self._tokenizer.tokenize(paragraph)
-
-                for question_answer in paragraph_json['qas']:
-                    question_text = question_answer["question"].strip().replace("\n", "")
-                    answer_texts = [answer['text'] for answer in question_answer['answers']]
-                    span_starts = [answer['answer_start'] for answer in question_answer['answers']]
-                    span_ends = [start + len(answer) for start, answer in zip(span_starts, answer_texts)]
-                    instance = self.text_to_instance(question_text,
-                                                     paragraph,
-                                                     zip(span_starts, span_ends),
-                                                     answer_texts,
-                                                     tokenized_paragraph)
-                    instances.append(instance)
+        for paragraph_json, tokenized_paragraph in zip(tqdm(paragraphs), tokenized_paragraphs):
+            paragraph = paragraph_json["context"]
+            for question_answer in paragraph_json['qas']:
+                question_text = question_answer["question"].strip().replace("\n", "")
+                answer_texts = [answer['text'] for answer in question_answer['answers']]
+                span_starts = [answer['answer_start'] for answer in question_answer['answers']]
+                span_ends = [start + len(answer) for start, answer in zip(span_starts, answer_texts)]
+                instance = self.text_to_instance(question_text,
+                                                 paragraph,
+                                                 zip(span_starts, span_ends),
+                                                 answer_texts,
+                                                 tokenized_paragraph,
+                                                 next(tokenized_questions))
+                instances.append(instance)
         if not instances:
             raise ConfigurationError("No instances were read from the given filepath {}. "
                                      "Is the path correct?".format(file_path))
@@ -83,10 +89,13 @@ class SquadReader(DatasetReader):
                          passage_text: str,
                          char_spans: List[Tuple[int, int]] = None,
                          answer_texts: List[str] = None,
-                         passage_tokens: List[Token] = None) -> Instance:
+                         passage_tokens: List[Token] = None,
+                         question_tokens: List[Token] = None) -> Instance:
         # pylint: disable=arguments-differ
         if not passage_tokens:
             passage_tokens = self._tokenizer.tokenize(passage_text)
+        if question_tokens is None:
+            question_tokens = self._tokenizer.tokenize(question_text)
         char_spans = char_spans or []
 
         # We need to convert character indices in `passage_text` to token indices in
@@ -106,7 +115,7 @@ class SquadReader(DatasetReader):
                 logger.debug("Answer: %s", passage_text[char_span_start:char_span_end])
             token_spans.append((span_start, span_end))
 
-        return util.make_reading_comprehension_instance(self._tokenizer.tokenize(question_text),
+        return util.make_reading_comprehension_instance(question_tokens,
                                                         passage_tokens,
                                                         self._token_indexers,
                                                         passage_text,
@@ -78,10 +78,13 @@ class TriviaQaReader(DatasetReader):
             data_json = json.loads(base_tarball.extractfile(path).read().decode('utf-8'))
 
         logger.info("Reading the dataset")
-        instances = []
+        question_texts: List[str] = []
+        # Each of these is the index of a question in `question_texts`, a paragraph, and the
+        # answer texts for the question.
+        paragraph_examples: List[Tuple[int, str, List[str]]] = []
         for question_json in tqdm(data_json['Data']):
             question_text = question_json['Question']
-            question_tokens = self._tokenizer.tokenize(question_text)
+            question_texts.append(question_text)
 
             evidence_files: List[List[str]] = []  # contains lines from each evidence file
             if 'web' in file_path:
@@ -99,19 +102,27 @@ class TriviaQaReader(DatasetReader):
             human_answers = [util.normalize_text(answer) for answer in answer_json.get('HumanAnswers', [])]
             answer_texts = answer_json['NormalizedAliases'] + human_answers
             for paragraph in self.pick_paragraphs(evidence_files, question_text, answer_texts):
-                paragraph_tokens = self._tokenizer.tokenize(paragraph)
-                token_spans = util.find_valid_answer_spans(paragraph_tokens, answer_texts)
-                if not token_spans:
-                    # For now, we'll just ignore instances that we can't find answer spans for.
-                    # Maybe we can do something smarter here later, but this will do for now.
-                    continue
-                instance = self.text_to_instance(question_text,
-                                                 paragraph,
-                                                 token_spans,
-                                                 answer_texts,
-                                                 question_tokens,
-                                                 paragraph_tokens)
-                instances.append(instance)
+                paragraph_examples.append((len(question_texts) - 1, paragraph, answer_texts))
+
+        logger.info("Tokenizing %d questions and %d paragraphs", len(question_texts), len(paragraph_examples))
+        question_tokens = list(self.batch_tokenize(self._tokenizer, question_texts))
+        paragraph_tokens = self.batch_tokenize(self._tokenizer,
+                                               [paragraph for _, paragraph, _ in paragraph_examples])
+        instances = []
+        for example, tokens in zip(paragraph_examples, paragraph_tokens):
+            example_question_index, example_paragraph, example_answer_texts = example
+            token_spans = util.find_valid_answer_spans(tokens, example_answer_texts)
+            if not token_spans:
+                # For now, we'll just ignore instances that we can't find answer spans for.
+                # Maybe we can do something smarter here later, but this will do for now.
+                continue
+            instance = self.text_to_instance(question_texts[example_question_index],
+                                             example_paragraph,
+                                             token_spans,
+                                             example_answer_texts,
+                                             question_tokens[example_question_index],
+                                             tokens)
+            instances.append(instance)
         if not instances:
             raise ConfigurationError("No instances were read from the given filepath {}. "
                                      "Is the path correct?".format(file_path))
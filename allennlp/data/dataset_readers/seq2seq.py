@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List
 import logging
 
 from overrides import overrides
@@ -64,7 +64,8 @@ class Seq2SeqDatasetReader(DatasetReader):
 
     @overrides
     def read(self, file_path):
-        instances = []
+        source_sequences = []
+        target_sequences = []
         with open(file_path, "r") as data_file:
             logger.info("Reading instances from lines in file at: %s", file_path)
             for line_num, line in enumerate(tqdm.tqdm(data_file)):
@@ -77,7 +78,14 @@ class Seq2SeqDatasetReader(DatasetReader):
                 if len(line_parts) != 2:
                     raise ConfigurationError("Invalid line format: %s (line number %d)" % (line, line_num + 1))
                 source_sequence, target_sequence = line_parts
-                instances.append(self.text_to_instance(source_sequence, target_sequence))
+                source_sequences.append(source_sequence)
+                target_sequences.append(target_sequence)
+
+        logger.info("Tokenizing %d sequence pairs", len(source_sequences))
+        tokenized_sources = list(self.batch_tokenize(self._source_tokenizer, source_sequences))
+        tokenized_targets = list(self.batch_tokenize(self._target_tokenizer, target_sequences))
+        instances = [self._make_instance(tokenized_source, tokenized_target)
+                     for tokenized_source, tokenized_target in zip(tokenized_sources, tokenized_targets)]
         if not instances:
             raise ConfigurationError("No instances read!")
         return Dataset(instances)
@@ -86,12 +94,20 @@ class Seq2SeqDatasetReader(DatasetReader):
     def text_to_instance(self, source_string: str, target_string: str = None) -> Instance:  # type: ignore
         # pylint: disable=arguments-differ
         tokenized_source = self._source_tokenizer.tokenize(source_string)
+        if target_string is not None:
+            tokenized_target = self._target_tokenizer.tokenize(target_string)
+        else:
+            tokenized_target = None
+        return self._make_instance(tokenized_source, tokenized_target)
+
+    def _make_instance(self,
+                       tokenized_source: List[Token],
+                       tokenized_target: List[Token] = None) -> Instance:
         if self._source_add_start_token:
             tokenized_source.insert(0, Token(START_SYMBOL))
         tokenized_source.append(Token(END_SYMBOL))
         source_field = TextField(tokenized_source, self._source_token_indexers)
-        if target_string is not None:
-            tokenized_target = self._target_tokenizer.tokenize(target_string)
+        if tokenized_target is not None:
             tokenized_target.insert(0, Token(START_SYMBOL))
             tokenized_target.append(Token(END_SYMBOL))
             target_field = TextField(tokenized_target, self._target_token_indexers)
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List
 import json
 import logging
 
@@ -13,7 +13,7 @@ from allennlp.data.dataset_readers.dataset_reader import DatasetReader
 from allennlp.data.fields import Field, TextField, LabelField
 from allennlp.data.instance import Instance
 from allennlp.data.token_indexers import SingleIdTokenIndexer, TokenIndexer
-from allennlp.data.tokenizers import Tokenizer, WordTokenizer
+from allennlp.data.tokenizers import Token, Tokenizer, WordTokenizer
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -45,7 +45,9 @@ class SnliReader(DatasetReader):
         # if `file_path` is a URL, redirect to the cache
         file_path = cached_path(file_path)
 
-        instances = []
+        premises = []
+        hypotheses = []
+        labels = []
         with open(file_path, 'r') as snli_file:
             logger.info("Reading SNLI instances from jsonl dataset at: %s", file_path)
             for line in tqdm.tqdm(snli_file):
@@ -57,9 +59,15 @@ class SnliReader(DatasetReader):
                     # like 800 out of 500k examples in the training data.
                     continue
 
-                premise = example["sentence1"]
-                hypothesis = example["sentence2"]
-                instances.append(self.text_to_instance(premise, hypothesis, label))
+                premises.append(example["sentence1"])
+                hypotheses.append(example["sentence2"])
+                labels.append(label)
+
+        logger.info("Tokenizing %d premises and hypotheses", len(labels))
+        tokenized_texts = list(self.batch_tokenize(self._tokenizer, premises + hypotheses))
+        instances = [self._make_instance(premise_tokens, hypothesis_tokens, label)
+                     for premise_tokens, hypothesis_tokens, label
+                     in zip(tokenized_texts[:len(labels)], tokenized_texts[len(labels):], labels)]
         if not instances:
             raise ConfigurationError("No instances were read from the given filepath {}. "
                                      "Is the path correct?".format(file_path))
@@ -71,9 +79,15 @@ class SnliReader(DatasetReader):
                          hypothesis: str,
                          label: str = None) -> Instance:
         # pylint: disable=arguments-differ
+        return self._make_instance(self._tokenizer.tokenize(premise),
+                                   self._tokenizer.tokenize(hypothesis),
+                                   label)
+
+    def _make_instance(self,
+                       premise_tokens: List[Token],
+                       hypothesis_tokens: List[Token],
+                       label: str = None) -> Instance:
         fields: Dict[str, Field] = {}
-        premise_tokens = self._tokenizer.tokenize(premise)
-        hypothesis_tokens = self._tokenizer.tokenize(hypothesis)
         fields['premise'] = TextField(premise_tokens, self._token_indexers)
         fields['hypothesis'] = TextField(hypothesis_tokens, self._token_indexers)
         if label:
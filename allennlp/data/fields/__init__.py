@@ -11,4 +11,5 @@ from allennlp.data.fields.list_field import ListField
 from allennlp.data.fields.metadata_field import MetadataField
 from allennlp.data.fields.sequence_field import SequenceField
 from allennlp.data.fields.sequence_label_field import SequenceLabelField
+from allennlp.data.fields.span_list_field import SpanListField
 from allennlp.data.fields.text_field import TextField
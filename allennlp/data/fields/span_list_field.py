@@ -0,0 +1,76 @@
+# pylint: disable=no-self-use
+from typing import Dict, Sequence, Union
+
+import numpy
+from overrides import overrides
+import torch
+from torch.autograd import Variable
+
+from allennlp.data.fields.sequence_field import SequenceField
+from allennlp.common.checks import ConfigurationError
+
+
+class SpanListField(SequenceField[torch.Tensor]):
+    """
+    A ``SpanListField`` is a list of spans in a
+    :class:`~allennlp.data.fields.sequence_field.SequenceField`, such as all of the candidate
+    mentions in a document for coreference resolution.  Each span is represented by its inclusive
+    start and end indices into the ``SequenceField``.
+
+    This does the same job as a ``ListField`` of start and end ``IndexFields``, but keeps all of the
+    span boundaries in two integer arrays instead of two python objects per span, so it's much
+    cheaper to create, pad and convert to a tensor when there are many spans.  The tensor for
+    this field has shape ``(num_spans, 2)``, with the span starts in the first column and the span
+    ends in the second.  Padding spans have a start and end of ``-1``.
+
+    Because this is a ``SequenceField`` over the spans, you can label each span with a
+    ``SequenceLabelField``.
+
+    Parameters
+    ----------
+    span_starts : ``Union[Sequence[int], numpy.ndarray]``
+        The inclusive start index of each span.
+    span_ends : ``Union[Sequence[int], numpy.ndarray]``
+        The inclusive end index of each span.
+    sequence_field : ``SequenceField``
+        A field containing the sequence that these spans are spans of.
+    """
+    def __init__(self,
+                 span_starts: Union[Sequence[int], numpy.ndarray],
+                 span_ends: Union[Sequence[int], numpy.ndarray],
+                 sequence_field: SequenceField) -> None:
+        self.span_starts = numpy.asarray(span_starts, dtype=numpy.int64)
+        self.span_ends = numpy.asarray(span_ends, dtype=numpy.int64)
+        self.sequence_field = sequence_field
+
+        if self.span_starts.ndim != 1 or self.span_starts.shape != self.span_ends.shape:
+            raise ConfigurationError("SpanListFields must be passed one dimensional span starts and "
+                                     "ends of the same length. Found shapes {} and {}."
+                                     .format(self.span_starts.shape, self.span_ends.shape))
+        if (self.span_starts > self.span_ends).any():
+            raise ConfigurationError("SpanListFields must be passed spans whose starts are not "
+                                     "after their ends.")
+
+    @overrides
+    def get_padding_lengths(self) -> Dict[str, int]:
+        return {'num_spans': len(self.span_starts)}
+
+    @overrides
+    def sequence_length(self) -> int:
+        return len(self.span_starts)
+
+    @overrides
+    def as_tensor(self,
+                  padding_lengths: Dict[str, int],
+                  cuda_device: int = -1,
+                  for_training: bool = True) -> torch.Tensor:
+        num_spans = min(padding_lengths['num_spans'], len(self.span_starts))
+        spans = numpy.full((padding_lengths['num_spans'], 2), -1, dtype=numpy.int64)
+        spans[:num_spans, 0] = self.span_starts[:num_spans]
+        spans[:num_spans, 1] = self.span_ends[:num_spans]
+        tensor = Variable(torch.from_numpy(spans), volatile=not for_training)
+        return tensor if cuda_device == -1 else tensor.cuda(cuda_device)
+
+    @overrides
+    def empty_field(self):
+        return SpanListField([], [], self.sequence_field.empty_field())
@@ -1,6 +1,8 @@
 from typing import Dict, List
+import functools
 
 from overrides import overrides
+import numpy
 
 from allennlp.common.checks import ConfigurationError
 from allennlp.common.params import Params
@@ -59,20 +61,74 @@ class ELMoCharacterMapper:
 
     @staticmethod
     def convert_word_to_char_ids(word: str) -> List[int]:
-        if word == ELMoCharacterMapper.bos_token:
-            char_ids = ELMoCharacterMapper.beginning_of_sentence_characters
-        elif word == ELMoCharacterMapper.eos_token:
-            char_ids = ELMoCharacterMapper.end_of_sentence_characters
-        else:
-            word_encoded = word.encode('utf-8', 'ignore')[:(ELMoCharacterMapper.max_word_length-2)]
-            char_ids = [ELMoCharacterMapper.padding_character] * ELMoCharacterMapper.max_word_length
-            char_ids[0] = ELMoCharacterMapper.beginning_of_word_character
-            for k, chr_id in enumerate(word_encoded, start=1):
-                char_ids[k] = chr_id
-            char_ids[len(word_encoded) + 1] = ELMoCharacterMapper.end_of_word_character
-
-        # +1 one for masking
-        return [c + 1 for c in char_ids]
+        return ELMoCharacterMapper.get_word_char_ids(word).tolist()
+
+    @staticmethod
+    def get_word_char_ids(word: str) -> numpy.ndarray:
+        """
+        Returns the character ids for ``word`` as a read-only ``int64`` array of shape
+        ``(max_word_length,)``.  These are the same ids as ``convert_word_to_char_ids`` returns,
+        but the encodings of the most recently used words are kept in a bounded LRU cache, so
+        frequent words are only ever encoded once.
+        """
+        return _cached_word_char_ids(word)
+
+    @staticmethod
+    def batch_to_char_ids(batch: List[List[str]], desired_num_tokens: int = None) -> numpy.ndarray:
+        """
+        Converts a batch of tokenized sentences into a single padded ``int64`` array of character
+        ids, with shape ``(len(batch), desired_num_tokens, max_word_length)``.  Padding tokens are
+        all zeros, exactly as ``ELMoTokenCharactersIndexer`` pads them.
+
+        Parameters
+        ----------
+        batch : ``List[List[str]]``
+            The sentences to convert, each a list of word strings.
+        desired_num_tokens : ``int``, optional (default = ``None``)
+            The number of tokens to pad (or truncate) every sentence to.  If ``None``, we use the
+            length of the longest sentence in the batch.
+        """
+        if desired_num_tokens is None:
+            desired_num_tokens = max([len(sentence) for sentence in batch], default=0)
+        sentences = [sentence[:desired_num_tokens] for sentence in batch]
+        char_ids = numpy.zeros((len(batch), desired_num_tokens, ELMoCharacterMapper.max_word_length),
+                               dtype=numpy.int64)
+        lengths = numpy.array([len(sentence) for sentence in sentences], dtype=numpy.int64)
+        if lengths.sum() == 0:
+            return char_ids
+        # Shape: (total_num_tokens, max_word_length)
+        word_char_ids = numpy.stack([_cached_word_char_ids(word)
+                                     for sentence in sentences
+                                     for word in sentence])
+        # The (sentence, position) of every token in ``word_char_ids``, so that we can scatter all
+        # of them into the padded array at once.
+        sentence_indices = numpy.repeat(numpy.arange(len(sentences)), lengths)
+        sentence_starts = numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+        positions = numpy.arange(len(word_char_ids)) - sentence_starts
+        char_ids[sentence_indices, positions] = word_char_ids
+        return char_ids
+
+
+@functools.lru_cache(maxsize=100000)
+def _cached_word_char_ids(word: str) -> numpy.ndarray:
+    if word == ELMoCharacterMapper.bos_token:
+        char_ids = numpy.array(ELMoCharacterMapper.beginning_of_sentence_characters, dtype=numpy.int64)
+    elif word == ELMoCharacterMapper.eos_token:
+        char_ids = numpy.array(ELMoCharacterMapper.end_of_sentence_characters, dtype=numpy.int64)
+    else:
+        word_encoded = word.encode('utf-8', 'ignore')[:(ELMoCharacterMapper.max_word_length-2)]
+        char_ids = numpy.full(ELMoCharacterMapper.max_word_length,
+                              ELMoCharacterMapper.padding_character,
+                              dtype=numpy.int64)
+        char_ids[0] = ELMoCharacterMapper.beginning_of_word_character
+        char_ids[1:len(word_encoded) + 1] = list(word_encoded)
+        char_ids[len(word_encoded) + 1] = ELMoCharacterMapper.end_of_word_character
+
+    # +1 one for masking
+    char_ids += 1
+    # These arrays are shared by everything that looks up the same word, so they must not change.
+    char_ids.flags.writeable = False
+    return char_ids
 
 
 @TokenIndexer.register("elmo_characters")
@@ -101,6 +157,21 @@ class ELMoTokenCharactersIndexer(TokenIndexer[List[int]]):
                                      'that retains text')
         return ELMoCharacterMapper.convert_word_to_char_ids(token.text)
 
+    @overrides
+    def tokens_to_indices(self, tokens: List[Token], vocabulary: Vocabulary) -> List[List[int]]:
+        # pylint: disable=unused-argument
+        # Words are usually repeated within a field, so we only convert each one once.
+        word_char_ids: Dict[str, List[int]] = {}
+        indices = []
+        for token in tokens:
+            if token.text is None:
+                raise ConfigurationError('ELMoTokenCharactersIndexer needs a tokenizer '
+                                         'that retains text')
+            if token.text not in word_char_ids:
+                word_char_ids[token.text] = ELMoCharacterMapper.convert_word_to_char_ids(token.text)
+            indices.append(word_char_ids[token.text])
+        return indices
+
     @overrides
     def get_padding_lengths(self, token: List[int]) -> Dict[str, int]:
         # pylint: disable=unused-argument
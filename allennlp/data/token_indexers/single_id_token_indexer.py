@@ -50,6 +50,18 @@ class SingleIdTokenIndexer(TokenIndexer[int]):
             index = vocabulary.get_token_index(text, self.namespace)
         return index
 
+    @overrides
+    def tokens_to_indices(self, tokens: List[Token], vocabulary: Vocabulary) -> List[int]:
+        if any(getattr(token, 'text_id', None) is not None for token in tokens):
+            # Tokens with `text_id` set bypass the vocab; this is rare enough that we just index
+            # these fields one token at a time.
+            return super(SingleIdTokenIndexer, self).tokens_to_indices(tokens, vocabulary)
+        if self.lowercase_tokens:
+            texts = [token.text.lower() for token in tokens]
+        else:
+            texts = [token.text for token in tokens]
+        return vocabulary.get_token_indices(texts, self.namespace).tolist()
+
     @overrides
     def get_padding_token(self) -> int:
         return 0
@@ -60,6 +60,30 @@ class TokenCharactersIndexer(TokenIndexer[List[int]]):
             indices.append(index)
         return indices
 
+    @overrides
+    def tokens_to_indices(self, tokens: List[Token], vocabulary: Vocabulary) -> List[List[int]]:
+        # Words are usually repeated within a field, so we split each distinct word into characters
+        # once, and then look up the characters of all of the distinct words in a single call.
+        word_characters: Dict[str, List[Token]] = {}
+        for token in tokens:
+            if token.text is None:
+                raise ConfigurationError('TokenCharactersIndexer needs a tokenizer that retains text')
+            if token.text not in word_characters:
+                word_characters[token.text] = self._character_tokenizer.tokenize(token.text)
+        # `text_id` being set on a character means that we aren't using the vocab for it, we just
+        # use this id instead.
+        vocab_characters = [character.text
+                            for characters in word_characters.values()
+                            for character in characters
+                            if getattr(character, 'text_id', None) is None]
+        vocab_indices = iter(vocabulary.get_token_indices(vocab_characters, self._namespace).tolist())
+        word_indices: Dict[str, List[int]] = {}
+        for word, characters in word_characters.items():
+            text_ids = [getattr(character, 'text_id', None) for character in characters]
+            word_indices[word] = [next(vocab_indices) if text_id is None else text_id
+                                  for text_id in text_ids]
+        return [word_indices[token.text] for token in tokens]
+
     @overrides
     def get_padding_lengths(self, token: List[int]) -> Dict[str, int]:
         return {'num_token_characters': len(token)}
@@ -38,6 +38,15 @@ class TokenIndexer(Generic[TokenType], Registrable):
         """
         raise NotImplementedError
 
+    def tokens_to_indices(self, tokens: List[Token], vocabulary: Vocabulary) -> List[TokenType]:
+        """
+        Converts a whole sequence of tokens into indices at once, returning one entry per token, as
+        :func:`token_to_indices` would.  :class:`~allennlp.data.fields.text_field.TextField` calls
+        this when it is indexed, so indexers that can look up many tokens at a time more cheaply
+        than one at a time (e.g., with :func:`Vocabulary.get_token_indices`) should override it.
+        """
+        return [self.token_to_indices(token, vocabulary) for token in tokens]
+
     def get_padding_token(self) -> TokenType:
         """
         When we need to add padding tokens, what should they look like?  This method returns a
@@ -1,8 +1,16 @@
+import sys
+
+
 class Token:
     """
     A simple token representation, keeping track of the token's text, offset in the passage it was
-    taken from, POS tag, and dependency relation.  These fields match spacy's exactly, so we can
-    just use a spacy token for this.
+    taken from, POS tag, and dependency relation.  These fields match spacy's exactly, so code that
+    uses a ``Token`` will also work with a spacy token, though our tokenizers always give you a
+    ``Token`` (see :func:`from_spacy`).
+
+    Datasets can hold millions of tokens, so this class is kept small: it uses ``__slots__``
+    instead of a per-instance ``__dict__``, and all of its strings are interned, so each distinct
+    word or tag is only stored once, however many tokens share it.
 
     Parameters
     ----------
@@ -28,6 +36,8 @@ class Token:
         The other fields on ``Token`` follow the fields on spacy's ``Token`` object; this is one we
         added, similar to spacy's ``lex_id``.
     """
+    __slots__ = ['text', 'idx', 'pos_', 'tag_', 'dep_', 'ent_type_', 'text_id']
+
     def __init__(self,
                  text: str = None,
                  idx: int = None,
@@ -36,16 +46,40 @@ class Token:
                  dep: str = None,
                  ent_type: str = None,
                  text_id: int = None) -> None:
-        self.text = text
+        self.text = _intern(text)
         self.idx = idx
-        self.pos_ = pos
-        self.tag_ = tag
-        self.dep_ = dep
-        self.ent_type_ = ent_type
+        self.pos_ = _intern(pos)
+        self.tag_ = _intern(tag)
+        self.dep_ = _intern(dep)
+        self.ent_type_ = _intern(ent_type)
         self.text_id = text_id
 
+    @classmethod
+    def from_spacy(cls, token) -> 'Token':
+        """
+        Copies a spacy token into a ``Token``.  A spacy token keeps its whole ``Doc`` alive, which
+        is far bigger than the token itself, so we don't hold on to spacy tokens in our datasets.
+        """
+        return cls(text=token.text,
+                   idx=token.idx,
+                   pos=token.pos_,
+                   tag=token.tag_,
+                   dep=token.dep_,
+                   ent_type=token.ent_type_)
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, _intern(value) if isinstance(value, str) else value)
+
     def __str__(self):
         return self.text
 
     def __repr__(self):
         return self.__str__()
+
+
+def _intern(string: str) -> str:
+    return sys.intern(string) if string is not None else None
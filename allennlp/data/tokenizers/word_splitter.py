@@ -181,12 +181,11 @@ class SpacyWordSplitter(WordSplitter):
 
     @overrides
     def batch_split_words(self, sentences: List[str]) -> List[List[Token]]:
-        return self.spacy.pipe(sentences, n_threads=-1)
+        return [_remove_spaces(doc) for doc in self.spacy.pipe(sentences, n_threads=-1)]
 
     @overrides
     def split_words(self, sentence: str) -> List[Token]:
-        # This works because our Token class matches spacy's.
-        return [t for t in self.spacy(sentence) if not t.is_space]
+        return _remove_spaces(self.spacy(sentence))
 
     @classmethod
     def from_params(cls, params: Params) -> 'WordSplitter':
@@ -196,3 +195,8 @@ class SpacyWordSplitter(WordSplitter):
         ner = params.pop_bool('ner', False)
         params.assert_empty(cls.__name__)
         return cls(language, pos_tags, parse, ner)
+
+
+def _remove_spaces(doc) -> List[Token]:
+    # We copy spacy's tokens into our own ``Token`` class, so the ``Doc`` can be freed.
+    return [Token.from_spacy(token) for token in doc if not token.is_space]
@@ -4,12 +4,17 @@ out-of-vocabulary token.
 """
 
 from collections import defaultdict
-from typing import Any, Callable, Dict, Union, Sequence, Set, Optional, Iterable
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Union, Sequence, Set, Sized, Optional, Iterable
 import codecs
+import json
 import logging
+import mmap
 import os
 import gzip
+import struct
 
+import numpy
 import tqdm
 
 from allennlp.common.util import namespace_match
@@ -24,6 +29,8 @@ DEFAULT_NON_PADDED_NAMESPACES = ("*tags", "*labels")
 DEFAULT_PADDING_TOKEN = "@@PADDING@@"
 DEFAULT_OOV_TOKEN = "@@UNKNOWN@@"
 NAMESPACE_PADDING_FILE = 'non_padded_namespaces.txt'
+BINARY_VOCABULARY_FILE = 'vocabulary.bin'
+_BINARY_VOCABULARY_MAGIC = b'ALNPVOC1'
 
 
 class _NamespaceDependentDefaultDict(defaultdict):
@@ -101,6 +108,136 @@ def _read_pretrained_words(embeddings_filename: str)-> Set[str]:
             words.add(word)
     return words
 
+
+class _CompactTokenTable(Sized):
+    """
+    A read-only, array-backed table of the tokens in a single vocabulary namespace.  This is a much
+    more compact alternative to the pair of python dictionaries that we normally keep for each
+    namespace, and it is what we use when loading a vocabulary from a binary file (see
+    :func:`Vocabulary.save_to_binary_file`).
+
+    All of the tokens are stored as one UTF-8 encoded byte string, in index order, together with
+    an array of offsets into that string, so looking up the token for an index is just a slice.
+    To go from a token to its index, we keep a second array containing the token indices sorted
+    by their encoded bytes, and do a binary search over it.  All three of these can be views on a
+    memory-mapped file, so loading a vocabulary with millions of tokens is nearly free, and several
+    processes serving the same model share the same pages.
+
+    Parameters
+    ----------
+    token_bytes : ``Any``
+        A bytes-like object with the UTF-8 encoding of every token, concatenated in index order.
+    offsets : ``numpy.ndarray``
+        An integer array of shape ``(num_tokens + 1,)``; the token with index ``i`` is
+        ``token_bytes[offsets[i]:offsets[i + 1]]``.
+    sorted_indices : ``numpy.ndarray``
+        An integer array of shape ``(num_tokens,)`` containing the token indices, ordered so that
+        their encoded tokens are sorted.
+    """
+    def __init__(self,
+                 token_bytes: Any,
+                 offsets: numpy.ndarray,
+                 sorted_indices: numpy.ndarray) -> None:
+        self._token_bytes = token_bytes
+        self._offsets = offsets
+        self._sorted_indices = sorted_indices
+
+    @classmethod
+    def from_tokens(cls, tokens: List[str]) -> '_CompactTokenTable':
+        """
+        Builds a table from a list of tokens, where the position of a token in the list is its
+        index.
+        """
+        encoded_tokens = [token.encode('utf-8') for token in tokens]
+        offsets = numpy.zeros(len(encoded_tokens) + 1, dtype=numpy.int64)
+        offsets[1:] = numpy.cumsum([len(token) for token in encoded_tokens], dtype=numpy.int64)
+        sorted_indices = numpy.array(sorted(range(len(encoded_tokens)), key=encoded_tokens.__getitem__),
+                                     dtype=numpy.int64)
+        return cls(b''.join(encoded_tokens), offsets, sorted_indices)
+
+    def __len__(self) -> int:
+        return len(self._sorted_indices)
+
+    def _encoded_token(self, index: int) -> bytes:
+        return bytes(self._token_bytes[self._offsets[index]:self._offsets[index + 1]])
+
+    def get_token(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise KeyError(index)
+        return self._encoded_token(index).decode('utf-8')
+
+    def get_index(self, token: str) -> Optional[int]:
+        """
+        Returns the index of ``token``, or ``None`` if the token is not in the table.
+        """
+        target = token.encode('utf-8')
+        low, high = 0, len(self._sorted_indices)
+        while low < high:
+            middle = (low + high) // 2
+            if self._encoded_token(self._sorted_indices[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._sorted_indices):
+            index = int(self._sorted_indices[low])
+            if self._encoded_token(index) == target:
+                return index
+        return None
+
+    def __getstate__(self):
+        # Memory maps can't be pickled, so we copy everything into memory first.
+        return {'token_bytes': bytes(self._token_bytes),
+                'offsets': numpy.array(self._offsets),
+                'sorted_indices': numpy.array(self._sorted_indices)}
+
+    def __setstate__(self, state):
+        self._token_bytes = state['token_bytes']
+        self._offsets = state['offsets']
+        self._sorted_indices = state['sorted_indices']
+
+
+class _CompactTokenToIndex(Mapping):
+    """
+    A read-only ``Dict[str, int]`` view of a :class:`_CompactTokenTable`.
+    """
+    def __init__(self, table: _CompactTokenTable) -> None:
+        self._table = table
+
+    def __getitem__(self, token: str) -> int:
+        index = self._table.get_index(token) if isinstance(token, str) else None
+        if index is None:
+            raise KeyError(token)
+        return index
+
+    def __contains__(self, token) -> bool:
+        return isinstance(token, str) and self._table.get_index(token) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._table.get_token(index) for index in range(len(self._table)))
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class _CompactIndexToToken(Mapping):
+    """
+    A read-only ``Dict[int, str]`` view of a :class:`_CompactTokenTable`.
+    """
+    def __init__(self, table: _CompactTokenTable) -> None:
+        self._table = table
+
+    def __getitem__(self, index: int) -> str:
+        if isinstance(index, bool) or not isinstance(index, (int, numpy.integer)):
+            raise KeyError(index)
+        return self._table.get_token(int(index))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._table)))
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
 class Vocabulary:
     """
     A Vocabulary maps strings to integers, allowing for strings to be mapped to an
@@ -228,16 +365,128 @@ class Vocabulary:
                 for i in range(start_index, num_tokens):
                     print(mapping[i].replace('\n', '@@NEWLINE@@'), file=token_file)
 
+    def save_to_binary_file(self, filename: str) -> None:
+        """
+        Persist this Vocabulary to a single binary file, which can be loaded much faster than the
+        text files written by :func:`save_to_files`, and can be memory-mapped instead of read into
+        python dictionaries.  See :func:`from_binary_file`.
+
+        The file starts with a magic string and a JSON header describing the namespaces, followed
+        by, for each namespace, an array of token offsets, an array of token indices sorted by
+        token, and the UTF-8 bytes of all of the tokens in index order.  All of the arrays are
+        little-endian int64s aligned on 8-byte boundaries.
+
+        Parameters
+        ----------
+        filename : ``str``
+            The file where we save the serialized vocabulary.  If you name this file
+            ``vocabulary.bin`` and put it in a directory written by :func:`save_to_files`,
+            :func:`from_files` will load it instead of the text files.
+        """
+        namespace_metadata: Dict[str, Dict[str, int]] = {}
+        chunks: List[bytes] = []
+        position = 0
+
+        def add_chunk(chunk: bytes) -> int:
+            nonlocal position
+            start = position
+            padding = -len(chunk) % 8
+            chunks.append(chunk + b'\x00' * padding)
+            position += len(chunk) + padding
+            return start
+
+        for namespace, mapping in self._index_to_token.items():
+            table = _CompactTokenTable.from_tokens([mapping[i] for i in range(len(mapping))])
+            # pylint: disable=protected-access
+            namespace_metadata[namespace] = {
+                    'num_tokens': len(table),
+                    'offsets': add_chunk(table._offsets.astype('<i8').tobytes()),
+                    'sorted_indices': add_chunk(table._sorted_indices.astype('<i8').tobytes()),
+                    'token_bytes_length': len(table._token_bytes),
+                    'token_bytes': add_chunk(table._token_bytes)
+            }
+        header = json.dumps({'non_padded_namespaces': list(self._non_padded_namespaces),
+                             'namespaces': namespace_metadata}).encode('utf-8')
+        header += b' ' * (-len(header) % 8)
+
+        with open(filename, 'wb') as binary_file:
+            binary_file.write(_BINARY_VOCABULARY_MAGIC)
+            binary_file.write(struct.pack('<Q', len(header)))
+            binary_file.write(header)
+            for chunk in chunks:
+                binary_file.write(chunk)
+
+    @classmethod
+    def from_binary_file(cls, filename: str, memory_map: bool = True) -> 'Vocabulary':
+        """
+        Loads a ``Vocabulary`` that was serialized using ``save_to_binary_file``.  The namespaces
+        in the returned vocabulary are backed by compact, read-only token tables instead of python
+        dictionaries; the ``Vocabulary`` API is unchanged, and adding a new token to one of these
+        namespaces transparently converts it back to dictionaries.
+
+        Parameters
+        ----------
+        filename : ``str``
+            The file containing the serialized vocabulary.
+        memory_map : ``bool``, optional (default=True)
+            If ``True``, we memory-map the file instead of reading it, so tokens are only paged in
+            from disk when they are used, and the pages are shared between processes.
+        """
+        logger.info("Loading binary token dictionary from %s.", filename)
+        buffer: Union[bytes, mmap.mmap]
+        with open(filename, 'rb') as binary_file:
+            if memory_map:
+                buffer = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = binary_file.read()
+        if buffer[:len(_BINARY_VOCABULARY_MAGIC)] != _BINARY_VOCABULARY_MAGIC:
+            raise ConfigurationError("%s is not a binary vocabulary file" % filename)
+        header_start = len(_BINARY_VOCABULARY_MAGIC) + 8
+        header_length, = struct.unpack('<Q', buffer[len(_BINARY_VOCABULARY_MAGIC):header_start])
+        header = json.loads(buffer[header_start:header_start + header_length].decode('utf-8'))
+        data_start = header_start + header_length
+
+        def read_array(position: int, length: int) -> numpy.ndarray:
+            if length == 0:
+                return numpy.zeros(0, dtype=numpy.int64)
+            return numpy.frombuffer(buffer, dtype='<i8', count=length, offset=data_start + position)
+
+        vocab = Vocabulary(non_padded_namespaces=header['non_padded_namespaces'])
+        buffer_view = memoryview(buffer)
+        for namespace, metadata in header['namespaces'].items():
+            num_tokens = metadata['num_tokens']
+            token_bytes_start = data_start + metadata['token_bytes']
+            table = _CompactTokenTable(
+                    buffer_view[token_bytes_start:token_bytes_start + metadata['token_bytes_length']],
+                    read_array(metadata['offsets'], num_tokens + 1),
+                    read_array(metadata['sorted_indices'], num_tokens))
+            # pylint: disable=protected-access
+            vocab._token_to_index[namespace] = _CompactTokenToIndex(table)
+            vocab._index_to_token[namespace] = _CompactIndexToToken(table)
+        return vocab
+
     @classmethod
     def from_files(cls, directory: str) -> 'Vocabulary':
         """
-        Loads a ``Vocabulary`` that was serialized using ``save_to_files``.
+        Loads a ``Vocabulary`` that was serialized using ``save_to_files``.  If the directory also
+        contains a ``vocabulary.bin`` file written by ``save_to_binary_file``, which is at least as
+        new as the text files, we load that instead, as it is much faster.  If any of the text files
+        was changed after it, we load the text files, so the changes aren't ignored.
 
         Parameters
         ----------
         directory : ``str``
             The directory containing the serialized vocabulary.
         """
+        binary_filename = os.path.join(directory, BINARY_VOCABULARY_FILE)
+        if os.path.exists(binary_filename):
+            binary_mtime = os.path.getmtime(binary_filename)
+            if all(os.path.getmtime(os.path.join(directory, filename)) <= binary_mtime
+                   for filename in os.listdir(directory)):
+                return cls.from_binary_file(binary_filename)
+            logger.warning("Some of the vocabulary files in %s are newer than %s, so we load those "
+                           "instead of it.", directory, BINARY_VOCABULARY_FILE)
+
         logger.info("Loading token dictionary from %s.", directory)
         with codecs.open(os.path.join(directory, NAMESPACE_PADDING_FILE), 'r', 'utf-8') as namespace_file:
             non_padded_namespaces = [namespace_str.strip() for namespace_str in namespace_file]
@@ -246,7 +495,7 @@ class Vocabulary:
 
         # Check every file in the directory.
         for namespace_filename in os.listdir(directory):
-            if namespace_filename == NAMESPACE_PADDING_FILE:
+            if namespace_filename in (NAMESPACE_PADDING_FILE, BINARY_VOCABULARY_FILE):
                 continue
             namespace = namespace_filename.replace('.txt', '')
             if any(namespace_match(pattern, namespace) for pattern in non_padded_namespaces):
@@ -389,6 +638,10 @@ class Vocabulary:
             raise ValueError("Vocabulary tokens must be strings, or saving and loading will break."
                              "  Got %s (with type %s)" % (repr(token), type(token)))
         if token not in self._token_to_index[namespace]:
+            if not isinstance(self._token_to_index[namespace], dict):
+                # This namespace was loaded from a binary file, and is read-only.
+                self._token_to_index[namespace] = dict(self._token_to_index[namespace])
+                self._index_to_token[namespace] = dict(self._index_to_token[namespace])
             index = len(self._token_to_index[namespace])
             self._token_to_index[namespace][token] = index
             self._index_to_token[namespace][index] = token
@@ -405,6 +658,24 @@ class Vocabulary:
         else:
             return self._token_to_index[namespace][self._oov_token]
 
+    def get_token_indices(self, tokens: Sequence[str], namespace: str = 'tokens') -> numpy.ndarray:
+        """
+        Looks up the index of every token in ``tokens`` at once, mapping tokens that are not in the
+        vocabulary to the OOV index, exactly as :func:`get_token_index` does.  This is much faster
+        than calling :func:`get_token_index` once per token, and returns an ``int64`` array of
+        shape ``(len(tokens),)``.
+        """
+        token_to_index = self._token_to_index[namespace]
+        if self._oov_token in token_to_index:
+            oov_index = token_to_index[self._oov_token]
+            lookup = token_to_index.get
+            indices = [lookup(token, oov_index) for token in tokens]
+        else:
+            # There's no OOV token in this namespace, so unknown tokens are an error, as they are
+            # in ``get_token_index``.
+            indices = [token_to_index[token] for token in tokens]
+        return numpy.array(indices, dtype=numpy.int64)
+
     def get_token_from_index(self, index: int, namespace: str = 'tokens') -> str:
         return self._index_to_token[namespace][index]
 
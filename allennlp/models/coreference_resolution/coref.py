@@ -8,12 +8,15 @@ from torch.autograd import Variable
 from overrides import overrides
 
 from allennlp.common import Params
+from allennlp.common.checks import ConfigurationError
 from allennlp.data import Vocabulary
 from allennlp.models.model import Model
 from allennlp.modules.token_embedders import Embedding
 from allennlp.modules import FeedForward
 from allennlp.modules import Seq2SeqEncoder, TimeDistributed, TextFieldEmbedder
 from allennlp.nn import util, InitializerApplicator, RegularizerApplicator
+from allennlp.nn.attention_util import masked_attention
+from allennlp.nn.coreference_util import get_coreference_clusters
 from allennlp.training.metrics import MentionRecall, ConllCorefScores
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -104,10 +107,12 @@ class CoreferenceResolver(Model):
     @overrides
     def forward(self,  # type: ignore
                 text: Dict[str, torch.LongTensor],
-                span_starts: torch.IntTensor,
-                span_ends: torch.IntTensor,
+                spans: torch.IntTensor = None,
                 span_labels: torch.IntTensor = None,
-                metadata: List[Dict[str, Any]] = None) -> Dict[str, torch.Tensor]:
+                metadata: List[Dict[str, Any]] = None,
+                sentence_ids: torch.IntTensor = None,
+                gold_mentions: torch.IntTensor = None,
+                gold_mention_labels: torch.IntTensor = None) -> Dict[str, torch.Tensor]:
         # pylint: disable=arguments-differ
         """
         Parameters
@@ -115,17 +120,29 @@ class CoreferenceResolver(Model):
         text : ``Dict[str, torch.LongTensor]``, required.
             The output of a ``TextField`` representing the text of
             the document.
-        span_starts : ``torch.IntTensor``, required.
-            A tensor of shape (batch_size, num_spans, 1), representing the start indices of
-            candidate spans for mentions. Comes from a ``ListField[IndexField]`` of indices into
-            the text of the document.
-        span_ends : ``torch.IntTensor``, required.
-            A tensor of shape (batch_size, num_spans, 1), representing the end indices of
-            candidate spans for mentions. Comes from a ``ListField[IndexField]`` of indices into
-            the text of the document.
+        spans : ``torch.IntTensor``, optional (default = None)
+            A tensor of shape (batch_size, num_spans, 2), representing the inclusive start and end
+            indices of candidate spans for mentions. Comes from a ``SpanListField`` of spans in
+            the text of the document.  If this is ``None``, we enumerate the candidate spans
+            ourselves, using ``sentence_ids``.
         span_labels : ``torch.IntTensor``, optional (default = None)
             A tensor of shape (batch_size, num_spans), representing the cluster ids
             of each span, or -1 for those which do not appear in any clusters.
+        metadata : ``List[Dict[str, Any]]``, optional (default = None)
+            The original text and gold clusters of each document, used for computing metrics.
+        sentence_ids : ``torch.IntTensor``, optional (default = None)
+            A tensor of shape (batch_size, document_length), giving the index of the sentence
+            each word is in.  If ``spans`` is ``None``, we take every span of at most
+            ``max_span_width`` words which doesn't cross a sentence boundary as a candidate.
+            This gives the same candidates, in the same order, as the ``ConllCorefReader``, but
+            avoids passing the candidates (which are quadratic in the span width) through the data
+            pipeline.
+        gold_mentions : ``torch.IntTensor``, optional (default = None)
+            When we enumerate the candidate spans ourselves, the gold labels are given as a tensor
+            of shape (batch_size, num_mentions, 2) of gold mention spans, padded with -1, ...
+        gold_mention_labels : ``torch.IntTensor``, optional (default = None)
+            ... and a tensor of shape (batch_size, num_mentions) of the cluster id of each
+            mention.  We use these to compute ``span_labels`` for the spans we enumerate.
 
         Returns
         -------
@@ -147,14 +164,27 @@ class CoreferenceResolver(Model):
         text_embeddings = self._lexical_dropout(self._text_field_embedder(text))
 
         document_length = text_embeddings.size(1)
-        num_spans = span_starts.size(1)
 
         # Shape: (batch_size, document_length)
         text_mask = util.get_text_field_mask(text).float()
 
+        if spans is None:
+            if sentence_ids is None:
+                raise ConfigurationError("CoreferenceResolver needs either candidate `spans` or "
+                                         "`sentence_ids` to enumerate the candidates from.")
+            spans = self._enumerate_spans(sentence_ids, text_mask)
+            if gold_mentions is not None:
+                span_labels = self._compute_enumerated_span_labels(gold_mentions,
+                                                                   gold_mention_labels,
+                                                                   sentence_ids)
+
+        num_spans = spans.size(1)
+        # Shape: (batch_size, num_spans, 1)
+        span_starts, span_ends = spans.split(1, dim=-1)
+
         # Shape: (batch_size, num_spans, 1)
         span_mask = (span_starts >= 0).float()
-        # IndexFields return -1 when they are used as padding. As we do
+        # SpanListFields return -1 when they are used as padding. As we do
         # some comparisons based on span widths when we attend over the
         # span representations that we generate from these indices, we
         # need them to be <= 0. This is only relevant in edge cases where
@@ -181,7 +211,7 @@ class CoreferenceResolver(Model):
         # Shape: (batch_size, num_spans_to_keep)
         # These are indices (with values between 0 and num_spans) into
         # the span_embeddings tensor.
-        top_span_indices = self._prune_and_sort_spans(mention_scores, num_spans_to_keep)
+        top_span_indices = self._prune_and_sort_spans(mention_scores, span_mask, num_spans_to_keep)
 
         # Now that we've decided which spans are actually mentions the next
         # few steps are reformatting all of our variables to be in terms of
@@ -334,57 +364,22 @@ class CoreferenceResolver(Model):
 
         # A tensor of shape (batch_size, num_spans_to_keep, 2), representing
         # the start and end indices of each span.
-        batch_top_spans = output_dict["top_spans"].data.cpu()
+        batch_top_spans = output_dict["top_spans"].data.cpu().numpy()
 
         # A tensor of shape (batch_size, num_spans_to_keep) representing, for each span,
         # the index into ``antecedent_indices`` which specifies the antecedent span. Additionally,
         # the index can be -1, specifying that the span has no predicted antecedent.
-        batch_predicted_antecedents = output_dict["predicted_antecedents"].data.cpu()
+        batch_predicted_antecedents = output_dict["predicted_antecedents"].data.cpu().numpy()
 
         # A tensor of shape (num_spans_to_keep, max_antecedents), representing the indices
         # of the predicted antecedents with respect to the 2nd dimension of ``batch_top_spans``
         # for each antecedent we considered.
-        antecedent_indices = output_dict["antecedent_indices"].data.cpu()
-        batch_clusters: List[List[List[Tuple[int, int]]]] = []
-
-        # Calling zip() on two tensors results in an iterator over their
-        # first dimension. This is iterating over instances in the batch.
-        for top_spans, predicted_antecedents in zip(batch_top_spans, batch_predicted_antecedents):
-            spans_to_cluster_ids: Dict[Tuple[int, int], int] = {}
-            clusters: List[List[Tuple[int, int]]] = []
-
-            for i, (span, predicted_antecedent) in enumerate(zip(top_spans, predicted_antecedents)):
-                if predicted_antecedent < 0:
-                    # We don't care about spans which are
-                    # not co-referent with anything.
-                    continue
-
-                # Find the right cluster to update with this span.
-                # To do this, we find the row in ``antecedent_indices``
-                # corresponding to this span we are considering.
-                # The predicted antecedent is then an index into this list
-                # of indices, denoting the span from ``top_spans`` which is the
-                # most likely antecedent.
-                predicted_index = antecedent_indices[i, predicted_antecedent]
-
-                antecedent_span = (top_spans[predicted_index, 0],
-                                   top_spans[predicted_index, 1])
-                # Check if we've seen the span before.
-                if antecedent_span in spans_to_cluster_ids.keys():
-                    predicted_cluster_id: int = spans_to_cluster_ids[antecedent_span]
-                else:
-                    # We start a new cluster.
-                    predicted_cluster_id = len(clusters)
-                    # Append a new cluster containing only this span.
-                    clusters.append([antecedent_span])
-                    # Record the new id of this span.
-                    spans_to_cluster_ids[antecedent_span] = predicted_cluster_id
-
-                # Now add the span we are currently considering.
-                span_start, span_end = span
-                clusters[predicted_cluster_id].append((span_start, span_end))
-                spans_to_cluster_ids[(span_start, span_end)] = predicted_cluster_id
-            batch_clusters.append(clusters)
+        antecedent_indices = output_dict["antecedent_indices"].data.cpu().numpy()
+
+        batch_clusters: List[List[List[Tuple[int, int]]]] = [
+                get_coreference_clusters(top_spans, antecedent_indices, predicted_antecedents)
+                for top_spans, predicted_antecedents in zip(batch_top_spans, batch_predicted_antecedents)
+        ]
 
         output_dict["clusters"] = batch_clusters
         return output_dict
@@ -460,13 +455,10 @@ class CoreferenceResolver(Model):
         # Shape: (batch_size, num_spans, max_span_width)
         span_head_scores = util.batched_index_select(head_scores, span_indices, flat_span_indices).squeeze(-1)
 
-        # Shape: (batch_size, num_spans, max_span_width)
-        span_head_weights = util.last_dim_softmax(span_head_scores, span_mask)
-
         # Do a weighted sum of the embedded spans with
         # respect to the normalised head score distributions.
         # Shape: (batch_size, num_spans, embedding_dim)
-        attended_text_embeddings = util.weighted_sum(span_text_embeddings, span_head_weights)
+        attended_text_embeddings = masked_attention(span_head_scores, span_text_embeddings, span_mask)
 
         return attended_text_embeddings
 
@@ -527,18 +519,113 @@ class CoreferenceResolver(Model):
                                      attended_text_embeddings], -1)
         return span_embeddings
 
+    def _enumerate_spans(self,
+                         sentence_ids: torch.IntTensor,
+                         text_mask: torch.FloatTensor) -> torch.IntTensor:
+        """
+        Enumerates every span of at most ``max_span_width`` words which lies within a single
+        sentence of the document, ordered by start index and then by end index.
+
+        Parameters
+        ----------
+        sentence_ids : ``torch.IntTensor``, required.
+            The index of the sentence each word is in, with shape (batch_size, document_length).
+        text_mask : ``torch.FloatTensor``, required.
+            The mask for the document text, with shape (batch_size, document_length).
+
+        Returns
+        -------
+        A tensor of shape (batch_size, document_length * max_span_width, 2), where the span
+        starting at word ``i`` and ending at word ``i + j`` is at index
+        ``i * max_span_width + j``.  Spans which run past the end of their sentence or document
+        are set to ``-1``, as if they were padding from a ``SpanListField``.
+        """
+        batch_size, document_length = sentence_ids.size()
+        # Shape: (document_length, 1)
+        starts = util.get_range_vector(document_length, sentence_ids.is_cuda).unsqueeze(1)
+        # Shape: (1, max_span_width)
+        widths = util.get_range_vector(self._max_span_width, sentence_ids.is_cuda).unsqueeze(0)
+        num_spans = document_length * self._max_span_width
+        # Shape: (document_length * max_span_width,)
+        span_starts = starts.expand(document_length, self._max_span_width).contiguous().view(-1)
+        span_ends = (starts + widths).view(-1)
+        clamped_span_ends = span_ends.clamp(max=document_length - 1)
+
+        # Shape: (batch_size, document_length * max_span_width)
+        start_sentence_ids = sentence_ids.index_select(1, span_starts)
+        end_sentence_ids = sentence_ids.index_select(1, clamped_span_ends)
+        span_mask = (start_sentence_ids == end_sentence_ids).long()
+        span_mask = span_mask * (span_ends < document_length).long().unsqueeze(0)
+        span_mask = span_mask * text_mask.long().index_select(1, clamped_span_ends)
+
+        # Shape: (batch_size, document_length * max_span_width, 2)
+        spans = torch.stack([span_starts, span_ends], -1).unsqueeze(0).expand(batch_size, num_spans, 2)
+        # Masked spans become (-1, -1).
+        return (spans + 1) * span_mask.unsqueeze(-1) - 1
+
+    def _compute_enumerated_span_labels(self,
+                                        gold_mentions: torch.IntTensor,
+                                        gold_mention_labels: torch.IntTensor,
+                                        sentence_ids: torch.IntTensor) -> torch.IntTensor:
+        """
+        Computes the cluster id of each span from :func:`_enumerate_spans`, or -1 if the span
+        isn't a gold mention.  Mentions which are wider than ``max_span_width``, or which cross a
+        sentence boundary, are ignored, as they can't be candidates.
+
+        Parameters
+        ----------
+        gold_mentions : ``torch.IntTensor``, required.
+            The gold mentions, with shape (batch_size, num_mentions, 2), padded with -1.
+        gold_mention_labels : ``torch.IntTensor``, required.
+            The cluster id of each gold mention, with shape (batch_size, num_mentions).
+        sentence_ids : ``torch.IntTensor``, required.
+            The index of the sentence each word is in, with shape (batch_size, document_length).
+
+        Returns
+        -------
+        A tensor of shape (batch_size, document_length * max_span_width).
+        """
+        batch_size, document_length = sentence_ids.size()
+        num_spans = document_length * self._max_span_width
+        mention_starts = gold_mentions[:, :, 0]
+        mention_ends = gold_mentions[:, :, 1]
+        mention_widths = mention_ends - mention_starts
+        # Padding mentions are (-1, -1), which we clamp to look up a sentence for them anyway.
+        start_sentence_ids = sentence_ids.gather(1, mention_starts.clamp(min=0))
+        end_sentence_ids = sentence_ids.gather(1, mention_ends.clamp(min=0))
+        valid_mentions = ((mention_starts >= 0) *
+                          (mention_widths < self._max_span_width) *
+                          (start_sentence_ids == end_sentence_ids)).long()
+        # Mentions we can't label get sent to an extra position past the end of the spans, which we
+        # drop afterwards.
+        # Shape: (batch_size, num_mentions)
+        positions = mention_starts * self._max_span_width + mention_widths
+        positions = positions * valid_mentions + num_spans * (1 - valid_mentions)
+
+        span_labels = Variable(gold_mention_labels.data.new(batch_size, num_spans + 1).fill_(-1))
+        span_labels = span_labels.scatter(1, positions, gold_mention_labels)
+        return span_labels[:, :num_spans]
+
     @staticmethod
     def _prune_and_sort_spans(mention_scores: torch.FloatTensor,
+                              span_mask: torch.FloatTensor,
                               num_spans_to_keep: int) -> torch.IntTensor:
         """
         The indices of the top-k scoring spans according to span_scores. We return the
         indices in their original order, not ordered by score, so that we can rely on
         the ordering to consider the previous k spans as antecedents for each span later.
 
+        A document with fewer candidate spans than we keep, such as a short document padded to
+        the length of the others in its batch, or one whose spans were enumerated by
+        :func:`_enumerate_spans`, has padding spans among the top-k.  These are put after all of
+        the real spans, so they never take the place of a real span's antecedents.
+
         Parameters
         ----------
         mention_scores : ``torch.FloatTensor``, required.
             The mention score for every candidate, with shape (batch_size, num_spans, 1).
+        span_mask : ``torch.FloatTensor``, required.
+            Whether each candidate is a real span, with shape (batch_size, num_spans, 1).
         num_spans_to_keep : ``int``, required.
             The number of spans to keep when pruning.
         Returns
@@ -546,9 +633,15 @@ class CoreferenceResolver(Model):
         top_span_indices : ``torch.IntTensor``, required.
             The indices of the top-k scoring spans. Has shape (batch_size, num_spans_to_keep).
         """
+        num_spans = mention_scores.size(1)
         # Shape: (batch_size, num_spans_to_keep, 1)
         _, top_span_indices = mention_scores.topk(num_spans_to_keep, 1)
-        top_span_indices, _ = torch.sort(top_span_indices, 1)
+        top_span_mask = span_mask.gather(1, top_span_indices)
+        # Sorting padding spans as if they came after the end of the document keeps the real
+        # spans in document order at the front.
+        sort_keys = top_span_indices + num_spans * (1 - top_span_mask.long())
+        _, sorted_order = torch.sort(sort_keys, 1)
+        top_span_indices = top_span_indices.gather(1, sorted_order)
 
         # Shape: (batch_size, num_spans_to_keep)
         top_span_indices = top_span_indices.squeeze(-1)
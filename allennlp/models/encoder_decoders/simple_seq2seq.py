@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Any, Dict, Tuple
 
 import numpy
 from overrides import overrides
@@ -16,6 +16,7 @@ from allennlp.modules import Attention, TextFieldEmbedder, Seq2SeqEncoder
 from allennlp.modules.similarity_functions import SimilarityFunction
 from allennlp.modules.token_embedders import Embedding
 from allennlp.models.model import Model
+from allennlp.nn import util
 from allennlp.nn.util import get_text_field_mask, sequence_cross_entropy_with_logits, weighted_sum
 
 
@@ -65,6 +66,19 @@ class SimpleSeq2Seq(Model):
         using target side ground truth labels.  See the following paper for more information:
         Scheduled Sampling for Sequence Prediction with Recurrent Neural Networks. Bengio et al.,
         2015.
+    beam_size : int, optional (default = 1)
+        When decoding without targets, we keep this many candidate sequences for each batch element
+        in a beam search.  With the default of 1, we decode greedily.  In either case we stop
+        decoding once every sequence has predicted the end symbol.
+    length_normalization : float, optional (default = 0.0)
+        When picking the best sequence from the beam, we divide each sequence's log probability by
+        its length raised to this power, so that values above 0.0 counteract the beam search's
+        preference for short sequences.
+    output_class_probabilities : bool, optional (default = True)
+        Whether to return the softmax ``class_probabilities`` (and, when there are no targets, the
+        ``logits``) over the whole target vocabulary for every decoding step.  These are large, and
+        aren't needed to get the predictions, so you may want to turn this off at inference time.
+        They are never returned by the beam search.
     """
     def __init__(self,
                  vocab: Vocabulary,
@@ -74,7 +88,10 @@ class SimpleSeq2Seq(Model):
                  target_namespace: str = "tokens",
                  target_embedding_dim: int = None,
                  attention_function: SimilarityFunction = None,
-                 scheduled_sampling_ratio: float = 0.0) -> None:
+                 scheduled_sampling_ratio: float = 0.0,
+                 beam_size: int = 1,
+                 length_normalization: float = 0.0,
+                 output_class_probabilities: bool = True) -> None:
         super(SimpleSeq2Seq, self).__init__(vocab)
         self._source_embedder = source_embedder
         self._encoder = encoder
@@ -82,6 +99,9 @@ class SimpleSeq2Seq(Model):
         self._target_namespace = target_namespace
         self._attention_function = attention_function
         self._scheduled_sampling_ratio = scheduled_sampling_ratio
+        self._beam_size = beam_size
+        self._length_normalization = length_normalization
+        self._output_class_probabilities = output_class_probabilities
         # We need the start symbol to provide as the input at the first timestep of decoding, and
         # end symbol as a way to indicate the end of the decoded sequence.
         self._start_index = self.vocab.get_token_index(START_SYMBOL, self._target_namespace)
@@ -123,10 +143,12 @@ class SimpleSeq2Seq(Model):
         """
         # (batch_size, input_sequence_length, encoder_output_dim)
         embedded_input = self._source_embedder(source_tokens)
-        batch_size, _, _ = embedded_input.size()
         source_mask = get_text_field_mask(source_tokens)
         encoder_outputs = self._encoder(embedded_input, source_mask)
-        final_encoder_output = encoder_outputs[:, -1]  # (batch_size, encoder_output_dim)
+        if not target_tokens and self._beam_size > 1:
+            return self._beam_search(encoder_outputs, source_mask)
+
+        batch_size = encoder_outputs.size(0)
         if target_tokens:
             targets = target_tokens["tokens"]
             target_sequence_length = targets.size()[1]
@@ -135,10 +157,13 @@ class SimpleSeq2Seq(Model):
             num_decoding_steps = target_sequence_length - 1
         else:
             num_decoding_steps = self._max_decoding_steps
-        decoder_hidden = final_encoder_output
+        decoder_hidden = encoder_outputs[:, -1]  # (batch_size, encoder_output_dim)
         decoder_context = Variable(encoder_outputs.data.new()
                                    .resize_(batch_size, self._decoder_output_dim).fill_(0))
+        precomputed_encoder_outputs = self._precompute_encoder_outputs(encoder_outputs)
         last_predictions = None
+        # Which sequences have predicted the end symbol, when we're decoding without targets.
+        finished = None
         step_logits = []
         step_probabilities = []
         step_predictions = []
@@ -153,40 +178,176 @@ class SimpleSeq2Seq(Model):
                                              .resize_(batch_size).fill_(self._start_index))
                 else:
                     input_choices = last_predictions
-            decoder_input = self._prepare_decode_step_input(input_choices, decoder_hidden,
-                                                            encoder_outputs, source_mask)
-            decoder_hidden, decoder_context = self._decoder_cell(decoder_input,
-                                                                 (decoder_hidden, decoder_context))
             # (batch_size, num_classes)
-            output_projections = self._output_projection_layer(decoder_hidden)
-            # list of (batch_size, 1, num_classes)
-            step_logits.append(output_projections.unsqueeze(1))
-            class_probabilities = F.softmax(output_projections, dim=-1)
-            _, predicted_classes = torch.max(class_probabilities, 1)
-            step_probabilities.append(class_probabilities.unsqueeze(1))
+            output_projections, decoder_hidden, decoder_context = \
+                    self._take_decoder_step(input_choices, decoder_hidden, decoder_context,
+                                            encoder_outputs, source_mask, precomputed_encoder_outputs)
+            if target_tokens or self._output_class_probabilities:
+                # list of (batch_size, 1, num_classes)
+                step_logits.append(output_projections.unsqueeze(1))
+            if self._output_class_probabilities:
+                class_probabilities = F.softmax(output_projections, dim=-1)
+                step_probabilities.append(class_probabilities.unsqueeze(1))
+            # The softmax doesn't change which class scores highest, so we can take the argmax of
+            # the logits directly.
+            _, predicted_classes = torch.max(output_projections, 1)
             last_predictions = predicted_classes
             # (batch_size, 1)
             step_predictions.append(last_predictions.unsqueeze(1))
+            if not target_tokens:
+                # Once every sequence in the batch has predicted the end symbol, the remaining
+                # predictions would all be trimmed off in ``decode``, so we can stop.
+                predicted_end = (last_predictions == self._end_index).data
+                finished = predicted_end if finished is None else finished | predicted_end
+                if finished.all():
+                    break
         # step_logits is a list containing tensors of shape (batch_size, 1, num_classes)
         # This is (batch_size, num_decoding_steps, num_classes)
-        logits = torch.cat(step_logits, 1)
-        class_probabilities = torch.cat(step_probabilities, 1)
-        all_predictions = torch.cat(step_predictions, 1)
-        output_dict = {"logits": logits,
-                       "class_probabilities": class_probabilities,
-                       "predictions": all_predictions}
+        output_dict = {"predictions": torch.cat(step_predictions, 1)}
+        if step_logits:
+            output_dict["logits"] = torch.cat(step_logits, 1)
+        if step_probabilities:
+            output_dict["class_probabilities"] = torch.cat(step_probabilities, 1)
         if target_tokens:
             target_mask = get_text_field_mask(target_tokens)
-            loss = self._get_loss(logits, targets, target_mask)
+            loss = self._get_loss(output_dict["logits"], targets, target_mask)
             output_dict["loss"] = loss
             # TODO: Define metrics
         return output_dict
 
+    def _take_decoder_step(self,
+                           input_choices: torch.LongTensor,
+                           decoder_hidden: torch.FloatTensor,
+                           decoder_context: torch.FloatTensor,
+                           encoder_outputs: torch.FloatTensor,
+                           source_mask: torch.LongTensor,
+                           precomputed_encoder_outputs: Any = None) -> Tuple[torch.FloatTensor,
+                                                                             torch.FloatTensor,
+                                                                             torch.FloatTensor]:
+        """
+        Runs the decoder for a single timestep, returning the output projections (logits over the
+        target vocabulary) and the new hidden and context states of the decoder cell.
+        """
+        decoder_input = self._prepare_decode_step_input(input_choices, decoder_hidden,
+                                                        encoder_outputs, source_mask,
+                                                        precomputed_encoder_outputs)
+        decoder_hidden, decoder_context = self._decoder_cell(decoder_input,
+                                                             (decoder_hidden, decoder_context))
+        # (batch_size, num_classes)
+        output_projections = self._output_projection_layer(decoder_hidden)
+        return output_projections, decoder_hidden, decoder_context
+
+    def _precompute_encoder_outputs(self, encoder_outputs: torch.FloatTensor) -> Any:
+        """
+        The encoder outputs are the same at every decoding step, so we do the attention's work on
+        them (e.g. projecting them with a bilinear similarity's weights) once per batch, instead of
+        once per step.  Returns ``None`` if we're not using attention.
+        """
+        if not self._attention_function:
+            return None
+        return self._decoder_attention.precompute_matrix(encoder_outputs)
+
+    def _beam_search(self,
+                     encoder_outputs: torch.FloatTensor,
+                     source_mask: torch.LongTensor) -> Dict[str, torch.Tensor]:
+        """
+        Decodes with a beam search of ``beam_size`` sequences per batch element, for at most
+        ``max_decoding_steps`` steps, stopping early once every beam has predicted the end symbol.
+        Finished beams are carried along unchanged.  When choosing the best beam, each beam's
+        log probability is divided by its length (including the end symbol) raised to the power of
+        ``length_normalization``.
+
+        Returns an output dictionary with the ``predictions`` of the best beam for each batch
+        element, of shape (batch_size, num_decoding_steps), and their (length normalized) scores,
+        ``prediction_scores``, of shape (batch_size,).
+        """
+        batch_size, source_length, encoder_output_dim = encoder_outputs.size()
+        beam_size = self._beam_size
+        num_classes = self.vocab.get_vocab_size(self._target_namespace)
+
+        # We decode all of the beams for a batch element together, so we repeat its encoder outputs
+        # for every beam.
+        # Shape: (batch_size * beam_size, source_length, encoder_output_dim)
+        encoder_outputs = encoder_outputs.unsqueeze(1).expand(batch_size, beam_size, source_length,
+                                                              encoder_output_dim).contiguous() \
+                .view(batch_size * beam_size, source_length, encoder_output_dim)
+        source_mask = source_mask.unsqueeze(1).expand(batch_size, beam_size, source_length).contiguous() \
+                .view(batch_size * beam_size, source_length)
+        decoder_hidden = encoder_outputs[:, -1]
+        decoder_context = Variable(encoder_outputs.data.new()
+                                   .resize_(batch_size * beam_size, self._decoder_output_dim).fill_(0))
+        precomputed_encoder_outputs = self._precompute_encoder_outputs(encoder_outputs)
+
+        # Every beam starts out with the start symbol, but only the first beam of each batch element
+        # is live at first, so that we don't pick the same continuation once per beam.
+        last_predictions = Variable(source_mask.data.new()
+                                    .resize_(batch_size * beam_size).fill_(self._start_index))
+        beam_scores = encoder_outputs.data.new().resize_(batch_size, beam_size).fill_(-1e30)
+        beam_scores[:, 0] = 0
+        beam_scores = Variable(beam_scores)
+        # Shape: (batch_size, beam_size)
+        finished = source_mask.data.new().resize_(batch_size, beam_size).fill_(0).byte()
+        lengths = source_mask.data.new().resize_(batch_size, beam_size).fill_(0)
+
+        # Finished beams may only "predict" the end symbol again, at no cost.
+        finished_log_probabilities = encoder_outputs.data.new().resize_(num_classes).fill_(-1e30)
+        finished_log_probabilities[self._end_index] = 0
+        finished_log_probabilities = Variable(finished_log_probabilities)
+
+        step_predictions = []
+        step_backpointers = []
+        for _ in range(self._max_decoding_steps):
+            output_projections, decoder_hidden, decoder_context = \
+                    self._take_decoder_step(last_predictions, decoder_hidden, decoder_context,
+                                            encoder_outputs, source_mask, precomputed_encoder_outputs)
+            # Shape: (batch_size, beam_size, num_classes)
+            log_probabilities = F.log_softmax(output_projections, dim=-1).view(batch_size, beam_size,
+                                                                               num_classes)
+            finished_mask = Variable(finished.unsqueeze(-1).float())
+            log_probabilities = log_probabilities * (1 - finished_mask) + \
+                    finished_log_probabilities.view(1, 1, num_classes) * finished_mask
+
+            # Shape: (batch_size, beam_size * num_classes)
+            candidate_scores = (beam_scores.unsqueeze(-1) + log_probabilities).view(batch_size, -1)
+            # Shape: (batch_size, beam_size)
+            beam_scores, candidate_indices = candidate_scores.topk(beam_size, dim=-1)
+            backpointers = (candidate_indices.float() / num_classes).floor().long()
+            predictions = candidate_indices - backpointers * num_classes
+
+            finished = finished.gather(1, backpointers.data)
+            lengths = lengths.gather(1, backpointers.data) + (1 - finished).long()
+            finished = finished | (predictions.data == self._end_index)
+            step_predictions.append(predictions)
+            step_backpointers.append(backpointers)
+
+            # Shape: (batch_size, 1)
+            beam_offsets = util.get_range_vector(batch_size, backpointers.is_cuda).unsqueeze(1) * beam_size
+            # Shape: (batch_size * beam_size,)
+            flat_backpointers = (backpointers + beam_offsets).view(-1)
+            decoder_hidden = decoder_hidden.index_select(0, flat_backpointers)
+            decoder_context = decoder_context.index_select(0, flat_backpointers)
+            last_predictions = predictions.view(-1)
+            if finished.all():
+                break
+
+        # Pick the best beam, then follow the backpointers to find its predictions.
+        normalized_scores = beam_scores / Variable(lengths.float()).pow(self._length_normalization)
+        best_scores, best_beams = normalized_scores.max(-1)
+        best_beams = best_beams.view(batch_size, 1)
+        predictions = []
+        for step_prediction, step_backpointer in zip(reversed(step_predictions), reversed(step_backpointers)):
+            predictions.append(step_prediction.gather(1, best_beams))
+            best_beams = step_backpointer.gather(1, best_beams)
+        predictions.reverse()
+        return {"predictions": torch.cat(predictions, 1),
+                "prediction_scores": best_scores.view(batch_size)}
+
     def _prepare_decode_step_input(self,
                                    input_indices: torch.LongTensor,
                                    decoder_hidden_state: torch.LongTensor = None,
                                    encoder_outputs: torch.LongTensor = None,
-                                   encoder_outputs_mask: torch.LongTensor = None) -> torch.LongTensor:
+                                   encoder_outputs_mask: torch.LongTensor = None,
+                                   precomputed_encoder_outputs: Any = None) -> torch.LongTensor:
         """
         Given the input indices for the current timestep of the decoder, and all the encoder
         outputs, compute the input at the current timestep.  Note: This method is agnostic to
@@ -208,6 +369,9 @@ class SimpleSeq2Seq(Model):
             Encoder outputs from all time steps. Needed only if using attention.
         encoder_outputs_mask : torch.LongTensor, optional (not needed if no attention)
             Masks on encoder outputs. Needed only if using attention.
+        precomputed_encoder_outputs : optional (not needed if no attention)
+            The output of ``Attention.precompute_matrix`` on the encoder outputs.  If given, we
+            don't repeat the attention's computation on the encoder outputs at this timestep.
         """
         # input_indices : (batch_size,)  since we are processing these one timestep at a time.
         # (batch_size, target_embedding_dim)
@@ -218,7 +382,8 @@ class SimpleSeq2Seq(Model):
             # complain.
             encoder_outputs_mask = encoder_outputs_mask.float()
             # (batch_size, input_sequence_length)
-            input_weights = self._decoder_attention(decoder_hidden_state, encoder_outputs, encoder_outputs_mask)
+            input_weights = self._decoder_attention(decoder_hidden_state, encoder_outputs, encoder_outputs_mask,
+                                                    precomputed_encoder_outputs)
             # (batch_size, encoder_output_dim)
             attended_input = weighted_sum(encoder_outputs, input_weights)
             # (batch_size, encoder_output_dim + target_embedding_dim)
@@ -298,10 +463,16 @@ class SimpleSeq2Seq(Model):
         else:
             attention_function = None
         scheduled_sampling_ratio = params.pop_float("scheduled_sampling_ratio", 0.0)
+        beam_size = params.pop_int("beam_size", 1)
+        length_normalization = params.pop_float("length_normalization", 0.0)
+        output_class_probabilities = params.pop_bool("output_class_probabilities", True)
         return cls(vocab,
                    source_embedder=source_embedder,
                    encoder=encoder,
                    max_decoding_steps=max_decoding_steps,
                    target_namespace=target_namespace,
                    attention_function=attention_function,
-                   scheduled_sampling_ratio=scheduled_sampling_ratio)
+                   scheduled_sampling_ratio=scheduled_sampling_ratio,
+                   beam_size=beam_size,
+                   length_normalization=length_normalization,
+                   output_class_probabilities=output_class_probabilities)
@@ -14,6 +14,7 @@ from allennlp.common.params import Params
 from allennlp.common.registrable import Registrable
 from allennlp.data import Instance, Vocabulary
 from allennlp.data.dataset import Dataset
+from allennlp.modules.token_embedders import Embedding
 from allennlp.nn import util
 from allennlp.nn.regularizers import RegularizerApplicator
 
@@ -225,6 +226,11 @@ class Model(torch.nn.Module, Registrable):
         _remove_pretrained_embedding_params(model_params)
         model = Model.from_params(vocab, model_params)
         model_state = torch.load(weights_file, map_location=util.device_mapping(cuda_device))
+        # Embeddings which read their weights from a ``weight_file`` have no weights to load, so
+        # a model trained with dense embeddings can be served from a (quantized) weight file.
+        for name, module in model.named_modules():
+            if isinstance(module, Embedding) and module.weight_file is not None:
+                model_state.pop(name + '.weight', None)
         model.load_state_dict(model_state)
 
         # Force model to cpu or gpu, as appropriate, to make sure that the embeddings are
@@ -12,6 +12,7 @@ from allennlp.models.model import Model
 from allennlp.modules import Highway, MatrixAttention
 from allennlp.modules import Seq2SeqEncoder, SimilarityFunction, TimeDistributed, TextFieldEmbedder
 from allennlp.nn import util, InitializerApplicator, RegularizerApplicator
+from allennlp.nn.attention_util import masked_attention
 from allennlp.training.metrics import BooleanAccuracy, CategoricalAccuracy, SquadEmAndF1
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -185,10 +186,10 @@ class BidirectionalAttentionFlow(Model):
 
         # Shape: (batch_size, passage_length, question_length)
         passage_question_similarity = self._matrix_attention(encoded_passage, encoded_question)
-        # Shape: (batch_size, passage_length, question_length)
-        passage_question_attention = util.last_dim_softmax(passage_question_similarity, question_mask)
         # Shape: (batch_size, passage_length, encoding_dim)
-        passage_question_vectors = util.weighted_sum(encoded_question, passage_question_attention)
+        passage_question_vectors = masked_attention(passage_question_similarity,
+                                                    encoded_question,
+                                                    question_mask)
 
         # We replace masked values with something really negative here, so they don't affect the
         # max below.
@@ -197,10 +198,8 @@ class BidirectionalAttentionFlow(Model):
                                                        -1e7)
         # Shape: (batch_size, passage_length)
         question_passage_similarity = masked_similarity.max(dim=-1)[0].squeeze(-1)
-        # Shape: (batch_size, passage_length)
-        question_passage_attention = util.masked_softmax(question_passage_similarity, passage_mask)
         # Shape: (batch_size, encoding_dim)
-        question_passage_vector = util.weighted_sum(encoded_passage, question_passage_attention)
+        question_passage_vector = masked_attention(question_passage_similarity, encoded_passage, passage_mask)
         # Shape: (batch_size, passage_length, encoding_dim)
         tiled_question_passage_vector = question_passage_vector.unsqueeze(1).expand(batch_size,
                                                                                     passage_length,
@@ -78,7 +78,8 @@ class SemanticRoleLabeler(Model):
     def forward(self,  # type: ignore
                 tokens: Dict[str, torch.LongTensor],
                 verb_indicator: torch.LongTensor,
-                tags: torch.LongTensor = None) -> Dict[str, torch.Tensor]:
+                tags: torch.LongTensor = None,
+                sentence_indices: torch.LongTensor = None) -> Dict[str, torch.Tensor]:
         # pylint: disable=arguments-differ
         """
         Parameters
@@ -99,6 +100,15 @@ class SemanticRoleLabeler(Model):
         tags : torch.LongTensor, optional (default = None)
             A torch tensor representing the sequence of integer gold class labels
             of shape ``(batch_size, num_tokens)``
+        sentence_indices : torch.LongTensor, optional (default = None)
+            At inference time, a sentence with many verbs gives us many instances that only differ
+            in their ``verb_indicator``, and embedding the same tokens for each of them is wasteful
+            (particularly with character or ELMo embeddings).  If this is given, ``tokens`` has one
+            row per `sentence`, while ``verb_indicator`` (and ``tags``) still have one row per
+            verb, and ``sentence_indices`` has shape ``(batch_size,)``, giving the row of
+            ``tokens`` that each verb is in.  We embed each sentence once and copy its embedding
+            for each of its verbs.  Because that also shares the embedding dropout mask between the
+            verbs of a sentence, this is intended for inference.
 
         Returns
         -------
@@ -115,6 +125,10 @@ class SemanticRoleLabeler(Model):
         """
         embedded_text_input = self.embedding_dropout(self.text_field_embedder(tokens))
         mask = get_text_field_mask(tokens)
+        if sentence_indices is not None:
+            # Shape: (batch_size, sequence_length, embedding_dim)
+            embedded_text_input = embedded_text_input.index_select(0, sentence_indices)
+            mask = mask.index_select(0, sentence_indices)
         embedded_verb_indicator = self.binary_feature_embedding(verb_indicator.long())
         # Concatenate the verb feature onto the embedded text. This now
         # has shape (batch_size, sequence_length, embedding_dim + binary_feature_dim).
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 from overrides import overrides
 import torch
@@ -7,7 +7,14 @@ from torch.nn import Parameter
 from torch.nn.utils.rnn import PackedSequence, pad_packed_sequence, pack_padded_sequence
 
 from allennlp.nn.initializers import block_orthogonal
-from allennlp.custom_extensions._ext import highway_lstm_layer
+from allennlp.nn.rnn_util import stack_timestep_outputs
+
+try:
+    from allennlp.custom_extensions._ext import highway_lstm_layer
+except (ImportError, FileNotFoundError):
+    # The kernel is only built on machines with a GPU (by ``make.sh`` in ``custom_extensions``).
+    # Without it, ``AlternatingHighwayLSTM`` runs ``_alternating_highway_lstm`` instead.
+    highway_lstm_layer = None
 
 
 class _AlternatingHighwayLSTMFunction(Function):
@@ -113,6 +120,111 @@ class _AlternatingHighwayLSTMFunction(Function):
                 grad_memory_accumulator, grad_dropout, grad_lengths, grad_gates)
 
 
+def _alternating_highway_lstm(inputs: Variable,
+                              batch_lengths: List[int],
+                              weight: Variable,
+                              bias: Variable,
+                              dropout_mask: Optional[Variable],
+                              hidden_size: int,
+                              num_layers: int) -> Variable:
+    """
+    Computes what the ``highway_lstm_layer`` kernel does, using the same flat ``weight`` and
+    ``bias``, with pytorch operations, so it runs on any device and autograd gives the backward
+    pass.  As in the kernel, each layer does its input projections for all of the timesteps in one
+    matrix multiplication, and only runs the recurrence on the sequences which cover a timestep.
+
+    Parameters
+    ----------
+    inputs : ``Variable``, required.
+        A batch first tensor of shape (batch_size, sequence_length, input_size), sorted by length.
+    batch_lengths : ``List[int]``, required.
+        The length of each sequence in the batch, longest first.
+    weight : ``Variable``, required.
+        The flat weight of an ``AlternatingHighwayLSTM``.  For each layer, this holds the input
+        weights, of shape (layer_input_size, 6 * hidden_size), followed by the state weights, of
+        shape (hidden_size, 5 * hidden_size).
+    bias : ``Variable``, required.
+        The flat bias of an ``AlternatingHighwayLSTM``, with 5 * hidden_size values per layer.
+    dropout_mask : ``Variable``, optional.
+        The recurrent dropout mask, of shape (num_layers, batch_size, hidden_size), or ``None``
+        if there is no dropout.
+    hidden_size : ``int``, required.
+    num_layers : ``int``, required.
+
+    Returns
+    -------
+    The outputs of the last layer, of shape (batch_size, sequence_length, hidden_size), with zeros
+    past the end of each sequence.
+    """
+    batch_size, total_timesteps, _ = inputs.size()
+    layer_inputs = inputs
+    weight_index = 0
+    for layer in range(num_layers):
+        layer_input_size = layer_inputs.size(2)
+        input_weight = weight[weight_index:weight_index + layer_input_size * 6 * hidden_size]\
+            .view(layer_input_size, 6 * hidden_size)
+        weight_index += input_weight.nelement()
+        state_weight = weight[weight_index:weight_index + hidden_size * 5 * hidden_size]\
+            .view(hidden_size, 5 * hidden_size)
+        weight_index += state_weight.nelement()
+        layer_bias = bias[layer * 5 * hidden_size:(layer + 1) * 5 * hidden_size]
+        go_forward = layer % 2 == 0
+
+        # Each has shape (batch_size, 6 * hidden_size).  We split by timestep, rather than
+        # indexing at each timestep, so that the gradient of each piece isn't the size of the
+        # whole projection.
+        projected_inputs = [projected_input.squeeze(1) for projected_input
+                            in layer_inputs.matmul(input_weight).split(1, 1)]
+        full_batch_previous_memory = Variable(inputs.data.new(batch_size, hidden_size).fill_(0))
+        full_batch_previous_state = Variable(inputs.data.new(batch_size, hidden_size).fill_(0))
+        current_length_index = batch_size - 1 if go_forward else 0
+        timestep_outputs: List[Variable] = [None] * total_timesteps
+
+        for timestep in range(total_timesteps):
+            index = timestep if go_forward else total_timesteps - timestep - 1
+            # The batch is sorted by length, so the sequences which cover this timestep are a
+            # prefix of it, which shrinks going forwards and grows going backwards.
+            if go_forward:
+                while batch_lengths[current_length_index] <= index:
+                    current_length_index -= 1
+            else:
+                while current_length_index < batch_size - 1 and \
+                        batch_lengths[current_length_index + 1] > index:
+                    current_length_index += 1
+            num_active = current_length_index + 1
+
+            previous_memory = full_batch_previous_memory[0:num_active]
+            previous_state = full_batch_previous_state[0:num_active]
+            projected_input = projected_inputs[index][0:num_active]
+
+            # Shape (num_active, 5 * hidden_size).  The last chunk of the input projection is
+            # the highway input, which has no state projection or bias.
+            projected = projected_input[:, :5 * hidden_size] + previous_state.mm(state_weight) + layer_bias
+            input_gate, forget_gate, memory_init, output_gate, highway_gate = projected.chunk(5, 1)
+            memory = torch.sigmoid(input_gate) * torch.tanh(memory_init) + \
+                    torch.sigmoid(forget_gate) * previous_memory
+            timestep_output = torch.sigmoid(output_gate) * torch.tanh(memory)
+
+            highway_gate = torch.sigmoid(highway_gate)
+            highway_input_projection = projected_input[:, 5 * hidden_size:]
+            timestep_output = highway_gate * timestep_output + (1 - highway_gate) * highway_input_projection
+            if dropout_mask is not None:
+                timestep_output = timestep_output * dropout_mask[layer, 0:num_active]
+
+            if num_active < batch_size:
+                full_batch_previous_memory = torch.cat([memory, full_batch_previous_memory[num_active:]], 0)
+                full_batch_previous_state = torch.cat([timestep_output,
+                                                       full_batch_previous_state[num_active:]], 0)
+            else:
+                full_batch_previous_memory = memory
+                full_batch_previous_state = timestep_output
+            timestep_outputs[index] = timestep_output
+
+        # Shape (batch_size, total_timesteps, hidden_size), the input to the next layer.
+        layer_inputs = stack_timestep_outputs(timestep_outputs, batch_size)
+    return layer_inputs
+
+
 class AlternatingHighwayLSTM(torch.nn.Module):
     """
     A stacked LSTM with LSTM layers which alternate between going forwards over
@@ -121,6 +233,11 @@ class AlternatingHighwayLSTM(torch.nn.Module):
     `Deep Semantic Role Labelling - What works and what's next
     <https://homes.cs.washington.edu/~luheng/files/acl2017_hllz.pdf>`_ .
 
+    On a GPU, if the ``highway_lstm_layer`` extension in ``allennlp.custom_extensions`` has been
+    built, this runs the fused CUDA kernel.  Otherwise (and always on a CPU), it runs the same
+    computation with pytorch operations, using the same parameters, so a model trained with the
+    kernel can be run without it.
+
     Parameters
     ----------
     input_size : int, required
@@ -226,7 +343,31 @@ class AlternatingHighwayLSTM(torch.nn.Module):
             (num_layers, batch_size, hidden_size).
         """
         inputs, lengths = pad_packed_sequence(inputs, batch_first=True)
+        batch_size = inputs.size(0)
+
+        dropout_weights = inputs.data.new().resize_(self.num_layers, batch_size, self.hidden_size).fill_(1.0)
+        if self.training:
+            # Normalize by 1 - dropout_prob to preserve the output statistics of the layer.
+            dropout_weights.bernoulli_(1 - self.recurrent_dropout_probability)\
+                .div_((1 - self.recurrent_dropout_probability))
+
+        dropout_weights = Variable(dropout_weights, requires_grad=False)
+
+        if inputs.is_cuda and highway_lstm_layer is not None:
+            output = self._kernel_forward(inputs, lengths, dropout_weights)
+        else:
+            if not self.training or self.recurrent_dropout_probability == 0.0:
+                # The mask is all ones.
+                dropout_weights = None
+            output = _alternating_highway_lstm(inputs, lengths, self.weight, self.bias, dropout_weights,
+                                               self.hidden_size, self.num_layers)
+
+        # TODO(Mark): Also return the state here by using index_select with the lengths so we can use
+        # it as a Seq2VecEncoder.
+        output = pack_padded_sequence(output, lengths, batch_first=True)
+        return output, None
 
+    def _kernel_forward(self, inputs: Variable, lengths: List[int], dropout_weights: Variable) -> Variable:
         # Kernel takes sequence length first tensors.
         inputs = inputs.transpose(0, 1)
 
@@ -235,13 +376,6 @@ class AlternatingHighwayLSTM(torch.nn.Module):
         state_accumulator = Variable(inputs.data.new(*accumulator_shape).zero_(), requires_grad=False)
         memory_accumulator = Variable(inputs.data.new(*accumulator_shape).zero_(), requires_grad=False)
 
-        dropout_weights = inputs.data.new().resize_(self.num_layers, batch_size, self.hidden_size).fill_(1.0)
-        if self.training:
-            # Normalize by 1 - dropout_prob to preserve the output statistics of the layer.
-            dropout_weights.bernoulli_(1 - self.recurrent_dropout_probability)\
-                .div_((1 - self.recurrent_dropout_probability))
-
-        dropout_weights = Variable(dropout_weights, requires_grad=False)
         gates = Variable(inputs.data.new().resize_(self.num_layers,
                                                    sequence_length,
                                                    batch_size, 6 * self.hidden_size))
@@ -253,9 +387,4 @@ class AlternatingHighwayLSTM(torch.nn.Module):
                                                          train=self.training)
         output, _ = implementation(inputs, self.weight, self.bias, state_accumulator,
                                    memory_accumulator, dropout_weights, lengths_variable, gates)
-
-        # TODO(Mark): Also return the state here by using index_select with the lengths so we can use
-        # it as a Seq2VecEncoder.
-        output = output.transpose(0, 1)
-        output = pack_padded_sequence(output, lengths, batch_first=True)
-        return output, None
+        return output.transpose(0, 1)
@@ -2,6 +2,7 @@
 An *attention* module that computes the similarity between
 an input vector and the rows of a matrix.
 """
+from typing import Any
 
 import torch
 from overrides import overrides
@@ -25,11 +26,17 @@ class Attention(torch.nn.Module):
     - vector: shape ``(batch_size, embedding_dim)``
     - matrix: shape ``(batch_size, num_rows, embedding_dim)``
     - matrix_mask: shape ``(batch_size, num_rows)``, specifying which rows are just padding.
+    - precomputed_matrix: optional, the output of :func:`precompute_matrix` for this ``matrix``.
 
     Output:
 
     - attention: shape ``(batch_size, num_rows)``.
 
+    If you attend over the same matrix with many different vectors, like a decoder attending over
+    its encoder outputs once per timestep, you can call :func:`precompute_matrix` once and pass
+    the result to each call as ``precomputed_matrix``, so that any work the similarity function does
+    on the matrix alone (e.g. projecting it with a weight matrix) isn't repeated.
+
     Parameters
     ----------
     similarity_function : ``SimilarityFunction``, optional (default=``DotProductSimilarity``)
@@ -50,16 +57,28 @@ class Attention(torch.nn.Module):
     def forward(self,  # pylint: disable=arguments-differ
                 vector: torch.Tensor,
                 matrix: torch.Tensor,
-                matrix_mask: torch.Tensor = None) -> torch.Tensor:
+                matrix_mask: torch.Tensor = None,
+                precomputed_matrix: Any = None) -> torch.Tensor:
         tiled_vector = vector.unsqueeze(1).expand(vector.size()[0],
                                                   matrix.size()[1],
                                                   vector.size()[1])
-        similarities = self._similarity_function(tiled_vector, matrix)
+        if precomputed_matrix is None:
+            similarities = self._similarity_function(tiled_vector, matrix)
+        else:
+            similarities = self._similarity_function.forward_with_precomputed_tensor_2(tiled_vector,
+                                                                                       precomputed_matrix)
         if self._normalize:
             return masked_softmax(similarities, matrix_mask)
         else:
             return similarities
 
+    def precompute_matrix(self, matrix: torch.Tensor) -> Any:
+        """
+        Does the part of the similarity computation that only depends on ``matrix``, returning
+        something to pass to ``forward`` as ``precomputed_matrix`` along with that same ``matrix``.
+        """
+        return self._similarity_function.precompute_tensor_2(matrix)
+
     @classmethod
     def from_params(cls, params: Params) -> 'Attention':
         similarity_function = SimilarityFunction.from_params(params.pop('similarity_function', {}))
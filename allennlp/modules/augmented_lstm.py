@@ -3,13 +3,14 @@ An LSTM with Recurrent Dropout and the option to use highway
 connections between layers.
 """
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import torch
 from torch.autograd import Variable
 from torch.nn.utils.rnn import pad_packed_sequence, pack_padded_sequence, PackedSequence
 
 from allennlp.common.checks import ConfigurationError
+from allennlp.nn.rnn_util import stack_timestep_outputs
 from allennlp.nn.util import get_dropout_mask
 from allennlp.nn.initializers import block_orthogonal
 
@@ -121,11 +122,10 @@ class AugmentedLstm(torch.nn.Module):
         batch_size = sequence_tensor.size()[0]
         total_timesteps = sequence_tensor.size()[1]
 
-        # We have to use this '.data.new().resize_.fill_' pattern to create tensors with the correct
-        # type - forward has no knowledge of whether these are torch.Tensors or torch.cuda.Tensors.
-        output_accumulator = Variable(sequence_tensor.data.new()
-                                      .resize_(batch_size, total_timesteps, self.hidden_size).fill_(0))
         if initial_state is None:
+            # We have to use this '.data.new().resize_.fill_' pattern to create tensors with the
+            # correct type - forward has no knowledge of whether these are torch.Tensors or
+            # torch.cuda.Tensors.
             full_batch_previous_memory = Variable(sequence_tensor.data.new()
                                                   .resize_(batch_size, self.hidden_size).fill_(0))
             full_batch_previous_state = Variable(sequence_tensor.data.new()
@@ -140,6 +140,17 @@ class AugmentedLstm(torch.nn.Module):
         else:
             dropout_mask = None
 
+        # The input projections don't depend on the recurrence, so we do them for all of the
+        # timesteps at once, in one big matrix multiplication.
+        # We split the result by timestep here, rather than indexing it at each timestep, because
+        # the gradient of each index would be the size of the whole tensor.
+        projected_inputs = [projected_input.squeeze(1) for projected_input
+                            in self.input_linearity(sequence_tensor).split(1, 1)]
+        # The state projection covers every part of the input projection but the highway input
+        # projection, if there is one.
+        num_gates = 5 if self.use_highway else 4
+        timestep_outputs: List[torch.Tensor] = [None] * total_timesteps
+
         for timestep in range(total_timesteps):
             # The index depends on which end we start.
             index = timestep if self.go_forward else total_timesteps - timestep - 1
@@ -164,48 +175,47 @@ class AugmentedLstm(torch.nn.Module):
                 while current_length_index < (len(batch_lengths) - 1) and \
                                 batch_lengths[current_length_index + 1] > index:
                     current_length_index += 1
+            num_active = current_length_index + 1
 
             # Actually get the slices of the batch which we need for the computation at this timestep.
-            previous_memory = full_batch_previous_memory[0: current_length_index + 1].clone()
-            previous_state = full_batch_previous_state[0: current_length_index + 1].clone()
-            timestep_input = sequence_tensor[0: current_length_index + 1, index]
-
-            # Do the projections for all the gates all at once.
-            projected_input = self.input_linearity(timestep_input)
-            projected_state = self.state_linearity(previous_state)
-
-            # Main LSTM equations using relevant chunks of the big linear
-            # projections of the hidden state and inputs.
-            input_gate = torch.sigmoid(projected_input[:, 0 * self.hidden_size:1 * self.hidden_size] +
-                                       projected_state[:, 0 * self.hidden_size:1 * self.hidden_size])
-            forget_gate = torch.sigmoid(projected_input[:, 1 * self.hidden_size:2 * self.hidden_size] +
-                                        projected_state[:, 1 * self.hidden_size:2 * self.hidden_size])
-            memory_init = torch.tanh(projected_input[:, 2 * self.hidden_size:3 * self.hidden_size] +
-                                     projected_state[:, 2 * self.hidden_size:3 * self.hidden_size])
-            output_gate = torch.sigmoid(projected_input[:, 3 * self.hidden_size:4 * self.hidden_size] +
-                                        projected_state[:, 3 * self.hidden_size:4 * self.hidden_size])
+            previous_memory = full_batch_previous_memory[0:num_active]
+            previous_state = full_batch_previous_state[0:num_active]
+            projected_input = projected_inputs[index][0:num_active]
+
+            # The projections for all the gates, from the input and the state, added together.
+            projected = projected_input[:, 0:num_gates * self.hidden_size] + self.state_linearity(previous_state)
+            gates = projected.chunk(num_gates, 1)
+
+            # Main LSTM equations using the relevant chunks of the projection.
+            input_gate = torch.sigmoid(gates[0])
+            forget_gate = torch.sigmoid(gates[1])
+            memory_init = torch.tanh(gates[2])
+            output_gate = torch.sigmoid(gates[3])
             memory = input_gate * memory_init + forget_gate * previous_memory
             timestep_output = output_gate * torch.tanh(memory)
 
             if self.use_highway:
-                highway_gate = torch.sigmoid(projected_input[:, 4 * self.hidden_size:5 * self.hidden_size] +
-                                             projected_state[:, 4 * self.hidden_size:5 * self.hidden_size])
+                highway_gate = torch.sigmoid(gates[4])
                 highway_input_projection = projected_input[:, 5 * self.hidden_size:6 * self.hidden_size]
                 timestep_output = highway_gate * timestep_output + (1 - highway_gate) * highway_input_projection
 
             # Only do dropout if the dropout prob is > 0.0 and we are in training mode.
             if dropout_mask is not None and self.training:
-                timestep_output = timestep_output * dropout_mask[0: current_length_index + 1]
-
-            # We've been doing computation with less than the full batch, so here we create a new
-            # variable for the the whole batch at this timestep and insert the result for the
-            # relevant elements of the batch into it.
-            full_batch_previous_memory = Variable(full_batch_previous_memory.data.clone())
-            full_batch_previous_state = Variable(full_batch_previous_state.data.clone())
-            full_batch_previous_memory[0:current_length_index + 1] = memory
-            full_batch_previous_state[0:current_length_index + 1] = timestep_output
-            output_accumulator[0:current_length_index + 1, index] = timestep_output
+                timestep_output = timestep_output * dropout_mask[0:num_active]
+
+            # We've been doing computation with less than the full batch.  The rest of the
+            # batch keeps the state and memory it had, either because it has finished, or
+            # (going backwards) because it hasn't started yet.
+            if num_active < batch_size:
+                full_batch_previous_memory = torch.cat([memory, full_batch_previous_memory[num_active:]], 0)
+                full_batch_previous_state = torch.cat([timestep_output,
+                                                       full_batch_previous_state[num_active:]], 0)
+            else:
+                full_batch_previous_memory = memory
+                full_batch_previous_state = timestep_output
+            timestep_outputs[index] = timestep_output
 
+        output_accumulator = stack_timestep_outputs(timestep_outputs, batch_size)
         output_accumulator = pack_padded_sequence(output_accumulator, batch_lengths, batch_first=True)
 
         # Mimic the pytorch API by returning state in the following shape:
@@ -12,6 +12,7 @@ from overrides import overrides
 from allennlp.common.file_utils import cached_path
 from allennlp.common.checks import ConfigurationError
 from allennlp.common import Params
+from allennlp.modules.elmo_cache import ElmoActivationCache
 from allennlp.modules.elmo_lstm import ElmoLstm
 from allennlp.modules.highway import Highway
 from allennlp.modules.scalar_mix import ScalarMix
@@ -22,6 +23,25 @@ from allennlp.data.token_indexers.elmo_indexer import ELMoCharacterMapper
 # pylint: disable=attribute-defined-outside-init
 
 
+def batch_to_ids(batch: List[List[str]]) -> torch.Tensor:
+    """
+    Converts a batch of tokenized sentences to a tensor representing the sentences with encoded
+    characters, suitable as input to :class:`Elmo` or :class:`_ElmoBiLm`.  This produces the same
+    ids as indexing the sentences with an ``ELMoTokenCharactersIndexer`` and padding them, but
+    without building any ``Instances``.
+
+    Parameters
+    ----------
+    batch : ``List[List[str]]``, required
+        A list of tokenized sentences.
+
+    Returns
+    -------
+    A ``LongTensor`` of shape ``(len(batch), max sentence length, max_word_length)``.
+    """
+    return torch.from_numpy(ELMoCharacterMapper.batch_to_char_ids(batch))
+
+
 class Elmo(torch.nn.Module):
     """
     Compute ELMo representations using a pre-trained bidirectional language model.
@@ -49,16 +69,35 @@ class Elmo(torch.nn.Module):
         Should we apply layer normalization (passed to ``ScalarMix``)?
     dropout : ``float``, optional, (default = 0.5).
         The dropout to be applied to the ELMo representations.
+    activation_cache_size : ``int``, optional, (default = 0).
+        The biLM's weights are frozen, so we can cache its activations for each sentence, and only
+        the (cheap) scalar mixes and dropout are computed each time we see the sentence again.  This
+        is how many sentences we keep in an in-memory cache.  See
+        :class:`~allennlp.modules.elmo_cache.ElmoActivationCache`.
+    activation_cache_file : ``str``, optional, (default = None).
+        An HDF5 file to keep cached activations in, which isn't limited in size, and persists
+        between runs.  If neither this nor ``activation_cache_size`` is given, we don't cache.
+    token_embedding_file : ``str``, optional, (default = None).
+        An HDF5 file of precomputed context insensitive token embeddings for a vocabulary, written
+        by the ``elmo-vocab`` command, so that we only run the character CNN for tokens that
+        aren't in it.
     """
     def __init__(self,
                  options_file: str,
                  weight_file: str,
                  num_output_representations: int,
                  do_layer_norm: bool = False,
-                 dropout: float = 0.5) -> None:
+                 dropout: float = 0.5,
+                 activation_cache_size: int = 0,
+                 activation_cache_file: str = None,
+                 token_embedding_file: str = None) -> None:
         super(Elmo, self).__init__()
 
-        self._elmo_lstm = _ElmoBiLm(options_file, weight_file)
+        if activation_cache_size > 0 or activation_cache_file is not None:
+            activation_cache = ElmoActivationCache(activation_cache_size, activation_cache_file)
+        else:
+            activation_cache = None
+        self._elmo_lstm = _ElmoBiLm(options_file, weight_file, activation_cache, token_embedding_file)
         self._dropout = Dropout(p=dropout)
         self._scalar_mixes: Any = []
         for k in range(num_output_representations):
@@ -128,9 +167,18 @@ class Elmo(torch.nn.Module):
         weight_file = params.pop('weight_file')
         num_output_representations = params.pop('num_output_representations')
         do_layer_norm = params.pop_bool('do_layer_norm', False)
+        activation_cache_size = params.pop_int('activation_cache_size', 0)
+        activation_cache_file = params.pop('activation_cache_file', None)
+        token_embedding_file = params.pop('token_embedding_file', None)
         params.assert_empty(cls.__name__)
 
-        return cls(options_file, weight_file, num_output_representations, do_layer_norm)
+        return cls(options_file,
+                   weight_file,
+                   num_output_representations,
+                   do_layer_norm,
+                   activation_cache_size=activation_cache_size,
+                   activation_cache_file=activation_cache_file,
+                   token_embedding_file=token_embedding_file)
 
 
 class _ElmoCharacterEncoder(torch.nn.Module):
@@ -153,6 +201,12 @@ class _ElmoCharacterEncoder(torch.nn.Module):
         ELMo JSON options file
     weight_file : ``str``
         ELMo hdf5 weight file
+    token_embedding_file : ``str``, optional
+        An HDF5 file of precomputed token embeddings for a vocabulary, as written by the
+        ``elmo-vocab`` command.  The weights of this encoder are frozen, so a token's embedding
+        only depends on its characters, and for tokens in this file we look their embedding up
+        instead of running the character CNN and highway layers.  Only tokens that aren't in the
+        file (each distinct one once per batch) go through the CNN.
 
     The relevant section of the options file is something like:
     .. example-code::
@@ -171,12 +225,16 @@ class _ElmoCharacterEncoder(torch.nn.Module):
     """
     def __init__(self,
                  options_file: str,
-                 weight_file: str) -> None:
+                 weight_file: str,
+                 token_embedding_file: str = None) -> None:
         super(_ElmoCharacterEncoder, self).__init__()
 
         with open(cached_path(options_file), 'r') as fin:
             self._options = json.load(fin)
         self._weight_file = weight_file
+        self._token_embeddings: _PrecomputedTokenEmbeddings = None
+        if token_embedding_file is not None:
+            self._token_embeddings = _PrecomputedTokenEmbeddings(token_embedding_file)
 
         self.output_dim = self._options['lstm']['projection_dim']
 
@@ -222,11 +280,33 @@ class _ElmoCharacterEncoder(torch.nn.Module):
                 self._end_of_sentence_characters
         )
 
-        # the character id embedding
+        # (batch_size * sequence_length, max_chars_per_token)
         max_chars_per_token = self._options['char_cnn']['max_characters_per_token']
-        # (batch_size * sequence_length, max_chars_per_token, embed_dim)
+        flat_character_ids = character_ids_with_bos_eos.view(-1, max_chars_per_token)
+        if self._token_embeddings is None:
+            # (batch_size * sequence_length, embedding_dim)
+            token_embedding = self.embed_characters(flat_character_ids)
+        else:
+            token_embedding = self._embed_with_precomputed_embeddings(flat_character_ids)
+
+        # reshape to (batch_size, sequence_length, embedding_dim)
+        batch_size, sequence_length, _ = character_ids_with_bos_eos.size()
+
+        return {
+                'mask': mask_with_bos_eos,
+                'token_embedding': token_embedding.view(batch_size, sequence_length, -1)
+        }
+
+    def embed_characters(self, character_ids: torch.Tensor) -> torch.Tensor:
+        """
+        Runs the character CNN, highway layers and projection on the character ids for a flat
+        list of tokens, with shape ``(num_tokens, max_characters_per_token)``, returning their
+        embeddings, with shape ``(num_tokens, embedding_dim)``.
+        """
+        # the character id embedding
+        # (num_tokens, max_chars_per_token, embed_dim)
         character_embedding = torch.nn.functional.embedding(
-                character_ids_with_bos_eos.view(-1, max_chars_per_token),
+                character_ids,
                 self._char_embedding_weights
         )
 
@@ -239,32 +319,47 @@ class _ElmoCharacterEncoder(torch.nn.Module):
         else:
             raise ConfigurationError("Unknown activation")
 
-        # (batch_size * sequence_length, embed_dim, max_chars_per_token)
+        # (num_tokens, embed_dim, max_chars_per_token)
         character_embedding = torch.transpose(character_embedding, 1, 2)
         convs = []
         for conv in self._convolutions:
             convolved = conv(character_embedding)
-            # (batch_size * sequence_length, n_filters for this width)
+            # (num_tokens, n_filters for this width)
             convolved, _ = torch.max(convolved, dim=-1)
             convolved = activation(convolved)
             convs.append(convolved)
 
-        # (batch_size * sequence_length, n_filters)
+        # (num_tokens, n_filters)
         token_embedding = torch.cat(convs, dim=-1)
 
-        # apply the highway layers (batch_size * sequence_length, n_filters)
+        # apply the highway layers (num_tokens, n_filters)
         token_embedding = self._highways(token_embedding)
 
-        # final projection  (batch_size * sequence_length, embedding_dim)
-        token_embedding = self._projection(token_embedding)
-
-        # reshape to (batch_size, sequence_length, embedding_dim)
-        batch_size, sequence_length, _ = character_ids_with_bos_eos.size()
-
-        return {
-                'mask': mask_with_bos_eos,
-                'token_embedding': token_embedding.view(batch_size, sequence_length, -1)
-        }
+        # final projection  (num_tokens, embedding_dim)
+        return self._projection(token_embedding)
+
+    def _embed_with_precomputed_embeddings(self, character_ids: torch.Tensor) -> torch.Tensor:
+        flat_ids = character_ids.data.cpu().numpy()
+        table_indices = self._token_embeddings.lookup(flat_ids)
+        known = numpy.nonzero(table_indices >= 0)[0]
+        unknown = numpy.nonzero(table_indices < 0)[0]
+
+        # We look up the known tokens and run the CNN on each distinct unknown token, then put
+        # those embeddings back in order with one ``index_select``.
+        embeddings = [Variable(self._token_embeddings.embeddings_for(table_indices[known], character_ids))]
+        positions = numpy.zeros(len(flat_ids), dtype=numpy.int64)
+        positions[known] = numpy.arange(len(known))
+        if unknown.size:
+            unknown_ids, unknown_positions = numpy.unique(flat_ids[unknown], axis=0, return_inverse=True)
+            unknown_ids = torch.from_numpy(unknown_ids)
+            if character_ids.is_cuda:
+                unknown_ids = unknown_ids.cuda(character_ids.get_device())
+            embeddings.append(self.embed_characters(Variable(unknown_ids)))
+            positions[unknown] = len(known) + unknown_positions.reshape(-1)
+        positions = torch.from_numpy(positions)
+        if character_ids.is_cuda:
+            positions = positions.cuda(character_ids.get_device())
+        return torch.cat(embeddings, dim=0).index_select(0, Variable(positions))
 
     def _load_weights(self):
         self._load_char_embedding()
@@ -367,8 +462,64 @@ class _ElmoCharacterEncoder(torch.nn.Module):
         # pylint: disable=unused-argument
         options_file = params.pop('options_file')
         weight_file = params.pop('weight_file')
+        token_embedding_file = params.pop('token_embedding_file', None)
         params.assert_empty(cls.__name__)
-        return cls(options_file, weight_file)
+        return cls(options_file, weight_file, token_embedding_file)
+
+
+class _PrecomputedTokenEmbeddings:
+    """
+    The context insensitive embeddings of a vocabulary, precomputed by an ``_ElmoCharacterEncoder``
+    and read from an HDF5 file with a ``char_ids`` dataset of shape ``(vocab_size,
+    max_characters_per_token)`` and an ``embeddings`` dataset of shape ``(vocab_size,
+    embedding_dim)``.
+
+    Tokens are looked up by their character ids.  We hash each token's character ids into a single
+    integer and binary search for it in the sorted hashes of the vocabulary, then check that the
+    character ids really match, so a hash collision just means we run the CNN on that token.
+    """
+    _HASH_MULTIPLIERS = numpy.random.RandomState(13370).randint(1, 2 ** 62, size=50, dtype=numpy.int64)
+
+    def __init__(self, token_embedding_file: str) -> None:
+        with h5py.File(cached_path(token_embedding_file), 'r') as fin:
+            self._char_ids = fin['char_ids'][...].astype(numpy.int16)
+            self._embeddings = torch.from_numpy(fin['embeddings'][...].astype(numpy.float32))
+        hashes = self._hash(self._char_ids)
+        self._order = numpy.argsort(hashes, kind='mergesort')
+        self._sorted_hashes = hashes[self._order]
+        # A copy of the embeddings on the GPU we're running on, if any.
+        self._cuda_embeddings: torch.Tensor = None
+
+    def _hash(self, char_ids: numpy.ndarray) -> numpy.ndarray:
+        # Integer overflow just wraps around, which is fine for a hash.
+        return (char_ids.astype(numpy.int64) * self._HASH_MULTIPLIERS[:char_ids.shape[-1]]).sum(axis=-1)
+
+    def lookup(self, char_ids: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the index in the vocabulary of each of the tokens in ``char_ids``, which has shape
+        ``(num_tokens, max_characters_per_token)``, or ``-1`` for tokens that aren't in it.
+        """
+        if not self._sorted_hashes.size:
+            return numpy.full(len(char_ids), -1, dtype=numpy.int64)
+        hashes = self._hash(char_ids)
+        positions = numpy.minimum(numpy.searchsorted(self._sorted_hashes, hashes), len(self._order) - 1)
+        indices = self._order[positions]
+        found = (self._sorted_hashes[positions] == hashes) & (self._char_ids[indices] == char_ids).all(axis=-1)
+        return numpy.where(found, indices, -1)
+
+    def embeddings_for(self, indices: numpy.ndarray, like: torch.Tensor) -> torch.Tensor:
+        """
+        The embeddings of the tokens at ``indices``, on the same device as ``like``.
+        """
+        embeddings = self._embeddings
+        if like.is_cuda:
+            if self._cuda_embeddings is None or self._cuda_embeddings.get_device() != like.get_device():
+                self._cuda_embeddings = self._embeddings.cuda(like.get_device())
+            embeddings = self._cuda_embeddings
+        index_tensor = torch.from_numpy(indices)
+        if like.is_cuda:
+            index_tensor = index_tensor.cuda(like.get_device())
+        return embeddings.index_select(0, index_tensor)
 
 
 class _ElmoBiLm(torch.nn.Module):
@@ -385,13 +536,25 @@ class _ElmoBiLm(torch.nn.Module):
         ELMo JSON options file
     weight_file : ``str``
         ELMo hdf5 weight file
+    activation_cache : ``ElmoActivationCache``, optional
+        If given, we look up the activations for each sentence in this cache, and only run the
+        biLM on the sentences that aren't in it (adding them to it).  The ``ElmoLstm`` is
+        stateful, carrying its states over from one batch to the next, so a cached sentence gets
+        the activations from the first time we ran it, not ones computed from the states left
+        by the previous batch.
+    token_embedding_file : ``str``, optional
+        Precomputed token embeddings for the ``_ElmoCharacterEncoder``.
     """
     def __init__(self,
                  options_file: str,
-                 weight_file: str) -> None:
+                 weight_file: str,
+                 activation_cache: ElmoActivationCache = None,
+                 token_embedding_file: str = None) -> None:
         super(_ElmoBiLm, self).__init__()
 
-        self._token_embedder = _ElmoCharacterEncoder(options_file, weight_file)
+        self._activation_cache = activation_cache
+
+        self._token_embedder = _ElmoCharacterEncoder(options_file, weight_file, token_embedding_file)
 
         with open(cached_path(options_file), 'r') as fin:
             options = json.load(fin)
@@ -428,6 +591,11 @@ class _ElmoBiLm(torch.nn.Module):
         Note that the output tensors all include additional special begin and end of sequence
         markers.
         """
+        if self._activation_cache is not None:
+            return self._cached_forward(inputs)
+        return self._run_bilm(inputs)
+
+    def _run_bilm(self, inputs: torch.Tensor) -> Dict[str, Union[torch.Tensor, List[torch.Tensor]]]:
         token_embedding = self._token_embedder(inputs)
         type_representation = token_embedding['token_embedding']
         mask = token_embedding['mask']
@@ -444,3 +612,47 @@ class _ElmoBiLm(torch.nn.Module):
                 'activations': output_tensors,
                 'mask': mask,
         }
+
+    def _cached_forward(self, inputs: torch.Tensor) -> Dict[str, Union[torch.Tensor, List[torch.Tensor]]]:
+        """
+        Computes the same thing as ``forward``, looking each sentence up in our activation cache,
+        and only running the biLM on the sentences that aren't there.
+        """
+        character_ids = inputs.data.cpu().numpy()
+        batch_size, timesteps, _ = character_ids.shape
+        lengths = (character_ids > 0).any(axis=-1).sum(axis=-1)
+        keys = [ElmoActivationCache.sentence_key(character_ids[i, :lengths[i]]) for i in range(batch_size)]
+        sentence_activations = [self._activation_cache.get(key) for key in keys]
+
+        missing = [i for i, activations in enumerate(sentence_activations) if activations is None]
+        if missing:
+            missing_indices = torch.LongTensor(missing)
+            if inputs.is_cuda:
+                missing_indices = missing_indices.cuda(inputs.get_device())
+            missing_length = max(1, max(lengths[i] for i in missing))
+            missing_inputs = inputs.index_select(0, Variable(missing_indices))[:, :missing_length]
+            missing_output = self._run_bilm(missing_inputs)
+            # Shape: (num_missing, num_layers, missing_length + 2, embedding_dim)
+            missing_activations = torch.stack(missing_output['activations'], dim=1).data.cpu().numpy()
+            for missing_index, i in enumerate(missing):
+                # A copy, so the cache doesn't keep the whole padded batch alive through a view.
+                activations = missing_activations[missing_index, :, :lengths[i] + 2].copy()
+                self._activation_cache.put(keys[i], activations)
+                sentence_activations[i] = activations
+
+        embedding_dim = sentence_activations[0].shape[-1]
+        padded_activations = numpy.zeros((self.num_layers, batch_size, timesteps + 2, embedding_dim),
+                                         dtype=numpy.float32)
+        for i, activations in enumerate(sentence_activations):
+            padded_activations[:, i, :lengths[i] + 2] = activations
+        mask = (numpy.arange(timesteps + 2)[None, :] < (lengths[:, None] + 2)).astype(numpy.int64)
+
+        activations_tensor = torch.from_numpy(padded_activations)
+        mask_tensor = torch.from_numpy(mask)
+        if inputs.is_cuda:
+            activations_tensor = activations_tensor.cuda(inputs.get_device())
+            mask_tensor = mask_tensor.cuda(inputs.get_device())
+        return {
+                'activations': [Variable(layer_activations) for layer_activations in activations_tensor],
+                'mask': Variable(mask_tensor),
+        }
@@ -0,0 +1,112 @@
+"""
+A cache of the activations of a pretrained ELMo biLM, so that a model using frozen ELMo
+representations only has to run the biLM once per distinct sentence, instead of once per sentence
+per epoch.
+"""
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import logging
+
+import h5py
+import numpy
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class ElmoActivationCache:
+    """
+    Stores the biLM activations for sentences, keyed by a hash of their character ids (see
+    :func:`sentence_key`).  Each entry is a ``float32`` array of shape ``(num_layers,
+    num_tokens + 2, embedding_dim)``, holding the activations of every layer of the biLM for the
+    sentence, including its beginning and end of sentence tokens, and without any padding.
+
+    There are two tiers: an in-memory least-recently-used cache of up to ``max_sentences_in_memory``
+    sentences, and, if you give a ``cache_file``, an HDF5 file with one dataset per sentence.  The
+    file is never evicted from, so it can hold the activations for a whole corpus, and it persists
+    between runs (and can be shared between experiments using the same biLM weights - but you need
+    to delete it yourself if you change the weights).  Sentences found in the file are moved into
+    memory, and new sentences are added to both tiers.
+
+    Parameters
+    ----------
+    max_sentences_in_memory : ``int``, optional (default=``10000``)
+        How many sentences to keep in memory.  With ``0``, we only use the ``cache_file``.
+    cache_file : ``str``, optional (default=``None``)
+        An HDF5 file to read activations from and write them to.  It's created if it doesn't exist.
+    """
+    def __init__(self,
+                 max_sentences_in_memory: int = 10000,
+                 cache_file: str = None) -> None:
+        self._max_sentences_in_memory = max_sentences_in_memory
+        self._cache_file = cache_file
+        self._memory: OrderedDict = OrderedDict()
+        # We open the file the first time we need it, so that building a model doesn't touch it.
+        self._file: h5py.File = None
+
+    @staticmethod
+    def sentence_key(character_ids: numpy.ndarray) -> str:
+        """
+        The key for a sentence, given its (unpadded) character ids, with shape ``(num_tokens,
+        max_characters_per_token)``.
+        """
+        return hashlib.sha1(numpy.ascontiguousarray(character_ids, dtype=numpy.int64)).hexdigest()
+
+    def get(self, key: str) -> Optional[numpy.ndarray]:
+        """
+        Returns the activations stored for ``key``, or ``None`` if there aren't any.
+        """
+        activations = self._memory.get(key)
+        if activations is not None:
+            self._memory.move_to_end(key)  # pylint: disable=no-member
+            return activations
+        if self._cache_file is not None and key in self._get_file():
+            activations = self._get_file()[key][...]
+            self._add_to_memory(key, activations)
+            return activations
+        return None
+
+    def put(self, key: str, activations: numpy.ndarray) -> None:
+        """
+        Stores the activations for ``key``.
+        """
+        self._add_to_memory(key, activations)
+        if self._cache_file is not None and key not in self._get_file():
+            self._get_file().create_dataset(key, data=activations)
+
+    def flush(self) -> None:
+        """
+        Makes sure everything we've added to the ``cache_file`` is written to disk.
+        """
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _add_to_memory(self, key: str, activations: numpy.ndarray) -> None:
+        if self._max_sentences_in_memory <= 0:
+            return
+        self._memory[key] = activations
+        self._memory.move_to_end(key)  # pylint: disable=no-member
+        while len(self._memory) > self._max_sentences_in_memory:
+            self._memory.popitem(last=False)
+
+    def _get_file(self) -> h5py.File:
+        if self._file is None:
+            logger.info("Using ELMo activation cache file %s", self._cache_file)
+            self._file = h5py.File(self._cache_file, 'a')
+        return self._file
+
+    def __getstate__(self):
+        # The cached activations can be recomputed, and h5py files can't be pickled or deep
+        # copied, so we leave both out.
+        state = dict(self.__dict__)
+        state['_memory'] = OrderedDict()
+        state['_file'] = None
+        return state
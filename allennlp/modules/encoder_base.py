@@ -1,9 +1,9 @@
-from typing import Tuple, Union, Optional, Callable
+from typing import List, Tuple, Union, Optional, Callable
 import torch
 from torch.autograd import Variable
-from torch.nn.utils.rnn import pack_padded_sequence, PackedSequence
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence, PackedSequence
 
-from allennlp.nn.util import get_lengths_from_binary_sequence_mask, sort_batch_by_length
+from allennlp.nn.util import get_lengths_from_binary_sequence_mask
 
 # We have two types here for the state, because storing the state in something
 # which is Iterable (like a tuple, below), is helpful for internal manipulation
@@ -13,6 +13,80 @@ RnnState = Union[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]  # pylint: dis
 RnnStateStorage = Tuple[torch.Tensor, ...]  # pylint: disable=invalid-name
 
 
+class SortedBatch:
+    """
+    The order which sorts a batch of sequences by length, as Pytorch RNNs need them, computed from
+    the mask of the batch.
+
+    Our encoders compute this from the mask they are given on every call.  If you run several
+    encoders over the same sequences, you can compute it once, with ``SortedBatch(mask)``, and pass
+    it to each of them in place of the mask.  You can go further, and ``pack`` the inputs once,
+    pass the ``PackedSequence`` from one encoder to the next (given a ``PackedSequence``, a
+    :class:`~allennlp.modules.seq2seq_encoders.PytorchSeq2SeqWrapper` returns one in the same
+    order), and ``unpack`` the output of the last one, so that the batch is only sorted and
+    unsorted once.
+
+    Parameters
+    ----------
+    mask : ``torch.Tensor``, required.
+        A binary mask of shape ``(batch_size, sequence_length)``.
+
+    Attributes
+    ----------
+    num_valid : ``int``
+        The number of sequences which aren't empty.  Pytorch RNNs can't take sequences of zero
+        length, so these are left out of packed sequences.  They sort last.
+    sorted_sequence_lengths : ``List[int]``
+        The lengths of the non-empty sequences, longest first.
+    sorting_indices : ``torch.LongTensor``
+        The indices which sort the batch, of shape ``(batch_size,)``.
+    restoration_indices : ``torch.LongTensor``
+        The indices which restore the original order of the sorted batch.
+    """
+    def __init__(self, mask: torch.Tensor) -> None:
+        self.mask = mask
+        self.batch_size, self.sequence_length = mask.size()
+        sequence_lengths = get_lengths_from_binary_sequence_mask(mask)
+        sorted_sequence_lengths, self.sorting_indices = sequence_lengths.sort(0, descending=True)
+        _, self.restoration_indices = self.sorting_indices.sort(0)
+        sorted_sequence_lengths = sorted_sequence_lengths.data.tolist()
+        self.num_valid = sum(1 for length in sorted_sequence_lengths if length > 0)
+        self.sorted_sequence_lengths: List[int] = sorted_sequence_lengths[:self.num_valid]
+
+    def pack(self, inputs: torch.Tensor) -> PackedSequence:
+        """
+        Sorts ``inputs``, of shape ``(batch_size, sequence_length, dim)``, and packs the
+        non-empty sequences.
+        """
+        sorted_inputs = inputs.index_select(0, self.sorting_indices)
+        return pack_padded_sequence(sorted_inputs[:self.num_valid], self.sorted_sequence_lengths, batch_first=True)
+
+    def unpack(self, sequence: PackedSequence) -> torch.Tensor:
+        """
+        Pads a ``PackedSequence`` in the sorted order, such as the output of an RNN run on the
+        output of ``pack``, and restores the original order.  Returns a tensor of shape
+        ``(batch_size, sequence_length, dim)``, with zeros past the end of each sequence.
+        """
+        unpacked_sequence_tensor, _ = pad_packed_sequence(sequence, batch_first=True)
+        num_valid, length, dim = unpacked_sequence_tensor.size()
+        # Add back the empty sequences.
+        if num_valid < self.batch_size:
+            zeros = Variable(unpacked_sequence_tensor.data.new(self.batch_size - num_valid, length, dim).fill_(0))
+            unpacked_sequence_tensor = torch.cat([unpacked_sequence_tensor, zeros], 0)
+
+        # It's possible to need to pass sequences which are padded to longer than the
+        # max length of the sequence to an encoder. However, packing and unpacking
+        # the sequences mean that the returned tensor won't include these dimensions, because
+        # the RNN did not need to process them. We add them back on in the form of zeros here.
+        if length < self.sequence_length:
+            zeros = Variable(unpacked_sequence_tensor.data.new(self.batch_size,
+                                                               self.sequence_length - length,
+                                                               dim).fill_(0))
+            unpacked_sequence_tensor = torch.cat([unpacked_sequence_tensor, zeros], 1)
+
+        return unpacked_sequence_tensor.index_select(0, self.restoration_indices)
+
+
 class _EncoderBase(torch.nn.Module):
     # pylint: disable=abstract-method
     """
@@ -33,8 +107,8 @@ class _EncoderBase(torch.nn.Module):
     def sort_and_run_forward(self,
                              module: Callable[[PackedSequence, Optional[RnnState]],
                                               Tuple[Union[PackedSequence, torch.Tensor], RnnState]],
-                             inputs: torch.Tensor,
-                             mask: torch.Tensor,
+                             inputs: Union[torch.Tensor, PackedSequence],
+                             mask: Union[torch.Tensor, SortedBatch],
                              hidden_state: Optional[RnnState] = None):
         """
         This function exists because Pytorch RNNs require that their inputs be sorted
@@ -56,12 +130,14 @@ class _EncoderBase(torch.nn.Module):
         module : ``Callable[[PackedSequence, Optional[RnnState]],
                             Tuple[Union[PackedSequence, torch.Tensor], RnnState]]``, required.
             A function to run on the inputs. In most cases, this is a ``torch.nn.Module``.
-        inputs : ``torch.Tensor``, required.
+        inputs : ``Union[torch.Tensor, PackedSequence]``, required.
             A tensor of shape ``(batch_size, sequence_length, embedding_size)`` representing
-            the inputs to the Encoder.
-        mask : ``torch.Tensor``, required.
+            the inputs to the Encoder, or a ``PackedSequence`` of them, which has already
+            been sorted and packed by ``SortedBatch.pack``.
+        mask : ``Union[torch.Tensor, SortedBatch]``, required.
             A tensor of shape ``(batch_size, sequence_length)``, representing masked and
-            non-masked elements of the sequence for each element in the batch.
+            non-masked elements of the sequence for each element in the batch, or the
+            ``SortedBatch`` computed from it.
         hidden_state : ``Optional[RnnState]``, (default = None).
             A single tensor of shape (num_layers, batch_size, hidden_size) representing the
             state of an RNN with or a tuple of
@@ -84,22 +160,17 @@ class _EncoderBase(torch.nn.Module):
             A tensor of shape ``(batch_size,)``, describing the re-indexing required to transform
             the outputs back to their original batch order.
         """
-        # In some circumstances you may have sequences of zero length. ``pack_padded_sequence``
-        # requires all sequence lengths to be > 0, so remove sequences of zero length before
-        # calling self._module, then fill with zeros.
-
-        # First count how many sequences are empty.
-        batch_size = mask.size(0)
-        num_valid = torch.sum(mask[:, 0]).int().data[0]
+        sorted_batch = mask if isinstance(mask, SortedBatch) else SortedBatch(mask)
+        sorting_indices = sorted_batch.sorting_indices
+        num_valid = sorted_batch.num_valid
 
-        sequence_lengths = get_lengths_from_binary_sequence_mask(mask)
-        sorted_inputs, sorted_sequence_lengths, restoration_indices, sorting_indices =\
-            sort_batch_by_length(inputs, sequence_lengths)
+        # Create a PackedSequence with only the non-empty, sorted sequences, unless we were
+        # given one.
+        if isinstance(inputs, PackedSequence):
+            packed_sequence_input = inputs
+        else:
+            packed_sequence_input = sorted_batch.pack(inputs)
 
-        # Now create a PackedSequence with only the non-empty, sorted sequences.
-        packed_sequence_input = pack_padded_sequence(sorted_inputs[:num_valid, :, :],
-                                                     sorted_sequence_lengths[:num_valid].data.tolist(),
-                                                     batch_first=True)
         # Prepare the initial states.
         if not self.stateful:
             if hidden_state is None:
@@ -111,12 +182,12 @@ class _EncoderBase(torch.nn.Module):
                 initial_states = hidden_state.index_select(1, sorting_indices)[:, :num_valid, :]
 
         else:
-            initial_states = self._get_initial_states(batch_size, num_valid, sorting_indices)
+            initial_states = self._get_initial_states(sorted_batch.batch_size, num_valid, sorting_indices)
 
         # Actually call the module on the sorted PackedSequence.
         module_output, final_states = module(packed_sequence_input, initial_states)
 
-        return module_output, final_states, restoration_indices
+        return module_output, final_states, sorted_batch.restoration_indices
 
     def _get_initial_states(self,
                             batch_size: int,
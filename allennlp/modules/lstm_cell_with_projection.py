@@ -8,6 +8,7 @@ from typing import Optional, Tuple, List
 import torch
 from torch.autograd import Variable
 
+from allennlp.nn.rnn_util import stack_timestep_outputs
 from allennlp.nn.util import get_dropout_mask
 from allennlp.nn.initializers import block_orthogonal
 
@@ -123,12 +124,10 @@ class LstmCellWithProjection(torch.nn.Module):
         batch_size = inputs.size()[0]
         total_timesteps = inputs.size()[1]
 
-        # We have to use this '.data.new().fill_' pattern to create tensors with the correct
-        # type - forward has no knowledge of whether these are torch.Tensors or torch.cuda.Tensors.
-        output_accumulator = Variable(inputs.data.new(batch_size,
-                                                      total_timesteps,
-                                                      self.hidden_size).fill_(0))
         if initial_state is None:
+            # We have to use this '.data.new().fill_' pattern to create tensors with the correct
+            # type - forward has no knowledge of whether these are torch.Tensors or
+            # torch.cuda.Tensors.
             full_batch_previous_memory = Variable(inputs.data.new(batch_size,
                                                                   self.cell_size).fill_(0))
             full_batch_previous_state = Variable(inputs.data.new(batch_size,
@@ -144,6 +143,16 @@ class LstmCellWithProjection(torch.nn.Module):
         else:
             dropout_mask = None
 
+        # The input projections don't depend on the recurrence, so we do them for all of the
+        # timesteps at once, in one big matrix multiplication, instead of one small one per
+        # timestep.
+        # We split the result by timestep here, rather than indexing it at each timestep, because
+        # the gradient of each index would be the size of the whole tensor.
+        # Each has shape (batch_size, 4 * cell_size)
+        projected_inputs = [projected_input.squeeze(1) for projected_input
+                            in self.input_linearity(inputs).split(1, 1)]
+        timestep_outputs: List[torch.Tensor] = [None] * total_timesteps
+
         for timestep in range(total_timesteps):
             # The index depends on which end we start.
             index = timestep if self.go_forward else total_timesteps - timestep - 1
@@ -168,32 +177,23 @@ class LstmCellWithProjection(torch.nn.Module):
                 while current_length_index < (len(batch_lengths) - 1) and \
                                 batch_lengths[current_length_index + 1] > index:
                     current_length_index += 1
+            num_active = current_length_index + 1
 
             # Actually get the slices of the batch which we
             # need for the computation at this timestep.
-            # shape (batch_size, cell_size)
-            previous_memory = full_batch_previous_memory[0: current_length_index + 1].clone()
-            # Shape (batch_size, hidden_size)
-            previous_state = full_batch_previous_state[0: current_length_index + 1].clone()
-            # Shape (batch_size, input_size)
-            timestep_input = inputs[0: current_length_index + 1, index]
-
-            # Do the projections for all the gates all at once.
-            # Both have shape (batch_size, 4 * cell_size)
-            projected_input = self.input_linearity(timestep_input)
-            projected_state = self.state_linearity(previous_state)
-
-            # Main LSTM equations using relevant chunks of the big linear
-            # projections of the hidden state and inputs.
-            input_gate = torch.sigmoid(projected_input[:, (0 * self.cell_size):(1 * self.cell_size)] +
-                                       projected_state[:, (0 * self.cell_size):(1 * self.cell_size)])
-            forget_gate = torch.sigmoid(projected_input[:, (1 * self.cell_size):(2 * self.cell_size)] +
-                                        projected_state[:, (1 * self.cell_size):(2 * self.cell_size)])
-            memory_init = torch.tanh(projected_input[:, (2 * self.cell_size):(3 * self.cell_size)] +
-                                     projected_state[:, (2 * self.cell_size):(3 * self.cell_size)])
-            output_gate = torch.sigmoid(projected_input[:, (3 * self.cell_size):(4 * self.cell_size)] +
-                                        projected_state[:, (3 * self.cell_size):(4 * self.cell_size)])
-            memory = input_gate * memory_init + forget_gate * previous_memory
+            # shape (num_active, cell_size)
+            previous_memory = full_batch_previous_memory[0:num_active]
+            # Shape (num_active, hidden_size)
+            previous_state = full_batch_previous_state[0:num_active]
+
+            # The projections for all the gates, from the input and the state, added together.
+            # Shape (num_active, 4 * cell_size)
+            projected = projected_inputs[index][0:num_active] + self.state_linearity(previous_state)
+
+            # Main LSTM equations using the relevant chunks of the projection.
+            input_gate, forget_gate, memory_init, output_gate = projected.chunk(4, 1)
+            memory = torch.sigmoid(input_gate) * torch.tanh(memory_init) + \
+                    torch.sigmoid(forget_gate) * previous_memory
 
             # Here is the non-standard part of this LSTM cell; first, we clip the
             # memory cell, then we project the output of the timestep to a smaller size
@@ -203,10 +203,10 @@ class LstmCellWithProjection(torch.nn.Module):
                 # pylint: disable=invalid-unary-operand-type
                 memory.data.clamp_(-self.memory_cell_clip_value, self.memory_cell_clip_value)
 
-            # shape (current_length_index, cell_size)
-            pre_projection_timestep_output = output_gate * torch.tanh(memory)
+            # shape (num_active, cell_size)
+            pre_projection_timestep_output = torch.sigmoid(output_gate) * torch.tanh(memory)
 
-            # shape (current_length_index, hidden_size)
+            # shape (num_active, hidden_size)
             timestep_output = self.state_projection(pre_projection_timestep_output)
             if self.state_projection_clip_value:
                 # pylint: disable=invalid-unary-operand-type
@@ -215,16 +215,24 @@ class LstmCellWithProjection(torch.nn.Module):
 
             # Only do dropout if the dropout prob is > 0.0 and we are in training mode.
             if dropout_mask is not None:
-                timestep_output = timestep_output * dropout_mask[0: current_length_index + 1]
-
-            # We've been doing computation with less than the full batch, so here we create a new
-            # variable for the the whole batch at this timestep and insert the result for the
-            # relevant elements of the batch into it.
-            full_batch_previous_memory = Variable(full_batch_previous_memory.data.clone())
-            full_batch_previous_state = Variable(full_batch_previous_state.data.clone())
-            full_batch_previous_memory[0:current_length_index + 1] = memory
-            full_batch_previous_state[0:current_length_index + 1] = timestep_output
-            output_accumulator[0:current_length_index + 1, index] = timestep_output
+                timestep_output = timestep_output * dropout_mask[0:num_active]
+
+            # We've been doing computation with less than the full batch.  The rest of the
+            # batch keeps the state and memory it had, either because it has finished, or
+            # (going backwards) because it hasn't started yet.
+            if num_active < batch_size:
+                full_batch_previous_memory = torch.cat([memory, full_batch_previous_memory[num_active:]], 0)
+                full_batch_previous_state = torch.cat([timestep_output,
+                                                       full_batch_previous_state[num_active:]], 0)
+            else:
+                full_batch_previous_memory = memory
+                full_batch_previous_state = timestep_output
+            timestep_outputs[index] = timestep_output
+
+        # Outputs past the end of each sequence are zero.  We pad them once, at the end, instead
+        # of writing each timestep into a zero tensor of the full size.
+        # Shape (batch_size, total_timesteps, hidden_size)
+        output_accumulator = stack_timestep_outputs(timestep_outputs, batch_size)
 
         # Mimic the pytorch API by returning state in the following shape:
         # (num_layers * num_directions, batch_size, ...). As this
@@ -24,6 +24,10 @@ class MatrixAttention(torch.nn.Module):
     unnormalized.  You should use this instead of ``TimeDistributed(Attention)`` if you want to
     compute multiple normalizations of the attention matrix.
 
+    We compute the similarities with :func:`SimilarityFunction.matrix_similarity`, which for all of
+    the similarity functions in the library avoids tiling the two matrices to ``(batch_size,
+    num_rows_1, num_rows_2, embedding_dim)``.
+
     Input:
         - matrix_1: ``(batch_size, num_rows_1, embedding_dim)``
         - matrix_2: ``(batch_size, num_rows_2, embedding_dim)``
@@ -44,15 +48,7 @@ class MatrixAttention(torch.nn.Module):
     @overrides
     def forward(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
         # pylint: disable=arguments-differ
-        tiled_matrix_1 = matrix_1.unsqueeze(2).expand(matrix_1.size()[0],
-                                                      matrix_1.size()[1],
-                                                      matrix_2.size()[1],
-                                                      matrix_1.size()[2])
-        tiled_matrix_2 = matrix_2.unsqueeze(1).expand(matrix_2.size()[0],
-                                                      matrix_1.size()[1],
-                                                      matrix_2.size()[1],
-                                                      matrix_2.size()[2])
-        return self._similarity_function(tiled_matrix_1, tiled_matrix_2)
+        return self._similarity_function.matrix_similarity(matrix_1, matrix_2)
 
     @classmethod
     def from_params(cls, params: Params) -> 'MatrixAttention':
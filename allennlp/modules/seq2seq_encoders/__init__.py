@@ -11,7 +11,7 @@ The available Seq2Seq encoders are
 * `"rnn" <http://pytorch.org/docs/master/nn.html#torch.nn.RNN>`_
 * :class:`"augmented_lstm" <allennlp.modules.augmented_lstm.AugmentedLstm>`
 * :class:`"alternating_lstm" <allennlp.modules.stacked_alternating_lstm.StackedAlternatingLstm>`
-* :class:`"alternating_highway_lstm" <allennlp.modules.stacked_alternating_lstm.StackedAlternatingLstm> (GPU only)`
+* :class:`"alternating_highway_lstm" <allennlp.modules.alternating_highway_lstm.AlternatingHighwayLSTM>`
 """
 
 from typing import Type
@@ -21,6 +21,7 @@ import torch
 
 from allennlp.common import Params
 from allennlp.common.checks import ConfigurationError
+from allennlp.modules.alternating_highway_lstm import AlternatingHighwayLSTM
 from allennlp.modules.augmented_lstm import AugmentedLstm
 from allennlp.modules.seq2seq_encoders.intra_sentence_attention import IntraSentenceAttentionEncoder
 from allennlp.modules.seq2seq_encoders.pytorch_seq2seq_wrapper import PytorchSeq2SeqWrapper
@@ -79,13 +80,6 @@ Seq2SeqEncoder.register("lstm")(_Seq2SeqWrapper(torch.nn.LSTM))
 Seq2SeqEncoder.register("rnn")(_Seq2SeqWrapper(torch.nn.RNN))
 Seq2SeqEncoder.register("augmented_lstm")(_Seq2SeqWrapper(AugmentedLstm))
 Seq2SeqEncoder.register("alternating_lstm")(_Seq2SeqWrapper(StackedAlternatingLstm))
-if torch.cuda.is_available():
-    try:
-        # TODO(Mark): Remove this once we have a CPU wrapper for the kernel/switch to ATen.
-        from allennlp.modules.alternating_highway_lstm import AlternatingHighwayLSTM
-        Seq2SeqEncoder.register("alternating_highway_lstm_cuda")(_Seq2SeqWrapper(AlternatingHighwayLSTM))
-    except (ModuleNotFoundError, FileNotFoundError):
-        logger.debug("allennlp could not register 'alternating_highway_lstm_cuda' - installation "
-                     "needs to be completed manually if you have pip-installed the package. "
-                     "Run ``bash make.sh`` in the 'custom_extensions' module on a machine with a "
-                     "GPU.")
+Seq2SeqEncoder.register("alternating_highway_lstm")(_Seq2SeqWrapper(AlternatingHighwayLSTM))
+# The name this was registered under when it needed the CUDA kernel; it now runs anywhere.
+Seq2SeqEncoder.register("alternating_highway_lstm_cuda")(_Seq2SeqWrapper(AlternatingHighwayLSTM))
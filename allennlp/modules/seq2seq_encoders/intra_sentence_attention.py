@@ -10,6 +10,7 @@ from allennlp.modules.seq2seq_encoders.seq2seq_encoder import Seq2SeqEncoder
 from allennlp.modules.similarity_functions import DotProductSimilarity, SimilarityFunction
 from allennlp.modules.similarity_functions import MultiHeadedSimilarity
 from allennlp.nn import util
+from allennlp.nn.attention_util import masked_attention
 
 
 @Seq2SeqEncoder.register("intra_sentence_attention")
@@ -100,19 +101,16 @@ class IntraSentenceAttentionEncoder(Seq2SeqEncoder):
             # In this case, the similarity matrix actually has shape
             # (batch_size, sequence_length, sequence_length, num_heads).  To make the rest of the
             # logic below easier, we'll permute this to
-            # (batch_size, sequence_length, num_heads, sequence_length).
-            similarity_matrix = similarity_matrix.permute(0, 1, 3, 2)
-
-        # Shape: (batch_size, sequence_length, [num_heads,] sequence_length)
-        intra_sentence_attention = util.last_dim_softmax(similarity_matrix.contiguous(), mask)
+            # (batch_size, num_heads, sequence_length, sequence_length).
+            similarity_matrix = similarity_matrix.permute(0, 3, 1, 2)
 
         # Shape: (batch_size, sequence_length, projection_dim)
         output_token_representation = self._projection(tokens)
 
         if self._num_attention_heads > 1:
             # We need to split and permute the output representation to be
-            # (batch_size, num_heads, sequence_length, projection_dim / num_heads), so that we can
-            # do a proper weighted sum with `intra_sentence_attention`.
+            # (batch_size, num_heads, sequence_length, projection_dim / num_heads), so that each
+            # head attends over its own part of it.
             shape = list(output_token_representation.size())
             new_shape = shape[:-1] + [self._num_attention_heads, -1]
             # Shape: (batch_size, sequence_length, num_heads, projection_dim / num_heads)
@@ -120,15 +118,15 @@ class IntraSentenceAttentionEncoder(Seq2SeqEncoder):
             # Shape: (batch_size, num_heads, sequence_length, projection_dim / num_heads)
             output_token_representation = output_token_representation.permute(0, 2, 1, 3)
 
-        # Shape: (batch_size, sequence_length, [num_heads,] projection_dim [/ num_heads])
-        attended_sentence = util.weighted_sum(output_token_representation,
-                                              intra_sentence_attention)
+        # Shape: (batch_size, [num_heads,] sequence_length, projection_dim [/ num_heads])
+        attended_sentence = masked_attention(similarity_matrix, output_token_representation, mask)
 
         if self._num_attention_heads > 1:
             # Here we concatenate the weighted representation for each head.  We'll accomplish this
-            # just with a resize.
+            # by permuting the heads next to the projection and resizing.
             # Shape: (batch_size, sequence_length, projection_dim)
-            attended_sentence = attended_sentence.view(batch_size, sequence_length, -1)
+            attended_sentence = attended_sentence.permute(0, 2, 1, 3).contiguous().view(batch_size,
+                                                                                        sequence_length, -1)
 
         # Shape: (batch_size, sequence_length, combination_dim)
         combined_tensors = util.combine_tensors(self._combination, [tokens, attended_sentence])
@@ -5,6 +5,7 @@ from torch.nn import Dropout, Linear
 from torch.nn import Parameter
 from torch.nn import init
 
+from allennlp.common.checks import ConfigurationError
 from allennlp.nn.util import last_dim_softmax
 from allennlp.modules.seq2seq_encoders.seq2seq_encoder import Seq2SeqEncoder
 
@@ -39,6 +40,16 @@ class MultiHeadSelfAttention(Seq2SeqEncoder):
     attention_dropout_prob : ``float``, optional (default = 0.1).
         The dropout probability applied to the normalised attention
         distributions.
+    attention_window : ``int``, optional (default = None)
+        If given, each position only attends to the positions at most this far away from it (and
+        to the global positions), and we compute the attention for a chunk of ``attention_window``
+        positions at a time, against the keys of that chunk and of its neighbours.  The memory and
+        time this takes are linear in the length of the sequence, rather than quadratic, which
+        makes long sequences affordable.  By default, every position attends to every position.
+    num_global_tokens : ``int``, optional (default = 0)
+        With an ``attention_window``, the number of positions at the start of the sequence (such
+        as a sentence start token) which attend to every position, and which every position
+        attends to.
     """
     def __init__(self,
                  num_heads: int,
@@ -46,8 +57,12 @@ class MultiHeadSelfAttention(Seq2SeqEncoder):
                  attention_dim: int,
                  values_dim: int,
                  output_projection_dim: int = None,
-                 attention_dropout_prob: float = 0.1) -> None:
+                 attention_dropout_prob: float = 0.1,
+                 attention_window: int = None,
+                 num_global_tokens: int = 0) -> None:
         super(MultiHeadSelfAttention, self).__init__()
+        if attention_window is not None and attention_window < 1:
+            raise ConfigurationError("attention_window must be positive, but was {}".format(attention_window))
 
         self._num_heads = num_heads
         self._input_dim = input_dim
@@ -63,6 +78,8 @@ class MultiHeadSelfAttention(Seq2SeqEncoder):
         self._output_projection = Linear(num_heads * values_dim,
                                          self._output_dim)
         self._attention_dropout = Dropout(attention_dropout_prob)
+        self._attention_window = attention_window
+        self._num_global_tokens = num_global_tokens
 
         self.reset_parameters()
 
@@ -128,21 +145,17 @@ class MultiHeadSelfAttention(Seq2SeqEncoder):
         # shape (num_heads * batch_size, timesteps, attention_dim)
         values_per_head = values_per_head.view(num_heads * batch_size, timesteps, self._values_dim)
 
-        # shape (num_heads * batch_size, timesteps, timesteps)
-        scaled_similarities = torch.bmm(queries_per_head, keys_per_head.transpose(1, 2)) / self._scale
+        # The same mask is used for all heads.
+        # shape (num_heads * batch_size, timesteps)
+        mask_per_head = mask.repeat(num_heads, 1)
 
-        # shape (num_heads * batch_size, timesteps, timesteps)
-        # Normalise the distributions, using the same mask for all heads.
-        attention = last_dim_softmax(scaled_similarities, mask.repeat(num_heads, 1))
-        attention = self._attention_dropout(attention)
-        # This is doing the following batch-wise matrix multiplication:
-        # (num_heads * batch_size, timesteps, timesteps) *
-        # (num_heads * batch_size, timesteps, values_dim)
-        # which is equivalent to a weighted sum of the values with respect to
-        # the attention distributions for each element in the num_heads * batch_size
-        # dimension.
-        # shape (num_heads * batch_size, timesteps, values_dim)
-        outputs = torch.bmm(attention, values_per_head)
+        if self._attention_window is None:
+            # shape (num_heads * batch_size, timesteps, values_dim)
+            outputs = self._attend(queries_per_head, keys_per_head, values_per_head, mask_per_head)
+        else:
+            # shape (num_heads * batch_size, timesteps, values_dim)
+            outputs = self._attend_within_window(queries_per_head, keys_per_head,
+                                                 values_per_head, mask_per_head)
 
         # Reshape back to original shape (batch_size, timesteps, num_heads * values_dim)
         # Note that we _cannot_ use a reshape here, because this tensor was created
@@ -154,3 +167,115 @@ class MultiHeadSelfAttention(Seq2SeqEncoder):
         # shape (batch_size, timesteps, input_size)
         outputs = self._output_projection(outputs)
         return outputs
+
+    def _attend(self,
+                queries: torch.autograd.Variable,
+                keys: torch.autograd.Variable,
+                values: torch.autograd.Variable,
+                mask: torch.autograd.Variable) -> torch.autograd.Variable:
+        """
+        Attends from each of the ``queries``, of shape ``(batch_size, num_queries, attention_dim)``,
+        to all of the ``keys``, of shape ``(batch_size, timesteps, attention_dim)``, masked with
+        ``mask``, of shape ``(batch_size, timesteps)``, and returns the weighted sums of the
+        ``values``, of shape ``(batch_size, num_queries, values_dim)``.  Here, the batch is the
+        ``num_heads * batch_size`` one.
+        """
+        # shape (batch_size, num_queries, timesteps)
+        scaled_similarities = torch.bmm(queries, keys.transpose(1, 2)) / self._scale
+
+        # shape (batch_size, num_queries, timesteps)
+        # Normalise the distributions.
+        attention = last_dim_softmax(scaled_similarities, mask)
+        attention = self._attention_dropout(attention)
+        # This is doing the following batch-wise matrix multiplication:
+        # (batch_size, num_queries, timesteps) *
+        # (batch_size, timesteps, values_dim)
+        # which is equivalent to a weighted sum of the values with respect to
+        # the attention distributions for each element in the batch.
+        # shape (batch_size, num_queries, values_dim)
+        return torch.bmm(attention, values)
+
+    def _attend_within_window(self,
+                              queries: torch.autograd.Variable,
+                              keys: torch.autograd.Variable,
+                              values: torch.autograd.Variable,
+                              mask: torch.autograd.Variable) -> torch.autograd.Variable:
+        """
+        Like ``_attend``, for the queries of every position, but each position only attends to the
+        positions at most ``attention_window`` away from it, and to the global positions.  We split
+        the queries into chunks of ``attention_window`` positions, which can only attend to the
+        positions in their own chunk and in the chunks either side of it, so we compute their
+        attention against the keys of those three chunks, plus the global ones.  The global
+        positions attend to everything, which we compute separately.
+        """
+        batch_size, timesteps, _ = queries.size()
+        mask = mask.float()
+        window = self._attention_window
+        num_global = min(self._num_global_tokens, timesteps)
+        num_chunks = (timesteps + window - 1) // window
+
+        def pad(tensor: torch.autograd.Variable, left: int, right: int) -> torch.autograd.Variable:
+            # Pads the timestep dimension with zeros.
+            def zeros(length):
+                size = list(tensor.size())
+                size[1] = length
+                return [Variable(tensor.data.new(*size).zero_())] if length > 0 else []
+            return torch.cat(zeros(left) + [tensor] + zeros(right), 1)
+
+        # The global positions are attended to as global keys, so we remove them from the local ones.
+        if num_global > 0:
+            local_mask = torch.cat([Variable(mask.data.new(batch_size, num_global).zero_()),
+                                    mask[:, num_global:]], 1)
+        else:
+            local_mask = mask
+        # We pad a chunk on the left, and a chunk (plus whatever fills the last chunk) on the right,
+        # so that every chunk has neighbours, and unfold the keys, values and mask of each chunk
+        # and its neighbours.
+        padding = window * (num_chunks + 1) - timesteps
+        # shape (batch_size, num_chunks, attention_dim, 3 * window)
+        key_chunks = pad(keys, window, padding).unfold(1, 3 * window, window)
+        # shape (batch_size, num_chunks, 3 * window, values_dim)
+        value_chunks = pad(values, window, padding).unfold(1, 3 * window, window).transpose(2, 3)
+        # shape (batch_size, num_chunks, 1, 3 * window)
+        mask_chunks = pad(local_mask, window, padding).unfold(1, 3 * window, window).unsqueeze(2)
+
+        # The j-th key of a chunk is j - window positions after the chunk starts, so it is
+        # j - window - i positions away from the i-th query of the chunk.
+        # shape (window, 3 * window)
+        distances = torch.arange(0, 3 * window).unsqueeze(0) - torch.arange(0, window).unsqueeze(1) - window
+        in_window = Variable((distances.abs() <= window).float())
+        if queries.is_cuda:
+            in_window = in_window.cuda(queries.get_device())
+        # shape (batch_size, num_chunks, window, 3 * window)
+        chunk_mask = mask_chunks * in_window.view(1, 1, window, 3 * window)
+
+        if num_global > 0:
+            # Every chunk also attends to the global keys.
+            global_size = (batch_size, num_chunks, num_global)
+            global_keys = keys[:, :num_global].transpose(1, 2).unsqueeze(1)
+            key_chunks = torch.cat([global_keys.expand(*global_size[:2], keys.size(2), num_global),
+                                    key_chunks], 3)
+            global_values = values[:, :num_global].unsqueeze(1)
+            value_chunks = torch.cat([global_values.expand(*global_size, values.size(2)), value_chunks], 2)
+            global_mask = mask[:, :num_global].contiguous().view(batch_size, 1, 1, num_global)
+            chunk_mask = torch.cat([global_mask.expand(*global_size[:2], window, num_global), chunk_mask], 3)
+        num_keys = key_chunks.size(3)
+
+        # shape (batch_size * num_chunks, window, attention_dim)
+        query_chunks = pad(queries, 0, padding - window).view(batch_size * num_chunks, window, -1)
+        # shape (batch_size * num_chunks, window, num_keys)
+        scaled_similarities = torch.bmm(query_chunks,
+                                        key_chunks.contiguous().view(batch_size * num_chunks, -1, num_keys))
+        scaled_similarities = scaled_similarities / self._scale
+        attention = last_dim_softmax(scaled_similarities,
+                                     chunk_mask.contiguous().view(batch_size * num_chunks, window, num_keys))
+        attention = self._attention_dropout(attention)
+        # shape (batch_size * num_chunks, window, values_dim)
+        outputs = torch.bmm(attention, value_chunks.contiguous().view(batch_size * num_chunks, num_keys, -1))
+        # shape (batch_size, timesteps, values_dim)
+        outputs = outputs.view(batch_size, num_chunks * window, -1)[:, :timesteps]
+
+        if num_global > 0:
+            global_outputs = self._attend(queries[:, :num_global], keys, values, mask)
+            outputs = torch.cat([global_outputs, outputs[:, num_global:]], 1)
+        return outputs
@@ -1,9 +1,12 @@
 
+from typing import Union
+
 import torch
 from torch.autograd import Variable
-from torch.nn.utils.rnn import pad_packed_sequence
+from torch.nn.utils.rnn import PackedSequence
 
 from allennlp.common.checks import ConfigurationError
+from allennlp.modules.encoder_base import SortedBatch
 from allennlp.modules.seq2seq_encoders.seq2seq_encoder import Seq2SeqEncoder
 
 
@@ -31,6 +34,11 @@ class PytorchSeq2SeqWrapper(Seq2SeqEncoder):
     when you call this module, to avoid subtle bugs around masking.  If you already have a
     ``PackedSequence`` you can pass ``None`` as the second parameter.
 
+    You can also pass a :class:`~allennlp.modules.encoder_base.SortedBatch` in place of the mask,
+    so that several encoders over the same sequences only sort them once.  If you pass it with a
+    ``PackedSequence`` from its ``pack`` method, the output is a ``PackedSequence`` in the same
+    sorted order, which you can pass to the next encoder in the same way, and ``unpack`` at the end.
+
     We support stateful RNNs where the final state from each batch is used as the initial
     state for the subsequent batch by passing ``stateful=True`` to the constructor.
     """
@@ -59,9 +67,9 @@ class PytorchSeq2SeqWrapper(Seq2SeqEncoder):
         return self._module.hidden_size * self._num_directions
 
     def forward(self,  # pylint: disable=arguments-differ
-                inputs: torch.Tensor,
-                mask: torch.Tensor,
-                hidden_state: torch.Tensor = None) -> torch.Tensor:
+                inputs: Union[torch.Tensor, PackedSequence],
+                mask: Union[torch.Tensor, SortedBatch],
+                hidden_state: torch.Tensor = None) -> Union[torch.Tensor, PackedSequence]:
 
         if self.stateful and mask is None:
             raise ValueError("Always pass a mask with stateful RNNs.")
@@ -71,50 +79,30 @@ class PytorchSeq2SeqWrapper(Seq2SeqEncoder):
         if mask is None:
             return self._module(inputs, hidden_state)[0]
 
-        batch_size, total_sequence_length = mask.size()
-
+        sorted_batch = mask if isinstance(mask, SortedBatch) else SortedBatch(mask)
         packed_sequence_output, final_states, restoration_indices = \
-            self.sort_and_run_forward(self._module, inputs, mask, hidden_state)
-
-        unpacked_sequence_tensor, _ = pad_packed_sequence(packed_sequence_output, batch_first=True)
-
-        num_valid = unpacked_sequence_tensor.size(0)
-        # Some RNNs (GRUs) only return one state as a Tensor.  Others (LSTMs) return two.
-        # If one state, use a single element list to handle in a consistent manner below.
-        if not isinstance(final_states, (list, tuple)) and self.stateful:
-            final_states = [final_states]
+            self.sort_and_run_forward(self._module, inputs, sorted_batch, hidden_state)
 
-        # Add back invalid rows.
-        if num_valid < batch_size:
-            _, length, output_dim = unpacked_sequence_tensor.size()
-            zeros = unpacked_sequence_tensor.data.new(batch_size - num_valid, length, output_dim).fill_(0)
-            zeros = Variable(zeros)
-            unpacked_sequence_tensor = torch.cat([unpacked_sequence_tensor, zeros], 0)
-
-            # The states also need to have invalid rows added back.
-            if self.stateful:
+        if self.stateful:
+            # Some RNNs (GRUs) only return one state as a Tensor.  Others (LSTMs) return two.
+            # If one state, use a single element list to handle in a consistent manner below.
+            if not isinstance(final_states, (list, tuple)):
+                final_states = [final_states]
+
+            # The states need to have invalid rows added back.
+            num_valid = sorted_batch.num_valid
+            if num_valid < sorted_batch.batch_size:
                 new_states = []
                 for state in final_states:
                     num_layers, _, state_dim = state.size()
-                    zeros = state.data.new(num_layers, batch_size - num_valid, state_dim).fill_(0)
+                    zeros = state.data.new(num_layers, sorted_batch.batch_size - num_valid, state_dim).fill_(0)
                     zeros = Variable(zeros)
                     new_states.append(torch.cat([state, zeros], 1))
                 final_states = new_states
-
-        # It's possible to need to pass sequences which are padded to longer than the
-        # max length of the sequence to a Seq2SeqEncoder. However, packing and unpacking
-        # the sequences mean that the returned tensor won't include these dimensions, because
-        # the RNN did not need to process them. We add them back on in the form of zeros here.
-        sequence_length_difference = total_sequence_length - unpacked_sequence_tensor.size(1)
-        if sequence_length_difference > 0:
-            zeros = unpacked_sequence_tensor.data.new(batch_size,
-                                                      sequence_length_difference,
-                                                      unpacked_sequence_tensor.size(-1)).fill_(0)
-            zeros = Variable(zeros)
-            unpacked_sequence_tensor = torch.cat([unpacked_sequence_tensor, zeros], 1)
-
-        if self.stateful:
             self._update_states(final_states, restoration_indices)
 
-        # Restore the original indices and return the sequence.
-        return unpacked_sequence_tensor.index_select(0, restoration_indices)
+        if isinstance(inputs, PackedSequence):
+            # The output stays sorted and packed, for the next encoder.
+            return packed_sequence_output
+        # Add back invalid rows and padding, and restore the original indices.
+        return sorted_batch.unpack(packed_sequence_output)
@@ -54,6 +54,13 @@ class StackedSelfAttentionEncoder(Seq2SeqEncoder):
         which can be important features for many tasks.
     dropout_prob : ``float``, optional, (default = 0.2)
         The dropout probability for the feedforward network.
+    attention_window : ``int``, optional, (default = None)
+        If given, each position of the self attention layers only attends to the positions at most
+        this far away from it, and to the global positions, which takes memory and time linear in
+        the length of the sequence, rather than quadratic.  See :class:`MultiHeadSelfAttention`.
+    num_global_tokens : ``int``, optional, (default = 0)
+        With an ``attention_window``, the number of positions at the start of the sequence which
+        attend to, and are attended to by, every position.
     """
     def __init__(self,
                  input_dim: int,
@@ -63,7 +70,9 @@ class StackedSelfAttentionEncoder(Seq2SeqEncoder):
                  num_layers: int,
                  num_attention_heads: int,
                  use_positional_encoding: bool = True,
-                 dropout_prob: float = 0.2) -> None:
+                 dropout_prob: float = 0.2,
+                 attention_window: int = None,
+                 num_global_tokens: int = 0) -> None:
         super(StackedSelfAttentionEncoder, self).__init__()
 
         self._use_positional_encoding = use_positional_encoding
@@ -91,7 +100,9 @@ class StackedSelfAttentionEncoder(Seq2SeqEncoder):
             self_attention = MultiHeadSelfAttention(num_heads=num_attention_heads,
                                                     input_dim=hidden_dim,
                                                     attention_dim=projection_dim,
-                                                    values_dim=projection_dim)
+                                                    values_dim=projection_dim,
+                                                    attention_window=attention_window,
+                                                    num_global_tokens=num_global_tokens)
             self.add_module(f"self_attention_{i}", self_attention)
             self._attention_layers.append(self_attention)
 
@@ -151,6 +162,8 @@ class StackedSelfAttentionEncoder(Seq2SeqEncoder):
         num_attention_heads = params.pop_int('num_attention_heads', 3)
         use_positional_encoding = params.pop_bool('use_positional_encoding', True)
         dropout_prob = params.pop_float("dropout_prob", 0.2)
+        attention_window = params.pop_int("attention_window", None)
+        num_global_tokens = params.pop_int("num_global_tokens", 0)
 
         return cls(input_dim=input_dim,
                    hidden_dim=hidden_dim,
@@ -159,4 +172,6 @@ class StackedSelfAttentionEncoder(Seq2SeqEncoder):
                    num_layers=num_layers,
                    num_attention_heads=num_attention_heads,
                    use_positional_encoding=use_positional_encoding,
-                   dropout_prob=dropout_prob)
+                   dropout_prob=dropout_prob,
+                   attention_window=attention_window,
+                   num_global_tokens=num_global_tokens)
@@ -1,7 +1,11 @@
+from typing import Union
+
 import torch
 from torch.autograd import Variable
+from torch.nn.utils.rnn import PackedSequence
 
 from allennlp.common.checks import ConfigurationError
+from allennlp.modules.encoder_base import SortedBatch
 from allennlp.modules.seq2vec_encoders.seq2vec_encoder import Seq2VecEncoder
 
 
@@ -35,6 +39,11 @@ class PytorchSeq2VecWrapper(Seq2VecEncoder):
     Note that we *require* you to pass sequence lengths when you call this module, to avoid subtle
     bugs around masking.  If you already have a ``PackedSequence`` you can pass ``None`` as the
     second parameter.
+
+    As with :class:`~allennlp.modules.seq2seq_encoders.PytorchSeq2SeqWrapper`, you can pass a
+    :class:`~allennlp.modules.encoder_base.SortedBatch` in place of the mask, with either the
+    inputs or a ``PackedSequence`` of them from its ``pack`` method.  The output is always in the
+    original order.
     """
     def __init__(self, module: torch.nn.modules.RNNBase) -> None:
         # Seq2VecEncoders cannot be stateful.
@@ -57,8 +66,8 @@ class PytorchSeq2VecWrapper(Seq2VecEncoder):
         return self._module.hidden_size * (2 if is_bidirectional else 1)
 
     def forward(self,  # pylint: disable=arguments-differ
-                inputs: torch.Tensor,
-                mask: torch.Tensor,
+                inputs: Union[torch.Tensor, PackedSequence],
+                mask: Union[torch.Tensor, SortedBatch],
                 hidden_state: torch.Tensor = None) -> torch.Tensor:
 
         if mask is None:
@@ -68,10 +77,11 @@ class PytorchSeq2VecWrapper(Seq2VecEncoder):
             # at the end of the max sequence length, so we have to use the state of the RNN below.
             return self._module(inputs, hidden_state)[0][:, -1, :]
 
-        batch_size = mask.size(0)
+        sorted_batch = mask if isinstance(mask, SortedBatch) else SortedBatch(mask)
+        batch_size = sorted_batch.batch_size
 
         _, state, restoration_indices, = \
-            self.sort_and_run_forward(self._module, inputs, mask, hidden_state)
+            self.sort_and_run_forward(self._module, inputs, sorted_batch, hidden_state)
 
         # Deal with the fact the LSTM state is a tuple of (state, memory).
         if isinstance(state, tuple):
@@ -48,6 +48,24 @@ class BilinearSimilarity(SimilarityFunction):
         result = (intermediate * tensor_2).sum(dim=-1)
         return self._activation(result + self._bias)
 
+    @overrides
+    def precompute_tensor_2(self, tensor_2: torch.Tensor) -> torch.Tensor:
+        # x^T W y is x^T (W y), so we can do the projection with the weight matrix on this side.
+        return torch.matmul(tensor_2, self._weight_matrix.t())
+
+    @overrides
+    def forward_with_precomputed_tensor_2(self,
+                                          tensor_1: torch.Tensor,
+                                          precomputed_tensor_2: torch.Tensor) -> torch.Tensor:
+        result = (tensor_1 * precomputed_tensor_2).sum(dim=-1)
+        return self._activation(result + self._bias)
+
+    @overrides
+    def matrix_similarity(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
+        intermediate = torch.matmul(matrix_1, self._weight_matrix)
+        result = torch.matmul(intermediate, matrix_2.transpose(-1, -2))
+        return self._activation(result + self._bias)
+
     @classmethod
     def from_params(cls, params: Params) -> 'BilinearSimilarity':
         tensor_1_dim = params.pop_int("tensor_1_dim")
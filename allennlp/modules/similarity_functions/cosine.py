@@ -17,6 +17,23 @@ class CosineSimilarity(SimilarityFunction):
         normalized_tensor_2 = tensor_2 / tensor_2.norm(dim=-1, keepdim=True)
         return (normalized_tensor_1 * normalized_tensor_2).sum(dim=-1)
 
+    @overrides
+    def precompute_tensor_2(self, tensor_2: torch.Tensor) -> torch.Tensor:
+        return tensor_2 / tensor_2.norm(dim=-1, keepdim=True)
+
+    @overrides
+    def forward_with_precomputed_tensor_2(self,
+                                          tensor_1: torch.Tensor,
+                                          precomputed_tensor_2: torch.Tensor) -> torch.Tensor:
+        normalized_tensor_1 = tensor_1 / tensor_1.norm(dim=-1, keepdim=True)
+        return (normalized_tensor_1 * precomputed_tensor_2).sum(dim=-1)
+
+    @overrides
+    def matrix_similarity(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
+        normalized_matrix_1 = matrix_1 / matrix_1.norm(dim=-1, keepdim=True)
+        normalized_matrix_2 = matrix_2 / matrix_2.norm(dim=-1, keepdim=True)
+        return torch.matmul(normalized_matrix_1, normalized_matrix_2.transpose(-1, -2))
+
     @classmethod
     def from_params(cls, params: Params) -> 'CosineSimilarity':
         params.assert_empty(cls.__name__)
@@ -30,6 +30,13 @@ class DotProductSimilarity(SimilarityFunction):
             result *= math.sqrt(tensor_1.size(-1))
         return result
 
+    @overrides
+    def matrix_similarity(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
+        result = torch.matmul(matrix_1, matrix_2.transpose(-1, -2))
+        if self._scale_output:
+            result *= math.sqrt(matrix_1.size(-1))
+        return result
+
     @classmethod
     def from_params(cls, params: Params) -> 'DotProductSimilarity':
         scale_output = params.pop_bool('scale_output', False)
@@ -1,3 +1,4 @@
+from typing import List, Tuple
 import math
 
 from overrides import overrides
@@ -52,6 +53,14 @@ class LinearSimilarity(SimilarityFunction):
         self._combination = combination
         combined_dim = util.get_combined_dim(combination, [tensor_1_dim, tensor_2_dim])
         self._weight_vector = Parameter(torch.Tensor(combined_dim))
+        # To precompute the part of the similarity that only depends on ``y``, we need to know which
+        # slice of the weight vector goes with each piece of the combination.
+        self._combination_pieces: List[Tuple[str, int, int]] = []
+        piece_start = 0
+        for piece in combination.split(','):
+            piece_dim = util.get_combined_dim(piece, [tensor_1_dim, tensor_2_dim])
+            self._combination_pieces.append((piece, piece_start, piece_start + piece_dim))
+            piece_start += piece_dim
         self._bias = Parameter(torch.Tensor(1))
         self._activation = activation
         self.reset_parameters()
@@ -67,6 +76,43 @@ class LinearSimilarity(SimilarityFunction):
         dot_product = torch.matmul(combined_tensors, self._weight_vector)
         return self._activation(dot_product + self._bias)
 
+    @overrides
+    def precompute_tensor_2(self, tensor_2: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        # The weights for combination pieces that only use ``y`` can be applied once, here.  We
+        # still need ``tensor_2`` itself for the pieces that combine it with ``x``.
+        tensor_2_score = None
+        for piece, start, end in self._combination_pieces:
+            if _only_uses_tensor_2(piece):
+                piece_score = torch.matmul(util.combine_tensors(piece, [tensor_2, tensor_2]),
+                                           self._weight_vector[start:end])
+                tensor_2_score = piece_score if tensor_2_score is None else tensor_2_score + piece_score
+        return tensor_2, tensor_2_score
+
+    @overrides
+    def forward_with_precomputed_tensor_2(self,
+                                          tensor_1: torch.Tensor,
+                                          precomputed_tensor_2: Tuple[torch.Tensor, torch.Tensor]) -> torch.Tensor:
+        tensor_2, dot_product = precomputed_tensor_2
+        for piece, start, end in self._combination_pieces:
+            if not _only_uses_tensor_2(piece):
+                piece_score = torch.matmul(util.combine_tensors(piece, [tensor_1, tensor_2]),
+                                           self._weight_vector[start:end])
+                dot_product = piece_score if dot_product is None else dot_product + piece_score
+        return self._activation(dot_product + self._bias)
+
+    @overrides
+    def matrix_similarity(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
+        # Each piece of the combination is either a function of one row, giving a score that we
+        # broadcast across the other matrix, or a product or quotient of the two rows, whose
+        # weighted sum is a matrix multiplication.  So we never build the combined tensor.
+        dot_product = None
+        for piece, start, end in self._combination_pieces:
+            piece_score = _matrix_piece_score(piece, self._weight_vector[start:end], matrix_1, matrix_2)
+            dot_product = piece_score if dot_product is None else dot_product + piece_score
+        # If no piece uses both matrices, we haven't broadcast to the full size yet.
+        dot_product = dot_product.expand(*matrix_1.size()[:-1], matrix_2.size(-2))
+        return self._activation(dot_product + self._bias)
+
     @classmethod
     def from_params(cls, params: Params) -> 'LinearSimilarity':
         tensor_1_dim = params.pop_int("tensor_1_dim")
@@ -78,3 +124,34 @@ class LinearSimilarity(SimilarityFunction):
                    tensor_2_dim=tensor_2_dim,
                    combination=combination,
                    activation=activation)
+
+
+def _only_uses_tensor_2(combination_piece: str) -> bool:
+    return all(character in '2y*/+-' for character in combination_piece)
+
+
+def _matrix_piece_score(combination_piece: str,
+                        weight: torch.Tensor,
+                        matrix_1: torch.Tensor,
+                        matrix_2: torch.Tensor) -> torch.Tensor:
+    """
+    Computes ``w^T piece(x, y)`` for every row ``x`` of ``matrix_1`` and every row ``y`` of
+    ``matrix_2``, as a tensor that broadcasts to ``(..., num_rows_1, num_rows_2)``.
+    """
+    combination_piece = combination_piece.replace('x', '1').replace('y', '2')
+    if '2' not in combination_piece:
+        return torch.matmul(util.combine_tensors(combination_piece, [matrix_1]), weight).unsqueeze(-1)
+    if '1' not in combination_piece:
+        return torch.matmul(util.combine_tensors(combination_piece, [matrix_2, matrix_2]),
+                            weight).unsqueeze(-2)
+    first, operation, second = combination_piece
+    if operation in '+-':
+        first_score = _matrix_piece_score(first, weight, matrix_1, matrix_2)
+        second_score = _matrix_piece_score(second, weight, matrix_1, matrix_2)
+        return first_score + second_score if operation == '+' else first_score - second_score
+    if operation == '*':
+        return torch.matmul(matrix_1 * weight, matrix_2.transpose(-1, -2))
+    # The only operation left is division, where the order matters.
+    if first == '1':
+        return torch.matmul(matrix_1 * weight, matrix_2.reciprocal().transpose(-1, -2))
+    return torch.matmul(matrix_1.reciprocal(), (matrix_2 * weight).transpose(-1, -2))
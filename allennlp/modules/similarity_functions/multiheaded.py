@@ -1,3 +1,5 @@
+from typing import Any
+
 from overrides import overrides
 import torch
 from torch.nn.parameter import Parameter
@@ -75,17 +77,8 @@ class MultiHeadedSimilarity(SimilarityFunction):
 
     @overrides
     def forward(self, tensor_1: torch.Tensor, tensor_2: torch.Tensor) -> torch.Tensor:
-        projected_tensor_1 = torch.matmul(tensor_1, self._tensor_1_projection)
-        projected_tensor_2 = torch.matmul(tensor_2, self._tensor_2_projection)
-
-        # Here we split the last dimension of the tensors from (..., projected_dim) to
-        # (..., num_heads, projected_dim / num_heads), using tensor.view().
-        last_dim_size = projected_tensor_1.size(-1) // self.num_heads
-        new_shape = list(projected_tensor_1.size())[:-1] + [self.num_heads, last_dim_size]
-        split_tensor_1 = projected_tensor_1.view(*new_shape)
-        last_dim_size = projected_tensor_2.size(-1) // self.num_heads
-        new_shape = list(projected_tensor_2.size())[:-1] + [self.num_heads, last_dim_size]
-        split_tensor_2 = projected_tensor_2.view(*new_shape)
+        split_tensor_1 = self._split_heads(torch.matmul(tensor_1, self._tensor_1_projection))
+        split_tensor_2 = self._split_heads(torch.matmul(tensor_2, self._tensor_2_projection))
 
         # And then we pass this off to our internal similarity function.  Because the similarity
         # functions don't care what dimension their input has, and only look at the last dimension,
@@ -93,6 +86,39 @@ class MultiHeadedSimilarity(SimilarityFunction):
         # projection dimension for each head, returning a tensor of shape (..., num_heads).
         return self._internal_similarity(split_tensor_1, split_tensor_2)
 
+    @overrides
+    def precompute_tensor_2(self, tensor_2: torch.Tensor) -> Any:
+        split_tensor_2 = self._split_heads(torch.matmul(tensor_2, self._tensor_2_projection))
+        return self._internal_similarity.precompute_tensor_2(split_tensor_2)
+
+    @overrides
+    def forward_with_precomputed_tensor_2(self,
+                                          tensor_1: torch.Tensor,
+                                          precomputed_tensor_2: Any) -> torch.Tensor:
+        split_tensor_1 = self._split_heads(torch.matmul(tensor_1, self._tensor_1_projection))
+        return self._internal_similarity.forward_with_precomputed_tensor_2(split_tensor_1,
+                                                                           precomputed_tensor_2)
+
+    @overrides
+    def matrix_similarity(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
+        # We move the heads in front of the rows, so the internal similarity compares the rows of
+        # each head as a separate pair of matrices.
+        # Shape: (..., num_heads, num_rows, projected_dim / num_heads)
+        split_matrix_1 = self._split_heads(torch.matmul(matrix_1, self._tensor_1_projection)).transpose(-2, -3)
+        split_matrix_2 = self._split_heads(torch.matmul(matrix_2, self._tensor_2_projection)).transpose(-2, -3)
+        # Shape: (..., num_heads, num_rows_1, num_rows_2)
+        similarities = self._internal_similarity.matrix_similarity(split_matrix_1, split_matrix_2)
+        # And then the heads go back to the end, as in ``forward``: (..., num_rows_1, num_rows_2,
+        # num_heads).
+        return similarities.transpose(-3, -2).transpose(-2, -1).contiguous()
+
+    def _split_heads(self, projected_tensor: torch.Tensor) -> torch.Tensor:
+        # Here we split the last dimension of the tensor from (..., projected_dim) to
+        # (..., num_heads, projected_dim / num_heads), using tensor.view().
+        last_dim_size = projected_tensor.size(-1) // self.num_heads
+        new_shape = list(projected_tensor.size())[:-1] + [self.num_heads, last_dim_size]
+        return projected_tensor.view(*new_shape)
+
     @classmethod
     def from_params(cls, params: Params) -> 'MultiHeadedSimilarity':
         num_heads = params.pop_int("num_heads")
@@ -1,3 +1,5 @@
+from typing import Any
+
 import torch
 
 from allennlp.common import Params, Registrable
@@ -17,6 +19,18 @@ class SimilarityFunction(torch.nn.Module, Registrable):
     them in the appropriate dimensions to make them the same before you can use these functions.
     The :class:`~allennlp.modules.Attention` and :class:`~allennlp.modules.MatrixAttention` modules
     do this.
+
+    When the same ``tensor_2`` is compared against many different ``tensor_1`` inputs (like the
+    encoder outputs in an attention-based decoder, which we attend over once per decoding step),
+    the work that only depends on ``tensor_2`` can be done once, with
+    :func:`precompute_tensor_2`, and reused by passing the result to
+    :func:`forward_with_precomputed_tensor_2`.
+
+    To compare every row of one matrix with every row of another, as
+    :class:`~allennlp.modules.MatrixAttention` does, use :func:`matrix_similarity`.  Subclasses
+    implement it without tiling the matrices against each other, which for the parameterized
+    similarity functions would mean concatenating tensors of shape ``(batch_size, num_rows_1,
+    num_rows_2, embedding_dim)``.
     """
     default_implementation = 'dot_product'
 
@@ -29,6 +43,44 @@ class SimilarityFunction(torch.nn.Module, Registrable):
         """
         raise NotImplementedError
 
+    def precompute_tensor_2(self, tensor_2: torch.Tensor) -> Any:
+        """
+        Does whatever computation on ``tensor_2`` doesn't depend on ``tensor_1`` (such as
+        projecting it with a weight matrix), returning something that can be passed to
+        :func:`forward_with_precomputed_tensor_2` along with any ``tensor_1`` that has the same
+        shape as ``tensor_2``, or that broadcasts to it.  By default there's nothing to precompute,
+        and we just return ``tensor_2``.
+        """
+        # pylint: disable=no-self-use
+        return tensor_2
+
+    def forward_with_precomputed_tensor_2(self,
+                                          tensor_1: torch.Tensor,
+                                          precomputed_tensor_2: Any) -> torch.Tensor:
+        """
+        Computes the same thing as ``forward(tensor_1, tensor_2)``, given the output of
+        ``precompute_tensor_2(tensor_2)`` instead of ``tensor_2`` itself.
+        """
+        return self.forward(tensor_1, precomputed_tensor_2)
+
+    def matrix_similarity(self, matrix_1: torch.Tensor, matrix_2: torch.Tensor) -> torch.Tensor:
+        """
+        Computes the similarity between each row of ``matrix_1``, with shape ``(..., num_rows_1,
+        embedding_dim_1)``, and each row of ``matrix_2``, with shape ``(..., num_rows_2,
+        embedding_dim_2)``, returning a tensor of shape ``(..., num_rows_1, num_rows_2)``.  This is
+        the same as calling ``forward`` on the two matrices tiled to ``(..., num_rows_1,
+        num_rows_2, embedding_dim)``, which is what we do by default, but subclasses can almost
+        always do it without building the tiled tensors.
+        """
+        tiled_matrix_1 = matrix_1.unsqueeze(-2).expand(*matrix_1.size()[:-1],
+                                                       matrix_2.size(-2),
+                                                       matrix_1.size(-1))
+        tiled_matrix_2 = matrix_2.unsqueeze(-3).expand(*matrix_2.size()[:-2],
+                                                       matrix_1.size(-2),
+                                                       matrix_2.size(-2),
+                                                       matrix_2.size(-1))
+        return self.forward(tiled_matrix_1, tiled_matrix_2)
+
     @classmethod
     def from_params(cls, params: Params) -> 'SimilarityFunction':
         choice = params.pop_choice('type', cls.list_available(), default_to_first_choice=True)
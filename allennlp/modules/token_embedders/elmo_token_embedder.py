@@ -25,19 +25,34 @@ class ElmoTokenEmbedder(TokenEmbedder):
         Should we apply layer normalization (passed to ``ScalarMix``)?
     dropout : ``float``, optional.
         The dropout value to be applied to the ELMo representations.
+    activation_cache_size : ``int``, optional (default=0).
+        How many sentences to cache the biLM activations of in memory.  The biLM is frozen, and
+        the dropout is applied after the cached activations are mixed together, so when training
+        for many epochs, every epoch after the first just looks the biLM activations up.
+    activation_cache_file : ``str``, optional.
+        An HDF5 file to cache biLM activations in, in addition to (or instead of) memory.
+    token_embedding_file : ``str``, optional.
+        An HDF5 file of precomputed token embeddings for a vocabulary, written by the
+        ``elmo-vocab`` command.  The character CNN is only run for tokens that aren't in it.
     """
     def __init__(self,
                  options_file: str,
                  weight_file: str,
                  do_layer_norm: bool = False,
-                 dropout: float = 0.5) -> None:
+                 dropout: float = 0.5,
+                 activation_cache_size: int = 0,
+                 activation_cache_file: str = None,
+                 token_embedding_file: str = None) -> None:
         super(ElmoTokenEmbedder, self).__init__()
 
         self._elmo = Elmo(options_file,
                           weight_file,
                           1,
                           do_layer_norm=do_layer_norm,
-                          dropout=dropout)
+                          dropout=dropout,
+                          activation_cache_size=activation_cache_size,
+                          activation_cache_file=activation_cache_file,
+                          token_embedding_file=token_embedding_file)
 
     def get_output_dim(self):
         # pylint: disable=protected-access
@@ -66,5 +81,11 @@ class ElmoTokenEmbedder(TokenEmbedder):
         weight_file = params.pop('weight_file')
         do_layer_norm = params.pop_bool('do_layer_norm', False)
         dropout = params.pop_float("dropout", 0.5)
+        activation_cache_size = params.pop_int("activation_cache_size", 0)
+        activation_cache_file = params.pop("activation_cache_file", None)
+        token_embedding_file = params.pop("token_embedding_file", None)
         params.assert_empty(cls.__name__)
-        return cls(options_file, weight_file, do_layer_norm, dropout)
+        return cls(options_file, weight_file, do_layer_norm, dropout,
+                   activation_cache_size=activation_cache_size,
+                   activation_cache_file=activation_cache_file,
+                   token_embedding_file=token_embedding_file)
@@ -57,6 +57,15 @@ class Embedding(TokenEmbedder):
         If given, this will scale gradients by the frequency of the words in the mini-batch.
     sparse : bool, (optional, default=False):
         Whether or not the Pytorch backend should use a sparse representation of the embedding weight.
+    weight_file : str, (optional, default=None)
+        A ``.npy`` file, written by :func:`write_embedding_weight_file`, to read frozen weights from,
+        in place of ``weight``.  We memory map the file, read only, and look up the rows we need
+        with numpy, so the weights are never loaded into memory, and processes which use the same
+        file share the pages the operating system reads.  The weights in the file can be
+        quantized, which we undo for the rows we look up.  They aren't part of the module's
+        parameters, so they aren't saved with the model, and loading a saved model ignores any
+        weights saved for this embedding.  Only allowed with ``trainable=False``, and without
+        ``max_norm``.
 
     Returns
     -------
@@ -74,7 +83,8 @@ class Embedding(TokenEmbedder):
                  max_norm: float = None,
                  norm_type: float = 2.,
                  scale_grad_by_freq: bool = False,
-                 sparse: bool = False) -> None:
+                 sparse: bool = False,
+                 weight_file: str = None) -> None:
         super(Embedding, self).__init__()
         self.num_embeddings = num_embeddings
         self.padding_index = padding_index
@@ -82,10 +92,23 @@ class Embedding(TokenEmbedder):
         self.norm_type = norm_type
         self.scale_grad_by_freq = scale_grad_by_freq
         self.sparse = sparse
+        self.weight_file = weight_file
+        self._memory_mapped_weight: numpy.ndarray = None
 
         self.output_dim = projection_dim or embedding_dim
 
-        if weight is None:
+        if weight_file is not None:
+            if trainable or max_norm is not None:
+                raise ConfigurationError("Weights read from a weight_file can't be trained or renormalized; "
+                                         "use trainable=False and no max_norm.")
+            if weight is not None:
+                raise ConfigurationError("Pass either a weight matrix or a weight_file, not both.")
+            memory_mapped_weight = self._get_memory_mapped_weight()
+            if (len(memory_mapped_weight), _embedding_dim_of_weight_file(memory_mapped_weight)) != \
+                    (num_embeddings, embedding_dim):
+                raise ConfigurationError("The weight_file has contradictory embedding shapes.")
+            self.register_parameter('weight', None)
+        elif weight is None:
             weight = torch.FloatTensor(num_embeddings, embedding_dim)
             self.weight = torch.nn.Parameter(weight, requires_grad=trainable)
             self.weight.data.normal_(0, 1)
@@ -94,7 +117,7 @@ class Embedding(TokenEmbedder):
                 raise ConfigurationError("A weight matrix was passed with contradictory embedding shapes.")
             self.weight = torch.nn.Parameter(weight, requires_grad=trainable)
 
-        if self.padding_index is not None:
+        if self.padding_index is not None and self.weight is not None:
             self.weight.data[self.padding_index].fill_(0)
 
         if projection_dim:
@@ -111,11 +134,14 @@ class Embedding(TokenEmbedder):
         original_inputs = inputs
         if original_inputs.dim() > 2:
             inputs = inputs.view(-1, inputs.size(-1))
-        embedded = embedding(inputs, self.weight,
-                             max_norm=self.max_norm,
-                             norm_type=self.norm_type,
-                             scale_grad_by_freq=self.scale_grad_by_freq,
-                             sparse=self.sparse)
+        if self.weight_file is not None:
+            embedded = self._embed_from_weight_file(inputs)
+        else:
+            embedded = embedding(inputs, self.weight,
+                                 max_norm=self.max_norm,
+                                 norm_type=self.norm_type,
+                                 scale_grad_by_freq=self.scale_grad_by_freq,
+                                 sparse=self.sparse)
         if original_inputs.dim() > 2:
             view_args = list(original_inputs.size()) + [embedded.size(-1)]
             embedded = embedded.view(*view_args)
@@ -126,6 +152,31 @@ class Embedding(TokenEmbedder):
             embedded = projection(embedded)
         return embedded
 
+    def _get_memory_mapped_weight(self) -> numpy.ndarray:
+        # We open the file lazily, because the memory map doesn't survive pickling.
+        if self._memory_mapped_weight is None:
+            self._memory_mapped_weight = numpy.load(cached_path(self.weight_file), mmap_mode='r')
+        return self._memory_mapped_weight
+
+    def _embed_from_weight_file(self, inputs: torch.autograd.Variable) -> torch.autograd.Variable:
+        indices = inputs.data.cpu().numpy()
+        # Indexing the memory map copies just the rows we need.
+        rows = self._get_memory_mapped_weight()[indices.reshape(-1)]
+        if rows.dtype.names:
+            # int8 values, with a scale for each row.
+            embedded = rows['values'].astype(numpy.float32) * rows['scale'][:, None]
+        else:
+            embedded = rows.astype(numpy.float32, copy=False)
+        embedded = torch.from_numpy(embedded).view(*(list(indices.shape) + [-1]))
+        if inputs.is_cuda:
+            embedded = embedded.cuda(inputs.get_device())
+        return torch.autograd.Variable(embedded, volatile=inputs.volatile)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_memory_mapped_weight'] = None
+        return state
+
     @classmethod
     def from_params(cls, vocab: Vocabulary, params: Params) -> 'Embedding':
         """
@@ -148,8 +199,11 @@ class Embedding(TokenEmbedder):
         norm_type = params.pop_float('norm_type', 2.)
         scale_grad_by_freq = params.pop_bool('scale_grad_by_freq', False)
         sparse = params.pop_bool('sparse', False)
+        weight_file = params.pop('weight_file', None)
         params.assert_empty(cls.__name__)
 
+        if pretrained_file and weight_file:
+            raise ConfigurationError("Pass either a pretrained_file or a weight_file, not both.")
         if pretrained_file:
             # If we're loading a saved model, we don't want to actually read a pre-trained
             # embedding file - the embeddings will just be in our saved weights, and we might not
@@ -170,7 +224,52 @@ class Embedding(TokenEmbedder):
                    max_norm=max_norm,
                    norm_type=norm_type,
                    scale_grad_by_freq=scale_grad_by_freq,
-                   sparse=sparse)
+                   sparse=sparse,
+                   weight_file=weight_file)
+
+
+def write_embedding_weight_file(weight: numpy.ndarray,
+                                weight_file: str,
+                                quantization: str = None) -> None:
+    """
+    Writes the weights of a frozen embedding to a ``.npy`` file, which an ``Embedding`` can
+    memory map with its ``weight_file`` parameter.  To serve a trained model this way, write its
+    embedding weights (e.g. ``model.state_dict()['_text_field_embedder.token_embedder_tokens.weight']``)
+    and load it with an override setting the embedding's ``weight_file``.
+
+    Parameters
+    ----------
+    weight : ``numpy.ndarray``, required.
+        The weights, of shape ``(num_embeddings, embedding_dim)``.
+    weight_file : ``str``, required.
+        The file to write.
+    quantization : ``str``, optional (default = None)
+        How to store the weights.  ``None`` keeps them as float32.  ``"float16"`` halves the size
+        of the file, and ``"int8"`` stores each row as bytes, scaled by the largest absolute value
+        in the row, which takes a quarter of the space, plus a float32 scale per row.
+    """
+    weight = numpy.asarray(weight, dtype=numpy.float32)
+    if quantization is None:
+        stored_weight = weight
+    elif quantization == 'float16':
+        stored_weight = weight.astype(numpy.float16)
+    elif quantization == 'int8':
+        scale = numpy.abs(weight).max(axis=1) / 127
+        # All zero rows, like padding, stay zero with any scale.
+        scale[scale == 0] = 1
+        stored_weight = numpy.empty(weight.shape[0], dtype=[('scale', numpy.float32),
+                                                            ('values', numpy.int8, (weight.shape[1],))])
+        stored_weight['scale'] = scale
+        stored_weight['values'] = numpy.round(weight / scale[:, None])
+    else:
+        raise ConfigurationError("Unknown quantization: {}".format(quantization))
+    numpy.save(weight_file, stored_weight)
+
+
+def _embedding_dim_of_weight_file(weight: numpy.ndarray) -> int:
+    if weight.dtype.names:
+        return weight.dtype['values'].shape[0]
+    return weight.shape[1]
 
 
 def _read_pretrained_embedding_file(embeddings_filename: str,
@@ -1,4 +1,7 @@
+from typing import Optional, Tuple
+
 import torch
+from torch.autograd import Variable
 
 from allennlp.common import Params
 from allennlp.data.vocabulary import Vocabulary
@@ -18,6 +21,11 @@ class TokenCharactersEncoder(TokenEmbedder):
     optionally apply dropout after the token-level encoder.
 
     We take the embedding and encoding modules as input, so this class is itself quite simple.
+
+    Padding tokens, with no characters, are all encoded the same way, so we only run the embedding
+    and encoder on the tokens which have characters, and on one padding token, whose encoding we
+    copy to all of the others.  In a batch of sentences of different lengths, this skips a lot of
+    work.
     """
     def __init__(self, embedding: Embedding, encoder: Seq2VecEncoder, dropout: float = 0.0) -> None:
         super(TokenCharactersEncoder, self).__init__()
@@ -32,8 +40,42 @@ class TokenCharactersEncoder(TokenEmbedder):
         return self._encoder._module.get_output_dim()  # pylint: disable=protected-access
 
     def forward(self, token_characters: torch.Tensor) -> torch.Tensor:  # pylint: disable=arguments-differ
+        # pylint: disable=protected-access
+        batch_size, num_tokens, num_characters = token_characters.size()
+        token_characters = token_characters.view(-1, num_characters)
         mask = (token_characters != 0).long()
-        return self._dropout(self._encoder(self._embedding(token_characters), mask))
+        # Shape (batch_size * num_tokens,)
+        token_mask = (mask.sum(-1) > 0).data
+        rows_to_encode, row_for_token = self._rows_to_encode(token_mask)
+        if rows_to_encode is not None:
+            token_characters = token_characters.index_select(0, rows_to_encode)
+            mask = mask.index_select(0, rows_to_encode)
+
+        # Shape (num_rows, encoding_dim)
+        encoded_tokens = self._encoder._module(self._embedding._module(token_characters), mask)
+        if row_for_token is not None:
+            encoded_tokens = encoded_tokens.index_select(0, row_for_token)
+        return self._dropout(encoded_tokens.view(batch_size, num_tokens, -1))
+
+    @staticmethod
+    def _rows_to_encode(token_mask: torch.Tensor) -> Tuple[Optional[Variable], Optional[Variable]]:
+        """
+        Given a mask of shape (num_tokens,) saying which tokens have characters, returns the
+        indices of the tokens we need to encode (these, and the first padding token), and for each
+        token, the index of its encoding among them.  If there is no padding, we encode every token,
+        and return ``None`` for both.
+        """
+        if token_mask.sum() == token_mask.size(0):
+            return None, None
+        padding = token_mask == 0
+        first_padding_token = padding.nonzero()[0, 0]
+        to_encode = token_mask.clone()
+        to_encode[first_padding_token] = 1
+        rows_to_encode = to_encode.nonzero().squeeze(1)
+        # The position of each token among the ones we encode.
+        row_for_token = to_encode.long().cumsum(0) - 1
+        row_for_token.masked_fill_(padding, int(row_for_token[first_padding_token]))
+        return Variable(rows_to_encode), Variable(row_for_token)
 
     @classmethod
     def from_params(cls, vocab: Vocabulary, params: Params) -> 'TokenCharactersEncoder':
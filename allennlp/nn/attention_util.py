@@ -0,0 +1,97 @@
+"""
+A fused implementation of attention, the masked softmax of attention scores followed by a weighted
+sum of the rows they score, which :func:`~allennlp.nn.util.last_dim_softmax` and
+:func:`~allennlp.nn.util.weighted_sum` compute separately.
+"""
+from typing import Optional
+
+import torch
+
+
+def masked_attention(scores: torch.autograd.Variable,
+                     matrix: torch.autograd.Variable,
+                     mask: Optional[torch.autograd.Variable] = None) -> torch.autograd.Variable:
+    """
+    Computes ``weighted_sum(matrix, last_dim_softmax(scores, mask))`` (or, with a single query,
+    ``weighted_sum(matrix, masked_softmax(scores, mask))``), the usual attention over the rows of
+    ``matrix``, in a single autograd function.  The unfused calls keep several temporary tensors
+    the size of ``scores`` for their backward pass, and expand the mask to that size; this keeps
+    only the attention weights, and computes the backward pass of the softmax and the weighted sum
+    together.
+
+    Parameters
+    ----------
+    scores : ``torch.autograd.Variable``
+        The unnormalised attention scores, of shape ``(batch_size, ..., num_queries, num_rows)``,
+        or ``(batch_size, ..., num_rows)`` for a single query.
+    matrix : ``torch.autograd.Variable``
+        The rows to attend over, of shape ``(batch_size, ..., num_rows, embedding_dim)``.
+    mask : ``torch.autograd.Variable``, optional (default = None)
+        The mask of the rows, of shape ``(batch_size, ..., num_rows)``, or ``(batch_size,
+        num_rows)``, which applies to all of the dimensions in between.  As in
+        ``masked_softmax``, if every row is masked, the result is zero.
+
+    Returns
+    -------
+    The attended rows, of shape ``(batch_size, ..., [num_queries,] embedding_dim)``.
+    """
+    single_query = scores.dim() == matrix.dim() - 1
+    if single_query:
+        scores = scores.unsqueeze(-2)
+    num_rows = matrix.size(-2)
+    output_size = list(scores.size())[:-1] + [matrix.size(-1)]
+    flat_scores = scores.contiguous().view(-1, scores.size(-2), num_rows)
+    flat_matrix = matrix.contiguous().view(-1, num_rows, matrix.size(-1))
+    if mask is not None:
+        mask = mask.float()
+        while mask.dim() < matrix.dim() - 1:
+            mask = mask.unsqueeze(1)
+        # The mask is broadcast over the queries, rather than expanded to the size of the scores.
+        mask = mask.expand(*matrix.size()[:-1]).contiguous().view(-1, 1, num_rows)
+    output, _ = _MaskedAttention.apply(flat_scores, flat_matrix, mask)
+    output = output.view(*output_size)
+    if single_query:
+        output = output.squeeze(-2)
+    return output
+
+
+class _MaskedAttention(torch.autograd.Function):
+    """
+    Takes ``scores`` of shape ``(batch_size, num_queries, num_rows)``, a ``matrix`` of shape
+    ``(batch_size, num_rows, embedding_dim)`` and an optional ``mask`` of shape ``(batch_size, 1,
+    num_rows)``, and returns the weighted sum of the rows with the masked softmax of the scores, and
+    the (non-differentiable) attention weights.
+    """
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def forward(ctx, scores, matrix, mask):
+        if mask is None:
+            attention = scores - scores.max(dim=-1, keepdim=True)[0]
+            attention.exp_()
+        else:
+            # As in masked_softmax, we zero the masked scores, so large ones don't cause numerical
+            # errors, and then zero their weights.
+            attention = scores * mask
+            attention.sub_(attention.max(dim=-1, keepdim=True)[0]).exp_().mul_(mask)
+        attention.div_(attention.sum(dim=-1, keepdim=True) + 1e-13)
+        output = attention.bmm(matrix)
+        ctx.mark_non_differentiable(attention)
+        ctx.save_for_backward(matrix, attention)
+        return output, attention
+
+    @staticmethod
+    def backward(ctx, grad_output, _):
+        matrix, attention = ctx.saved_tensors
+        grad_scores = grad_matrix = None
+        if ctx.needs_input_grad[0]:
+            batch_size, num_queries, num_rows = attention.size()
+            # Shape: (batch_size, num_queries, num_rows)
+            grad_attention = grad_output.bmm(matrix.transpose(1, 2))
+            # The gradient of the softmax is attention * (grad_attention - attention . grad_attention).
+            # We take the dot products with a batched matrix multiplication, so we don't need a
+            # temporary tensor the size of the attention.
+            attention_dot_grad = grad_attention.view(-1, 1, num_rows).bmm(attention.view(-1, num_rows, 1))
+            grad_scores = grad_attention.sub_(attention_dot_grad.view(batch_size, num_queries, 1)).mul_(attention)
+        if ctx.needs_input_grad[1]:
+            grad_matrix = attention.transpose(1, 2).bmm(grad_output)
+        return grad_scores, grad_matrix, None
@@ -0,0 +1,85 @@
+"""
+Helpers for decoding the predictions of coreference models.
+"""
+from typing import List, Tuple
+
+import numpy
+
+
+def get_coreference_clusters(top_spans: numpy.ndarray,
+                             antecedent_indices: numpy.ndarray,
+                             predicted_antecedents: numpy.ndarray) -> List[List[Tuple[int, int]]]:
+    """
+    Builds the clusters implied by a coreference model's antecedent predictions for a single
+    document.  Every span which predicts an antecedent is in the same cluster as that antecedent,
+    and clusters are closed under this relation (i.e., they are the connected components of the
+    graph of antecedent links).
+
+    This works on arrays for all of the spans at once, finding the connected components by
+    repeatedly propagating the smallest span index in each component along the links, so it's
+    much faster than building the clusters span by span.  Identical spans are treated as the same
+    mention.
+
+    Parameters
+    ----------
+    top_spans : ``numpy.ndarray``, required.
+        An array of shape (num_spans, 2), giving the inclusive start and end indices of each span.
+    antecedent_indices : ``numpy.ndarray``, required.
+        An array of shape (num_spans, max_antecedents), giving the index into ``top_spans`` of
+        each antecedent considered for each span.
+    predicted_antecedents : ``numpy.ndarray``, required.
+        An array of shape (num_spans,), giving for each span the index into its row of
+        ``antecedent_indices`` of its predicted antecedent, or -1 if it has none.
+
+    Returns
+    -------
+    clusters : ``List[List[Tuple[int, int]]]``
+        The clusters, each of which is a list of (start, end) spans in the order they appear in
+        ``top_spans``.  The clusters are ordered by the first span which links into each of them.
+    """
+    top_spans = numpy.asarray(top_spans)
+    antecedent_indices = numpy.asarray(antecedent_indices)
+    predicted_antecedents = numpy.asarray(predicted_antecedents)
+    # Shape: (num_links,)
+    linked_spans = numpy.nonzero(predicted_antecedents >= 0)[0]
+    if len(linked_spans) == 0:  # pylint: disable=len-as-condition
+        return []
+    antecedents = antecedent_indices[linked_spans, predicted_antecedents[linked_spans]]
+
+    # Identical spans are the same mention, so we represent each of them by its first occurrence.
+    _, first_occurrences, inverse = numpy.unique(top_spans.reshape(len(top_spans), -1),
+                                                 axis=0,
+                                                 return_index=True,
+                                                 return_inverse=True)
+    nodes = first_occurrences[inverse.reshape(-1)]
+    sources = nodes[linked_spans]
+    targets = nodes[antecedents]
+
+    # Each span starts out with its own index as its component, and we repeatedly give both ends
+    # of every link the smaller of their components, then point every span at its component's
+    # component, until nothing changes.
+    components = numpy.arange(len(top_spans))
+    while True:
+        new_components = components.copy()
+        link_components = numpy.minimum(components[sources], components[targets])
+        numpy.minimum.at(new_components, sources, link_components)
+        numpy.minimum.at(new_components, targets, link_components)
+        new_components = new_components[new_components]
+        if (new_components == components).all():
+            break
+        components = new_components
+
+    # The first link into each component decides the order of the clusters.
+    first_links = numpy.full(len(top_spans), len(top_spans))
+    numpy.minimum.at(first_links, components[sources], linked_spans)
+
+    mentions = numpy.unique(numpy.concatenate([sources, targets]))
+    mention_first_links = first_links[components[mentions]]
+    order = numpy.lexsort((mentions, mention_first_links))
+    mentions = mentions[order]
+    mention_first_links = mention_first_links[order]
+    cluster_boundaries = numpy.nonzero(numpy.diff(mention_first_links))[0] + 1
+
+    spans: List[Tuple[int, int]] = [(start, end) for start, end in top_spans[mentions].tolist()]
+    return [spans[start:end] for start, end in zip([0] + cluster_boundaries.tolist(),
+                                                   cluster_boundaries.tolist() + [len(spans)])]
@@ -0,0 +1,37 @@
+"""
+Helpers for recurrent cells which run one timestep at a time.
+"""
+from typing import Dict, List
+
+import torch
+from torch.autograd import Variable
+
+
+def stack_timestep_outputs(timestep_outputs: List[torch.Tensor], batch_size: int) -> torch.Tensor:
+    """
+    Stacks the outputs of a recurrent cell which, at each timestep, only runs on the sequences in
+    a (length sorted) batch that haven't finished, so each output has shape ``(num_rows, dim)`` for
+    some ``num_rows <= batch_size``.  The missing rows are filled with zeros.
+
+    Parameters
+    ----------
+    timestep_outputs : ``List[torch.Tensor]``, required.
+        The output for each timestep, each for the first ``num_rows`` rows of the batch.
+    batch_size : ``int``, required.
+        The number of rows to pad every output to.
+
+    Returns
+    -------
+    A tensor of shape ``(batch_size, num_timesteps, dim)``.
+    """
+    padding: Dict[int, torch.Tensor] = {}
+    padded_outputs = []
+    for output in timestep_outputs:
+        num_rows = output.size(0)
+        if num_rows < batch_size:
+            # Outputs with the same number of rows share their padding.
+            if num_rows not in padding:
+                padding[num_rows] = Variable(output.data.new(batch_size - num_rows, output.size(1)).fill_(0))
+            output = torch.cat([output, padding[num_rows]], 0)
+        padded_outputs.append(output)
+    return torch.stack(padded_outputs, 1)
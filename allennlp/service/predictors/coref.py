@@ -1,10 +1,12 @@
-from typing import Tuple
+from typing import Any, Dict, List, Tuple
 
 from overrides import overrides
+import numpy
 
 from allennlp.common.util import get_spacy_model
-from allennlp.common.util import JsonDict
+from allennlp.common.util import JsonDict, sanitize
 from allennlp.data import DatasetReader, Instance
+from allennlp.data.dataset import Dataset
 from allennlp.models import Model
 from allennlp.service.predictors.predictor import Predictor
 
@@ -13,14 +15,127 @@ from allennlp.service.predictors.predictor import Predictor
 class CorefPredictor(Predictor):
     """
     Wrapper for the :class:`~allennlp.models.coreference_resolution.CoreferenceResolver` model.
+
+    The model's memory use grows with the length of the document, so very long documents can be
+    split into overlapping segments of whole sentences, which are run through the model a few at a
+    time.  The clusters from each segment are then merged, joining any clusters which share a
+    mention (which can happen in the overlap between two segments).  The segmenting arguments can
+    be given to :func:`Predictor.from_archive` as ``predictor_args``, or to ``allennlp predict``
+    with ``--predictor-args``.
+
+    Parameters
+    ----------
+    model : ``Model``
+    dataset_reader : ``DatasetReader``
+    max_segment_length : ``int``, optional (default = None)
+        If given, we split documents with more words than this into segments of at most this many
+        words (unless a single sentence is longer than this).  By default we always run the model
+        over the whole document.
+    segment_overlap : ``int``, optional (default = 100)
+        Each segment starts with at least this many words from the end of the previous segment,
+        so that we can link clusters across segments.
+    segments_per_batch : ``int``, optional (default = 4)
+        How many segments we run through the model at once.  This bounds the memory we use.
     """
-    def __init__(self, model: Model, dataset_reader: DatasetReader) -> None:
+    def __init__(self,
+                 model: Model,
+                 dataset_reader: DatasetReader,
+                 max_segment_length: int = None,
+                 segment_overlap: int = 100,
+                 segments_per_batch: int = 4) -> None:
         super().__init__(model, dataset_reader)
+        self._max_segment_length = max_segment_length
+        self._segment_overlap = segment_overlap
+        self._segments_per_batch = segments_per_batch
 
         # We have to use spacy to tokenise our document here, because we need
         # to also know sentence boundaries to propose valid mentions.
         self._spacy = get_spacy_model("en_core_web_sm", pos_tags=True, parse=True, ner=False)
 
+    @overrides
+    def predict_json(self, inputs: JsonDict, cuda_device: int = -1) -> JsonDict:
+        return self.predict_batch_json([inputs], cuda_device)[0]
+
+    @overrides
+    def predict_batch_json(self, inputs: List[JsonDict], cuda_device: int = -1) -> List[JsonDict]:
+        documents = [self._split_sentences(json_dict["document"]) for json_dict in inputs]
+        results: List[JsonDict] = [{"document": [word for sentence in sentences for word in sentence]}
+                                   for sentences in documents]
+
+        # Documents short enough to run through the model whole are batched together, as usual.
+        whole_documents = [index for index, sentences in enumerate(documents)
+                           if not self._needs_segmenting(sentences)]
+        if whole_documents:
+            instances = [self._dataset_reader.text_to_instance(documents[index]) for index in whole_documents]
+            outputs = self._predict_instances(instances, cuda_device)
+            for index, output in zip(whole_documents, outputs):
+                results[index].update(output)
+
+        for index, sentences in enumerate(documents):
+            if self._needs_segmenting(sentences):
+                results[index].update(self._predict_segmented_document(sentences, cuda_device))
+        return sanitize(results)
+
+    def _needs_segmenting(self, sentences: List[List[str]]) -> bool:
+        document_length = sum(len(sentence) for sentence in sentences)
+        return self._max_segment_length is not None and document_length > self._max_segment_length
+
+    def _predict_instances(self, instances: List[Instance], cuda_device: int) -> List[Dict[str, Any]]:
+        """
+        Runs the model on a batch of documents, as :func:`Model.forward_on_instances` does, but
+        gives every document all of ``antecedent_indices``, which has no batch dimension, rather
+        than splitting it up as if it had one.
+        """
+        dataset = Dataset(instances)
+        dataset.index_instances(self._model.vocab)
+        model_input = dataset.as_tensor_dict(cuda_device=cuda_device, for_training=False)
+        output_dict = self._model.decode(self._model(**model_input))
+        antecedent_indices = output_dict["antecedent_indices"].data.cpu().numpy()
+        return [{"top_spans": top_spans,
+                 "antecedent_indices": antecedent_indices,
+                 "predicted_antecedents": predicted_antecedents,
+                 "clusters": clusters}
+                for top_spans, predicted_antecedents, clusters
+                in zip(output_dict["top_spans"].data.cpu().numpy(),
+                       output_dict["predicted_antecedents"].data.cpu().numpy(),
+                       output_dict["clusters"])]
+
+    def _predict_segmented_document(self, sentences: List[List[str]], cuda_device: int) -> Dict[str, Any]:
+        """
+        Runs the model over the segments of a document, and joins their outputs into the same
+        outputs as for a whole document.  The spans of each segment come after those of the
+        segments before it in ``top_spans``, so a span in the overlap between two segments is
+        there twice, and the clusters are merged across segments.
+        """
+        segments = _segment_sentences(sentences, self._max_segment_length, self._segment_overlap)
+        top_spans: List[numpy.ndarray] = []
+        antecedent_indices: List[numpy.ndarray] = []
+        predicted_antecedents: List[numpy.ndarray] = []
+        clusters: List[List[Tuple[int, int]]] = []
+        num_spans = 0
+        for batch_start in range(0, len(segments), self._segments_per_batch):
+            batch = segments[batch_start:batch_start + self._segments_per_batch]
+            instances = [self._dataset_reader.text_to_instance(sentences[start:end])
+                         for start, end, _ in batch]
+            outputs = self._predict_instances(instances, cuda_device)
+            for (_, _, offset), output in zip(batch, outputs):
+                top_spans.append(output["top_spans"] + offset)
+                antecedent_indices.append(output["antecedent_indices"] + num_spans)
+                predicted_antecedents.append(output["predicted_antecedents"])
+                clusters.extend([[(start + offset, end + offset) for start, end in cluster]
+                                 for cluster in output["clusters"]])
+                num_spans += len(output["top_spans"])
+
+        # Batches of segments with different lengths keep different numbers of antecedents, so we
+        # pad the shorter rows with antecedents which are never predicted, as the model does.
+        max_antecedents = max(indices.shape[1] for indices in antecedent_indices)
+        antecedent_indices = [numpy.pad(indices, ((0, 0), (0, max_antecedents - indices.shape[1])), 'edge')
+                              for indices in antecedent_indices]
+        return {"top_spans": numpy.concatenate(top_spans),
+                "antecedent_indices": numpy.concatenate(antecedent_indices),
+                "predicted_antecedents": numpy.concatenate(predicted_antecedents),
+                "clusters": _merge_clusters(clusters)}
+
     @overrides
     def _json_to_instance(self, json_dict: JsonDict) -> Tuple[Instance, JsonDict]:
 
@@ -47,11 +162,76 @@ class CorefPredictor(Predictor):
               ]
             }
         """
-        document = json_dict["document"]
-        spacy_document = self._spacy(document)
-        sentences = [[token.text for token in sentence] for sentence in spacy_document.sents]
+        sentences = self._split_sentences(json_dict["document"])
         flattened_sentences = [word for sentence in sentences for word in sentence]
 
         results_dict: JsonDict = {"document": flattened_sentences}
         instance = self._dataset_reader.text_to_instance(sentences)
         return instance, results_dict
+
+    def _split_sentences(self, document: str) -> List[List[str]]:
+        spacy_document = self._spacy(document)
+        return [[token.text for token in sentence] for sentence in spacy_document.sents]
+
+
+def _segment_sentences(sentences: List[List[str]],
+                       max_segment_length: int,
+                       segment_overlap: int) -> List[Tuple[int, int, int]]:
+    """
+    Splits a document into overlapping segments of whole sentences, returning the index of the
+    first sentence, the index after the last sentence, and the offset of the first word of each
+    segment.
+    """
+    sentence_offsets = [0]
+    for sentence in sentences:
+        sentence_offsets.append(sentence_offsets[-1] + len(sentence))
+
+    def fits(start: int, end: int) -> bool:
+        return sentence_offsets[end] - sentence_offsets[start] <= max_segment_length
+
+    segments: List[Tuple[int, int, int]] = []
+    start = 0
+    while True:
+        # Each segment has at least one sentence, then as many more as fit.
+        end = start + 1
+        while end < len(sentences) and fits(start, end + 1):
+            end += 1
+        segments.append((start, end, sentence_offsets[start]))
+        if end == len(sentences):
+            return segments
+        # The next segment starts with the sentences covering the last ``segment_overlap`` words
+        # of this one, but always moves forward.  If the next sentence is too long to share a
+        # segment with any of these, there's no point overlapping.
+        next_start = end
+        while next_start - 1 > start and sentence_offsets[end] - sentence_offsets[next_start] < segment_overlap:
+            next_start -= 1
+        start = next_start if fits(next_start, end + 1) else end
+
+
+def _merge_clusters(clusters: List[List[Tuple[int, int]]]) -> List[List[Tuple[int, int]]]:
+    """
+    Merges clusters which share a mention, keeping the clusters in the order of their first
+    mention, and the mentions within each cluster sorted.
+    """
+    # A union-find over clusters, where mentions point to the first cluster they were in.
+    parents = list(range(len(clusters)))
+
+    def find(cluster_id: int) -> int:
+        while parents[cluster_id] != cluster_id:
+            parents[cluster_id] = parents[parents[cluster_id]]
+            cluster_id = parents[cluster_id]
+        return cluster_id
+
+    mention_clusters: Dict[Tuple[int, int], int] = {}
+    for cluster_id, cluster in enumerate(clusters):
+        for mention in cluster:
+            if mention in mention_clusters:
+                root, other_root = sorted([find(cluster_id), find(mention_clusters[mention])])
+                parents[other_root] = root
+            else:
+                mention_clusters[mention] = cluster_id
+
+    merged_clusters: Dict[int, List[Tuple[int, int]]] = {}
+    for mention, cluster_id in mention_clusters.items():
+        merged_clusters.setdefault(find(cluster_id), []).append(mention)
+    return sorted((sorted(cluster) for cluster in merged_clusters.values()), key=lambda cluster: cluster[0])
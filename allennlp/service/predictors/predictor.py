@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 import json
 
 from allennlp.common import Registrable
@@ -67,11 +67,16 @@ class Predictor(Registrable):
         return instances
 
     @classmethod
-    def from_archive(cls, archive: Archive, predictor_name: str) -> 'Predictor':
+    def from_archive(cls,
+                     archive: Archive,
+                     predictor_name: str,
+                     predictor_args: Dict[str, Any] = None) -> 'Predictor':
         """
         Instantiate a :class:`Predictor` from an :class:`~allennlp.models.archival.Archive`;
         that is, from the result of training a model. Optionally specify which `Predictor`
-        subclass; otherwise, the default one for the model will be used.
+        subclass; otherwise, the default one for the model will be used.  Any ``predictor_args``
+        are passed to the constructor of the ``Predictor`` subclass, after the model and dataset
+        reader.
         """
         config = archive.config
 
@@ -81,19 +86,23 @@ class Predictor(Registrable):
         model = archive.model
         model.eval()
 
-        return Predictor.by_name(predictor_name)(model, dataset_reader)
+        # Only the subclass knows which ``predictor_args`` it takes.
+        predictor_class: Callable[..., Predictor] = Predictor.by_name(predictor_name)
+        return predictor_class(model, dataset_reader, **(predictor_args or {}))
 
 
 class DemoModel:
     """
     A demo model is determined by both an archive file
     (representing the trained model)
-    and a choice of predictor
+    and a choice of predictor, optionally with arguments
+    for the predictor's constructor
     """
-    def __init__(self, archive_file: str, predictor_name: str) -> None:
+    def __init__(self, archive_file: str, predictor_name: str, predictor_args: Dict[str, Any] = None) -> None:
         self.archive_file = archive_file
         self.predictor_name = predictor_name
+        self.predictor_args = predictor_args
 
     def predictor(self) -> Predictor:
         archive = load_archive(self.archive_file)
-        return Predictor.from_archive(archive, self.predictor_name)
+        return Predictor.from_archive(archive, self.predictor_name, predictor_args=self.predictor_args)
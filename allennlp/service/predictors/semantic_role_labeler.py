@@ -1,9 +1,13 @@
 from typing import List, Tuple
 
 from overrides import overrides
+import torch
+from torch.autograd import Variable
 
 from allennlp.common.util import JsonDict, sanitize, group_by_count
 from allennlp.data import DatasetReader, Instance
+from allennlp.data.dataset import Dataset
+from allennlp.data.tokenizers import Token
 from allennlp.data.tokenizers.word_splitter import SpacyWordSplitter
 from allennlp.models import Model
 from allennlp.service.predictors.predictor import Predictor
@@ -13,10 +17,30 @@ from allennlp.service.predictors.predictor import Predictor
 class SemanticRoleLabelerPredictor(Predictor):
     """
     Wrapper for the :class:`~allennlp.models.bidaf.SemanticRoleLabeler` model.
+
+    The model makes a prediction for every verb in a sentence.  By default, we embed each
+    sentence's tokens once and share that embedding between all of its verbs (see the
+    ``sentence_indices`` argument to ``SemanticRoleLabeler.forward``), and when predicting a
+    batch, we sort the sentences by length, so that sentences of similar lengths are run
+    together and there is little padding.
+
+    Parameters
+    ----------
+    model : ``Model``
+        The ``SemanticRoleLabeler`` to predict with.
+    dataset_reader : ``DatasetReader``
+        The reader whose ``text_to_instance`` we use to index sentences.
+    share_sentence_embeddings : ``bool``, optional (default=``True``)
+        If ``False``, we create a separate instance for every verb, embedding a sentence once per
+        verb in it, and run the verbs in the order they were given.
     """
-    def __init__(self, model: Model, dataset_reader: DatasetReader) -> None:
+    def __init__(self,
+                 model: Model,
+                 dataset_reader: DatasetReader,
+                 share_sentence_embeddings: bool = True) -> None:
         super().__init__(model, dataset_reader)
         self._tokenizer = SpacyWordSplitter(language='en_core_web_sm', pos_tags=True)
+        self._share_sentence_embeddings = share_sentence_embeddings
 
     @staticmethod
     def make_srl_string(words: List[str], tags: List[str]) -> str:
@@ -68,20 +92,96 @@ class SemanticRoleLabelerPredictor(Predictor):
             by the Spacy POS tagger. These will be replaced in ``predict_json`` with the
             SRL frame for the verb.
         """
+        tokens, verb_indices, result_dict = self._tokenize_sentence(json_dict)
+        instances: List[Instance] = []
+        for verb_index in verb_indices:
+            verb_labels = [0 for _ in tokens]
+            verb_labels[verb_index] = 1
+            instances.append(self._dataset_reader.text_to_instance(tokens, verb_labels))
+        return instances, result_dict
+
+    def _tokenize_sentence(self, json_dict: JsonDict) -> Tuple[List[Token], List[int], JsonDict]:
+        """
+        Tokenizes the ``"sentence"`` in ``json_dict``, returning its tokens, the indices of the
+        verbs in it, and a result dictionary containing the words of the sentence and the verbs.
+        """
         sentence = json_dict["sentence"]
         tokens = self._tokenizer.split_words(sentence)
         words = [token.text for token in tokens]
-        result_dict: JsonDict = {"words": words, "verbs": []}
-        instances: List[Instance] = []
-        for i, word in enumerate(tokens):
-            if word.pos_ == "VERB":
-                verb = word.text
-                result_dict["verbs"].append(verb)
-                verb_labels = [0 for _ in words]
-                verb_labels[i] = 1
-                instance = self._dataset_reader.text_to_instance(tokens, verb_labels)
-                instances.append(instance)
-        return instances, result_dict
+        verb_indices = [i for i, token in enumerate(tokens) if token.pos_ == "VERB"]
+        result_dict: JsonDict = {"words": words, "verbs": [words[i] for i in verb_indices]}
+        return tokens, verb_indices, result_dict
+
+    def _predict_sentence_frames(self,
+                                 sentences: List[Tuple[List[Token], List[int]]],
+                                 max_frames_per_batch: int,
+                                 cuda_device: int) -> List[List[List[str]]]:
+        """
+        Predicts the tags for every verb in ``sentences``, given as ``(tokens, verb_indices)``
+        pairs, embedding each sentence only once.  Sentences are sorted by length and grouped into
+        batches with at most ``max_frames_per_batch`` verbs (unless a single sentence has more
+        verbs than that).  Returns a list of the tags for each verb, for each sentence, in the
+        order we were given the sentences.
+        """
+        sorted_indices = sorted(range(len(sentences)), key=lambda index: len(sentences[index][0]))
+        batches: List[List[int]] = []
+        batch_frames = 0
+        for index in sorted_indices:
+            num_frames = len(sentences[index][1])
+            if num_frames == 0:
+                continue
+            if not batches or batch_frames + num_frames > max_frames_per_batch:
+                batches.append([])
+                batch_frames = 0
+            batches[-1].append(index)
+            batch_frames += num_frames
+
+        tags: List[List[List[str]]] = [[] for _ in sentences]
+        for batch in batches:
+            # We only need the tokens of each sentence from the dataset reader; we build the verb
+            # indicators for all of the verbs in the batch ourselves.
+            dataset = Dataset([self._dataset_reader.text_to_instance(sentences[index][0],
+                                                                     [0] * len(sentences[index][0]))
+                               for index in batch])
+            dataset.index_instances(self._model.vocab)
+            tokens = dataset.as_tensor_dict(cuda_device=cuda_device, for_training=False)["tokens"]
+            sequence_length = max(len(sentences[index][0]) for index in batch)
+
+            sentence_indices: List[int] = []
+            verb_indicator = torch.zeros(sum(len(sentences[index][1]) for index in batch),
+                                         sequence_length).long()
+            for batch_index, index in enumerate(batch):
+                for verb_index in sentences[index][1]:
+                    verb_indicator[len(sentence_indices), verb_index] = 1
+                    sentence_indices.append(batch_index)
+            sentence_index_tensor = torch.LongTensor(sentence_indices)
+            if cuda_device >= 0:
+                verb_indicator = verb_indicator.cuda(cuda_device)
+                sentence_index_tensor = sentence_index_tensor.cuda(cuda_device)
+
+            output_dict = self._model.decode(self._model(tokens=tokens,
+                                                         verb_indicator=Variable(verb_indicator,
+                                                                                 volatile=True),
+                                                         sentence_indices=Variable(sentence_index_tensor,
+                                                                                   volatile=True)))
+            frame_tags = iter(output_dict["tags"])
+            for index in batch:
+                tags[index] = [next(frame_tags) for _ in sentences[index][1]]
+        return tags
+
+    @staticmethod
+    def _add_frames(results: JsonDict, tags_for_verbs: List[List[str]]) -> None:
+        # ``results["verbs"]`` holds the verbs of the sentence, which we replace with their frames.
+        verbs_for_sentence: List[str] = results["verbs"]
+        results["verbs"] = []
+        for verb, tags in zip(verbs_for_sentence, tags_for_verbs):
+            description = SemanticRoleLabelerPredictor.make_srl_string(results["words"], tags)
+            results["verbs"].append({
+                    "verb": verb,
+                    "description": description,
+                    "tags": tags,
+            })
+        results["tokens"] = results["words"]
 
     @overrides
     def predict_batch_json(self, inputs: List[JsonDict], cuda_device: int = -1) -> List[JsonDict]:
@@ -111,6 +211,15 @@ class SemanticRoleLabelerPredictor(Predictor):
         # that here by taking the batch size which we use to be the number of sentences
         # we are given.
         batch_size = len(inputs)
+        if self._share_sentence_embeddings:
+            tokenized_sentences = [self._tokenize_sentence(json) for json in inputs]
+            sentences = [(tokens, verb_indices) for tokens, verb_indices, _ in tokenized_sentences]
+            tags_for_sentences = self._predict_sentence_frames(sentences, batch_size, cuda_device)
+            sentence_results = [result_dict for _, _, result_dict in tokenized_sentences]
+            for results, tags_for_verbs in zip(sentence_results, tags_for_sentences):
+                self._add_frames(results, tags_for_verbs)
+            return sanitize(sentence_results)
+
         instances_per_sentence, return_dicts = zip(*[self._sentence_to_srl_instances(json)
                                                      for json in inputs])
 
@@ -120,35 +229,19 @@ class SemanticRoleLabelerPredictor(Predictor):
         # padded elements as the number of instances might not be perfectly
         # divisible by the batch size.
         batched_instances = group_by_count(flattened_instances, batch_size, None)
-        batched_instances[-1] = [instance for instance in batched_instances[-1]
-                                 if instance is not None]
+        if batched_instances:
+            batched_instances[-1] = [instance for instance in batched_instances[-1]
+                                     if instance is not None]
         # Run the model on the batches.
         outputs = []
         for batch in batched_instances:
             outputs.extend(self._model.forward_on_instances(batch, cuda_device))
 
-        sentence_index = 0
+        # The outputs are already flattened from running through the model, so we just step
+        # through this flat list for each verb of each sentence.
+        output_tags = iter(output['tags'] for output in outputs)
         for results in return_dicts:
-            # We just added the verbs to the list in _sentence_to_srl_instances
-            # but we actually want to replace them with their frames, so we
-            # reset them here.
-            verbs_for_sentence: List[str] = results["verbs"]
-            results["verbs"] = []
-            # The verbs are in order, but nested as we have multiple sentences.
-            # The outputs are already flattened from running through the model,
-            # so we just index into this flat list for each verb, updating as we go.
-            for verb in verbs_for_sentence:
-                output = outputs[sentence_index]
-                tags = output['tags']
-                description = SemanticRoleLabelerPredictor.make_srl_string(results["words"], tags)
-                results["verbs"].append({
-                        "verb": verb,
-                        "description": description,
-                        "tags": tags,
-                })
-                sentence_index += 1
-
-            results["tokens"] = results["words"]
+            self._add_frames(results, [next(output_tags) for _ in results["verbs"]])
 
         return return_dicts
 
@@ -167,23 +260,13 @@ class SemanticRoleLabelerPredictor(Predictor):
                 {"verb": "...", "description": "...", "tags": [...]},
             ]}
         """
-        instances, results = self._sentence_to_srl_instances(inputs)
-        # We just added the verbs to the list in _sentence_to_srl_instances
-        # but we actually want to replace them with their frames, so we
-        # reset them here.
-        verbs_for_instances: List[str] = results["verbs"]
-        results["verbs"] = []
-
-        outputs = self._model.forward_on_instances(instances, cuda_device)
+        if self._share_sentence_embeddings:
+            tokens, verb_indices, results = self._tokenize_sentence(inputs)
+            tags = self._predict_sentence_frames([(tokens, verb_indices)], len(verb_indices), cuda_device)
+            self._add_frames(results, tags[0])
+            return sanitize(results)
 
-        for output, verb in zip(outputs, verbs_for_instances):
-            tags = output['tags']
-            description = SemanticRoleLabelerPredictor.make_srl_string(results["words"], tags)
-            results["verbs"].append({
-                    "verb": verb,
-                    "description": description,
-                    "tags": tags,
-            })
-
-        results["tokens"] = results["words"]
+        instances, results = self._sentence_to_srl_instances(inputs)
+        outputs = self._model.forward_on_instances(instances, cuda_device) if instances else []
+        self._add_frames(results, [output['tags'] for output in outputs])
         return sanitize(results)
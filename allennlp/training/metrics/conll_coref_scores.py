@@ -1,10 +1,11 @@
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 from collections import Counter
 import numpy as np
 from sklearn.utils.linear_assignment_ import linear_assignment
 
 from overrides import overrides
 
+from allennlp.nn.coreference_util import get_coreference_clusters
 from allennlp.training.metrics.metric import Metric
 
 @Metric.register("conll_coref_scores")
@@ -49,39 +50,14 @@ class ConllCorefScores(Metric):
 
     @staticmethod
     def get_predicted_clusters(top_spans, antecedent_indices, predicted_antecedents):
-        predicted_clusters_to_ids: Dict[Tuple[int, int], int] = {}
-        clusters: List[List[Tuple[int, int]]] = []
-        for i, predicted_antecedent in enumerate(predicted_antecedents):
-            if predicted_antecedent < 0:
-                continue
-
-            # Find predicted index in the antecedent spans.
-            predicted_index = antecedent_indices[i, predicted_antecedent]
-            # Must be a previous span.
-            assert i > predicted_index
-            antecedent_span = tuple(top_spans[predicted_index])
-
-            # Check if we've seen the span before.
-            if antecedent_span in predicted_clusters_to_ids.keys():
-                predicted_cluster_id: int = predicted_clusters_to_ids[antecedent_span]
-            else:
-                # We start a new cluster.
-                predicted_cluster_id = len(clusters)
-                clusters.append([antecedent_span])
-                predicted_clusters_to_ids[antecedent_span] = predicted_cluster_id
-
-            mention = tuple(top_spans[i])
-            clusters[predicted_cluster_id].append(mention)
-            predicted_clusters_to_ids[mention] = predicted_cluster_id
-
-        # finalise the spans and clusters.
-        clusters = [tuple(cluster) for cluster in clusters]
+        clusters = [tuple(cluster) for cluster in
+                    get_coreference_clusters(top_spans.numpy(),
+                                             antecedent_indices.numpy(),
+                                             predicted_antecedents.numpy())]
         # Return a mapping of each mention to the cluster containing it.
-        predicted_clusters_to_ids: Dict[Tuple[int, int], List[Tuple[int, int]]] = \
-            {mention: clusters[cluster_id] for mention, cluster_id
-             in predicted_clusters_to_ids.items()}
-
-        return clusters, predicted_clusters_to_ids
+        mention_to_predicted: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]] = \
+            {mention: cluster for cluster in clusters for mention in cluster}
+        return clusters, mention_to_predicted
 
 
 class Scorer:
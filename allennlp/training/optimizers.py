@@ -10,9 +10,13 @@ The available optimizers are
 * `"adam" <http://pytorch.org/docs/master/optim.html#torch.optim.Adam>`_
 * `"sgd" <http://pytorch.org/docs/master/optim.html#torch.optim.SGD>`_
 * `"rmsprop <http://pytorch.org/docs/master/optim.html#torch.optim.RMSprop>`_
+* :class:`"dense_sparse_adam" <DenseSparseAdam>`, Adam which also takes the sparse gradients of
+  an ``Embedding`` with ``sparse=True``.  Of the Pytorch optimizers, only ``"sgd"`` and
+  ``"adagrad"`` take sparse gradients.
 """
 
 from typing import List
+import math
 
 import torch
 
@@ -34,6 +38,100 @@ class Optimizer(Registrable):
             optimizer = params.pop_choice("type", Optimizer.list_available())
         return Optimizer.by_name(optimizer)(model_parameters, **params.as_dict()) # type: ignore
 
+
+class DenseSparseAdam(torch.optim.Optimizer):
+    """
+    Adam, which also takes sparse gradients, such as those of an ``Embedding`` with
+    ``sparse=True``, and updates "lazily" for them: it only updates the moments, and the weights, of
+    the rows which have a gradient in this step.  Training a large embedding with dense Adam instead
+    needs dense gradients, and updates every row at every step.  Dense gradients get the usual Adam
+    update.
+
+    Parameters
+    ----------
+    params : ``Iterable``
+        The parameters to optimize, or dicts defining parameter groups.
+    lr : ``float``, optional (default = 1e-3)
+        The learning rate.
+    betas : ``Tuple[float, float]``, optional (default = (0.9, 0.999))
+        The coefficients of the running averages of the gradient and of its square.
+    eps : ``float``, optional (default = 1e-8)
+        Added to the denominator, for numerical stability.
+    """
+    def __init__(self, params, lr=1e-3, betas=(0.9, 0.999), eps=1e-8):  # pylint: disable=invalid-name
+        if lr < 0.0:
+            raise ValueError("Invalid learning rate: {}".format(lr))
+        if eps < 0.0:
+            raise ValueError("Invalid epsilon value: {}".format(eps))
+        if not 0.0 <= betas[0] < 1.0 or not 0.0 <= betas[1] < 1.0:
+            raise ValueError("Invalid betas: {}".format(betas))
+        defaults = dict(lr=lr, betas=betas, eps=eps)
+        super(DenseSparseAdam, self).__init__(params, defaults)
+
+    def step(self, closure=None):
+        """
+        Performs a single optimization step.
+
+        Parameters
+        ----------
+        closure : ``Callable``, optional.
+            A closure that reevaluates the model and returns the loss.
+        """
+        loss = None
+        if closure is not None:
+            loss = closure()
+
+        for group in self.param_groups:
+            beta1, beta2 = group['betas']
+            for parameter in group['params']:
+                if parameter.grad is None:
+                    continue
+                grad = parameter.grad.data
+
+                state = self.state[parameter]
+                if not state:
+                    state['step'] = 0
+                    state['exp_avg'] = parameter.data.new().resize_as_(parameter.data).zero_()
+                    state['exp_avg_sq'] = parameter.data.new().resize_as_(parameter.data).zero_()
+                exp_avg, exp_avg_sq = state['exp_avg'], state['exp_avg_sq']
+
+                state['step'] += 1
+                bias_correction1 = 1 - beta1 ** state['step']
+                bias_correction2 = 1 - beta2 ** state['step']
+                step_size = group['lr'] * math.sqrt(bias_correction2) / bias_correction1
+
+                if grad.is_sparse:
+                    # pylint: disable=protected-access
+                    # Summing the gradients of repeated rows lets us update each row once.
+                    grad = grad.coalesce()
+                    grad_indices = grad._indices()
+                    grad_values = grad._values()
+
+                    def make_sparse(values):
+                        # pylint: disable=cell-var-from-loop
+                        return grad.new(grad_indices, values, grad.size())
+
+                    # exp_avg = beta1 * exp_avg + (1 - beta1) * grad, for the rows in the gradient,
+                    # computed as exp_avg + (1 - beta1) * (grad - exp_avg).
+                    old_exp_avg_values = exp_avg.sparse_mask(grad)._values()
+                    exp_avg_update_values = grad_values.sub(old_exp_avg_values).mul_(1 - beta1)
+                    exp_avg.add_(make_sparse(exp_avg_update_values))
+                    old_exp_avg_sq_values = exp_avg_sq.sparse_mask(grad)._values()
+                    exp_avg_sq_update_values = grad_values.pow(2).sub_(old_exp_avg_sq_values).mul_(1 - beta2)
+                    exp_avg_sq.add_(make_sparse(exp_avg_sq_update_values))
+
+                    numerator = exp_avg_update_values.add_(old_exp_avg_values)
+                    denominator = exp_avg_sq_update_values.add_(old_exp_avg_sq_values).sqrt_().add_(group['eps'])
+                    parameter.data.add_(make_sparse(numerator.div_(denominator).mul_(-step_size)))
+                else:
+                    exp_avg.mul_(beta1).add_(grad * (1 - beta1))
+                    exp_avg_sq.mul_(beta2).add_(grad * grad * (1 - beta2))
+                    denominator = exp_avg_sq.sqrt().add_(group['eps'])
+                    parameter.data.add_(exp_avg.div(denominator).mul_(-step_size))
+
+        return loss
+
+
 # We just use the Pytorch optimizers, so here we force them into
 # Registry._registry so we can build them from params.
 Registrable._registry[Optimizer] = {   # pylint: disable=protected-access
@@ -42,4 +140,5 @@ Registrable._registry[Optimizer] = {   # pylint: disable=protected-access
         "adadelta": torch.optim.Adadelta,
         "sgd": torch.optim.SGD,
         "rmsprop": torch.optim.RMSprop,
+        "dense_sparse_adam": DenseSparseAdam,
 }
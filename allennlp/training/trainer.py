@@ -15,7 +15,6 @@ from typing import Dict, Optional, List, Tuple
 
 import torch
 import torch.optim.lr_scheduler
-from torch.nn.utils.clip_grad import clip_grad_norm
 from torch.optim.lr_scheduler import _LRScheduler as PytorchLRScheduler  # pylint: disable=protected-access
 import tqdm
 from tensorboard import SummaryWriter
@@ -32,6 +31,62 @@ from allennlp.training.optimizers import Optimizer
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
+def sparse_clip_norm(parameters, max_norm: float, norm_type: float = 2) -> float:
+    """
+    Rescales the gradients of ``parameters`` so that their norm, taken together as one vector, is
+    at most ``max_norm``, like Pytorch's ``clip_grad_norm``, but also for sparse gradients, such as
+    those of an ``Embedding`` with ``sparse=True``, which we take the norm of, and rescale, without
+    making them dense.  The gradients are modified in place.
+
+    Parameters
+    ----------
+    parameters : ``Iterable[torch.nn.Parameter]``
+        The parameters whose gradients to rescale.
+    max_norm : ``float``
+        The maximum norm of the gradients.
+    norm_type : ``float``, optional (default = 2)
+        The type of p-norm to use.  Can be ``float('inf')`` for the infinity norm.
+
+    Returns
+    -------
+    The norm of the gradients, before rescaling.
+    """
+    # pylint: disable=protected-access
+    parameters = [parameter for parameter in parameters if parameter.grad is not None]
+    max_norm = float(max_norm)
+    norm_type = float(norm_type)
+    total_norm = 0.0
+    for parameter in parameters:
+        grad = parameter.grad.data
+        if grad.is_sparse:
+            # Repeated rows need summing before we can take the norm of the values.
+            grad = grad.coalesce()._values()
+        if grad.nelement() == 0:
+            continue
+        if norm_type == float('inf'):
+            total_norm = max(total_norm, float(grad.abs().max()))
+        else:
+            total_norm += float(grad.norm(norm_type)) ** norm_type
+    if norm_type != float('inf'):
+        total_norm = total_norm ** (1. / norm_type)
+    clip_coefficient = max_norm / (total_norm + 1e-6)
+    if clip_coefficient < 1:
+        for parameter in parameters:
+            parameter.grad.mul_(clip_coefficient)
+    return total_norm
+
+
+def _clamp_gradient(grad: torch.autograd.Variable, clip_value: float) -> torch.autograd.Variable:
+    if grad.data.is_sparse:
+        # pylint: disable=protected-access
+        # We clamp the summed gradient of each row, as we would a dense gradient.
+        data = grad.data.coalesce()
+        return torch.autograd.Variable(data.new(data._indices(),
+                                                data._values().clamp(-clip_value, clip_value),
+                                                data.size()))
+    return grad.clamp(-clip_value, clip_value)
+
+
 class TensorboardWriter:
     """
     Wraps a pair of ``SummaryWriter`` instances but is a no-op if they're ``None``.
@@ -155,9 +210,7 @@ class Trainer:
 
     def _enable_gradient_clipping(self) -> None:
         if self._grad_clipping is not None:
-            # Pylint is unable to tell that we're in the case that _grad_clipping is not None...
-            # pylint: disable=invalid-unary-operand-type
-            clip_function = lambda grad: grad.clamp(-self._grad_clipping, self._grad_clipping)
+            clip_function = lambda grad: _clamp_gradient(grad, self._grad_clipping)
             for parameter in self._model.parameters():
                 if parameter.requires_grad:
                     parameter.register_hook(clip_function)
@@ -167,7 +220,7 @@ class Trainer:
         Performs gradient rescaling. Is a no-op if gradient rescaling is not enabled.
         """
         if self._grad_norm:
-            clip_grad_norm(self._model.parameters(), self._grad_norm)
+            sparse_clip_norm(self._model.parameters(), self._grad_norm)
 
     def _batch_loss(self, batch: torch.Tensor, for_training: bool) -> torch.Tensor:
         """
@@ -247,11 +300,19 @@ class Trainer:
                                                        batch_num_total)
                     self._tensorboard.add_train_scalar("parameter_std/" + name, param.data.std(), batch_num_total)
                     if param.grad is not None:
+                        if param.grad.data.is_sparse:
+                            # We log the gradients of the rows which have one, rather than making
+                            # the gradient dense.
+                            grad_data = param.grad.data.coalesce()._values()  # pylint: disable=protected-access
+                        else:
+                            grad_data = param.grad.data
+                        if grad_data.nelement() == 0:
+                            continue
                         self._tensorboard.add_train_scalar("gradient_mean/" + name,
-                                                           param.grad.data.mean(),
+                                                           grad_data.mean(),
                                                            batch_num_total)
                         self._tensorboard.add_train_scalar("gradient_std/" + name,
-                                                           param.grad.data.std(),
+                                                           grad_data.std(),
                                                            batch_num_total)
                 self._tensorboard.add_train_scalar("loss/loss_train", metrics["loss"], batch_num_total)
                 self._metrics_to_tensorboard(batch_num_total,
@@ -0,0 +1,78 @@
+"""
+Times ``AlternatingHighwayLSTM``, which without the CUDA kernel runs its pytorch implementation,
+against ``StackedAlternatingLstm``, the module made of ``AugmentedLstm`` layers which computes the
+same thing, on a batch of variable length sequences, for inference and for a training step.  Pass
+``--cuda-device`` to time them on a GPU, where ``AlternatingHighwayLSTM`` uses the kernel if it
+has been built.  The default sizes are those of the semantic role labeling model.
+
+    python scripts/benchmark_alternating_highway_lstm.py --batch-size 80 --num-layers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import torch
+from torch.autograd import Variable
+from torch.nn.utils.rnn import pack_padded_sequence
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.alternating_highway_lstm import AlternatingHighwayLSTM
+from allennlp.modules.stacked_alternating_lstm import StackedAlternatingLstm
+
+
+def time_call(function, repeats: int, cuda: bool) -> float:
+    function()
+    if cuda:
+        torch.cuda.synchronize()
+    start = time.time()
+    for _ in range(repeats):
+        function()
+    if cuda:
+        torch.cuda.synchronize()
+    return (time.time() - start) / repeats
+
+
+def main(args: argparse.Namespace) -> None:
+    torch.manual_seed(0)
+    numpy.random.seed(0)
+    lengths = sorted(numpy.random.randint(1, args.max_length + 1, args.batch_size).tolist(), reverse=True)
+    lengths[0] = args.max_length
+    inputs = torch.randn(args.batch_size, args.max_length, args.input_size)
+
+    modules = [('StackedAlternatingLstm', StackedAlternatingLstm(args.input_size, args.hidden_size,
+                                                                 args.num_layers,
+                                                                 use_input_projection_bias=False)),
+               ('AlternatingHighwayLSTM', AlternatingHighwayLSTM(args.input_size, args.hidden_size,
+                                                                 args.num_layers))]
+    cuda = args.cuda_device >= 0
+    if cuda:
+        inputs = inputs.cuda(args.cuda_device)
+        for _, module in modules:
+            module.cuda(args.cuda_device)
+
+    print("{:<24} {:>14} {:>14}".format("module", "inference (ms)", "training (ms)"))
+    for name, module in modules:
+        def inference():
+            module(pack_padded_sequence(Variable(inputs, volatile=True), lengths, batch_first=True))
+
+        def training():
+            output, _ = module(pack_padded_sequence(Variable(inputs, requires_grad=True),
+                                                    lengths, batch_first=True))
+            output.data.sum().backward()
+        inference_seconds = time_call(inference, args.repeats, cuda)
+        training_seconds = time_call(training, args.repeats, cuda)
+        print("{:<24} {:>14.1f} {:>14.1f}".format(name, inference_seconds * 1000, training_seconds * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the alternating highway LSTMs.")
+    parser.add_argument('--batch-size', type=int, default=80)
+    parser.add_argument('--max-length', type=int, default=40)
+    parser.add_argument('--input-size', type=int, default=200)
+    parser.add_argument('--hidden-size', type=int, default=300)
+    parser.add_argument('--num-layers', type=int, default=8)
+    parser.add_argument('--cuda-device', type=int, default=-1)
+    parser.add_argument('--repeats', type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,86 @@
+"""
+Compares an ``Embedding`` holding its weights in memory with one reading frozen weights from a
+memory mapped ``weight_file``, stored as float32, float16 and int8, by the size of the weights,
+the memory each needs, and the time it takes to embed batches of tokens.  The defaults are the
+size of the 400,000 word, 300 dimensional GloVe vocabulary, and the tokens are drawn from a Zipf
+distribution, as words are.
+
+Each measurement builds the embedding and embeds the batches in a fresh process, and reports how
+much the process's resident memory grew, split into its private memory, and the pages of a weight
+file which the lookups read, which every process using the file shares, rather than copying them.
+This reads ``/proc``, so it only runs on Linux.
+
+    python scripts/benchmark_embedding_storage.py --vocab-size 400000 --embedding-dim 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy
+import torch
+import torch.multiprocessing
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.token_embedders.embedding import Embedding, write_embedding_weight_file
+
+
+def resident_memory() -> numpy.ndarray:
+    """
+    Returns the private and the file backed resident memory of this process, in MB.
+    """
+    with open('/proc/self/status') as status:
+        fields = dict(line.split(':', 1) for line in status)
+    return numpy.array([int(fields[name].split()[0]) / 1024 for name in ['RssAnon', 'RssFile']])
+
+
+def measure(storage: str, weight_filename: str, args: argparse.Namespace, results) -> None:
+    numpy.random.seed(0)
+    batches = [numpy.minimum(numpy.random.zipf(1.2, (args.batch_size, args.sequence_length)),
+                             args.vocab_size - 1)
+               for _ in range(args.num_batches)]
+
+    start_memory = resident_memory()
+    if storage == 'dense':
+        # This is how a model with a pretrained embedding holds it.
+        weight = torch.from_numpy(numpy.load(weight_filename))
+        embedding = Embedding(args.vocab_size, args.embedding_dim, weight=weight, trainable=False)
+    else:
+        embedding = Embedding(args.vocab_size, args.embedding_dim, trainable=False, weight_file=weight_filename)
+    start = time.time()
+    for batch in batches:
+        embedding(Variable(torch.from_numpy(batch), volatile=True))
+    seconds = (time.time() - start) / len(batches)
+    results.put((seconds, resident_memory() - start_memory))
+
+
+def main(args: argparse.Namespace) -> None:
+    context = torch.multiprocessing.get_context('spawn')
+    weight = numpy.random.randn(args.vocab_size, args.embedding_dim).astype(numpy.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        print("{:<10} {:>14} {:>14} {:>14} {:>14}".format("storage", "weights (MB)", "private (MB)",
+                                                          "file (MB)", "batch (ms)"))
+        storages = [('dense', None), ('float32', None), ('float16', 'float16'), ('int8', 'int8')]
+        for storage, quantization in storages:
+            weight_filename = os.path.join(directory, storage + '.npy')
+            write_embedding_weight_file(weight, weight_filename, quantization)
+            results = context.Queue()
+            process = context.Process(target=measure, args=(storage, weight_filename, args, results))
+            process.start()
+            seconds, memory = results.get()
+            process.join()
+            size = os.path.getsize(weight_filename) / 1024 ** 2
+            print("{:<10} {:>14.0f} {:>14.0f} {:>14.0f} {:>14.2f}".format(storage, size, memory[0], memory[1],
+                                                                          seconds * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory mapped and quantized embedding weights.")
+    parser.add_argument('--vocab-size', type=int, default=400000)
+    parser.add_argument('--embedding-dim', type=int, default=300)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--sequence-length', type=int, default=40)
+    parser.add_argument('--num-batches', type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,68 @@
+"""
+Times how long it takes to index a dataset, comparing the per-token ``TokenIndexer.token_to_indices``
+path with the batched ``TokenIndexer.tokens_to_indices`` path that ``TextField.index`` uses.
+
+By default this reads a CoNLL formatted SRL directory with the ``SrlReader``, indexing words
+with a ``SingleIdTokenIndexer`` and characters with a ``TokenCharactersIndexer``; any other
+dataset reader can be used by passing a JSON reader configuration.
+
+    python scripts/benchmark_indexing.py /path/to/conll-formatted-ontonotes-5.0/data/train
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.common import Params
+from allennlp.data import DatasetReader, Vocabulary
+from allennlp.data.fields import TextField
+
+
+def index_token_by_token(instances, vocab: Vocabulary) -> None:
+    # This is what ``TextField.index`` did before indexers could look up a whole field at once.
+    for instance in instances:
+        for field in instance.fields.values():
+            if isinstance(field, TextField):
+                # pylint: disable=protected-access
+                field._indexed_tokens = {name: [indexer.token_to_indices(token, vocab)
+                                                for token in field.tokens]
+                                         for name, indexer in field._token_indexers.items()}
+            else:
+                field.index(vocab)
+
+
+def main(data_path: str, reader_config: str, repeats: int) -> None:
+    reader_params = Params(json.loads(reader_config))
+    reader = DatasetReader.from_params(reader_params)
+
+    start = time.time()
+    dataset = reader.read(data_path)
+    print("Read {} instances in {:.2f}s".format(len(dataset.instances), time.time() - start))
+    vocab = Vocabulary.from_instances(dataset)
+
+    for _ in range(repeats):
+        start = time.time()
+        index_token_by_token(dataset.instances, vocab)
+        print("Token by token indexing: {:.2f}s".format(time.time() - start))
+
+        start = time.time()
+        dataset.index_instances(vocab)
+        print("Batched indexing: {:.2f}s".format(time.time() - start))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dataset indexing.")
+    parser.add_argument('data_path', type=str, help='The data to read and index.')
+    parser.add_argument('--reader-config', type=str,
+                        default=json.dumps({"type": "srl",
+                                            "token_indexers": {
+                                                    "tokens": {"type": "single_id",
+                                                               "lowercase_tokens": True},
+                                                    "token_characters": {"type": "characters"}
+                                            }}),
+                        help='A JSON DatasetReader configuration.')
+    parser.add_argument('--repeats', type=int, default=3, help='How many times to time each path.')
+    args = parser.parse_args()
+    main(args.data_path, args.reader_config, args.repeats)
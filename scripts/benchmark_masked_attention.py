@@ -0,0 +1,82 @@
+"""
+Times ``attention_util.masked_attention``, which computes the masked softmax of attention scores
+and the weighted sum of the rows they attend over in one autograd function, against calling
+``util.last_dim_softmax`` and ``util.weighted_sum``, and measures how much memory each needs, for
+the attention of a few models.
+
+Each measurement runs a forward and backward pass in a fresh process, and reports the increase
+in that process's peak resident memory, so the numbers include everything kept for the backward
+pass.
+
+    python scripts/benchmark_masked_attention.py --repeats 5
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import torch
+import torch.multiprocessing
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.nn import attention_util, util
+
+# The sizes of the scores and the matrix attended over, for each setting.
+SETTINGS = {
+        # The passage to question attention of BiDAF on SQuAD.
+        'bidaf': ((40, 400, 30), (40, 30, 200)),
+        # The attention of the decomposable attention model, or of a self attention layer.
+        'sentence_pair': ((32, 300, 300), (32, 300, 200)),
+        # The attention over the words of each span of the coreference model.
+        'coref_span_heads': ((1, 4000, 10), (1, 4000, 10, 400)),
+}
+
+
+def measure(setting: str, fused: bool, args: argparse.Namespace, results) -> None:
+    torch.manual_seed(0)
+    scores_size, matrix_size = SETTINGS[setting]
+    scores = Variable(torch.randn(*scores_size), requires_grad=True)
+    matrix = Variable(torch.randn(*matrix_size), requires_grad=True)
+    # Each row of the matrix is masked with probability 0.2.
+    mask = Variable(torch.bernoulli(torch.ones(*matrix_size[:-1]) * 0.8))
+    if fused:
+        def compute():
+            return attention_util.masked_attention(scores, matrix, mask)
+    else:
+        def compute():
+            return util.weighted_sum(matrix, util.last_dim_softmax(scores, mask))
+
+    start_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # One pass to warm up, before we start timing.
+    compute().sum().backward()
+    start = time.time()
+    for _ in range(args.repeats):
+        compute().sum().backward()
+    seconds = (time.time() - start) / args.repeats
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((seconds, (peak_memory - start_memory) / 1024))
+
+
+def main(args: argparse.Namespace) -> None:
+    context = torch.multiprocessing.get_context('spawn')
+    print("{:<18} {:>12} {:>12} {:>16} {:>16}".format("setting", "unfused (ms)", "fused",
+                                                      "unfused peak (MB)", "fused peak"))
+    for setting in SETTINGS:
+        measurements = []
+        for fused in [False, True]:
+            results = context.Queue()
+            process = context.Process(target=measure, args=(setting, fused, args, results))
+            process.start()
+            measurements.append(results.get())
+            process.join()
+        (unfused_seconds, unfused_memory), (seconds, memory) = measurements
+        print("{:<18} {:>12.1f} {:>12.1f} {:>16.0f} {:>16.0f}".format(setting, unfused_seconds * 1000,
+                                                                      seconds * 1000, unfused_memory, memory))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the fused masked attention.")
+    parser.add_argument('--repeats', type=int, default=5)
+    main(parser.parse_args())
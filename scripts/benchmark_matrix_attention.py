@@ -0,0 +1,88 @@
+"""
+Times ``MatrixAttention`` with each similarity function, and measures how much memory it needs,
+comparing tiling the two matrices to ``(batch_size, num_rows_1, num_rows_2, embedding_dim)`` and
+calling the similarity function on them (which is what ``SimilarityFunction.matrix_similarity``
+does by default) with the decomposed ``matrix_similarity`` each similarity function implements.
+
+Each measurement runs a forward and backward pass in a fresh process, and reports the increase
+in that process's peak resident memory, so the numbers include everything kept for the backward
+pass.  The defaults are the sizes of a BiDAF batch on SQuAD.
+
+    python scripts/benchmark_matrix_attention.py --batch-size 40 --passage-length 400
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import torch
+import torch.multiprocessing
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.similarity_functions import (BilinearSimilarity, CosineSimilarity, DotProductSimilarity,
+                                                   LinearSimilarity, MultiHeadedSimilarity, SimilarityFunction)
+
+
+def build_similarity_function(name: str, dim: int) -> SimilarityFunction:
+    if name == 'dot_product':
+        return DotProductSimilarity()
+    elif name == 'cosine':
+        return CosineSimilarity()
+    elif name == 'bilinear':
+        return BilinearSimilarity(dim, dim)
+    elif name == 'linear':
+        return LinearSimilarity(dim, dim, combination='x,y,x*y')
+    else:
+        return MultiHeadedSimilarity(num_heads=4, tensor_1_dim=dim)
+
+
+def measure(name: str, tiled: bool, args: argparse.Namespace, results) -> None:
+    torch.manual_seed(0)
+    similarity_function = build_similarity_function(name, args.dim)
+    matrix_1 = Variable(torch.rand(args.batch_size, args.passage_length, args.dim), requires_grad=True)
+    matrix_2 = Variable(torch.rand(args.batch_size, args.question_length, args.dim), requires_grad=True)
+    if tiled:
+        def compute():
+            return SimilarityFunction.matrix_similarity(similarity_function, matrix_1, matrix_2)
+    else:
+        def compute():
+            return similarity_function.matrix_similarity(matrix_1, matrix_2)
+
+    start_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # One pass to warm up, before we start timing.
+    compute().sum().backward()
+    start = time.time()
+    for _ in range(args.repeats):
+        compute().sum().backward()
+    seconds = (time.time() - start) / args.repeats
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((seconds, (peak_memory - start_memory) / 1024))
+
+
+def main(args: argparse.Namespace) -> None:
+    context = torch.multiprocessing.get_context('spawn')
+    print("{:<12} {:>12} {:>12} {:>16} {:>16}".format("similarity", "tiled (ms)", "decomposed",
+                                                      "tiled peak (MB)", "decomposed peak"))
+    for name in ['dot_product', 'cosine', 'bilinear', 'linear', 'multiheaded']:
+        measurements = []
+        for tiled in [True, False]:
+            results = context.Queue()
+            process = context.Process(target=measure, args=(name, tiled, args, results))
+            process.start()
+            measurements.append(results.get())
+            process.join()
+        (tiled_seconds, tiled_memory), (seconds, memory) = measurements
+        print("{:<12} {:>12.1f} {:>12.1f} {:>16.0f} {:>16.0f}".format(name, tiled_seconds * 1000, seconds * 1000,
+                                                                      tiled_memory, memory))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MatrixAttention similarity functions.")
+    parser.add_argument('--batch-size', type=int, default=40)
+    parser.add_argument('--passage-length', type=int, default=400)
+    parser.add_argument('--question-length', type=int, default=30)
+    parser.add_argument('--dim', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,75 @@
+"""
+Times the recurrent cells that loop over timesteps in python (``LstmCellWithProjection``,
+``AugmentedLstm`` and the bidirectional ``ElmoLstm`` built from the former) on a batch of
+variable length sequences, for inference and for a training step.  The default sizes are those of
+the original ELMo biLM.
+
+    python scripts/benchmark_recurrent_cells.py --batch-size 32 --max-length 40
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import torch
+from torch.autograd import Variable
+from torch.nn.utils.rnn import pack_padded_sequence
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.augmented_lstm import AugmentedLstm
+from allennlp.modules.elmo_lstm import ElmoLstm
+from allennlp.modules.lstm_cell_with_projection import LstmCellWithProjection
+
+
+def time_call(function, repeats: int) -> float:
+    function()
+    start = time.time()
+    for _ in range(repeats):
+        function()
+    return (time.time() - start) / repeats
+
+
+def main(args: argparse.Namespace) -> None:
+    torch.manual_seed(0)
+    numpy.random.seed(0)
+    lengths = sorted(numpy.random.randint(1, args.max_length + 1, args.batch_size).tolist(), reverse=True)
+    lengths[0] = args.max_length
+    inputs = torch.randn(args.batch_size, args.max_length, args.input_size)
+    mask = torch.LongTensor([[1] * length + [0] * (args.max_length - length) for length in lengths])
+
+    lstm_cell = LstmCellWithProjection(args.input_size, args.hidden_size, args.cell_size,
+                                       memory_cell_clip_value=3, state_projection_clip_value=3)
+    augmented_lstm = AugmentedLstm(args.input_size, args.hidden_size)
+    elmo_lstm = ElmoLstm(args.input_size, args.hidden_size, args.cell_size, num_layers=2,
+                         memory_cell_clip_value=3, state_projection_clip_value=3)
+    runs = [('LstmCellWithProjection', lambda variable: lstm_cell(variable, lengths)[0]),
+            ('AugmentedLstm', lambda variable: augmented_lstm(
+                    pack_padded_sequence(variable, lengths, batch_first=True))[1][0]),
+            ('ElmoLstm', lambda variable: elmo_lstm(variable, Variable(mask)))]
+
+    print("{:<24} {:>14} {:>14}".format("module", "inference (ms)", "training (ms)"))
+    for name, run in runs:
+        def inference():
+            run(Variable(inputs, volatile=True))
+
+        def training():
+            run(Variable(inputs, requires_grad=True)).sum().backward()
+        # The ElmoLstm keeps its states between batches, so every run would start from a different
+        # state.
+        elmo_lstm.reset_states()
+        inference_seconds = time_call(inference, args.repeats)
+        elmo_lstm.reset_states()
+        training_seconds = time_call(training, args.repeats)
+        print("{:<24} {:>14.1f} {:>14.1f}".format(name, inference_seconds * 1000, training_seconds * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark recurrent cells on CPU.")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-length', type=int, default=40)
+    parser.add_argument('--input-size', type=int, default=512)
+    parser.add_argument('--hidden-size', type=int, default=512)
+    parser.add_argument('--cell-size', type=int, default=4096)
+    parser.add_argument('--repeats', type=int, default=3)
+    main(parser.parse_args())
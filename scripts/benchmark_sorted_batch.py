@@ -0,0 +1,82 @@
+"""
+Times a stack of ``PytorchSeq2SeqWrapper`` LSTMs run over the same batch of variable length
+sequences in three ways: passing each of them the mask, so each sorts and packs its inputs and
+unsorts its outputs; passing each of them a ``SortedBatch`` computed once from the mask; and
+passing a ``PackedSequence`` from one to the next, so the batch is only sorted and unsorted once.
+
+    python scripts/benchmark_sorted_batch.py --batch-size 40 --max-length 200 --num-encoders 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import torch
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.encoder_base import SortedBatch
+from allennlp.modules.seq2seq_encoders import PytorchSeq2SeqWrapper
+
+
+def main(args: argparse.Namespace) -> None:
+    torch.manual_seed(0)
+    numpy.random.seed(0)
+    lengths = numpy.random.randint(1, args.max_length + 1, args.batch_size)
+    lengths[0] = args.max_length
+    inputs = torch.randn(args.batch_size, args.max_length, 2 * args.hidden_size)
+    mask = Variable(torch.from_numpy((numpy.arange(args.max_length)[None, :] < lengths[:, None]).astype('int64')))
+    encoders = [PytorchSeq2SeqWrapper(torch.nn.LSTM(2 * args.hidden_size, args.hidden_size,
+                                                    batch_first=True, bidirectional=True))
+                for _ in range(args.num_encoders)]
+
+    def with_masks(variable):
+        for encoder in encoders:
+            variable = encoder(variable, mask)
+        return variable
+
+    def with_sorted_batch(variable):
+        sorted_batch = SortedBatch(mask)
+        for encoder in encoders:
+            variable = encoder(variable, sorted_batch)
+        return variable
+
+    def with_packed_sequences(variable):
+        sorted_batch = SortedBatch(mask)
+        variable = sorted_batch.pack(variable)
+        for encoder in encoders:
+            variable = encoder(variable, sorted_batch)
+        return sorted_batch.unpack(variable)
+
+    runs = [("masks", with_masks),
+            ("a SortedBatch", with_sorted_batch),
+            ("packed sequences", with_packed_sequences)]
+    # The differences are small, so we interleave the runs, to spread any noise between them,
+    # and report the median.
+    times = {(name, training): [] for name, _ in runs for training in [False, True]}
+    for _ in range(args.repeats + 1):
+        for training in [False, True]:
+            for name, run in runs:
+                start = time.time()
+                output = run(Variable(inputs, volatile=not training, requires_grad=training))
+                if training:
+                    output.sum().backward()
+                times[(name, training)].append(time.time() - start)
+
+    print("{:<20} {:>14} {:>14}".format("encoders given", "inference (ms)", "training (ms)"))
+    for name, _ in runs:
+        # The first run of each is a warm up.
+        print("{:<20} {:>14.1f} {:>14.1f}".format(name,
+                                                  numpy.median(times[(name, False)][1:]) * 1000,
+                                                  numpy.median(times[(name, True)][1:]) * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sharing the sorting of a batch between encoders.")
+    parser.add_argument('--batch-size', type=int, default=40)
+    parser.add_argument('--max-length', type=int, default=200)
+    parser.add_argument('--hidden-size', type=int, default=100)
+    parser.add_argument('--num-encoders', type=int, default=3)
+    parser.add_argument('--repeats', type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,59 @@
+"""
+Times a training step of a large trainable ``Embedding``, with a linear layer on top, as the
+``Trainer`` takes it, with ``grad_norm`` set: with dense gradients and Adam, which update every row
+of the embedding at every step, and with sparse gradients and ``DenseSparseAdam``, which only
+update the rows looked up in the batch.
+
+    python scripts/benchmark_sparse_embedding_training.py --vocab-size 1000000 --embedding-dim 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import torch
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.token_embedders import Embedding
+from allennlp.training.optimizers import DenseSparseAdam
+from allennlp.training.trainer import sparse_clip_norm
+
+
+def main(args: argparse.Namespace) -> None:
+    torch.manual_seed(0)
+    numpy.random.seed(0)
+    batches = [torch.from_numpy(numpy.minimum(numpy.random.zipf(1.2, (args.batch_size, args.sequence_length)),
+                                              args.vocab_size - 1))
+               for _ in range(args.repeats + 1)]
+
+    runs = []
+    for name, sparse, optimizer_class in [("dense, Adam", False, torch.optim.Adam),
+                                          ("sparse, DenseSparseAdam", True, DenseSparseAdam)]:
+        model = torch.nn.Sequential(Embedding(args.vocab_size, args.embedding_dim, sparse=sparse),
+                                    torch.nn.Linear(args.embedding_dim, 1))
+        runs.append((name, model, optimizer_class(model.parameters())))
+
+    print("{:<24} {:>12}".format("gradients, optimizer", "step (ms)"))
+    for name, model, optimizer in runs:
+        times = []
+        for batch in batches:
+            start = time.time()
+            optimizer.zero_grad()
+            model(Variable(batch)).sum().backward()
+            sparse_clip_norm(model.parameters(), 5.0)
+            optimizer.step()
+            times.append(time.time() - start)
+        # The first step is a warm up, which also allocates the optimizer's state.
+        print("{:<24} {:>12.1f}".format(name, numpy.median(times[1:]) * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark training a large embedding with sparse gradients.")
+    parser.add_argument('--vocab-size', type=int, default=1000000)
+    parser.add_argument('--embedding-dim', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--sequence-length', type=int, default=40)
+    parser.add_argument('--repeats', type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,82 @@
+"""
+Times SRL prediction on sentences with many verbs, comparing running one instance per verb (which
+embeds a sentence once for each of its verbs) with embedding each sentence once and sharing that
+embedding between its verbs, as the ``SemanticRoleLabelerPredictor`` does by default.
+
+The model is built, untrained, from an experiment configuration, so that you can see the effect of
+different token embedders (characters, ELMo) without training anything, and the sentences and verbs
+come from a CoNLL formatted SRL directory.
+
+    python scripts/benchmark_srl_prediction.py tests/fixtures/srl/experiment.json \\
+            /path/to/conll-formatted-ontonotes-5.0/data/development
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.common import Params
+from allennlp.common.util import group_by_count
+from allennlp.data import DatasetReader, Token, Vocabulary
+from allennlp.models import Model
+from allennlp.service.predictors import SemanticRoleLabelerPredictor
+
+
+def main(config_file: str, data_path: str, min_verbs: int, batch_size: int, repeats: int) -> None:
+    params = Params.from_file(config_file)
+    reader = DatasetReader.from_params(params.pop('dataset_reader'))
+    dataset = reader.read(data_path)
+    vocab = Vocabulary.from_instances(dataset)
+    model = Model.from_params(vocab, params.pop('model'))
+    model.eval()
+    predictor = SemanticRoleLabelerPredictor(model, reader)
+
+    # The reader gives us one instance per verb, with the instances for the verbs of a sentence
+    # next to each other and sharing their tokens, so we can group them back into sentences.
+    sentences: List[Tuple[List[Token], List[int]]] = []
+    for instance in dataset.instances:
+        tokens = instance.fields['tokens'].tokens
+        if not sentences or sentences[-1][0] is not tokens:
+            sentences.append((tokens, []))
+        sentences[-1][1].extend(i for i, label in enumerate(instance.fields['verb_indicator'].labels)
+                                if label == 1)
+    sentences = [sentence for sentence in sentences if len(sentence[1]) >= min_verbs]
+    num_verbs = sum(len(verb_indices) for _, verb_indices in sentences)
+    print("Predicting {} verbs in {} sentences with at least {} verbs".format(num_verbs, len(sentences),
+                                                                               min_verbs))
+
+    for _ in range(repeats):
+        start = time.time()
+        for sentence_batch in group_by_count(sentences, batch_size, None):
+            instances = []
+            for tokens, verb_indices in [sentence for sentence in sentence_batch if sentence is not None]:
+                for verb_index in verb_indices:
+                    verb_labels = [0] * len(tokens)
+                    verb_labels[verb_index] = 1
+                    instances.append(reader.text_to_instance(tokens, verb_labels))
+            for instance_batch in group_by_count(instances, batch_size, None):
+                model.forward_on_instances([instance for instance in instance_batch if instance is not None],
+                                           cuda_device=-1)
+        print("One instance per verb: {:.2f}s".format(time.time() - start))
+
+        start = time.time()
+        for sentence_batch in group_by_count(sentences, batch_size, None):
+            # pylint: disable=protected-access
+            predictor._predict_sentence_frames([sentence for sentence in sentence_batch if sentence is not None],
+                                               max_frames_per_batch=batch_size, cuda_device=-1)
+        print("Shared sentence embeddings: {:.2f}s".format(time.time() - start))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SRL prediction.")
+    parser.add_argument('config_file', type=str, help='An SRL experiment configuration.')
+    parser.add_argument('data_path', type=str, help='CoNLL formatted SRL data to predict on.')
+    parser.add_argument('--min-verbs', type=int, default=4,
+                        help='Only predict on sentences with at least this many verbs.')
+    parser.add_argument('--batch-size', type=int, default=32,
+                        help='The number of sentences we predict at a time.')
+    parser.add_argument('--repeats', type=int, default=3, help='How many times to time each path.')
+    args = parser.parse_args()
+    main(args.config_file, args.data_path, args.min_verbs, args.batch_size, args.repeats)
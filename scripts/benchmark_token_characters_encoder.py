@@ -0,0 +1,79 @@
+"""
+Times ``TokenCharactersEncoder``, which only runs its character encoder on the tokens of a batch
+that aren't padding, against running the encoder on every token, as ``TimeDistributed`` does, on
+a batch of sentences of different lengths, for inference and for a training step.  The default
+character encoders are the CNN of the BiDAF and coreference models, and a bidirectional LSTM.
+
+    python scripts/benchmark_token_characters_encoder.py --batch-size 32 --max-length 40
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import torch
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.common import Params
+from allennlp.modules.seq2vec_encoders import Seq2VecEncoder
+from allennlp.modules.token_embedders import Embedding, TokenCharactersEncoder
+
+
+def time_call(function, repeats: int) -> float:
+    function()
+    start = time.time()
+    for _ in range(repeats):
+        function()
+    return (time.time() - start) / repeats
+
+
+def main(args: argparse.Namespace) -> None:
+    torch.manual_seed(0)
+    numpy.random.seed(0)
+    sentence_lengths = numpy.random.randint(args.min_length, args.max_length + 1, args.batch_size)
+    sentence_lengths[0] = args.max_length
+    token_characters = numpy.zeros((args.batch_size, args.max_length, args.max_word_length), dtype=numpy.int64)
+    for sentence, sentence_length in enumerate(sentence_lengths):
+        for token in range(sentence_length):
+            word_length = numpy.random.randint(1, args.max_word_length + 1)
+            token_characters[sentence, token, :word_length] = numpy.random.randint(1, 262, word_length)
+    token_characters = torch.from_numpy(token_characters)
+    padding = 1 - sentence_lengths.sum() / (args.batch_size * args.max_length)
+    print("{:.0%} of the tokens are padding".format(padding))
+
+    encoders = [('cnn', Seq2VecEncoder.from_params(Params({"type": "cnn", "embedding_dim": 16,
+                                                           "num_filters": 100, "ngram_filter_sizes": [5]}))),
+                ('lstm', Seq2VecEncoder.from_params(Params({"type": "lstm", "input_size": 16,
+                                                            "hidden_size": 50, "bidirectional": True})))]
+
+    print("{:<8} {:>20} {:>16} {:>20} {:>16}".format("encoder", "every token (ms)", "real tokens",
+                                                     "every token, train", "real tokens"))
+    for name, character_encoder in encoders:
+        encoder = TokenCharactersEncoder(Embedding(262, 16), character_encoder)
+
+        def every_token(variable):
+            # pylint: disable=protected-access
+            return encoder._encoder(encoder._embedding(variable), (variable != 0).long())
+
+        times = []
+        for training in [False, True]:
+            for run in [every_token, encoder]:
+                def call():
+                    # pylint: disable=cell-var-from-loop
+                    output = run(Variable(token_characters, volatile=not training))
+                    if training:
+                        output.sum().backward()
+                times.append(time_call(call, args.repeats) * 1000)
+        print("{:<8} {:>20.1f} {:>16.1f} {:>20.1f} {:>16.1f}".format(name, *times))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TokenCharactersEncoder on padded batches.")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--min-length', type=int, default=10)
+    parser.add_argument('--max-length', type=int, default=40)
+    parser.add_argument('--max-word-length', type=int, default=15)
+    parser.add_argument('--repeats', type=int, default=10)
+    main(parser.parse_args())
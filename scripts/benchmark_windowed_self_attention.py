@@ -0,0 +1,73 @@
+"""
+Times ``MultiHeadSelfAttention`` attending over every position, against attending within an
+``attention_window`` (plus a global first position), and measures how much memory each needs, for
+a forward and backward pass over sequences of increasing length.  Attending over every position
+takes memory and time quadratic in the length, while the windowed attention is linear.
+
+Each measurement runs in a fresh process, and reports the increase in that process's peak resident
+memory, so the numbers include everything kept for the backward pass.
+
+    python scripts/benchmark_windowed_self_attention.py --lengths 512 1024 2048 4096 --attention-window 64
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import torch
+import torch.multiprocessing
+from torch.autograd import Variable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.modules.seq2seq_encoders import MultiHeadSelfAttention
+
+
+def measure(length: int, attention_window: int, args: argparse.Namespace, results) -> None:
+    torch.manual_seed(0)
+    attention = MultiHeadSelfAttention(num_heads=args.num_heads,
+                                       input_dim=args.input_dim,
+                                       attention_dim=args.input_dim // args.num_heads,
+                                       values_dim=args.input_dim // args.num_heads,
+                                       attention_window=attention_window,
+                                       num_global_tokens=1 if attention_window else 0)
+    inputs = Variable(torch.randn(args.batch_size, length, args.input_dim), requires_grad=True)
+    mask = Variable(torch.ones(args.batch_size, length))
+
+    start_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # One pass to warm up, before we start timing.
+    attention(inputs, mask).sum().backward()
+    start = time.time()
+    for _ in range(args.repeats):
+        attention(inputs, mask).sum().backward()
+    seconds = (time.time() - start) / args.repeats
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((seconds, (peak_memory - start_memory) / 1024))
+
+
+def main(args: argparse.Namespace) -> None:
+    context = torch.multiprocessing.get_context('spawn')
+    print("{:<8} {:>12} {:>14} {:>16} {:>16}".format("length", "full (ms)", "windowed (ms)",
+                                                     "full peak (MB)", "windowed peak"))
+    for length in args.lengths:
+        measurements = []
+        for attention_window in [None, args.attention_window]:
+            results = context.Queue()
+            process = context.Process(target=measure, args=(length, attention_window, args, results))
+            process.start()
+            measurements.append(results.get())
+            process.join()
+        (full_seconds, full_memory), (seconds, memory) = measurements
+        print("{:<8} {:>12.1f} {:>14.1f} {:>16.0f} {:>16.0f}".format(length, full_seconds * 1000, seconds * 1000,
+                                                                     full_memory, memory))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark windowed self attention on long sequences.")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[512, 1024, 2048, 4096])
+    parser.add_argument('--attention-window', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--input-dim', type=int, default=128)
+    parser.add_argument('--num-heads', type=int, default=4)
+    parser.add_argument('--repeats', type=int, default=3)
+    main(parser.parse_args())
@@ -20,12 +20,6 @@ MODULES_THAT_NEED_NO_DOCS: Set[str] = {
         'allennlp.custom_extensions._ext',
         'allennlp.custom_extensions._ext.highway_lstm_layer',
         'allennlp.custom_extensions.build',
-
-        # TODO(joelgrus): Figure out how to make these docs build;
-        # the cffi part is causing problems.
-        'allennlp.modules.alternating_highway_lstm',
-        # Private base class, no docs needed.
-        'allennlp.modules.encoder_base'
 }
 
 DOCS_THAT_NEED_NO_MODULES: Set[str] = {
@@ -0,0 +1,51 @@
+"""
+Measures how much memory the instances from a dataset reader keep alive, and how much of that
+is taken up by their tokens.  We read the data with ``tracemalloc`` running and report the
+memory that's still allocated once reading has finished.
+
+By default this reads SQuAD with the ``SquadReader``; pass ``--reader-config`` to use another
+reader, e.g. ``'{"type": "srl"}'`` for a CoNLL formatted OntoNotes directory.
+
+    python scripts/measure_token_memory.py /path/to/squad/train-v1.1.json
+    python scripts/measure_token_memory.py /path/to/conll-formatted-ontonotes-5.0/data/train \\
+            --reader-config '{"type": "srl"}'
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir))))
+from allennlp.common import Params
+from allennlp.data import DatasetReader
+from allennlp.data.fields import TextField
+
+
+def main(data_path: str, reader_config: str) -> None:
+    reader = DatasetReader.from_params(Params(json.loads(reader_config)))
+    gc.collect()
+    tracemalloc.start()
+    dataset = reader.read(data_path)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    num_tokens = sum(len(field.tokens)
+                     for instance in dataset.instances
+                     for field in instance.fields.values()
+                     if isinstance(field, TextField))
+    print("Read {} instances with {} tokens".format(len(dataset.instances), num_tokens))
+    print("Retained memory: {:.1f} MB".format(retained / 2 ** 20))
+    print("Peak memory while reading: {:.1f} MB".format(peak / 2 ** 20))
+    print("Retained bytes per token: {:.0f}".format(retained / max(num_tokens, 1)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the memory used by a dataset's tokens.")
+    parser.add_argument('data_path', type=str, help='The data to read.')
+    parser.add_argument('--reader-config', type=str, default=json.dumps({"type": "squad"}),
+                        help='A JSON DatasetReader configuration.')
+    args = parser.parse_args()
+    main(args.data_path, args.reader_config)
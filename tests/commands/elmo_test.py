@@ -0,0 +1,81 @@
+# pylint: disable=invalid-name,no-self-use,protected-access
+import argparse
+import os
+
+import h5py
+import numpy
+from torch.autograd import Variable
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.commands.elmo import Elmo, sentence_batches
+from allennlp.modules.elmo import _ElmoBiLm, batch_to_ids
+
+FIXTURES = os.path.join('tests', 'fixtures', 'elmo')
+
+
+class TestElmoCommand(AllenNlpTestCase):
+    def setUp(self):
+        super(TestElmoCommand, self).setUp()
+        self.options_file = os.path.join(FIXTURES, 'options.json')
+        self.weight_file = os.path.join(FIXTURES, 'lm_weights.hdf5')
+        self.sentences = [['The', 'sentence', '.'],
+                          ['ELMo', 'helps', 'disambiguate', 'ELMo', 'from', 'Elmo', '.'],
+                          [],
+                          ['A', 'third', 'one', '.'],
+                          ['Short']]
+        self.input_file = os.path.join(self.TEST_DIR, 'sentences.txt')
+        with open(self.input_file, 'w') as sentences:
+            for sentence in self.sentences:
+                sentences.write(' '.join(sentence) + '\n')
+        self.output_file = os.path.join(self.TEST_DIR, 'activations.hdf5')
+
+    def run_command(self, *extra_args):
+        parser = argparse.ArgumentParser(description="Testing")
+        subparsers = parser.add_subparsers(title='Commands', metavar='')
+        Elmo().add_subparser('elmo', subparsers)
+        args = parser.parse_args(['elmo', self.input_file, self.output_file,
+                                  '--options-file', self.options_file,
+                                  '--weight-file', self.weight_file,
+                                  '--tokens-per-batch', '20',
+                                  '--sort-window', '3'] + list(extra_args))
+        args.func(args)
+
+    def check_activations(self, keys):
+        elmo_bilm = _ElmoBiLm(self.options_file, self.weight_file)
+        with h5py.File(self.output_file, 'r') as activations:
+            for key in keys:
+                sentence = self.sentences[int(key)]
+                elmo_bilm._elmo_lstm.reset_states()
+                expected = elmo_bilm(Variable(batch_to_ids([sentence])))['activations']
+                expected = numpy.stack([layer.data.numpy()[0, 1:-1] for layer in expected])
+                assert activations[key].shape == (3, len(sentence), 32)
+                numpy.testing.assert_array_almost_equal(activations[key][...], expected, decimal=5)
+
+    def test_elmo_writes_the_activations_of_every_sentence(self):
+        self.run_command()
+        with h5py.File(self.output_file, 'r') as activations:
+            assert set(activations.keys()) == {'0', '1', '2', '3', '4'}
+        self.check_activations(['0', '1', '2', '3', '4'])
+
+    def test_elmo_skips_sentences_that_are_already_written(self):
+        with h5py.File(self.output_file, 'w') as activations:
+            activations.create_dataset('1', data=numpy.zeros((1,)))
+        self.run_command()
+        with h5py.File(self.output_file, 'r') as activations:
+            assert set(activations.keys()) == {'0', '1', '2', '3', '4'}
+            numpy.testing.assert_array_equal(activations['1'][...], numpy.zeros((1,)))
+        self.check_activations(['0', '2', '3', '4'])
+
+    def test_elmo_with_several_workers_writes_one_file(self):
+        self.run_command('--workers-per-device', '2')
+        with h5py.File(self.output_file, 'r') as activations:
+            assert set(activations.keys()) == {'0', '1', '2', '3', '4'}
+        self.check_activations(['0', '1', '2', '3', '4'])
+
+    def test_sentence_batches_sorts_within_the_window_and_respects_the_token_budget(self):
+        sentences = [(str(i), ['word'] * length) for i, length in enumerate([5, 1, 3, 2, 8, 0, 4])]
+        batches = list(sentence_batches(sentences, tokens_per_batch=12, sort_window=4, skip_keys={'3'}))
+        # The first window is sentences 0, 1, 2 and 4, because 3 is skipped.
+        assert [[key for key, _ in batch] for batch in batches] == [['1', '2'], ['0'], ['4'], ['5', '6']]
+        for batch in batches:
+            assert len(batch) * (max(len(tokens) for _, tokens in batch) + 2) <= 12
@@ -0,0 +1,45 @@
+# pylint: disable=invalid-name,no-self-use
+import argparse
+import os
+
+import h5py
+import numpy
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.commands.elmo_vocab import ElmoVocab
+from allennlp.data.token_indexers.elmo_indexer import ELMoCharacterMapper
+
+FIXTURES = os.path.join('tests', 'fixtures', 'elmo')
+
+
+class TestElmoVocab(AllenNlpTestCase):
+    def test_elmo_vocab_from_args(self):
+        vocab_file = os.path.join(self.TEST_DIR, 'tokens.txt')
+        output_file = os.path.join(self.TEST_DIR, 'token_embeddings.hdf5')
+        # The last two tokens are truncated to the same characters, so they share an embedding.
+        tokens = ['The', 'sentence', '.', 'a' * 60, 'a' * 70]
+        with open(vocab_file, 'w') as vocab:
+            vocab.write('\n'.join(tokens) + '\n')
+
+        parser = argparse.ArgumentParser(description="Testing")
+        subparsers = parser.add_subparsers(title='Commands', metavar='')
+        ElmoVocab().add_subparser('elmo-vocab', subparsers)
+        args = parser.parse_args(['elmo-vocab', vocab_file, output_file,
+                                  '--options-file', os.path.join(FIXTURES, 'options.json'),
+                                  '--weight-file', os.path.join(FIXTURES, 'lm_weights.hdf5'),
+                                  '--batch-size', '2'])
+        args.func(args)
+
+        with h5py.File(output_file, 'r') as table:
+            char_ids = table['char_ids'][...]
+            embeddings = table['embeddings'][...]
+            written_tokens = [token.decode('utf-8') if isinstance(token, bytes) else token
+                              for token in table['tokens'][...]]
+
+        # The four distinct words, the sentence boundaries and padding.
+        assert char_ids.shape == (7, ELMoCharacterMapper.max_word_length)
+        assert embeddings.shape == (7, 16)
+        assert set(written_tokens) == {'The', 'sentence', '.', 'a' * 60, '<S>', '</S>', ''}
+        assert not char_ids[written_tokens.index('')].any()
+        numpy.testing.assert_array_equal(char_ids[written_tokens.index('The')],
+                                         ELMoCharacterMapper.convert_word_to_char_ids('The'))
@@ -31,8 +31,8 @@ class TestCorefReader(AllenNlpTestCase):
                         'attention', '.', 'The', 'world', "'s", 'fifth', 'Disney', 'park',
                         'will', 'soon', 'open', 'to', 'the', 'public', 'here', '.']
 
-        span_starts = fields["span_starts"].field_list
-        span_ends = fields["span_ends"].field_list
+        span_starts = fields["spans"].span_starts.tolist()
+        span_ends = fields["spans"].span_ends.tolist()
 
         candidate_mentions = self.check_candidate_mentions_are_well_defined(span_starts, span_ends, text)
 
@@ -56,8 +56,8 @@ class TestCorefReader(AllenNlpTestCase):
                         'Hong', 'Kong', 'people', 'will', 'utilize', 'all', 'resources', 'they', 'have',
                         'created', 'for', 'developing', 'the', 'Hong', 'Kong', 'tourism', 'industry', '.']
 
-        span_starts = fields["span_starts"].field_list
-        span_ends = fields["span_ends"].field_list
+        span_starts = fields["spans"].span_starts.tolist()
+        span_ends = fields["spans"].span_ends.tolist()
 
         candidate_mentions = self.check_candidate_mentions_are_well_defined(span_starts, span_ends, text)
 
@@ -76,10 +76,32 @@ class TestCorefReader(AllenNlpTestCase):
         candidate_mentions = []
         for start, end in zip(span_starts, span_ends):
             # Spans are inclusive.
-            text_span = text[start.sequence_index: end.sequence_index + 1]
+            text_span = text[start: end + 1]
             candidate_mentions.append(text_span)
 
         # Check we aren't considering zero length spans and all
         # candidate spans are less than what we specified
         assert all([self.span_width >= len(x) > 0 for x in candidate_mentions])  # pylint: disable=len-as-condition
         return candidate_mentions
+
+    def test_text_to_instance_enumerates_spans_within_sentences(self):
+        conll_reader = ConllCorefReader(max_span_width=2)
+        instance = conll_reader.text_to_instance([["A", "b", "c"], ["D"], [], ["e", "f"]],
+                                                 [[(0, 1), (3, 3), (0, 2)], [(4, 5)]])
+        spans = list(zip(instance.fields["spans"].span_starts.tolist(),
+                         instance.fields["spans"].span_ends.tolist()))
+        assert spans == [(0, 0), (0, 1), (1, 1), (1, 2), (2, 2), (3, 3), (4, 4), (4, 5), (5, 5)]
+        # (0, 2) is too wide to be a candidate span, so it isn't labelled.
+        assert instance.fields["span_labels"].labels == [-1, 0, -1, -1, -1, 0, -1, 1, -1]
+
+    def test_text_to_instance_can_leave_enumerating_spans_to_the_model(self):
+        conll_reader = ConllCorefReader(max_span_width=2, enumerate_spans=False)
+        instance = conll_reader.text_to_instance([["A", "b", "c"], ["D"], [], ["e", "f"]],
+                                                 [[(0, 1), (3, 3), (0, 2)], [(4, 5)]])
+        assert "spans" not in instance.fields
+        assert "span_labels" not in instance.fields
+        assert instance.fields["sentence_ids"].labels == [0, 0, 0, 1, 3, 3]
+        gold_mentions = instance.fields["gold_mentions"]
+        assert list(zip(gold_mentions.span_starts.tolist(), gold_mentions.span_ends.tolist())) == \
+                [(0, 1), (3, 3), (0, 2), (4, 5)]
+        assert instance.fields["gold_mention_labels"].labels == [0, 0, 0, 1]
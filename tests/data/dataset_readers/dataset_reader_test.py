@@ -0,0 +1,46 @@
+# pylint: disable=no-self-use,invalid-name
+from allennlp.common import Params
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.data.dataset_readers import DatasetReader, SnliReader
+from allennlp.data.tokenizers import WordTokenizer
+
+
+class TestDatasetReader(AllenNlpTestCase):
+    texts = ["A person on a horse jumps over a broken down airplane.",
+             "",
+             "  Two  spaces, then   more words.  ",
+             "A person is at a diner, ordering an omelette."]
+
+    def assert_same_tokens(self, tokenizer, tokenized_texts):
+        tokenized_texts = list(tokenized_texts)
+        assert len(tokenized_texts) == len(self.texts)
+        for text, tokens in zip(self.texts, tokenized_texts):
+            expected_tokens = tokenizer.tokenize(text)
+            assert [token.text for token in tokens] == [token.text for token in expected_tokens]
+            assert [token.idx for token in tokens] == [token.idx for token in expected_tokens]
+
+    def test_batch_tokenize_matches_tokenize(self):
+        tokenizer = WordTokenizer()
+        reader = SnliReader()
+        reader.tokenization_chunk_size = 3
+        self.assert_same_tokens(tokenizer, reader.batch_tokenize(tokenizer, iter(self.texts)))
+
+    def test_batch_tokenize_with_several_workers_matches_tokenize(self):
+        tokenizer = WordTokenizer()
+        reader = SnliReader()
+        reader.tokenization_chunk_size = 1
+        reader.tokenization_workers = 2
+        self.assert_same_tokens(tokenizer, reader.batch_tokenize(tokenizer, self.texts))
+
+    def test_from_params_sets_tokenization_options(self):
+        reader = DatasetReader.from_params(Params({"type": "snli",
+                                                   "tokenization_chunk_size": 10,
+                                                   "tokenization_workers": 2}))
+        assert isinstance(reader, SnliReader)
+        assert reader.tokenization_chunk_size == 10
+        assert reader.tokenization_workers == 2
+
+        dataset = reader.read('tests/fixtures/data/snli.jsonl')
+        assert len(dataset.instances) == 3
+        assert [token.text for token in dataset.instances[1].fields["hypothesis"].tokens] == \
+                ["A", "person", "is", "at", "a", "diner", ",", "ordering", "an", "omelette", "."]
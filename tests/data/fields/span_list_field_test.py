@@ -0,0 +1,51 @@
+# pylint: disable=no-self-use,invalid-name
+import numpy
+import pytest
+
+from allennlp.common.checks import ConfigurationError
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.data import Token
+from allennlp.data.fields import SequenceLabelField, SpanListField, TextField
+from allennlp.data.token_indexers import SingleIdTokenIndexer
+
+
+class TestSpanListField(AllenNlpTestCase):
+    def setUp(self):
+        super(TestSpanListField, self).setUp()
+        self.text = TextField([Token(t) for t in ["here", "is", "a", "sentence", "."]],
+                              {"words": SingleIdTokenIndexer("words")})
+
+    def test_get_padding_lengths_counts_spans(self):
+        span_field = SpanListField([0, 1, 3], [0, 2, 4], self.text)
+        assert span_field.get_padding_lengths() == {"num_spans": 3}
+        assert span_field.sequence_length() == 3
+
+    def test_as_tensor_pads_spans_with_minus_one(self):
+        span_field = SpanListField(numpy.array([0, 1, 3]), numpy.array([0, 2, 4]), self.text)
+        tensor = span_field.as_tensor({"num_spans": 5}).data.cpu().numpy()
+        numpy.testing.assert_array_equal(tensor, numpy.array([[0, 0], [1, 2], [3, 4], [-1, -1], [-1, -1]]))
+
+    def test_empty_field_pads_to_all_minus_one(self):
+        empty_field = SpanListField([0], [1], self.text).empty_field()
+        assert empty_field.sequence_length() == 0
+        tensor = empty_field.as_tensor({"num_spans": 2}).data.cpu().numpy()
+        numpy.testing.assert_array_equal(tensor, numpy.array([[-1, -1], [-1, -1]]))
+
+    def test_batch_tensors_stacks_padded_spans(self):
+        fields = [SpanListField([0, 1], [1, 1], self.text), SpanListField([2], [4], self.text)]
+        padding_lengths = {"num_spans": 2}
+        batched = fields[0].batch_tensors([field.as_tensor(padding_lengths) for field in fields])
+        numpy.testing.assert_array_equal(batched.data.cpu().numpy(),
+                                         numpy.array([[[0, 1], [1, 1]], [[2, 4], [-1, -1]]]))
+
+    def test_can_be_labelled_with_a_sequence_label_field(self):
+        span_field = SpanListField([0, 1], [1, 1], self.text)
+        labels = SequenceLabelField([3, -1], span_field)
+        tensor = labels.as_tensor({"num_tokens": 3}).data.cpu().numpy()
+        numpy.testing.assert_array_equal(tensor, numpy.array([3, -1, 0]))
+
+    def test_raises_on_malformed_spans(self):
+        with pytest.raises(ConfigurationError):
+            _ = SpanListField([0, 1], [1], self.text)
+        with pytest.raises(ConfigurationError):
+            _ = SpanListField([2], [1], self.text)
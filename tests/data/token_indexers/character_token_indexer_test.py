@@ -43,3 +43,17 @@ class CharacterTokenIndexerTest(AllenNlpTestCase):
         indexer = TokenCharactersIndexer("characters")
         indices = indexer.token_to_indices(Token("sentential"), vocab)
         assert indices == [3, 4, 5, 6, 4, 5, 6, 1, 1, 1]
+
+    def test_tokens_to_indices_matches_token_to_indices(self):
+        vocab = Vocabulary()
+        vocab.add_token_to_namespace("a", namespace="characters")
+        vocab.add_token_to_namespace("b", namespace="characters")
+        tokens = [Token("ab"), Token(""), Token("bca")]
+        indexer = TokenCharactersIndexer("characters")
+        indices = indexer.tokens_to_indices(tokens, vocab)
+        assert indices == [[2, 3], [], [3, 1, 2]]
+        assert indices == [indexer.token_to_indices(token, vocab) for token in tokens]
+
+        indexer = TokenCharactersIndexer("characters", CharacterTokenizer(byte_encoding='utf-8'))
+        indices = indexer.tokens_to_indices(tokens, vocab)
+        assert indices == [indexer.token_to_indices(token, vocab) for token in tokens]
@@ -2,6 +2,7 @@
 from allennlp.common.testing import AllenNlpTestCase
 from allennlp.data import Token, Vocabulary
 from allennlp.data.token_indexers import ELMoTokenCharactersIndexer
+from allennlp.data.token_indexers.elmo_indexer import ELMoCharacterMapper
 
 
 class TestELMoTokenCharactersIndexer(AllenNlpTestCase):
@@ -67,3 +68,29 @@ class TestELMoTokenCharactersIndexer(AllenNlpTestCase):
                                    0, 0, 0, 0, 0]]
 
         assert padded_tokens == expected_padded_tokens
+
+    def test_tokens_to_indices_matches_token_to_indices(self): # pylint: disable=invalid-name
+        indexer = ELMoTokenCharactersIndexer()
+        tokens = [Token(token) for token in ['<S>', 'the', 'cat', 'the', chr(256), '</S>']]
+        indices = indexer.tokens_to_indices(tokens, Vocabulary())
+        assert indices == [indexer.token_to_indices(token, Vocabulary()) for token in tokens]
+
+    def test_batch_to_char_ids_matches_indexer(self):
+        indexer = ELMoTokenCharactersIndexer()
+        batch = [['Second', '.'], [], ['<S>', 'a' * 60, '', 'Second', '</S>']]
+        char_ids = ELMoCharacterMapper.batch_to_char_ids(batch)
+        assert char_ids.shape == (3, 5, 50)
+        for sentence, sentence_char_ids in zip(batch, char_ids):
+            indices = indexer.tokens_to_indices([Token(word) for word in sentence], Vocabulary())
+            padded_indices = indexer.pad_token_sequence(indices, desired_num_tokens=5, padding_lengths={})
+            assert sentence_char_ids.tolist() == padded_indices
+
+        truncated = ELMoCharacterMapper.batch_to_char_ids(batch, desired_num_tokens=1)
+        assert truncated.shape == (3, 1, 50)
+        assert truncated[:, 0].tolist() == char_ids[:, 0].tolist()
+
+    def test_cached_char_ids_are_read_only(self):
+        char_ids = ELMoCharacterMapper.get_word_char_ids('cached')
+        assert char_ids is ELMoCharacterMapper.get_word_char_ids('cached')
+        assert not char_ids.flags.writeable
+        assert char_ids.tolist() == ELMoCharacterMapper.convert_word_to_char_ids('cached')
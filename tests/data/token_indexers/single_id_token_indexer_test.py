@@ -2,7 +2,7 @@
 from collections import defaultdict
 
 from allennlp.common.testing import AllenNlpTestCase
-from allennlp.data import Token
+from allennlp.data import Token, Vocabulary
 from allennlp.data.token_indexers import SingleIdTokenIndexer
 
 
@@ -24,3 +24,13 @@ class TestSingleIdTokenIndexer(AllenNlpTestCase):
         indexer = SingleIdTokenIndexer("words")
         padded_tokens = indexer.pad_token_sequence([1, 2, 3, 4, 5], 10, {})
         assert padded_tokens == [1, 2, 3, 4, 5, 0, 0, 0, 0, 0]
+
+    def test_tokens_to_indices_matches_token_to_indices(self):
+        vocab = Vocabulary()
+        vocab.add_token_to_namespace("hello", namespace="words")
+        vocab.add_token_to_namespace("world", namespace="words")
+        indexer = SingleIdTokenIndexer("words", lowercase_tokens=True)
+        tokens = [Token("Hello"), Token("unknown"), Token("world"), Token("hash", text_id=17)]
+        indices = indexer.tokens_to_indices(tokens, vocab)
+        assert indices == [2, 1, 3, 17]
+        assert indices == [indexer.token_to_indices(token, vocab) for token in tokens]
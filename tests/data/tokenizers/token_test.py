@@ -0,0 +1,28 @@
+# pylint: disable=no-self-use,invalid-name
+import pickle
+
+import pytest
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.data.tokenizers import Token
+
+
+class TestToken(AllenNlpTestCase):
+    def test_token_has_no_dict(self):
+        token = Token("word", idx=3)
+        assert not hasattr(token, '__dict__')
+        with pytest.raises(AttributeError):
+            token.some_other_attribute = 1  # pylint: disable=assigning-non-slot
+
+    def test_strings_are_interned(self):
+        first = Token("".join(["wo", "rd"]), tag="".join(["N", "N"]))
+        second = Token("".join(["w", "ord"]), tag="".join(["NN"]))
+        assert first.text is second.text
+        assert first.tag_ is second.tag_
+
+    def test_pickling_keeps_fields_and_interns_strings(self):
+        token = Token("word", idx=3, pos="NOUN", tag="NN", dep="nsubj", ent_type="ORG", text_id=7)
+        unpickled = pickle.loads(pickle.dumps(token))
+        for field in ['text', 'idx', 'pos_', 'tag_', 'dep_', 'ent_type_', 'text_id']:
+            assert getattr(unpickled, field) == getattr(token, field)
+        assert unpickled.text is token.text
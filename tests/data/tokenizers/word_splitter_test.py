@@ -136,3 +136,14 @@ class TestSpacyWordSplitter(AllenNlpTestCase):
                            "e.g.", ",", "the", "store"]
         tokens = [t.text for t in self.word_splitter.split_words(sentence)]
         assert tokens == expected_tokens
+
+    def test_returns_compact_tokens(self):
+        sentence = "The jones' house, the jones' car"
+        tokens = self.word_splitter.split_words(sentence)
+        assert all(type(token) is Token for token in tokens)  # pylint: disable=unidiomatic-typecheck
+        assert tokens[0].text == "The"
+        # Repeated words share a single interned string.
+        assert tokens[1].text is tokens[6].text
+        batched_tokens = self.word_splitter.batch_split_words([sentence])[0]
+        assert all(type(token) is Token for token in batched_tokens)  # pylint: disable=unidiomatic-typecheck
+        assert [(t.text, t.idx) for t in batched_tokens] == [(t.text, t.idx) for t in tokens]
@@ -203,6 +203,19 @@ class TestVocabulary(AllenNlpTestCase):
         assert vocab.get_token_from_index(3, namespace='tags') == "B-ORG"
         assert vocab.get_token_from_index(4, namespace='tags') == "I-ORG"
 
+    def test_get_token_indices_maps_unknown_tokens_to_oov(self):
+        vocab = Vocabulary()
+        vocab.add_token_to_namespace("a")
+        vocab.add_token_to_namespace("b")
+        indices = vocab.get_token_indices(["b", "c", "a", "b"])
+        assert indices.tolist() == [3, 1, 2, 3]
+        assert vocab.get_token_indices([]).tolist() == []
+
+        vocab.add_token_to_namespace("O", namespace="tags")
+        assert vocab.get_token_indices(["O", "O"], namespace="tags").tolist() == [0, 0]
+        with pytest.raises(KeyError):
+            vocab.get_token_indices(["O", "B-PER"], namespace="tags")
+
     def test_saving_and_loading(self):
         # pylint: disable=protected-access
         vocab_dir = os.path.join(self.TEST_DIR, 'vocab_save')
@@ -293,3 +306,87 @@ class TestVocabulary(AllenNlpTestCase):
         # present apart from 'vocabulary_directory' and we aren't calling from_dataset.
         with pytest.raises(ConfigurationError):
             _ = Vocabulary.from_params(Params({"directory_path": vocab_dir, "min_count": 2}))
+
+    def test_saving_and_loading_binary_file(self):
+        # pylint: disable=protected-access
+        vocab_filename = os.path.join(self.TEST_DIR, 'vocabulary.bin')
+
+        vocab = Vocabulary(non_padded_namespaces=["a", "c"])
+        vocab.add_token_to_namespace("a0", namespace="a")  # non-padded, should start at 0
+        vocab.add_token_to_namespace("a1", namespace="a")
+        vocab.add_token_to_namespace("a2", namespace="a")
+        vocab.add_token_to_namespace("b3", namespace="b")  # padded, should start at 2
+        vocab.add_token_to_namespace("b2", namespace="b")
+        vocab.add_token_to_namespace("汉字\n", namespace="b")
+        vocab.get_vocab_size(namespace="c")  # creates an empty namespace
+
+        vocab.save_to_binary_file(vocab_filename)
+        for memory_map in [True, False]:
+            vocab2 = Vocabulary.from_binary_file(vocab_filename, memory_map=memory_map)
+            assert vocab2._non_padded_namespaces == ["a", "c"]
+
+            assert vocab2.get_vocab_size(namespace='a') == 3
+            assert vocab2.get_token_index('a1', namespace='a') == 1
+            assert vocab2.get_token_from_index(2, namespace='a') == 'a2'
+
+            assert vocab2.get_vocab_size(namespace='b') == 5
+            assert vocab2.get_token_index(vocab._padding_token, namespace='b') == 0
+            assert vocab2.get_token_index('b3', namespace='b') == 2
+            assert vocab2.get_token_index('b2', namespace='b') == 3
+            assert vocab2.get_token_index('汉字\n', namespace='b') == 4
+            assert vocab2.get_token_index('unseen', namespace='b') == 1
+            assert vocab2.get_token_from_index(4, namespace='b') == '汉字\n'
+            assert vocab2.get_vocab_size(namespace='c') == 0
+
+            for namespace in ["a", "b", "c"]:
+                assert (vocab.get_index_to_token_vocabulary(namespace) ==
+                        vocab2.get_index_to_token_vocabulary(namespace))
+                assert vocab._token_to_index[namespace] == vocab2._token_to_index[namespace]
+
+        # Binary namespaces are read-only, but adding a token still works.
+        assert vocab2.add_token_to_namespace("b3", namespace="b") == 2
+        assert vocab2.add_token_to_namespace("b4", namespace="b") == 5
+        assert vocab2.get_token_from_index(4, namespace='b') == '汉字\n'
+        assert vocab2.get_token_index('b4', namespace='b') == 5
+
+        # Memory-mapped namespaces can still be copied and pickled.
+        vocab3 = Vocabulary.from_binary_file(vocab_filename)
+        token_to_index = deepcopy(vocab3._token_to_index["b"])
+        assert token_to_index['b2'] == 3
+
+    def test_from_files_prefers_binary_file(self):
+        vocab_dir = os.path.join(self.TEST_DIR, 'vocab_save')
+        vocab = Vocabulary()
+        vocab.add_token_to_namespace("a", namespace="tokens")
+        vocab.save_to_files(vocab_dir)
+        vocab.add_token_to_namespace("b", namespace="tokens")
+        vocab.save_to_binary_file(os.path.join(vocab_dir, 'vocabulary.bin'))
+
+        vocab2 = Vocabulary.from_files(vocab_dir)
+        assert vocab2.get_token_index("b") == 3
+
+    def test_from_files_ignores_a_binary_file_older_than_the_text_files(self):
+        vocab_dir = os.path.join(self.TEST_DIR, 'vocab_save')
+        vocab = Vocabulary()
+        vocab.add_token_to_namespace("a", namespace="tokens")
+        vocab.save_to_files(vocab_dir)
+        binary_filename = os.path.join(vocab_dir, 'vocabulary.bin')
+        vocab.save_to_binary_file(binary_filename)
+        # Someone edits a text file after the binary file was written.
+        vocab.add_token_to_namespace("b", namespace="tokens")
+        vocab.save_to_files(vocab_dir)
+        binary_mtime = os.path.getmtime(binary_filename)
+        os.utime(binary_filename, (binary_mtime - 10, binary_mtime - 10))
+
+        vocab2 = Vocabulary.from_files(vocab_dir)
+        assert vocab2.get_token_index("b") == 3
+        assert vocab2.get_vocab_size("tokens") == vocab.get_vocab_size("tokens")
+        # The binary file isn't read as another namespace.
+        assert "vocabulary.bin" not in vocab2._index_to_token  # pylint: disable=protected-access
+
+    def test_from_binary_file_raises_on_other_files(self):
+        filename = os.path.join(self.TEST_DIR, 'not_a_vocab.bin')
+        with open(filename, 'wb') as not_a_vocab:
+            not_a_vocab.write(b'some other kind of file')
+        with pytest.raises(ConfigurationError):
+            Vocabulary.from_binary_file(filename)
@@ -3,11 +3,13 @@ import os
 import copy
 
 import torch
+from torch.autograd import Variable
 
 from allennlp.common import Params
 from allennlp.common.testing import AllenNlpTestCase
 from allennlp.commands.train import train_model
 from allennlp.models.archival import load_archive, archive_model
+from allennlp.modules.token_embedders.embedding import write_embedding_weight_file
 
 
 class ArchivalTest(AllenNlpTestCase):
@@ -93,3 +95,19 @@ class ArchivalTest(AllenNlpTestCase):
 
         # The validation data path should be the same though.
         assert params.get('validation_data_path') == 'tests/fixtures/data/sequence_tagging.tsv'
+
+    def test_loading_with_an_embedding_weight_file(self):
+        archive_path = 'tests/fixtures/decomposable_attention/serialization/model.tar.gz'
+        model = load_archive(archive_path).model
+        weight_name = '_text_field_embedder.token_embedder_tokens.weight'
+        weight_filename = os.path.join(self.TEST_DIR, 'weights.npy')
+        write_embedding_weight_file(model.state_dict()[weight_name].numpy(), weight_filename)
+
+        overrides = '{"model": {"text_field_embedder": {"tokens": {"weight_file": "%s"}}}}' % weight_filename
+        model2 = load_archive(archive_path, overrides=overrides).model
+
+        assert set(model2.state_dict().keys()) == set(model.state_dict().keys()) - {weight_name}
+        inputs = Variable(torch.LongTensor([[2, 5, 0]]))
+        # pylint: disable=protected-access
+        assert torch.equal(model._text_field_embedder({'tokens': inputs}).data,
+                           model2._text_field_embedder({'tokens': inputs}).data)
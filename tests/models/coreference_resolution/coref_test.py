@@ -1,8 +1,13 @@
-# pylint: disable=no-self-use,invalid-name
+# pylint: disable=no-self-use,invalid-name,protected-access
 
 import torch
 from torch.autograd import Variable
+from allennlp.common import Params
 from allennlp.common.testing import ModelTestCase
+from allennlp.data import DatasetReader
+from allennlp.data.dataset import Dataset
+from allennlp.data.dataset_readers import ConllCorefReader
+from allennlp.nn import util
 
 
 class CorefTest(ModelTestCase):
@@ -14,6 +19,68 @@ class CorefTest(ModelTestCase):
     def test_coref_model_can_train_save_and_load(self):
         self.ensure_model_can_train_save_and_load(self.param_file)
 
+    def test_enumerated_spans_and_labels_match_the_reader(self):
+        enumerating_reader = ConllCorefReader(max_span_width=5)
+        reader = ConllCorefReader(max_span_width=5, enumerate_spans=False)
+        expected = Dataset(enumerating_reader.read('tests/fixtures/coref/coref.gold_conll').instances)
+        dataset = Dataset(reader.read('tests/fixtures/coref/coref.gold_conll').instances)
+        for data in [expected, dataset]:
+            data.index_instances(self.vocab)
+        expected_tensors = expected.as_tensor_dict(expected.get_padding_lengths())
+        tensors = dataset.as_tensor_dict(dataset.get_padding_lengths())
+        assert "spans" not in tensors
+
+        text_mask = util.get_text_field_mask(tensors["text"]).float()
+        spans = self.model._enumerate_spans(tensors["sentence_ids"], text_mask)
+        span_labels = self.model._compute_enumerated_span_labels(tensors["gold_mentions"],
+                                                                 tensors["gold_mention_labels"],
+                                                                 tensors["sentence_ids"])
+        for i in range(spans.size(0)):
+            valid_spans = (spans[i, :, 0] >= 0).data.nonzero().view(-1)
+            num_expected_spans = int((expected_tensors["spans"][i, :, 0] >= 0).data.sum())
+            assert spans[i].data[valid_spans].tolist() == \
+                    expected_tensors["spans"][i].data[:num_expected_spans].tolist()
+            assert span_labels[i].data[valid_spans].tolist() == \
+                    expected_tensors["span_labels"][i].data[:num_expected_spans].tolist()
+
+    def test_padding_spans_are_kept_after_the_real_spans(self):
+        reader_params = Params.from_file(self.param_file)['dataset_reader']
+        reader_params['enumerate_spans'] = False
+        reader = DatasetReader.from_params(reader_params)
+        short_document = reader.text_to_instance([["Alice", "barked", "loudly"]])
+        long_document = reader.text_to_instance([["people"] * 20, ["animals"] * 20])
+        dataset = Dataset([short_document, long_document])
+        dataset.index_instances(self.vocab)
+        tensors = dataset.as_tensor_dict(dataset.get_padding_lengths())
+        self.model.eval()
+        output_dict = self.model(**tensors)
+
+        # The short document has 6 candidate spans, but we keep 16 for each document in the batch.
+        short_top_spans = output_dict["top_spans"][0].data
+        assert short_top_spans.size(0) == 16
+        # The real spans come first, in document order, so the padding spans after them are never
+        # their antecedents.
+        assert short_top_spans[:6].tolist() == [[0, 0], [0, 1], [0, 2], [1, 1], [1, 2], [2, 2]]
+        assert short_top_spans[6:].tolist() == [[0, 0]] * 10
+        assert output_dict["predicted_antecedents"][0].data[6:].tolist() == [-1] * 10
+
+    def test_prune_and_sort_spans_puts_padding_spans_last(self):
+        span_mask = Variable(torch.FloatTensor([[[1], [0], [1], [0]]]))
+        mention_scores = Variable(torch.FloatTensor([[[1.0], [0.0], [2.0], [0.0]]])) + span_mask.log()
+        top_span_indices = self.model._prune_and_sort_spans(mention_scores, span_mask, 4)
+        assert top_span_indices.data.tolist() == [[0, 2, 1, 3]]
+
+    def test_span_labels_ignore_mentions_crossing_sentences(self):
+        sentence_ids = Variable(torch.LongTensor([[0, 0, 1, 1]]))
+        gold_mentions = Variable(torch.LongTensor([[[0, 1], [1, 2], [-1, -1]]]))
+        gold_mention_labels = Variable(torch.LongTensor([[0, 1, 0]]))
+        span_labels = self.model._compute_enumerated_span_labels(gold_mentions,
+                                                                 gold_mention_labels,
+                                                                 sentence_ids)
+        expected_span_labels = [-1] * 20
+        expected_span_labels[1] = 0
+        assert span_labels.data[0].tolist() == expected_span_labels
+
     def test_decode(self):
 
         spans = torch.LongTensor([[1, 2],
@@ -4,7 +4,7 @@ import torch
 from torch.autograd import Variable
 
 from allennlp.common.testing import ModelTestCase
-from allennlp.nn.util import sequence_cross_entropy_with_logits
+from allennlp.nn.util import get_text_field_mask, sequence_cross_entropy_with_logits
 
 
 class SimpleSeq2SeqWithoutAttentionTest(ModelTestCase):
@@ -16,6 +16,27 @@ class SimpleSeq2SeqWithoutAttentionTest(ModelTestCase):
     def test_encoder_decoder_can_train_save_and_load(self):
         self.ensure_model_can_train_save_and_load(self.param_file)
 
+    def test_greedy_decoding_stops_once_every_sequence_has_ended(self):
+        self.model.eval()
+        source_tokens = self.dataset.as_tensor_dict()["source_tokens"]
+        output_dict = self.model(source_tokens)
+        predictions = output_dict["predictions"].data.numpy()
+        num_steps = predictions.shape[1]
+        assert num_steps <= self.model._max_decoding_steps  # pylint: disable=protected-access
+        assert output_dict["class_probabilities"].size(1) == num_steps
+        if num_steps < self.model._max_decoding_steps:  # pylint: disable=protected-access
+            assert all(self.model._end_index in row for row in predictions)  # pylint: disable=protected-access
+
+    def test_greedy_decoding_can_skip_class_probabilities(self):
+        self.model.eval()
+        source_tokens = self.dataset.as_tensor_dict()["source_tokens"]
+        expected_predictions = self.model(source_tokens)["predictions"].data.numpy()
+        self.model._output_class_probabilities = False  # pylint: disable=protected-access
+        output_dict = self.model(source_tokens)
+        assert "class_probabilities" not in output_dict
+        assert "logits" not in output_dict
+        numpy.testing.assert_array_equal(output_dict["predictions"].data.numpy(), expected_predictions)
+
     def test_loss_is_computed_correctly(self):
         batch_size = 5
         num_decoding_steps = 5
@@ -47,3 +68,54 @@ class SimpleSeq2SeqWithAttentionTest(ModelTestCase):
 
     def test_encoder_decoder_can_train_save_and_load(self):
         self.ensure_model_can_train_save_and_load(self.param_file)
+
+    def test_beam_search_with_a_single_beam_is_greedy(self):
+        # pylint: disable=protected-access
+        self.model.eval()
+        source_tokens = self.dataset.as_tensor_dict()["source_tokens"]
+        greedy_predictions = self.model(source_tokens)["predictions"].data.numpy()
+        self.model._beam_size = 1
+        encoder_outputs = self.model._encoder(self.model._source_embedder(source_tokens),
+                                              get_text_field_mask(source_tokens))
+        beam_predictions = self.model._beam_search(encoder_outputs,
+                                                   get_text_field_mask(source_tokens))["predictions"]
+        assert self.model.decode({"predictions": beam_predictions})["predicted_tokens"] == \
+                self.model.decode({"predictions": greedy_predictions})["predicted_tokens"]
+
+    def test_beam_search_finds_sequences_at_least_as_likely_as_greedy_decoding(self):
+        # pylint: disable=protected-access
+        self.model.eval()
+        self.model._max_decoding_steps = 6
+        encoder_outputs = Variable(torch.randn(3, 5, 10))
+        source_mask = Variable(torch.ones(3, 5).long())
+        source_mask[2, 3:] = 0
+        self.model._beam_size = 1
+        greedy_output = self.model._beam_search(encoder_outputs, source_mask)
+        self.model._beam_size = 4
+        beam_output = self.model._beam_search(encoder_outputs, source_mask)
+        assert beam_output["predictions"].size(0) == 3
+        assert beam_output["predictions"].size(1) <= 6
+        assert (beam_output["prediction_scores"] >= greedy_output["prediction_scores"] - 1e-5).data.all()
+
+    def test_beam_search_is_used_without_targets(self):
+        # pylint: disable=protected-access
+        self.model.eval()
+        self.model._beam_size = 3
+        output_dict = self.model(self.dataset.as_tensor_dict()["source_tokens"])
+        assert "prediction_scores" in output_dict
+        assert "predicted_tokens" in self.model.decode(output_dict)
+
+    def test_precomputed_encoder_outputs_give_the_same_decoder_input(self):
+        # pylint: disable=protected-access
+        encoder_outputs = Variable(torch.randn(3, 5, 10))
+        source_mask = Variable(torch.ones(3, 5).long())
+        source_mask[2, 3:] = 0
+        decoder_hidden = Variable(torch.randn(3, 10))
+        input_indices = Variable(torch.LongTensor([1, 2, 3]))
+        expected_input = self.model._prepare_decode_step_input(input_indices, decoder_hidden,
+                                                               encoder_outputs, source_mask)
+        precomputed_encoder_outputs = self.model._precompute_encoder_outputs(encoder_outputs)
+        decoder_input = self.model._prepare_decode_step_input(input_indices, decoder_hidden,
+                                                              encoder_outputs, source_mask,
+                                                              precomputed_encoder_outputs)
+        numpy.testing.assert_almost_equal(decoder_input.data.numpy(), expected_input.data.numpy())
@@ -5,6 +5,8 @@ import os
 from flaky import flaky
 import pytest
 import numpy
+import torch
+from torch.autograd import Variable
 
 from allennlp.common.testing import ModelTestCase
 from allennlp.common.params import Params
@@ -46,6 +48,23 @@ class SemanticRoleLabelerTest(ModelTestCase):
             assert len(prediction) == length
 
 
+    def test_sharing_sentence_embeddings_gives_the_same_output(self):
+        self.model.eval()
+        training_tensors = self.dataset.as_tensor_dict()
+        tokens = training_tensors["tokens"]
+        # Pretend that the first sentence has a verb at the position of every instance's verb.
+        sentence_indices = Variable(torch.zeros(tokens["tokens"].size(0)).long())
+        verb_indicator = training_tensors["verb_indicator"]
+        output = self.model(tokens={"tokens": tokens["tokens"][0:1]},
+                            verb_indicator=verb_indicator,
+                            sentence_indices=sentence_indices)
+        repeated_tokens = {"tokens": tokens["tokens"][0:1].expand_as(tokens["tokens"])}
+        expected_output = self.model(tokens=repeated_tokens, verb_indicator=verb_indicator)
+        numpy.testing.assert_almost_equal(output["class_probabilities"].data.numpy(),
+                                          expected_output["class_probabilities"].data.numpy(),
+                                          decimal=6)
+        assert output["mask"].data.tolist() == expected_output["mask"].data.tolist()
+
     def test_bio_tags_correctly_convert_to_conll_format(self):
         bio_tags = ["B-ARG-1", "I-ARG-1", "O", "B-V", "B-ARGM-ADJ", "O"]
         conll_tags = convert_bio_tags_to_conll_format(bio_tags)
@@ -0,0 +1,95 @@
+# pylint: disable=no-self-use,invalid-name
+import numpy
+import torch
+from torch.autograd import Variable
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
+
+from allennlp.common import Params
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.modules.alternating_highway_lstm import AlternatingHighwayLSTM
+from allennlp.modules.seq2seq_encoders import Seq2SeqEncoder
+from allennlp.modules.stacked_alternating_lstm import StackedAlternatingLstm
+
+
+class TestAlternatingHighwayLSTM(AllenNlpTestCase):
+    def test_cpu_implementation_matches_stacked_alternating_lstm(self):
+        for num_layers in [1, 3]:
+            baseline, model = self.get_models(input_size=5, hidden_size=7, num_layers=num_layers)
+            inputs = torch.randn(4, 6, 5)
+            lengths = [6, 6, 4, 1]
+            baseline_input = Variable(inputs.clone(), requires_grad=True)
+            model_input = Variable(inputs.clone(), requires_grad=True)
+
+            baseline_output, _ = baseline(pack_padded_sequence(baseline_input, lengths, batch_first=True))
+            baseline_output, _ = pad_packed_sequence(baseline_output, batch_first=True)
+            output, _ = model(pack_padded_sequence(model_input, lengths, batch_first=True))
+            output, _ = pad_packed_sequence(output, batch_first=True)
+            numpy.testing.assert_array_almost_equal(output.data.numpy(), baseline_output.data.numpy())
+
+            random_error = torch.randn(output.size())
+            baseline_output.backward(random_error)
+            output.backward(random_error)
+            numpy.testing.assert_array_almost_equal(model_input.grad.data.numpy(),
+                                                    baseline_input.grad.data.numpy())
+            weight_index = 0
+            bias_index = 0
+            for layer_index in range(num_layers):
+                layer = getattr(baseline, 'layer_%d' % layer_index)
+                for baseline_weight in [layer.input_linearity.weight, layer.state_linearity.weight]:
+                    weight_grad = model.weight.grad[weight_index:weight_index + baseline_weight.nelement()]
+                    weight_index += baseline_weight.nelement()
+                    numpy.testing.assert_array_almost_equal(
+                            weight_grad.view_as(baseline_weight.t()).t().data.numpy(),
+                            baseline_weight.grad.data.numpy(), decimal=5)
+                baseline_bias = layer.state_linearity.bias
+                bias_grad = model.bias.grad[bias_index:bias_index + baseline_bias.nelement()]
+                bias_index += baseline_bias.nelement()
+                numpy.testing.assert_array_almost_equal(bias_grad.data.numpy(),
+                                                        baseline_bias.grad.data.numpy(), decimal=5)
+
+    def test_recurrent_dropout_is_only_applied_in_training(self):
+        _, model = self.get_models(input_size=5, hidden_size=7, num_layers=2, dropout_probability=0.5)
+        inputs = pack_padded_sequence(Variable(torch.randn(3, 4, 5)), [4, 3, 3], batch_first=True)
+
+        def run_model():
+            output, _ = pad_packed_sequence(model(inputs)[0], batch_first=True)
+            return output.data.numpy()
+
+        model.eval()
+        output = run_model()
+        numpy.testing.assert_array_almost_equal(output, run_model())
+        assert (output[:, :3] == 0).sum() == 0
+
+        model.train()
+        # With a dropout probability of 0.5, some of the outputs of the last layer are dropped.
+        assert (run_model()[:, :3] == 0).sum() > 0
+
+    def test_can_construct_from_params(self):
+        params = Params({"type": "alternating_highway_lstm", "input_size": 5,
+                         "hidden_size": 7, "num_layers": 2})
+        encoder = Seq2SeqEncoder.from_params(params)
+        assert encoder.get_input_dim() == 5
+        assert encoder.get_output_dim() == 7
+        output = encoder(Variable(torch.randn(2, 3, 5)), Variable(torch.LongTensor([[1, 1, 1], [1, 1, 0]])))
+        assert list(output.size()) == [2, 3, 7]
+        numpy.testing.assert_array_equal(output.data[1, 2].numpy(), numpy.zeros(7))
+
+    @staticmethod
+    def get_models(input_size, hidden_size, num_layers, dropout_probability=0.0):
+        baseline = StackedAlternatingLstm(input_size, hidden_size, num_layers,
+                                          dropout_probability, use_input_projection_bias=False)
+        model = AlternatingHighwayLSTM(input_size, hidden_size, num_layers, dropout_probability)
+
+        # The flat weight holds the transposed weights of each layer.
+        weight_index = 0
+        bias_index = 0
+        for layer_index in range(num_layers):
+            layer = getattr(baseline, 'layer_%d' % layer_index)
+            for weight in [layer.input_linearity.weight, layer.state_linearity.weight]:
+                model.weight.data[weight_index:weight_index + weight.nelement()]\
+                    .view_as(weight.t()).copy_(weight.data.t())
+                weight_index += weight.nelement()
+            bias = layer.state_linearity.bias
+            model.bias.data[bias_index:bias_index + bias.nelement()].copy_(bias.data)
+            bias_index += bias.nelement()
+        return baseline, model
@@ -6,6 +6,7 @@ from torch.autograd import Variable
 
 from allennlp.common import Params
 from allennlp.modules import Attention
+from allennlp.modules.similarity_functions import BilinearSimilarity, LinearSimilarity
 from allennlp.common.testing import AllenNlpTestCase
 
 
@@ -79,6 +80,19 @@ class TestAttention(AllenNlpTestCase):
         result = attention(query_tensor, sentence_tensor).data.numpy()
         assert_almost_equal(result, [[1.9, 1.4, 1.9, -.6]])
 
+    def test_precomputed_matrix_gives_the_same_attention(self):
+        matrix = Variable(torch.rand(2, 4, 3))
+        mask = Variable(torch.FloatTensor([[1, 1, 1, 0], [1, 1, 1, 1]]))
+        for similarity_function in [None, BilinearSimilarity(5, 3), LinearSimilarity(5, 3)]:
+            attention = Attention(similarity_function)
+            vector_dim = 3 if similarity_function is None else 5
+            precomputed_matrix = attention.precompute_matrix(matrix)
+            for _ in range(3):
+                vector = Variable(torch.rand(2, vector_dim))
+                expected_result = attention(vector, matrix, mask).data.numpy()
+                result = attention(vector, matrix, mask, precomputed_matrix).data.numpy()
+                assert_almost_equal(result, expected_result, decimal=6)
+
     def test_can_build_from_params(self):
         params = Params({'similarity_function': {'type': 'cosine'}, 'normalize': False})
         attention = Attention.from_params(params)
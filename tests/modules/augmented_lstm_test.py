@@ -98,3 +98,14 @@ class TestAugmentedLSTM(AllenNlpTestCase):
         lstm = AugmentedLstm(2, 3, use_highway=False)
         true_state_bias = numpy.array([0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0])
         numpy.testing.assert_array_equal(lstm.state_linearity.bias.data.numpy(), true_state_bias)
+
+    def test_final_state_of_short_sequences_depends_on_their_whole_input(self):
+        sorted_tensor, sorted_sequence, _, _ = sort_batch_by_length(self.random_tensor, self.sequence_lengths)
+        sorted_tensor = torch.autograd.Variable(sorted_tensor.data, requires_grad=True)
+        tensor = pack_padded_sequence(sorted_tensor, sorted_sequence.data.tolist(), batch_first=True)
+        lstm = AugmentedLstm(10, 11)
+        _, (state, _) = lstm(tensor)
+        # The last sequence in the sorted batch has length 2.
+        state[0, 4].sum().backward()
+        assert sorted_tensor.grad.data[4, 0].abs().sum() > 0
+        numpy.testing.assert_array_equal(sorted_tensor.grad.data[4, 2:].numpy(), 0.0)
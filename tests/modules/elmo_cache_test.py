@@ -0,0 +1,85 @@
+# pylint: disable=no-self-use,invalid-name,protected-access
+import os
+
+import numpy
+from torch.autograd import Variable
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.modules.elmo import _ElmoBiLm, batch_to_ids
+from allennlp.modules.elmo_cache import ElmoActivationCache
+
+FIXTURES = os.path.join('tests', 'fixtures', 'elmo')
+
+
+class TestElmoActivationCache(AllenNlpTestCase):
+    def test_memory_cache_evicts_least_recently_used_sentences(self):
+        cache = ElmoActivationCache(max_sentences_in_memory=2)
+        cache.put('a', numpy.zeros((3, 4, 2)))
+        cache.put('b', numpy.ones((3, 4, 2)))
+        assert cache.get('a') is not None
+        cache.put('c', numpy.ones((3, 5, 2)))
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+
+    def test_file_cache_persists_between_caches(self):
+        cache_file = os.path.join(self.TEST_DIR, 'elmo_cache.hdf5')
+        activations = numpy.random.rand(3, 4, 2).astype(numpy.float32)
+        cache = ElmoActivationCache(max_sentences_in_memory=0, cache_file=cache_file)
+        cache.put('a', activations)
+        assert not cache
+        cache.close()
+
+        new_cache = ElmoActivationCache(max_sentences_in_memory=10, cache_file=cache_file)
+        numpy.testing.assert_array_equal(new_cache.get('a'), activations)
+        assert len(new_cache) == 1
+        assert new_cache.get('b') is None
+        new_cache.close()
+
+    def test_sentence_key_ignores_the_character_id_dtype(self):
+        character_ids = batch_to_ids([['The', 'sentence', '.']]).numpy()[0]
+        assert ElmoActivationCache.sentence_key(character_ids) == \
+                ElmoActivationCache.sentence_key(character_ids.astype(numpy.int32))
+        assert ElmoActivationCache.sentence_key(character_ids) != \
+                ElmoActivationCache.sentence_key(character_ids[:2])
+
+    def test_cached_bilm_matches_the_bilm(self):
+        options_file = os.path.join(FIXTURES, 'options.json')
+        weight_file = os.path.join(FIXTURES, 'lm_weights.hdf5')
+        bilm = _ElmoBiLm(options_file, weight_file)
+        cached_bilm = _ElmoBiLm(options_file, weight_file, ElmoActivationCache(10))
+
+        sentences = [['The', 'sentence', '.'],
+                     ['ELMo', 'helps', 'disambiguate', 'ELMo', 'from', 'Elmo', '.'],
+                     []]
+        first_output = cached_bilm(Variable(batch_to_ids(sentences)))
+        assert len(cached_bilm._activation_cache) == 3
+        # Each sentence's activations are a copy, rather than a view keeping the batch alive.
+        for activations in cached_bilm._activation_cache._memory.values():
+            assert activations.base is None
+
+        # The second batch has one new sentence, and two we've cached, padded to a different
+        # length.  The new sentence is run through the biLM on its own.
+        new_sentence = ['A', 'new', 'one', 'appears']
+        cached_bilm._elmo_lstm.reset_states()
+        second_output = cached_bilm(Variable(batch_to_ids([sentences[0], new_sentence, sentences[2]])))
+        assert len(cached_bilm._activation_cache) == 4
+
+        for output, batch, positions in [(first_output, sentences, [0, 1, 2]),
+                                         (second_output, [sentences[0], sentences[2]], [0, 2])]:
+            bilm._elmo_lstm.reset_states()
+            expected_output = bilm(Variable(batch_to_ids(batch)))
+            for expected_index, index in enumerate(positions):
+                length = len(batch[expected_index]) + 2
+                assert output['mask'].data[index].sum() == length
+                for layer, expected_layer in zip(output['activations'], expected_output['activations']):
+                    numpy.testing.assert_array_almost_equal(layer.data[index, :length].numpy(),
+                                                            expected_layer.data[expected_index, :length].numpy(),
+                                                            decimal=5)
+
+        bilm._elmo_lstm.reset_states()
+        expected_output = bilm(Variable(batch_to_ids([new_sentence])))
+        for layer, expected_layer in zip(second_output['activations'], expected_output['activations']):
+            numpy.testing.assert_array_almost_equal(layer.data[1, :6].numpy(),
+                                                    expected_layer.data[0].numpy(), decimal=5)
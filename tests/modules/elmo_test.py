@@ -7,12 +7,13 @@ import numpy
 import torch
 from torch.autograd import Variable
 
+from allennlp.commands.elmo_vocab import write_vocab_embeddings
 from allennlp.common.testing import AllenNlpTestCase
 from allennlp.data.token_indexers.elmo_indexer import ELMoTokenCharactersIndexer
 from allennlp.data import Token, Vocabulary, Instance
 from allennlp.data.dataset import Dataset
 from allennlp.data.iterators import BasicIterator
-from allennlp.modules.elmo import _ElmoBiLm, Elmo, _ElmoCharacterEncoder
+from allennlp.modules.elmo import _ElmoBiLm, Elmo, _ElmoCharacterEncoder, batch_to_ids
 from allennlp.data.fields import TextField
 from allennlp.nn.util import remove_sentence_boundaries
 
@@ -137,6 +138,14 @@ class TestElmo(AllenNlpTestCase):
         assert list(elmo_representations[1].size()) == [2, 7, 32]
         assert list(mask.size()) == [2, 7]
 
+    def test_batch_to_ids_matches_indexing_instances(self):
+        sentences = [['The', 'sentence', '.'],
+                     ['ELMo', 'helps', 'disambiguate', 'ELMo', 'from', 'Elmo', '.'],
+                     []]
+        expected_ids = self._sentences_to_ids(sentences)
+        character_ids = batch_to_ids(sentences)
+        numpy.testing.assert_array_equal(character_ids.numpy(), expected_ids.data.numpy())
+
     def test_elmo_4D_input(self):
         sentences = [[['The', 'sentence', '.'],
                       ['ELMo', 'helps', 'disambiguate', 'ELMo', 'from', 'Elmo', '.']],
@@ -215,3 +224,27 @@ class TestElmoTokenRepresentation(AllenNlpTestCase):
             indices = Variable(torch.from_numpy(numpy.array(indices))).view(1, 1, -1)
             embeddings = elmo_token_embedder(indices)['token_embedding']
             assert numpy.allclose(embeddings[0, correct_index, :].data.numpy(), embeddings[0, 1, :].data.numpy())
+
+    def test_elmo_token_representation_with_precomputed_embeddings(self):
+        with open(os.path.join(FIXTURES, 'vocab_test.txt'), 'r') as fin:
+            tokens = fin.read().strip().split('\n')
+
+        options_file = os.path.join(FIXTURES, 'options.json')
+        weight_file = os.path.join(FIXTURES, 'lm_weights.hdf5')
+        token_embedding_file = os.path.join(self.TEST_DIR, 'token_embeddings.hdf5')
+        # Only half of the tokens have precomputed embeddings, so the rest go through the CNN.
+        write_vocab_embeddings(tokens[:200], options_file, weight_file, token_embedding_file)
+
+        elmo_token_embedder = _ElmoCharacterEncoder(options_file, weight_file)
+        precomputed_token_embedder = _ElmoCharacterEncoder(options_file, weight_file,
+                                                           token_embedding_file=token_embedding_file)
+
+        sentences = [tokens[:5], tokens[195:210], tokens[300:302] + tokens[300:302], []]
+        character_ids = Variable(batch_to_ids(sentences))
+        expected_output = elmo_token_embedder(character_ids)
+        output = precomputed_token_embedder(character_ids)
+
+        numpy.testing.assert_array_equal(output['mask'].data.numpy(), expected_output['mask'].data.numpy())
+        numpy.testing.assert_array_almost_equal(output['token_embedding'].data.numpy(),
+                                                expected_output['token_embedding'].data.numpy(),
+                                                decimal=5)
@@ -4,7 +4,7 @@ import torch
 from torch.autograd import Variable
 from torch.nn import LSTM
 
-from allennlp.modules.encoder_base import _EncoderBase
+from allennlp.modules.encoder_base import _EncoderBase, SortedBatch
 from allennlp.common.testing import AllenNlpTestCase
 from allennlp.nn.util import sort_batch_by_length, get_lengths_from_binary_sequence_mask
 
@@ -188,3 +188,16 @@ class TestEncoderBase(AllenNlpTestCase):
                                          index_selected_initial_states[0][:, 4, :].data.numpy())
         numpy.testing.assert_array_equal(self.encoder_base._states[1][:, 4, :].data.numpy(),
                                          index_selected_initial_states[1][:, 4, :].data.numpy())
+
+    def test_sorted_batch_packs_and_unpacks(self):
+        sorted_batch = SortedBatch(self.mask)
+        assert sorted_batch.num_valid == self.num_valid
+        assert sorted_batch.sorted_sequence_lengths == [7, 6, 2]
+        numpy.testing.assert_array_equal(sorted_batch.sorting_indices.data.numpy()[:3], [0, 1, 3])
+
+        packed_sequence = sorted_batch.pack(self.tensor)
+        assert packed_sequence.data.size(0) == 15
+        # Unpacking restores the order and padding, and the empty sequences are zero.
+        unpacked = sorted_batch.unpack(packed_sequence)
+        expected = self.tensor.data.numpy() * self.mask.data.numpy()[:, :, None]
+        numpy.testing.assert_array_equal(unpacked.data.numpy(), expected)
@@ -39,3 +39,31 @@ class TestLstmCellWithProjection(AllenNlpTestCase):
         # Test the cell clipping.
         numpy.testing.assert_array_less(lstm_state[0].data.numpy(), 2.0)
         numpy.testing.assert_array_less(-lstm_state[0].data.numpy(), 2.0)
+
+    def test_batched_sequences_match_running_each_sequence_on_its_own(self):
+        lengths = [5, 4, 2, 1]
+        input_tensor = torch.rand(4, 5, 3)
+        for go_forward in [True, False]:
+            lstm = LstmCellWithProjection(input_size=3,
+                                          hidden_size=5,
+                                          cell_size=7,
+                                          go_forward=go_forward,
+                                          memory_cell_clip_value=2,
+                                          state_projection_clip_value=1)
+            output_sequence, (state, memory) = lstm(Variable(input_tensor), lengths)
+            for i, length in enumerate(lengths):
+                single_output, (single_state, single_memory) = lstm(Variable(input_tensor[i:i + 1, :length]),
+                                                                    [length])
+                numpy.testing.assert_array_almost_equal(output_sequence.data[i, :length].numpy(),
+                                                        single_output.data[0].numpy())
+                numpy.testing.assert_array_almost_equal(state.data[0, i].numpy(), single_state.data[0, 0].numpy())
+                numpy.testing.assert_array_almost_equal(memory.data[0, i].numpy(),
+                                                        single_memory.data[0, 0].numpy())
+
+    def test_final_state_of_short_sequences_depends_on_their_whole_input(self):
+        input_tensor = Variable(torch.rand(2, 4, 3), requires_grad=True)
+        lstm = LstmCellWithProjection(input_size=3, hidden_size=5, cell_size=7)
+        _, (state, _) = lstm(input_tensor, [4, 2])
+        state[0, 1].sum().backward()
+        assert input_tensor.grad.data[1, 0].abs().sum() > 0
+        numpy.testing.assert_array_equal(input_tensor.grad.data[1, 2:].numpy(), 0.0)
@@ -5,6 +5,7 @@ from torch.autograd import Variable
 
 from allennlp.common import Params
 from allennlp.modules import MatrixAttention
+from allennlp.modules.similarity_functions import LinearSimilarity
 from allennlp.common.testing import AllenNlpTestCase
 
 
@@ -22,3 +23,22 @@ class TestMatrixAttention(AllenNlpTestCase):
         attention = MatrixAttention.from_params(params)
         # pylint: disable=protected-access
         assert attention._similarity_function.__class__.__name__ == 'CosineSimilarity'
+
+    def test_forward_matches_tiled_similarity_with_gradients(self):
+        similarity = LinearSimilarity(4, 4, combination='x,y,x*y')
+        attention = MatrixAttention(similarity)
+        matrix_1_data = torch.rand(2, 5, 4)
+        matrix_2_data = torch.rand(2, 3, 4)
+        # The default implementation, which tiles the matrices and calls ``forward``.
+        tiled_similarity = super(LinearSimilarity, similarity).matrix_similarity
+        results = []
+        for compute in [attention, tiled_similarity]:
+            similarity.zero_grad()
+            matrix_1 = Variable(matrix_1_data.clone(), requires_grad=True)
+            matrix_2 = Variable(matrix_2_data.clone(), requires_grad=True)
+            output = compute(matrix_1, matrix_2)
+            (output * output).sum().backward()
+            results.append([output.data.numpy(), matrix_1.grad.data.numpy(), matrix_2.grad.data.numpy(),
+                            similarity._weight_vector.grad.data.numpy()])  # pylint: disable=protected-access
+        for result, expected_result in zip(*results):
+            assert_allclose(result, expected_result, rtol=1e-5, atol=1e-6)
@@ -31,3 +31,37 @@ class MultiHeadSelfAttentionTest(AllenNlpTestCase):
         result_without_mask = attention(tensor[:, :6, :])
         numpy.testing.assert_almost_equal(result[0, :6, :].data.cpu().numpy(),
                                           result_without_mask[0, :, :].data.cpu().numpy())
+
+    def test_windowed_attention_matches_attention_with_a_banded_mask(self):
+        # pylint: disable=protected-access
+        attention = MultiHeadSelfAttention(num_heads=2,
+                                           input_dim=5,
+                                           attention_dim=4,
+                                           values_dim=3,
+                                           attention_dropout_prob=0.0,
+                                           attention_window=2,
+                                           num_global_tokens=1)
+        inputs = Variable(torch.randn(2, 9, 5))
+        mask = Variable(torch.ones([2, 9]))
+        mask[1, 6:] = 0
+        result = attention(inputs, mask)
+
+        # Compute the attention over all positions, masking the pairs of positions which are more
+        # than two apart, unless one of them is the global first position.
+        positions = numpy.arange(9)
+        allowed = ((numpy.abs(positions[:, None] - positions[None, :]) <= 2) |
+                   (positions[:, None] < 1) | (positions[None, :] < 1))
+        allowed = allowed[None, :, :] & (mask.data.numpy()[:, None, :] == 1)
+        inputs_array = inputs.data.numpy()
+        head_outputs = []
+        for head in range(2):
+            queries = inputs_array.dot(attention._query_projections.data[head].numpy())
+            keys = inputs_array.dot(attention._key_projections.data[head].numpy())
+            values = inputs_array.dot(attention._value_projections.data[head].numpy())
+            similarities = numpy.matmul(queries, keys.transpose(0, 2, 1)) / attention._scale
+            similarities = numpy.where(allowed, similarities, -numpy.inf)
+            weights = numpy.exp(similarities - similarities.max(axis=-1, keepdims=True))
+            weights /= weights.sum(axis=-1, keepdims=True)
+            head_outputs.append(numpy.matmul(weights, values))
+        expected = attention._output_projection(Variable(torch.from_numpy(numpy.concatenate(head_outputs, -1))))
+        numpy.testing.assert_almost_equal(result.data.numpy(), expected.data.numpy(), decimal=5)
@@ -9,6 +9,7 @@ from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 
 from allennlp.common.checks import ConfigurationError
 from allennlp.common.testing import AllenNlpTestCase
+from allennlp.modules.encoder_base import SortedBatch
 from allennlp.modules.seq2seq_encoders import PytorchSeq2SeqWrapper
 from allennlp.nn.util import sort_batch_by_length, get_lengths_from_binary_sequence_mask
 
@@ -199,3 +200,39 @@ class TestPytorchSeq2SeqWrapper(AllenNlpTestCase):
         assert_almost_equal(
                 states[-1][0][:, -5:, :].data.numpy(), states[-2][0][:, -5:, :].data.numpy()
         )
+
+    def test_consecutive_encoders_can_share_a_sorted_batch(self):
+        first_encoder = PytorchSeq2SeqWrapper(LSTM(bidirectional=True, num_layers=1, input_size=3,
+                                                   hidden_size=4, batch_first=True))
+        second_encoder = PytorchSeq2SeqWrapper(GRU(num_layers=2, input_size=8, hidden_size=5, batch_first=True))
+        tensor = Variable(torch.rand([5, 7, 3]))
+        mask = Variable(torch.ones(5, 7))
+        mask[0, 3:] = 0
+        mask[2, :] = 0
+        mask[3, 6:] = 0
+        mask[4, 1:] = 0
+        expected_output = second_encoder(first_encoder(tensor, mask), mask)
+
+        sorted_batch = SortedBatch(mask)
+        output = second_encoder(first_encoder(tensor, sorted_batch), sorted_batch)
+        assert_almost_equal(output.data.numpy(), expected_output.data.numpy())
+
+        packed_output = second_encoder(first_encoder(sorted_batch.pack(tensor), sorted_batch), sorted_batch)
+        assert_almost_equal(sorted_batch.unpack(packed_output).data.numpy(), expected_output.data.numpy())
+
+    def test_stateful_wrapper_accepts_a_packed_sorted_batch(self):
+        encoder = PytorchSeq2SeqWrapper(LSTM(num_layers=1, input_size=3, hidden_size=7, batch_first=True),
+                                        stateful=True)
+        packed_encoder = PytorchSeq2SeqWrapper(encoder._module, stateful=True)  # pylint: disable=protected-access
+        for _ in range(2):
+            tensor = Variable(torch.rand([4, 5, 3]))
+            mask = Variable(torch.ones(4, 5))
+            mask[1, 2:] = 0
+            mask[3, :] = 0
+            sorted_batch = SortedBatch(mask)
+            expected_output = encoder(tensor, mask)
+            output = sorted_batch.unpack(packed_encoder(sorted_batch.pack(tensor), sorted_batch))
+            assert_almost_equal(output.data.numpy(), expected_output.data.numpy())
+            # pylint: disable=protected-access
+            for state, expected_state in zip(packed_encoder._states, encoder._states):
+                assert_almost_equal(state.data.numpy(), expected_state.data.numpy())
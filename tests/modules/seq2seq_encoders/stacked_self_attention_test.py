@@ -2,8 +2,9 @@
 import torch
 from torch.autograd import Variable
 
+from allennlp.common import Params
 from allennlp.common.testing import AllenNlpTestCase
-from allennlp.modules.seq2seq_encoders import StackedSelfAttentionEncoder
+from allennlp.modules.seq2seq_encoders import Seq2SeqEncoder, StackedSelfAttentionEncoder
 
 
 class TestStackedSelfAttention(AllenNlpTestCase):
@@ -30,3 +31,18 @@ class TestStackedSelfAttention(AllenNlpTestCase):
         inputs = Variable(torch.randn([3, 5, 9]))
         encoder_output = encoder(inputs, None)
         assert list(encoder_output.size()) == [3, 5, 12]
+
+    def test_stacked_self_attention_can_attend_within_a_window(self):
+        encoder = Seq2SeqEncoder.from_params(Params({"type": "stacked_self_attention",
+                                                     "input_dim": 9,
+                                                     "hidden_dim": 12,
+                                                     "projection_dim": 9,
+                                                     "feedforward_hidden_dim": 5,
+                                                     "num_layers": 2,
+                                                     "num_attention_heads": 3,
+                                                     "attention_window": 2,
+                                                     "num_global_tokens": 1}))
+        inputs = Variable(torch.randn([3, 7, 9]))
+        mask = Variable(torch.LongTensor([[1] * 7, [1] * 5 + [0] * 2, [1] * 2 + [0] * 5]))
+        encoder_output = encoder(inputs, mask)
+        assert list(encoder_output.size()) == [3, 7, 12]
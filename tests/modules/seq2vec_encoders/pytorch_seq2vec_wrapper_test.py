@@ -8,6 +8,7 @@ from torch.nn.utils.rnn import pack_padded_sequence
 
 from allennlp.common.checks import ConfigurationError
 from allennlp.common.testing import AllenNlpTestCase
+from allennlp.modules.encoder_base import SortedBatch
 from allennlp.modules.seq2vec_encoders import PytorchSeq2VecWrapper
 from allennlp.nn.util import sort_batch_by_length, get_lengths_from_binary_sequence_mask
 
@@ -118,3 +119,16 @@ class TestPytorchSeq2VecWrapper(AllenNlpTestCase):
         with pytest.raises(ConfigurationError):
             lstm = LSTM(bidirectional=True, num_layers=3, input_size=3, hidden_size=7)
             _ = PytorchSeq2VecWrapper(lstm)
+
+    def test_forward_accepts_a_sorted_batch(self):
+        encoder = PytorchSeq2VecWrapper(LSTM(bidirectional=True, num_layers=2, input_size=3,
+                                             hidden_size=7, batch_first=True))
+        tensor = Variable(torch.rand([4, 6, 3]))
+        mask = Variable(torch.ones(4, 6))
+        mask[0, 2:] = 0
+        mask[2, :] = 0
+        expected_output = encoder(tensor, mask)
+        sorted_batch = SortedBatch(mask)
+        assert_almost_equal(encoder(tensor, sorted_batch).data.numpy(), expected_output.data.numpy())
+        assert_almost_equal(encoder(sorted_batch.pack(tensor), sorted_batch).data.numpy(),
+                            expected_output.data.numpy())
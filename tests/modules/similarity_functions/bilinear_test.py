@@ -7,7 +7,7 @@ from torch.nn.parameter import Parameter
 from torch.autograd import Variable
 
 from allennlp.common import Params
-from allennlp.modules.similarity_functions import BilinearSimilarity
+from allennlp.modules.similarity_functions import BilinearSimilarity, SimilarityFunction
 from allennlp.common.testing import AllenNlpTestCase
 
 class TestBilinearSimilarityFunction(AllenNlpTestCase):
@@ -51,3 +51,22 @@ class TestBilinearSimilarityFunction(AllenNlpTestCase):
                 })
         bilinear = BilinearSimilarity.from_params(params)
         assert list(bilinear._weight_matrix.size()) == [3, 4]  # pylint: disable=protected-access
+
+    def test_forward_with_precomputed_tensor_2_matches_forward(self):
+        bilinear = BilinearSimilarity(4, 3)
+        a_vectors = Variable(torch.rand(2, 5, 4))
+        b_vectors = Variable(torch.rand(2, 5, 3))
+        expected_result = bilinear(a_vectors, b_vectors).data.numpy()
+        precomputed = bilinear.precompute_tensor_2(b_vectors)
+        result = bilinear.forward_with_precomputed_tensor_2(a_vectors, precomputed).data.numpy()
+        assert_almost_equal(result, expected_result, decimal=5)
+
+    def test_matrix_similarity_matches_tiled_forward(self):
+        bilinear = BilinearSimilarity(4, 3)
+        bilinear._bias = Parameter(torch.FloatTensor([.1]))  # pylint: disable=protected-access
+        matrix_1 = Variable(torch.rand(2, 5, 4))
+        matrix_2 = Variable(torch.rand(2, 7, 3))
+        expected_result = SimilarityFunction.matrix_similarity(bilinear, matrix_1, matrix_2).data.numpy()
+        result = bilinear.matrix_similarity(matrix_1, matrix_2).data.numpy()
+        assert result.shape == (2, 5, 7)
+        assert_almost_equal(result, expected_result, decimal=5)
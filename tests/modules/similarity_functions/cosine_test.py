@@ -6,7 +6,7 @@ import torch
 from torch.autograd import Variable
 
 from allennlp.common import Params
-from allennlp.modules.similarity_functions import CosineSimilarity
+from allennlp.modules.similarity_functions import CosineSimilarity, SimilarityFunction
 from allennlp.common.testing import AllenNlpTestCase
 
 
@@ -40,3 +40,21 @@ class TestCosineSimilarityFunction(AllenNlpTestCase):
 
     def test_can_construct_from_params(self):
         assert CosineSimilarity.from_params(Params({})).__class__.__name__ == 'CosineSimilarity'
+
+    def test_forward_with_precomputed_tensor_2_matches_forward(self):
+        cosine_similarity = CosineSimilarity()
+        a_vectors = Variable(torch.rand(2, 5, 4))
+        b_vectors = Variable(torch.rand(2, 5, 4))
+        expected_result = cosine_similarity(a_vectors, b_vectors).data.numpy()
+        precomputed = cosine_similarity.precompute_tensor_2(b_vectors)
+        result = cosine_similarity.forward_with_precomputed_tensor_2(a_vectors, precomputed).data.numpy()
+        assert_almost_equal(result, expected_result, decimal=5)
+
+    def test_matrix_similarity_matches_tiled_forward(self):
+        cosine_similarity = CosineSimilarity()
+        matrix_1 = Variable(torch.rand(2, 5, 4))
+        matrix_2 = Variable(torch.rand(2, 7, 4))
+        expected_result = SimilarityFunction.matrix_similarity(cosine_similarity, matrix_1, matrix_2).data.numpy()
+        result = cosine_similarity.matrix_similarity(matrix_1, matrix_2).data.numpy()
+        assert result.shape == (2, 5, 7)
+        assert_almost_equal(result, expected_result, decimal=5)
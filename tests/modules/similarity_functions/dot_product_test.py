@@ -6,7 +6,7 @@ import torch
 from torch.autograd import Variable
 
 from allennlp.common import Params
-from allennlp.modules.similarity_functions import DotProductSimilarity
+from allennlp.modules.similarity_functions import DotProductSimilarity, SimilarityFunction
 from allennlp.common.testing import AllenNlpTestCase
 
 
@@ -33,3 +33,13 @@ class TestDotProductSimilarityFunction(AllenNlpTestCase):
 
     def test_can_construct_from_params(self):
         assert DotProductSimilarity.from_params(Params({})).__class__.__name__ == 'DotProductSimilarity'
+
+    def test_matrix_similarity_matches_tiled_forward(self):
+        for scale_output in [False, True]:
+            dot_product = DotProductSimilarity(scale_output=scale_output)
+            matrix_1 = Variable(torch.rand(2, 5, 4))
+            matrix_2 = Variable(torch.rand(2, 7, 4))
+            expected_result = SimilarityFunction.matrix_similarity(dot_product, matrix_1, matrix_2).data.numpy()
+            result = dot_product.matrix_similarity(matrix_1, matrix_2).data.numpy()
+            assert result.shape == (2, 5, 7)
+            assert_almost_equal(result, expected_result, decimal=5)
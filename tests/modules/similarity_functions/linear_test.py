@@ -7,7 +7,7 @@ from torch.nn.parameter import Parameter
 from torch.autograd import Variable
 
 from allennlp.common import Params
-from allennlp.modules.similarity_functions import LinearSimilarity
+from allennlp.modules.similarity_functions import LinearSimilarity, SimilarityFunction
 from allennlp.common.testing import AllenNlpTestCase
 
 class TestLinearSimilarityFunction(AllenNlpTestCase):
@@ -90,3 +90,25 @@ class TestLinearSimilarityFunction(AllenNlpTestCase):
                 })
         linear = LinearSimilarity.from_params(params)
         assert list(linear._weight_vector.size()) == [16]
+
+    def test_forward_with_precomputed_tensor_2_matches_forward(self):
+        for combination in ['x,y', 'x*y', 'y,x-y,y*y', 'y,2']:
+            linear = LinearSimilarity(4, 4, combination=combination)
+            linear._bias = Parameter(torch.FloatTensor([.3]))
+            a_vectors = Variable(torch.rand(2, 5, 4))
+            b_vectors = Variable(torch.rand(2, 5, 4))
+            expected_result = linear(a_vectors, b_vectors).data.numpy()
+            precomputed = linear.precompute_tensor_2(b_vectors)
+            result = linear.forward_with_precomputed_tensor_2(a_vectors, precomputed).data.numpy()
+            assert_almost_equal(result, expected_result, decimal=5)
+
+    def test_matrix_similarity_matches_tiled_forward(self):
+        for combination in ['x,y,x*y', 'x', 'y', 'x+y,x-y', 'y-x', 'x/y,y/x', '1*1,2*2,1+1', 'y,2']:
+            linear = LinearSimilarity(4, 4, combination=combination)
+            linear._bias = Parameter(torch.FloatTensor([.3]))
+            matrix_1 = Variable(torch.rand(2, 5, 4) + .5)
+            matrix_2 = Variable(torch.rand(2, 7, 4) + .5)
+            expected_result = SimilarityFunction.matrix_similarity(linear, matrix_1, matrix_2).data.numpy()
+            result = linear.matrix_similarity(matrix_1, matrix_2).data.numpy()
+            assert result.shape == (2, 5, 7)
+            assert_almost_equal(result, expected_result, decimal=5)
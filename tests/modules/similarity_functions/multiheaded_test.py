@@ -8,7 +8,7 @@ from torch.autograd import Variable
 from allennlp.common import Params
 from allennlp.common.checks import ConfigurationError
 from allennlp.common.testing import AllenNlpTestCase
-from allennlp.modules.similarity_functions import MultiHeadedSimilarity
+from allennlp.modules.similarity_functions import MultiHeadedSimilarity, SimilarityFunction
 
 class TestMultiHeadedSimilarityFunction(AllenNlpTestCase):
     def test_weights_are_correct_sizes(self):
@@ -33,3 +33,22 @@ class TestMultiHeadedSimilarityFunction(AllenNlpTestCase):
         result = similarity(a_vectors, b_vectors).data.numpy()
         assert result.shape == (1, 1, 2, 3)
         assert_almost_equal(result, [[[[2, -1, 5], [5, -2, 11]]]])
+
+    def test_forward_with_precomputed_tensor_2_matches_forward(self):
+        similarity = MultiHeadedSimilarity(num_heads=2, tensor_1_dim=6, tensor_1_projected_dim=4, tensor_2_dim=4)
+        a_vectors = Variable(torch.rand(2, 5, 6))
+        b_vectors = Variable(torch.rand(2, 5, 4))
+        expected_result = similarity(a_vectors, b_vectors).data.numpy()
+        precomputed = similarity.precompute_tensor_2(b_vectors)
+        result = similarity.forward_with_precomputed_tensor_2(a_vectors, precomputed).data.numpy()
+        assert result.shape == (2, 5, 2)
+        assert_almost_equal(result, expected_result, decimal=5)
+
+    def test_matrix_similarity_matches_tiled_forward(self):
+        similarity = MultiHeadedSimilarity(num_heads=2, tensor_1_dim=6, tensor_1_projected_dim=4, tensor_2_dim=4)
+        matrix_1 = Variable(torch.rand(2, 5, 6))
+        matrix_2 = Variable(torch.rand(2, 7, 4))
+        expected_result = SimilarityFunction.matrix_similarity(similarity, matrix_1, matrix_2).data.numpy()
+        result = similarity.matrix_similarity(matrix_1, matrix_2).data.numpy()
+        assert result.shape == (2, 5, 7, 2)
+        assert_almost_equal(result, expected_result, decimal=5)
@@ -60,3 +60,15 @@ class TestElmoTokenEmbedder(ModelTestCase):
         for key, original_filename in files_to_archive.items():
             new_filename = os.path.join(unarchive_dir, "fta", key)
             assert filecmp.cmp(original_filename, new_filename)
+
+    def test_tagger_with_cached_elmo_activations_can_train(self):
+        cache_file = os.path.join(self.TEST_DIR, 'elmo_cache.hdf5')
+        elmo_overrides = {'activation_cache_size': 100, 'activation_cache_file': cache_file}
+        overrides = json.dumps({'model': {'text_field_embedder': {'elmo': elmo_overrides}},
+                                'trainer': {'num_epochs': 2}})
+        params = Params.from_file('tests/fixtures/elmo/config/characters_token_embedder.json', overrides)
+        model = train_model(params, os.path.join(self.TEST_DIR, 'serialization'))
+        # pylint: disable=protected-access
+        activation_cache = model.text_field_embedder._token_embedders['elmo']._elmo._elmo_lstm._activation_cache
+        assert activation_cache
+        assert os.path.exists(cache_file)
@@ -1,5 +1,6 @@
 # pylint: disable=no-self-use,invalid-name
 import gzip
+import pickle
 
 import numpy
 import pytest
@@ -11,7 +12,8 @@ from allennlp.common import Params
 from allennlp.common.checks import ConfigurationError
 from allennlp.common.testing import AllenNlpTestCase
 from allennlp.data import Vocabulary
-from allennlp.modules.token_embedders.embedding import Embedding, _read_pretrained_embedding_file
+from allennlp.modules.token_embedders.embedding import Embedding, _read_pretrained_embedding_file, \
+        write_embedding_weight_file
 
 
 class TestEmbedding(AllenNlpTestCase):
@@ -113,3 +115,47 @@ class TestEmbedding(AllenNlpTestCase):
                 })
         with pytest.raises(ConfigurationError):
             _ = Embedding.from_params(vocab, params)
+
+    def test_weight_file_gives_the_same_embeddings_as_the_weight(self):
+        weight = torch.randn(10, 4)
+        weight[0].fill_(0)
+        dense_embedding = Embedding(10, 4, weight=weight, trainable=False, projection_dim=3)
+        inputs = Variable(torch.LongTensor([[0, 1, 2], [9, 3, 3]]))
+        expected = dense_embedding(inputs).data.numpy()
+        for quantization, decimal in [(None, 6), ('float16', 2), ('int8', 1)]:
+            weight_filename = self.TEST_DIR + "weights.npy"
+            write_embedding_weight_file(weight.numpy(), weight_filename, quantization)
+            embedding_layer = Embedding(10, 4, trainable=False, projection_dim=3, weight_file=weight_filename)
+            assert embedding_layer.weight is None
+            assert 'weight' not in embedding_layer.state_dict()
+            embedding_layer._projection.load_state_dict(dense_embedding._projection.state_dict())
+            output = embedding_layer(inputs).data.numpy()
+            numpy.testing.assert_array_almost_equal(output, expected, decimal=decimal)
+            # The padding embedding is still exactly zero after quantization.
+            numpy.testing.assert_array_equal(embedding_layer(inputs)[0, 0].data.numpy(),
+                                             dense_embedding(inputs)[0, 0].data.numpy())
+
+    def test_weight_file_can_be_pickled(self):
+        weight_filename = self.TEST_DIR + "weights.npy"
+        write_embedding_weight_file(numpy.random.rand(5, 3), weight_filename, 'int8')
+        embedding_layer = Embedding(5, 3, trainable=False, weight_file=weight_filename)
+        inputs = Variable(torch.LongTensor([[1, 4]]))
+        unpickled = pickle.loads(pickle.dumps(embedding_layer))
+        numpy.testing.assert_array_equal(unpickled(inputs).data.numpy(), embedding_layer(inputs).data.numpy())
+
+    def test_weight_file_raises_on_invalid_configurations(self):
+        weight_filename = self.TEST_DIR + "weights.npy"
+        write_embedding_weight_file(numpy.random.rand(5, 3), weight_filename)
+        with pytest.raises(ConfigurationError):
+            Embedding(5, 3, weight_file=weight_filename)
+        with pytest.raises(ConfigurationError):
+            Embedding(5, 4, trainable=False, weight_file=weight_filename)
+        with pytest.raises(ConfigurationError):
+            write_embedding_weight_file(numpy.random.rand(5, 3), weight_filename, 'int4')
+        vocab = Vocabulary()
+        params = Params({'pretrained_file': 'tests/fixtures/glove.6B.300d.sample.txt.gz',
+                         'weight_file': weight_filename,
+                         'embedding_dim': 3,
+                         'trainable': False})
+        with pytest.raises(ConfigurationError):
+            Embedding.from_params(vocab, params)
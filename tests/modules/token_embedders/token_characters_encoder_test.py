@@ -57,3 +57,29 @@ class TestTokenCharactersEncoder(AllenNlpTestCase):
         reshaped_manual_output = self.inner_encoder(embedded, mask)
         manual_output = reshaped_manual_output.view(3, 4, 3)
         assert_almost_equal(encoder_output.data.numpy(), manual_output.data.numpy())
+
+    def test_forward_only_encodes_one_padding_token(self):
+        numpy_tensor = numpy.random.randint(1, 6, size=(3, 4, 7))
+        # Padding characters within tokens, padding tokens, and a batch element with no tokens.
+        numpy_tensor[:, :, 5:] = 0
+        numpy_tensor[0, 2:] = 0
+        numpy_tensor[1, 3:] = 0
+        numpy_tensor[2] = 0
+        inputs = Variable(torch.from_numpy(numpy_tensor))
+
+        encoded_rows = []
+        self.encoder._encoder._module.register_forward_hook(  # pylint: disable=protected-access
+                lambda module, inputs, output: encoded_rows.append(output.size(0)))
+        encoder_output = self.encoder(inputs)
+        assert encoded_rows == [6]
+
+        embedded = self.embedding(inputs.view(12, 7))
+        mask = (inputs != 0).long().view(12, 7)
+        manual_output = self.inner_encoder(embedded, mask).view(3, 4, 3)
+        assert_almost_equal(encoder_output.data.numpy(), manual_output.data.numpy())
+
+        encoder_output.sum().backward()
+        manual_output.sum().backward()
+        # pylint: disable=protected-access
+        assert_almost_equal(self.encoder._embedding._module.weight.grad.data.numpy(),
+                            self.embedding.weight.grad.data.numpy())
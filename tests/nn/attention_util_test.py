@@ -0,0 +1,47 @@
+# pylint: disable=no-self-use,invalid-name
+import numpy
+from numpy.testing import assert_array_almost_equal
+import torch
+from torch.autograd import Variable
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.nn import attention_util, util
+
+
+class TestAttentionUtil(AllenNlpTestCase):
+    def test_masked_attention_matches_softmax_and_weighted_sum(self):
+        scores = Variable(torch.randn(2, 3, 4), requires_grad=True)
+        matrix = Variable(torch.randn(2, 4, 5), requires_grad=True)
+        mask = Variable(torch.FloatTensor([[1, 1, 1, 0], [0, 0, 0, 0]]))
+        for call_mask in [mask, None]:
+            output = attention_util.masked_attention(scores, matrix, call_mask)
+            expected = util.weighted_sum(matrix, util.last_dim_softmax(scores, call_mask))
+            assert_array_almost_equal(output.data.numpy(), expected.data.numpy())
+            grad_output = torch.randn(2, 3, 5)
+            gradients = torch.autograd.grad([output], [scores, matrix], [grad_output])
+            expected_gradients = torch.autograd.grad([expected], [scores, matrix], [grad_output])
+            for gradient, expected_gradient in zip(gradients, expected_gradients):
+                assert_array_almost_equal(gradient.data.numpy(), expected_gradient.data.numpy())
+        # The second instance is entirely masked, so attends to nothing.
+        assert_array_almost_equal(attention_util.masked_attention(scores, matrix, mask).data[1].numpy(),
+                                  numpy.zeros((3, 5)))
+
+    def test_masked_attention_handles_single_queries_and_higher_order_input(self):
+        scores = Variable(torch.randn(2, 3, 4))
+        matrix = Variable(torch.randn(2, 3, 4, 5))
+        mask = Variable(torch.FloatTensor([[1, 1, 0, 0], [1, 1, 1, 1]]))
+        output = attention_util.masked_attention(scores, matrix, mask)
+        assert output.size() == (2, 3, 5)
+        expected = util.weighted_sum(matrix, util.last_dim_softmax(scores, mask))
+        assert_array_almost_equal(output.data.numpy(), expected.data.numpy())
+
+        # Several queries over each of the (batch_size, 3) matrices, with a mask of the rows of
+        # each matrix.
+        scores = Variable(torch.randn(2, 3, 6, 4))
+        mask = Variable(torch.bernoulli(torch.ones(2, 3, 4) * 0.7))
+        output = attention_util.masked_attention(scores, matrix, mask)
+        assert output.size() == (2, 3, 6, 5)
+        attention = util.masked_softmax(scores.view(-1, 4),
+                                        mask.unsqueeze(2).expand(2, 3, 6, 4).contiguous().view(-1, 4))
+        expected = (attention.view(2, 3, 6, 4, 1) * matrix.unsqueeze(2)).sum(dim=-2)
+        assert_array_almost_equal(output.data.numpy(), expected.data.numpy())
@@ -0,0 +1,53 @@
+# pylint: disable=no-self-use,invalid-name
+import numpy
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.nn import coreference_util
+
+
+class TestCoreferenceUtil(AllenNlpTestCase):
+    def test_get_coreference_clusters_follows_antecedent_chains(self):
+        top_spans = numpy.array([[1, 2], [3, 4], [3, 7], [5, 6], [14, 56], [17, 80]])
+        antecedent_indices = numpy.array([[0, 0, 0, 0, 0, 0],
+                                          [0, 0, 0, 0, 0, 0],
+                                          [1, 0, 0, 0, 0, 0],
+                                          [2, 1, 0, 0, 0, 0],
+                                          [3, 2, 1, 0, 0, 0],
+                                          [4, 3, 2, 1, 0, 0]])
+        predicted_antecedents = numpy.array([-1, 0, -1, -1, 1, 3])
+        clusters = coreference_util.get_coreference_clusters(top_spans, antecedent_indices, predicted_antecedents)
+        assert clusters == [[(1, 2), (3, 4), (17, 80)], [(3, 7), (14, 56)]]
+
+        no_antecedents = -numpy.ones(6, dtype=int)
+        assert coreference_util.get_coreference_clusters(top_spans, antecedent_indices, no_antecedents) == []
+
+    def test_get_coreference_clusters_matches_building_clusters_span_by_span(self):
+        def span_by_span_clusters(top_spans, antecedent_indices, predicted_antecedents):
+            spans_to_cluster_ids = {}
+            clusters = []
+            for i, predicted_antecedent in enumerate(predicted_antecedents):
+                if predicted_antecedent < 0:
+                    continue
+                antecedent_span = tuple(top_spans[antecedent_indices[i, predicted_antecedent]])
+                if antecedent_span not in spans_to_cluster_ids:
+                    spans_to_cluster_ids[antecedent_span] = len(clusters)
+                    clusters.append([antecedent_span])
+                cluster_id = spans_to_cluster_ids[antecedent_span]
+                clusters[cluster_id].append(tuple(top_spans[i]))
+                spans_to_cluster_ids[tuple(top_spans[i])] = cluster_id
+            return clusters
+
+        random = numpy.random.RandomState(0)
+        for _ in range(20):
+            num_spans, max_antecedents = 40, 8
+            top_spans = numpy.stack([numpy.arange(num_spans), numpy.arange(num_spans) + 2], -1)
+            antecedent_indices = numpy.maximum(numpy.arange(num_spans)[:, None] -
+                                               numpy.arange(1, max_antecedents + 1)[None, :], 0)
+            predicted_antecedents = random.randint(-1, max_antecedents, num_spans)
+            # The first span can't have an antecedent, and the others can only pick valid ones.
+            predicted_antecedents = numpy.minimum(predicted_antecedents, numpy.arange(num_spans) - 1)
+            clusters = coreference_util.get_coreference_clusters(top_spans,
+                                                                 antecedent_indices,
+                                                                 predicted_antecedents)
+            expected = span_by_span_clusters(top_spans.tolist(), antecedent_indices, predicted_antecedents)
+            assert clusters == [[tuple(span) for span in cluster] for cluster in expected]
@@ -0,0 +1,15 @@
+# pylint: disable=no-self-use,invalid-name
+from numpy.testing import assert_almost_equal
+import torch
+from torch.autograd import Variable
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.nn import rnn_util
+
+
+class TestRnnUtil(AllenNlpTestCase):
+    def test_stack_timestep_outputs_pads_missing_rows_with_zeros(self):
+        outputs = [Variable(torch.ones(3, 2)), Variable(torch.ones(2, 2) * 2), Variable(torch.ones(1, 2) * 3)]
+        stacked = rnn_util.stack_timestep_outputs(outputs, 3).data.numpy()
+        assert stacked.shape == (3, 3, 2)
+        assert_almost_equal(stacked[:, :, 0], [[1, 2, 3], [1, 2, 0], [1, 0, 0]])
@@ -1,8 +1,12 @@
 # pylint: disable=no-self-use,invalid-name
 from unittest import TestCase
 
+import numpy
+
 from allennlp.models.archival import load_archive
+from allennlp.nn.coreference_util import get_coreference_clusters
 from allennlp.service.predictors import Predictor
+from allennlp.service.predictors.coref import _merge_clusters, _segment_sentences
 
 
 class TestCorefPredictor(TestCase):
@@ -29,3 +33,62 @@ class TestCorefPredictor(TestCase):
                 # Spans should be inside document.
                 assert 0 < mention[0] <= len(document)
                 assert 0 < mention[1] <= len(document)
+
+    def test_segmented_predictions_cover_the_whole_document(self):
+        inputs = {"document": "The dog chased the cat. It was fast. The cat climbed a tree. "
+                              "It waited there. The dog barked at it."}
+        archive = load_archive('tests/fixtures/coref/serialization/model.tar.gz')
+        predictor = Predictor.from_archive(archive, 'coreference-resolution')
+        archive = load_archive('tests/fixtures/coref/serialization/model.tar.gz')
+        segmenting_predictor = Predictor.from_archive(archive, 'coreference-resolution',
+                                                      predictor_args={"max_segment_length": 10,
+                                                                      "segment_overlap": 4,
+                                                                      "segments_per_batch": 2})
+        whole_result = predictor.predict_json(inputs)
+        document = whole_result["document"]
+        assert len(document) > 10
+
+        result = segmenting_predictor.predict_json(inputs)
+        assert result.keys() == whole_result.keys()
+        assert result["document"] == document
+        mentions = [tuple(mention) for cluster in result["clusters"] for mention in cluster]
+        # Clusters sharing a mention are merged, so each mention is in a single cluster.
+        assert len(mentions) == len(set(mentions))
+        for start, end in mentions:
+            assert 0 <= start <= end < len(document)
+        # The spans and antecedents of the segments, joined, describe the same clusters.
+        clusters = get_coreference_clusters(numpy.array(result["top_spans"]),
+                                            numpy.array(result["antecedent_indices"]),
+                                            numpy.array(result["predicted_antecedents"]))
+        assert sorted(sorted(cluster) for cluster in clusters) == \
+                sorted([tuple(mention) for mention in cluster] for cluster in result["clusters"])
+
+        # Batches go through the same path, whether or not a document is segmented.
+        short_inputs = {"document": "The cat slept."}
+        batch_results = segmenting_predictor.predict_batch_json([inputs, short_inputs])
+        assert batch_results[0] == result
+        assert batch_results[1] == segmenting_predictor.predict_json(short_inputs)
+        assert batch_results[1]["clusters"] == predictor.predict_json(short_inputs)["clusters"]
+
+
+class TestCorefSegmentation(TestCase):
+    def test_segment_sentences_overlaps_whole_sentences(self):
+        sentences = [["a"] * length for length in [3, 4, 2, 5, 3]]
+        segments = _segment_sentences(sentences, max_segment_length=9, segment_overlap=2)
+        assert segments == [(0, 3, 0), (2, 4, 7), (3, 5, 9)]
+        assert _segment_sentences(sentences, max_segment_length=100, segment_overlap=2) == [(0, 5, 0)]
+
+    def test_segment_sentences_puts_long_sentences_in_their_own_segment(self):
+        sentences = [["a"] * length for length in [2, 2, 10, 2]]
+        segments = _segment_sentences(sentences, max_segment_length=5, segment_overlap=2)
+        assert segments == [(0, 2, 0), (2, 3, 4), (3, 4, 14)]
+
+    def test_merge_clusters_joins_clusters_sharing_mentions(self):
+        clusters = [[(0, 1), (5, 6)],
+                    [(20, 21), (30, 30)],
+                    [(5, 6), (12, 14)],
+                    [(30, 30), (40, 41)],
+                    [(8, 8), (9, 9)]]
+        assert _merge_clusters(clusters) == [[(0, 1), (5, 6), (12, 14)],
+                                             [(8, 8), (9, 9)],
+                                             [(20, 21), (30, 30), (40, 41)]]
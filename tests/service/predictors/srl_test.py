@@ -1,6 +1,7 @@
 # pylint: disable=no-self-use,invalid-name
 from unittest import TestCase
 
+from allennlp.data.tokenizers import Token
 from allennlp.models.archival import load_archive
 from allennlp.service.predictors import Predictor
 
@@ -44,3 +45,20 @@ class TestSrlPredictor(TestCase):
         predictor = Predictor.from_archive(archive, 'semantic-role-labeling')
         result = predictor.predict_batch_json([inputs, inputs])
         assert result[0] == result[1]
+
+    def test_sharing_sentence_embeddings_gives_the_same_tags(self):
+        # pylint: disable=protected-access
+        archive = load_archive('tests/fixtures/srl/serialization/model.tar.gz')
+        predictor = Predictor.from_archive(archive, 'semantic-role-labeling')
+        sentences = [(["The", "squirrel", "wrote", "a", "unit", "test", "to", "make", "sure"], [2, 7, 8]),
+                     (["No", "verbs", "here"], []),
+                     (["It", "worked", "."], [1])]
+        sentences = [([Token(word) for word in words], verb_indices) for words, verb_indices in sentences]
+        tags = predictor._predict_sentence_frames(sentences, max_frames_per_batch=2, cuda_device=-1)
+        for (tokens, verb_indices), sentence_tags in zip(sentences, tags):
+            assert len(sentence_tags) == len(verb_indices)
+            for verb_index, verb_tags in zip(verb_indices, sentence_tags):
+                verb_labels = [0] * len(tokens)
+                verb_labels[verb_index] = 1
+                instance = predictor._dataset_reader.text_to_instance(tokens, verb_labels)
+                assert verb_tags == predictor._model.forward_on_instance(instance, -1)["tags"]
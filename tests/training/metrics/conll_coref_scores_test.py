@@ -0,0 +1,26 @@
+# pylint: disable=no-self-use,invalid-name,protected-access
+import torch
+
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.training.metrics import ConllCorefScores
+
+
+class ConllCorefScoresTest(AllenNlpTestCase):
+    def setUp(self):
+        super(ConllCorefScoresTest, self).setUp()
+        self.top_spans = torch.LongTensor([[[0, 1], [3, 4], [5, 5], [7, 9]]])
+        self.antecedent_indices = torch.LongTensor([[0, 0], [0, 0], [1, 0], [2, 1]])
+        self.predicted_antecedents = torch.LongTensor([[-1, 0, -1, 1]])
+
+    def test_get_predicted_clusters(self):
+        clusters, mention_to_predicted = ConllCorefScores.get_predicted_clusters(self.top_spans[0],
+                                                                                 self.antecedent_indices,
+                                                                                 self.predicted_antecedents[0])
+        assert clusters == [((0, 1), (3, 4), (7, 9))]
+        assert mention_to_predicted == {(0, 1): clusters[0], (3, 4): clusters[0], (7, 9): clusters[0]}
+
+    def test_perfect_predictions_score_one(self):
+        metric = ConllCorefScores()
+        metadata = [{"clusters": [[[0, 1], [3, 4], [7, 9]]]}]
+        metric(self.top_spans, self.antecedent_indices, self.predicted_antecedents, metadata)
+        assert metric.get_metric() == (1.0, 1.0, 1.0)
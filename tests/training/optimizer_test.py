@@ -0,0 +1,53 @@
+# pylint: disable=no-self-use,invalid-name
+import numpy
+import torch
+from torch.autograd import Variable
+
+from allennlp.common.params import Params
+from allennlp.common.testing import AllenNlpTestCase
+from allennlp.training.optimizers import DenseSparseAdam, Optimizer
+
+
+class TestOptimizer(AllenNlpTestCase):
+    def test_dense_sparse_adam_matches_adam_on_dense_gradients(self):
+        torch.manual_seed(0)
+        weight = torch.randn(6, 4)
+        parameter = torch.nn.Parameter(weight.clone())
+        baseline_parameter = torch.nn.Parameter(weight.clone())
+        # Newer versions of Pytorch add epsilon to the square root of the second moment after its
+        # bias correction, rather than before, which changes the update of weights with tiny
+        # gradients.  Without epsilon the updates are the same, up to rounding.
+        optimizer = DenseSparseAdam([parameter], lr=0.1, eps=0.0)
+        baseline_optimizer = torch.optim.Adam([baseline_parameter], lr=0.1, eps=0.0)
+        for _ in range(3):
+            grad = torch.randn(6, 4)
+            for param, opt in [(parameter, optimizer), (baseline_parameter, baseline_optimizer)]:
+                opt.zero_grad()
+                (param * Variable(grad)).sum().backward()
+                opt.step()
+        numpy.testing.assert_array_almost_equal(parameter.data.numpy(), baseline_parameter.data.numpy())
+
+    def test_dense_sparse_adam_only_updates_the_rows_with_sparse_gradients(self):
+        weight = torch.randn(6, 4)
+        parameter = torch.nn.Parameter(weight.clone())
+        baseline_parameter = torch.nn.Parameter(weight.clone())
+        optimizer = DenseSparseAdam([parameter], lr=0.1)
+        baseline_optimizer = DenseSparseAdam([baseline_parameter], lr=0.1)
+        # Row 2 is looked up twice, so its gradients are summed.
+        inputs = Variable(torch.LongTensor([[1, 2, 2]]))
+        for param, opt, sparse in [(parameter, optimizer, True), (baseline_parameter, baseline_optimizer, False)]:
+            opt.zero_grad()
+            torch.nn.functional.embedding(inputs, param, sparse=sparse).pow(2).sum().backward()
+            opt.step()
+        assert parameter.grad.data.is_sparse
+        # With a dense gradient, the rows which weren't looked up have a gradient of zero, which
+        # leaves them unchanged on the first step.
+        numpy.testing.assert_array_almost_equal(parameter.data.numpy(), baseline_parameter.data.numpy())
+        numpy.testing.assert_array_equal(parameter.data[3:].numpy(), weight[3:].numpy())
+        assert not numpy.allclose(parameter.data[1:3].numpy(), weight[1:3].numpy())
+
+    def test_optimizer_can_construct_dense_sparse_adam(self):
+        parameters = [torch.nn.Parameter(torch.randn(2, 3))]
+        optimizer = Optimizer.from_params(parameters, Params({"type": "dense_sparse_adam", "lr": 0.01}))
+        assert isinstance(optimizer, DenseSparseAdam)
+        assert optimizer.param_groups[0]['lr'] == 0.01
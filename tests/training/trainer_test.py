@@ -1,13 +1,17 @@
-# pylint: disable=invalid-name
+# pylint: disable=no-self-use,invalid-name
+import numpy
 import torch
+from torch.autograd import Variable
+from torch.nn.utils.clip_grad import clip_grad_norm
 import pytest
 
 from allennlp.common.testing import AllenNlpTestCase
-from allennlp.training.trainer import Trainer
+from allennlp.training.trainer import Trainer, sparse_clip_norm
 from allennlp.data import Vocabulary
 from allennlp.common.params import Params
 from allennlp.common.checks import ConfigurationError
 from allennlp.models.simple_tagger import SimpleTagger
+from allennlp.training.optimizers import DenseSparseAdam
 from allennlp.data.iterators import BasicIterator
 from allennlp.data.dataset_readers import SequenceTaggingDatasetReader
 
@@ -90,3 +94,42 @@ class TestTrainer(AllenNlpTestCase):
                               self.iterator, self.dataset,
                               num_epochs=2, serialization_dir=self.TEST_DIR)
             trainer.train()
+
+    def test_trainer_can_train_a_sparse_embedding(self):
+        params = Params({
+                "text_field_embedder": {
+                        "tokens": {
+                                "type": "embedding",
+                                "embedding_dim": 5,
+                                "sparse": True
+                                }
+                        },
+                "stacked_encoder": {
+                        "type": "lstm",
+                        "input_size": 5,
+                        "hidden_size": 7,
+                        "num_layers": 2
+                        }
+                })
+        model = SimpleTagger.from_params(self.vocab, params)
+        optimizer = DenseSparseAdam(model.parameters())
+        trainer = Trainer(model, optimizer, self.iterator, self.dataset, num_epochs=2,
+                          grad_norm=1.0, grad_clipping=0.1, serialization_dir=self.TEST_DIR)
+        trainer.train()
+        assert model.text_field_embedder.token_embedder_tokens.weight.grad.data.is_sparse
+
+    def test_sparse_clip_norm_matches_clip_grad_norm(self):
+        weight = torch.randn(5, 3)
+        inputs = Variable(torch.LongTensor([[0, 2, 2, 4]]))
+        for norm_type in [2, float('inf')]:
+            sparse_parameter = torch.nn.Parameter(weight.clone())
+            dense_parameter = torch.nn.Parameter(weight.clone())
+            for parameter, sparse in [(sparse_parameter, True), (dense_parameter, False)]:
+                embedded = torch.nn.functional.embedding(inputs, parameter, sparse=sparse)
+                (embedded * 10).pow(2).sum().backward()
+            norm = sparse_clip_norm([sparse_parameter], 1.0, norm_type)
+            expected_norm = clip_grad_norm([dense_parameter], 1.0, norm_type)
+            numpy.testing.assert_almost_equal(norm, float(expected_norm), decimal=3)
+            assert sparse_parameter.grad.data.is_sparse
+            numpy.testing.assert_array_almost_equal(sparse_parameter.grad.data.to_dense().numpy(),
+                                                    dense_parameter.grad.data.numpy())